@@ -0,0 +1,52 @@
+"""add candidate_committee link table
+
+Revision ID: add_candidate_committee
+Revises: add_contribution_date_backfill
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_candidate_committee'
+down_revision: Union[str, None] = 'add_contribution_date_backfill'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create candidate_committee and fill it from committees.candidate_ids"""
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'candidate_committee' in tables:
+        return
+
+    op.create_table(
+        'candidate_committee',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('candidate_id', sa.String(), nullable=False),
+        sa.Column('committee_id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('candidate_id', 'committee_id', name='uq_candidate_committee')
+    )
+    op.create_index(op.f('ix_candidate_committee_id'), 'candidate_committee', ['id'])
+    op.create_index('idx_candidate_committee_candidate', 'candidate_committee', ['candidate_id'])
+    op.create_index('idx_candidate_committee_committee', 'candidate_committee', ['committee_id'])
+
+    if 'committees' in tables:
+        op.execute(
+            "INSERT OR IGNORE INTO candidate_committee (candidate_id, committee_id, created_at) "
+            "SELECT DISTINCT TRIM(j.value), c.committee_id, datetime('now') "
+            "FROM committees c, json_each(c.candidate_ids) j "
+            "WHERE c.committee_id IS NOT NULL AND json_valid(c.candidate_ids) "
+            "AND json_type(c.candidate_ids) = 'array' AND TRIM(COALESCE(j.value, '')) != ''"
+        )
+
+
+def downgrade() -> None:
+    """Drop candidate_committee"""
+    op.drop_table('candidate_committee')
@@ -0,0 +1,40 @@
+"""add contribution_date_backfill table
+
+Revision ID: add_contribution_date_backfill
+Revises: add_contributor_rollups
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_contribution_date_backfill'
+down_revision: Union[str, None] = 'add_contributor_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create contribution_date_backfill (pending missing-date backfills)"""
+    if 'contribution_date_backfill' in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        'contribution_date_backfill',
+        sa.Column('contribution_id', sa.String(), nullable=False),
+        sa.Column('committee_id', sa.String(), nullable=True),
+        sa.Column('contribution_date', sa.DateTime(), nullable=True),
+        sa.Column('queued_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('contribution_id')
+    )
+    op.create_index(op.f('ix_contribution_date_backfill_committee_id'), 'contribution_date_backfill', ['committee_id'])
+    op.create_index(op.f('ix_contribution_date_backfill_queued_at'), 'contribution_date_backfill', ['queued_at'])
+
+
+def downgrade() -> None:
+    """Drop contribution_date_backfill"""
+    op.drop_table('contribution_date_backfill')
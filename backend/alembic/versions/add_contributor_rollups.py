@@ -0,0 +1,60 @@
+"""add contributor_rollups table
+
+Revision ID: add_contributor_rollups
+Revises: add_contributor_search_index
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.shared.contributor_rollups import ROLLUPS_TABLE, build_rebuild_sql, reset_rollup_cache
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_contributor_rollups'
+down_revision: Union[str, None] = 'add_contributor_search_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create contributor_rollups and fill it from existing contributions"""
+    bind = op.get_bind()
+    tables = sa.inspect(bind).get_table_names()
+    if ROLLUPS_TABLE in tables:
+        return
+
+    op.create_table(
+        ROLLUPS_TABLE,
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name_key', sa.String(), nullable=False),
+        sa.Column('contributor_name', sa.String(), nullable=True),
+        sa.Column('candidate_id', sa.String(), nullable=False),
+        sa.Column('committee_id', sa.String(), nullable=False),
+        sa.Column('cycle', sa.Integer(), nullable=False),
+        sa.Column('contributor_state', sa.String(), nullable=True),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.Column('contribution_count', sa.Integer(), nullable=False),
+        sa.Column('first_date', sa.DateTime(), nullable=True),
+        sa.Column('last_date', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name_key', 'candidate_id', 'committee_id', 'cycle', name='uq_contributor_rollup')
+    )
+    op.create_index(op.f('ix_contributor_rollups_id'), ROLLUPS_TABLE, ['id'])
+    op.create_index('idx_rollup_candidate_cycle', ROLLUPS_TABLE, ['candidate_id', 'cycle'])
+    op.create_index('idx_rollup_committee_cycle', ROLLUPS_TABLE, ['committee_id', 'cycle'])
+    op.create_index('idx_rollup_name_key', ROLLUPS_TABLE, ['name_key'])
+
+    if 'contributions' in tables:
+        op.execute(build_rebuild_sql(bind.dialect.name))
+    reset_rollup_cache()
+
+
+def downgrade() -> None:
+    """Drop contributor_rollups"""
+    op.drop_table(ROLLUPS_TABLE)
+    reset_rollup_cache()
@@ -0,0 +1,63 @@
+"""add contributor name trigram search index
+
+Revision ID: add_contributor_search_index
+Revises: add_import_checkpoints
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.shared.contributor_index import (
+    backfill_statement,
+    create_index_statements,
+    drop_legacy_index_statements,
+    FTS_TABLE,
+    NAMES_TABLE,
+    reset_index_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_contributor_search_index'
+down_revision: Union[str, None] = 'add_import_checkpoints'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create contributor_names with its trigram index and fill it from contributions"""
+    bind = op.get_bind()
+    dialect_name = bind.dialect.name
+
+    if dialect_name == 'sqlite':
+        # The per-contribution FTS5 table is superseded; its triggers slow every insert
+        for statement in drop_legacy_index_statements():
+            op.execute(statement)
+
+    try:
+        for statement in create_index_statements(dialect_name):
+            op.execute(statement)
+    except Exception as e:
+        # SQLite without FTS5 trigram (< 3.34) or PostgreSQL without pg_trgm
+        logger.warning(f"Contributor search index not created, donor search will use ILIKE: {e}")
+        if dialect_name == 'sqlite':
+            op.execute(f"DROP TABLE IF EXISTS {NAMES_TABLE}")
+        return
+
+    if 'contributions' in sa.inspect(bind).get_table_names():
+        op.execute(backfill_statement(dialect_name))
+    reset_index_cache()
+
+
+def downgrade() -> None:
+    """Drop the contributor name index"""
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    op.execute(f"DROP TABLE IF EXISTS {NAMES_TABLE}")
+    reset_index_cache()
@@ -0,0 +1,42 @@
+"""add byte-offset checkpoint columns to bulk_import_jobs
+
+Revision ID: add_import_checkpoints
+Revises: add_precomputed_analysis
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_import_checkpoints'
+down_revision: Union[str, None] = 'add_precomputed_analysis'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add checkpoint_start/checkpoint_hash and widen file_position to hold byte offsets"""
+    inspector = sa.inspect(op.get_bind())
+    if 'bulk_import_jobs' not in inspector.get_table_names():
+        return  # Created with the new columns by init_db
+
+    columns = {col['name'] for col in inspector.get_columns('bulk_import_jobs')}
+    if 'checkpoint_start' not in columns:
+        op.add_column('bulk_import_jobs', sa.Column('checkpoint_start', sa.BigInteger(), nullable=True))
+    if 'checkpoint_hash' not in columns:
+        op.add_column('bulk_import_jobs', sa.Column('checkpoint_hash', sa.String(), nullable=True))
+
+    # SQLite INTEGER is already 64-bit; other databases need BIGINT for files over 2GB
+    if op.get_bind().dialect.name != 'sqlite':
+        op.alter_column('bulk_import_jobs', 'file_position', type_=sa.BigInteger())
+
+
+def downgrade() -> None:
+    """Remove checkpoint columns"""
+    with op.batch_alter_table('bulk_import_jobs') as batch_op:
+        batch_op.drop_column('checkpoint_hash')
+        batch_op.drop_column('checkpoint_start')
@@ -1,6 +1,11 @@
 from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, WebSocket, WebSocketDisconnect, Request
+from fastapi.responses import StreamingResponse
 from typing import Optional, List
 from app.services.bulk_data import BulkDataService, _running_tasks, _cancelled_jobs
+from app.services.bulk_data.progress_bus import (
+    TERMINAL_STATUSES, get_progress_bus, job_snapshot, progress_message
+)
+from app.services.shared.import_metrics import get_import_metrics
 from app.services.bulk_updater import BulkUpdaterService
 from app.services.bulk_data_config import DataType, get_config, get_high_priority_types, DATA_TYPE_CONFIGS
 from app.services.backfill_candidate_ids import backfill_candidate_ids_from_committees, get_backfill_stats
@@ -22,6 +27,10 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Idle progress streams re-send the last state this often (re-read from the
+# database when the job is not running in this process)
+PROGRESS_KEEPALIVE_SECONDS = 15.0
+
 # Rate limiter instance (will be set from app state)
 limiter = None
 
@@ -426,7 +435,8 @@ async def compute_analysis(
             # Compute for entire cycle
             results = await orchestrator.compute_analyses_for_cycle(
                 cycle=cycle,
-                analysis_types=analysis_types_list
+                analysis_types=analysis_types_list,
+                force_recompute=force_recompute
             )
             
             return {
@@ -701,6 +711,56 @@ async def get_backfill_stats_endpoint():
         )
 
 
+@router.get("/contribution-dates/backfill/stats")
+async def get_date_backfill_stats_endpoint():
+    """Get the depth and throughput of the missing contribution date backfill queue"""
+    try:
+        backfill = get_service_container().get_fec_client().date_backfill
+        stats = backfill.get_metrics()
+        try:
+            stats["stored"] = await backfill.count_stored()
+        except Exception as e:
+            logger.debug(f"Could not count stored date backfills: {e}")
+            stats["stored"] = None
+        return stats
+    except Exception as e:
+        logger.error(f"Error getting date backfill stats: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get date backfill stats: {str(e)}"
+        )
+
+
+@router.post("/rollups/rebuild")
+async def rebuild_contributor_rollups_endpoint():
+    """Recompute the contributor_rollups table from contributions in the background"""
+    from app.db.database import AsyncSessionLocal
+    from app.services.shared.contributor_rollups import rebuild_contributor_rollups
+
+    async def _rebuild_task():
+        try:
+            async with AsyncSessionLocal() as session:
+                rows = await rebuild_contributor_rollups(session)
+            logger.info(f"Contributor rollup rebuild completed: {rows} rows")
+        except Exception as e:
+            logger.error(f"Error rebuilding contributor rollups: {e}", exc_info=True)
+
+    try:
+        task = asyncio.create_task(_rebuild_task())
+        _running_tasks.add(task)
+        task.add_done_callback(_running_tasks.discard)
+        return {
+            "message": "Contributor rollup rebuild started",
+            "status": "started"
+        }
+    except Exception as e:
+        logger.error(f"Error starting contributor rollup rebuild: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to start contributor rollup rebuild: {str(e)}"
+        )
+
+
 @router.delete("/contributions")
 async def clear_contributions(
     request: Request,
@@ -1026,7 +1086,9 @@ async def get_job_status(job_id: str):
             "started_at": job.started_at.isoformat() if job.started_at else None,
             "completed_at": job.completed_at.isoformat() if job.completed_at else None,
             "progress_data": progress_data,
-            "overall_progress": overall_progress
+            "overall_progress": overall_progress,
+            # Throughput and stage timing of the job's current (or last) import in this process
+            "metrics": get_import_metrics(job_id)
         }
     except HTTPException:
         raise
@@ -1306,74 +1368,38 @@ async def fix_invalid_committee_ids():
         )
 
 
+async def _job_progress_messages(job_id: str):
+    """Progress messages of a job: its current state, then pushed updates until it finishes"""
+    bus = get_progress_bus()
+    # Subscribe before reading the job so no update between the two is missed
+    with bus.subscribe(job_id) as subscription:
+        job = await get_bulk_data_service().get_job(job_id)
+        if not job:
+            yield {"type": "error", "message": "Job not found"}
+            return
+        message = progress_message(job_id, bus.seed(job_id, job_snapshot(job)))
+        while True:
+            yield message
+            if message["data"]["status"] in TERMINAL_STATUSES:
+                return
+            # Re-send the last state while idle so dead connections are noticed
+            update = await subscription.get(timeout=PROGRESS_KEEPALIVE_SECONDS)
+            if update is None and not bus.has_publisher(job_id):
+                # Imported by another worker process: its progress only reaches the database
+                job = await get_bulk_data_service().get_job(job_id)
+                if job:
+                    update = progress_message(job_id, job_snapshot(job))
+            message = update or message
+
+
 @router.websocket("/ws/{job_id}")
 async def websocket_job_status(websocket: WebSocket, job_id: str):
-    """WebSocket endpoint for real-time job progress updates"""
+    """WebSocket endpoint for real-time job progress updates (pushed; idle jobs of other workers are re-read)"""
     await websocket.accept()
     
     try:
-        bulk_data_service = get_bulk_data_service()
-        
-        # Send initial status
-        job = await bulk_data_service.get_job(job_id)
-        if not job:
-            await websocket.send_json({
-                "type": "error",
-                "message": "Job not found"
-            })
-            await websocket.close()
-            return
-        
-        # Send updates every 1-2 seconds while job is running
-        last_status = None
-        while True:
-            job = await bulk_data_service.get_job(job_id)
-            if not job:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Job not found"
-                })
-                break
-            
-            # Calculate overall progress
-            overall_progress = 0.0
-            if job.total_chunks > 0:
-                overall_progress = (job.current_chunk / job.total_chunks) * 100
-            elif job.total_cycles > 0:
-                overall_progress = (job.completed_cycles / job.total_cycles) * 100
-            
-            current_status = job.status
-            message = {
-                "type": "progress" if job.status == "running" else job.status,
-                "job_id": job_id,
-                "data": {
-                    "status": job.status,
-                    "cycle": job.cycle,
-                    "current_cycle": job.current_cycle,
-                    "total_cycles": job.total_cycles,
-                    "completed_cycles": job.completed_cycles,
-                    "imported_records": job.imported_records,
-                    "skipped_records": job.skipped_records,
-                    "current_chunk": job.current_chunk,
-                    "total_chunks": job.total_chunks,
-                    "overall_progress": overall_progress,
-                    "progress_data": job.progress_data or {},
-                    "error_message": job.error_message
-                }
-            }
-            
-            # Only send if status changed or every 2 seconds
-            if current_status != last_status or job.status == "running":
-                await websocket.send_json(message)
-                last_status = current_status
-            
-            # Stop sending updates if job is completed/failed/cancelled
-            if job.status in ["completed", "failed", "cancelled"]:
-                await websocket.send_json(message)
-                break
-            
-            # Wait before next update
-            await asyncio.sleep(2)
+        async for message in _job_progress_messages(job_id):
+            await websocket.send_json(message)
             
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected for job {job_id}")
@@ -1392,3 +1418,17 @@ async def websocket_job_status(websocket: WebSocket, job_id: str):
         except Exception as close_err:
             logger.debug(f"Error closing WebSocket: {close_err}")
 
+
+@router.get("/jobs/{job_id}/events")
+async def job_progress_events(job_id: str):
+    """Server-Sent Events stream of job progress (for clients without WebSocket)"""
+    async def events():
+        async for message in _job_progress_messages(job_id):
+            yield f"event: {message['type']}\ndata: {json.dumps(message, default=str)}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
@@ -4,6 +4,7 @@ import asyncio
 from app.services.fec_client import FECClient
 from app.models.schemas import CandidateSummary, FinancialSummary, BatchFinancialsRequest, ContactInformation
 from app.services.analysis import AnalysisService
+from app.services.analysis.scheduler import record_candidate_view
 from app.api.dependencies import get_fec_client, get_analysis_service
 from app.utils.date_utils import serialize_datetime
 from app.utils.logging import get_logger
@@ -242,6 +243,9 @@ async def get_candidate(
         if not candidate:
             raise HTTPException(status_code=404, detail="Candidate not found")
         
+        # Viewed candidates get their analyses precomputed first
+        record_candidate_view(candidate_id)
+        
         # Extract contact information
         contact_info = extract_candidate_contact_info(candidate)
         
@@ -1,18 +1,25 @@
-from fastapi import APIRouter, HTTPException, Query, Body, Depends
-from fastapi.responses import StreamingResponse, Response
-from typing import Optional, List, Dict
+from fastapi import APIRouter, HTTPException, Query, Body, Depends, Path
+from fastapi.responses import FileResponse, StreamingResponse, Response
+from typing import Awaitable, Callable, Optional, List, Dict, Tuple
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
+from sqlalchemy import and_, false
+from app.db.database import Contribution
 from app.services.fec_client import FECClient
+from app.services.contribution_export import (
+    EXPORT_COLUMNS, EXPORT_MEDIA_TYPES, contributions_condition, out_of_state_condition,
+    stream_contribution_frames, stream_export
+)
+from app.services.excel_export import write_contributions_xlsx
 from app.services.report_generator import ReportGenerator
+from app.services.report_jobs import ReportJob, get_report_job_manager
 from app.services.analysis import AnalysisService
 from app.api.dependencies import get_fec_client, get_analysis_service
 import logging
 import io
+import os
 import csv
 from io import StringIO, BytesIO
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
-from openpyxl.utils import get_column_letter
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +40,86 @@ def get_report_generator(fec_client: FECClient = Depends(get_fec_client)) -> Rep
     return ReportGenerator(fec_client)
 
 
+REPORT_MEDIA_TYPES = {
+    "pdf": ("application/pdf", "pdf"),
+    "docx": ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", "docx"),
+    "csv": ("text/csv", "csv"),
+    "excel": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    "md": ("text/markdown", "md"),
+}
+
+
+async def render_report(
+    report_generator: ReportGenerator,
+    data: Dict,
+    format: str,
+    is_race: bool
+) -> Tuple[BytesIO, str, str]:
+    """
+    Render collected report data in an export format.
+
+    Returns:
+        (document buffer, media type, file extension)
+    """
+    if format == "pdf":
+        buffer = await report_generator.generate_pdf_report(data, is_race=is_race)
+    elif format == "docx":
+        buffer = await report_generator.generate_docx_report(data, is_race=is_race)
+    elif format == "csv":
+        buffer = await report_generator.generate_csv_export(data, is_race=is_race)
+    elif format == "excel":
+        buffer = await report_generator.generate_excel_export(data, is_race=is_race)
+    else:  # md
+        markdown = await report_generator.generate_markdown_report(data, is_race=is_race)
+        buffer = io.BytesIO(markdown.encode('utf-8'))
+    media_type, extension = REPORT_MEDIA_TYPES[format]
+    return buffer, media_type, extension
+
+
+def race_report_name(request: RaceExportRequest) -> str:
+    """File name (without extension) of a race report"""
+    if request.district:
+        return f"race_{request.office}_{request.state}_{request.district}_report"
+    return f"race_{request.office}_{request.state}_report"
+
+
+async def render_candidate_report(
+    report_generator: ReportGenerator,
+    candidate_id: str,
+    format: str,
+    cycle: Optional[int]
+) -> Tuple[BytesIO, str, str]:
+    """Collect and render a candidate report: (document buffer, media type, filename)"""
+    data = await report_generator.collect_candidate_data(candidate_id, cycle=cycle)
+    if not data.get('candidate'):
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    buffer, media_type, extension = await render_report(report_generator, data, format, is_race=False)
+    return buffer, media_type, f"candidate_{candidate_id}_report.{extension}"
+
+
+async def render_race_report(
+    report_generator: ReportGenerator,
+    request: RaceExportRequest
+) -> Tuple[BytesIO, str, str]:
+    """Collect and render a race report: (document buffer, media type, filename)"""
+    data = await report_generator.collect_race_data(
+        candidate_ids=request.candidate_ids,
+        office=request.office,
+        state=request.state,
+        district=request.district,
+        year=request.year
+    )
+    buffer, media_type, extension = await render_report(report_generator, data, request.format, is_race=True)
+    return buffer, media_type, f"{race_report_name(request)}.{extension}"
+
+
+def validate_race_request(request: RaceExportRequest) -> None:
+    if request.format not in REPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Invalid format. Must be pdf, docx, md, csv, or excel")
+    if not request.candidate_ids:
+        raise HTTPException(status_code=400, detail="At least one candidate ID is required")
+
+
 @router.get("/candidate/{candidate_id}")
 async def export_candidate(
     candidate_id: str,
@@ -42,60 +129,12 @@ async def export_candidate(
 ):
     """Export candidate report in specified format"""
     try:
-        
-        # Collect all candidate data
-        data = await report_generator.collect_candidate_data(candidate_id, cycle=cycle)
-        
-        if not data.get('candidate'):
-            raise HTTPException(status_code=404, detail="Candidate not found")
-        
-        # Generate report based on format
-        if format == "pdf":
-            buffer = await report_generator.generate_pdf_report(data, is_race=False)
-            filename = f"candidate_{candidate_id}_report.pdf"
-            media_type = "application/pdf"
-            return StreamingResponse(
-                buffer,
-                media_type=media_type,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
-            )
-        elif format == "docx":
-            buffer = await report_generator.generate_docx_report(data, is_race=False)
-            filename = f"candidate_{candidate_id}_report.docx"
-            media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            return StreamingResponse(
-                buffer,
-                media_type=media_type,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
-            )
-        elif format == "csv":
-            buffer = await report_generator.generate_csv_export(data, is_race=False)
-            filename = f"candidate_{candidate_id}_report.csv"
-            media_type = "text/csv"
-            return StreamingResponse(
-                buffer,
-                media_type=media_type,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
-            )
-        elif format == "excel":
-            buffer = await report_generator.generate_excel_export(data, is_race=False)
-            filename = f"candidate_{candidate_id}_report.xlsx"
-            media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            return StreamingResponse(
-                buffer,
-                media_type=media_type,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
-            )
-        else:  # md
-            markdown = await report_generator.generate_markdown_report(data, is_race=False)
-            buffer = io.BytesIO(markdown.encode('utf-8'))
-            filename = f"candidate_{candidate_id}_report.md"
-            media_type = "text/markdown"
-            return StreamingResponse(
-                buffer,
-                media_type=media_type,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
-            )
+        buffer, media_type, filename = await render_candidate_report(report_generator, candidate_id, format, cycle)
+        return StreamingResponse(
+            buffer,
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -104,81 +143,19 @@ async def export_candidate(
 
 
 @router.post("/race")
-async def export_race(request: RaceExportRequest):
+async def export_race(
+    request: RaceExportRequest,
+    report_generator: ReportGenerator = Depends(get_report_generator)
+):
     """Export race report in specified format"""
     try:
-        if request.format not in ["pdf", "docx", "md", "csv", "excel"]:
-            raise HTTPException(status_code=400, detail="Invalid format. Must be pdf, docx, md, csv, or excel")
-        
-        if not request.candidate_ids:
-            raise HTTPException(status_code=400, detail="At least one candidate ID is required")
-        
-        # Collect race data
-        data = await report_generator.collect_race_data(
-            candidate_ids=request.candidate_ids,
-            office=request.office,
-            state=request.state,
-            district=request.district,
-            year=request.year
+        validate_race_request(request)
+        buffer, media_type, filename = await render_race_report(report_generator, request)
+        return StreamingResponse(
+            buffer,
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
-        
-        # Generate report based on format
-        if request.format == "pdf":
-            buffer = await report_generator.generate_pdf_report(data, is_race=True)
-            filename = f"race_{request.office}_{request.state}_report.pdf"
-            if request.district:
-                filename = f"race_{request.office}_{request.state}_{request.district}_report.pdf"
-            media_type = "application/pdf"
-            return StreamingResponse(
-                buffer,
-                media_type=media_type,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
-            )
-        elif request.format == "docx":
-            buffer = await report_generator.generate_docx_report(data, is_race=True)
-            filename = f"race_{request.office}_{request.state}_report.docx"
-            if request.district:
-                filename = f"race_{request.office}_{request.state}_{request.district}_report.docx"
-            media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            return StreamingResponse(
-                buffer,
-                media_type=media_type,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
-            )
-        elif request.format == "csv":
-            buffer = await report_generator.generate_csv_export(data, is_race=True)
-            filename = f"race_{request.office}_{request.state}_report.csv"
-            if request.district:
-                filename = f"race_{request.office}_{request.state}_{request.district}_report.csv"
-            media_type = "text/csv"
-            return StreamingResponse(
-                buffer,
-                media_type=media_type,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
-            )
-        elif request.format == "excel":
-            buffer = await report_generator.generate_excel_export(data, is_race=True)
-            filename = f"race_{request.office}_{request.state}_report.xlsx"
-            if request.district:
-                filename = f"race_{request.office}_{request.state}_{request.district}_report.xlsx"
-            media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            return StreamingResponse(
-                buffer,
-                media_type=media_type,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
-            )
-        else:  # md
-            markdown = await report_generator.generate_markdown_report(data, is_race=True)
-            buffer = io.BytesIO(markdown.encode('utf-8'))
-            filename = f"race_{request.office}_{request.state}_report.md"
-            if request.district:
-                filename = f"race_{request.office}_{request.state}_{request.district}_report.md"
-            media_type = "text/markdown"
-            return StreamingResponse(
-                buffer,
-                media_type=media_type,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
-            )
     except HTTPException:
         raise
     except Exception as e:
@@ -186,8 +163,74 @@ async def export_race(request: RaceExportRequest):
         raise HTTPException(status_code=500, detail=f"Failed to export race report: {str(e)}")
 
 
-@router.get("/contributions/csv")
-async def export_contributions_csv(
+def _job_response(job: ReportJob) -> Dict:
+    response = job.to_dict()
+    response["status_url"] = f"/api/export/jobs/{job.id}"
+    response["download_url"] = f"/api/export/jobs/{job.id}/download"
+    return response
+
+
+def _report_job(description: str, render: Callable[[], Awaitable[Tuple[BytesIO, str, str]]]) -> ReportJob:
+    async def run():
+        try:
+            buffer, media_type, filename = await render()
+        except HTTPException as e:
+            raise RuntimeError(e.detail) from e
+        return buffer.getvalue(), filename, media_type
+    return get_report_job_manager().submit(description, run)
+
+
+@router.post("/candidate/{candidate_id}/jobs", status_code=202)
+async def start_candidate_export_job(
+    candidate_id: str,
+    format: str = Query("pdf", regex="^(pdf|docx|md|csv|excel)$", description="Export format"),
+    cycle: Optional[int] = Query(None, description="Election cycle"),
+    report_generator: ReportGenerator = Depends(get_report_generator)
+):
+    """Start a candidate report export in the background; poll status_url, then fetch download_url"""
+    job = _report_job(
+        f"candidate {candidate_id} ({format})",
+        lambda: render_candidate_report(report_generator, candidate_id, format, cycle)
+    )
+    return _job_response(job)
+
+
+@router.post("/race/jobs", status_code=202)
+async def start_race_export_job(
+    request: RaceExportRequest,
+    report_generator: ReportGenerator = Depends(get_report_generator)
+):
+    """Start a race report export in the background; poll status_url, then fetch download_url"""
+    validate_race_request(request)
+    job = _report_job(
+        f"{race_report_name(request)} ({request.format})",
+        lambda: render_race_report(report_generator, request)
+    )
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}")
+async def get_export_job(job_id: str):
+    """Status of a background report export"""
+    job = get_report_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_export_job(job_id: str):
+    """Document of a completed background report export"""
+    job = get_report_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    if job.status != 'completed':
+        raise HTTPException(status_code=409, detail=f"Export job is {job.status}")
+    return FileResponse(job.path, media_type=job.media_type, filename=job.filename)
+
+
+@router.get("/contributions/excel")
+async def export_contributions_excel(
     candidate_id: Optional[str] = Query(None, description="Candidate ID"),
     committee_id: Optional[str] = Query(None, description="Committee ID"),
     contributor_name: Optional[str] = Query(None, description="Contributor name"),
@@ -195,67 +238,52 @@ async def export_contributions_csv(
     max_amount: Optional[float] = Query(None, description="Maximum amount"),
     min_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     max_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
-    limit: int = Query(10000, ge=1, le=100000, description="Maximum results"),
-    fec_client: FECClient = Depends(get_fec_client)
+    limit: Optional[int] = Query(None, ge=1, description="Maximum results (default: all)")
 ):
-    """Export contributions as CSV"""
+    """Export contributions from the local database as Excel (written to a temp file, then streamed)"""
     try:
-        contributions = await fec_client.get_contributions(
+        condition = await contributions_condition(
             candidate_id=candidate_id,
             committee_id=committee_id,
             contributor_name=contributor_name,
             min_amount=min_amount,
             max_amount=max_amount,
             min_date=min_date,
-            max_date=max_date,
+            max_date=max_date
+        )
+        frames = stream_contribution_frames(
+            condition,
+            [Contribution.contribution_date.desc().nulls_last()],
+            candidate_id=candidate_id,
             limit=limit
         )
-        
-        output = StringIO()
-        writer = csv.writer(output)
-        
-        # Write headers
-        writer.writerow([
-            'Contribution ID', 'Candidate ID', 'Committee ID', 'Contributor Name',
-            'Contributor City', 'Contributor State', 'Contributor Zip',
-            'Contributor Employer', 'Contributor Occupation', 'Amount',
-            'Date', 'Type', 'Receipt Type'
-        ])
-        
-        # Write data
-        for contrib in contributions:
-            writer.writerow([
-                contrib.get('sub_id') or contrib.get('contribution_id', ''),
-                contrib.get('candidate_id', ''),
-                contrib.get('committee_id', ''),
-                contrib.get('contributor_name', ''),
-                contrib.get('contributor_city', ''),
-                contrib.get('contributor_state', ''),
-                contrib.get('contributor_zip', ''),
-                contrib.get('contributor_employer', ''),
-                contrib.get('contributor_occupation', ''),
-                contrib.get('contribution_amount', 0),
-                contrib.get('contribution_receipt_date') or contrib.get('contribution_date', ''),
-                contrib.get('contribution_type', ''),
-                contrib.get('receipt_type', '')
-            ])
-        
-        output.seek(0)
-        buffer = BytesIO(output.getvalue().encode('utf-8'))
-        filename = "contributions_export.csv"
-        
-        return StreamingResponse(
-            buffer,
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        path = await write_contributions_xlsx(frames, EXPORT_COLUMNS)
+        return FileResponse(
+            path,
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            filename="contributions_export.xlsx",
+            background=BackgroundTask(os.remove, path)
         )
     except Exception as e:
-        logger.error(f"Error exporting contributions CSV: {e}", exc_info=True)
+        logger.error(f"Error exporting contributions Excel: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to export contributions: {str(e)}")
 
 
-@router.get("/contributions/excel")
-async def export_contributions_excel(
+def contribution_export_response(frames, format: str, compress: bool, name: str) -> StreamingResponse:
+    """Streamed CSV/NDJSON export of mapped contribution batches"""
+    headers = {"Content-Disposition": f"attachment; filename={name}.{format}"}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        stream_export(frames, format=format, compress=compress),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers=headers
+    )
+
+
+@router.get("/contributions/{format}")
+async def export_contributions_stream(
+    format: str = Path(..., regex="^(csv|ndjson)$", description="Export format"),
     candidate_id: Optional[str] = Query(None, description="Candidate ID"),
     committee_id: Optional[str] = Query(None, description="Committee ID"),
     contributor_name: Optional[str] = Query(None, description="Contributor name"),
@@ -263,148 +291,68 @@ async def export_contributions_excel(
     max_amount: Optional[float] = Query(None, description="Maximum amount"),
     min_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     max_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
-    limit: int = Query(10000, ge=1, le=100000, description="Maximum results"),
-    fec_client: FECClient = Depends(get_fec_client)
+    limit: Optional[int] = Query(None, ge=1, description="Maximum results (default: all)"),
+    compress: bool = Query(False, description="gzip the response (Content-Encoding: gzip)")
 ):
-    """Export contributions as Excel"""
+    """Export contributions from the local database as CSV or NDJSON, streamed as rows are read"""
     try:
-        contributions = await fec_client.get_contributions(
+        condition = await contributions_condition(
             candidate_id=candidate_id,
             committee_id=committee_id,
             contributor_name=contributor_name,
             min_amount=min_amount,
             max_amount=max_amount,
             min_date=min_date,
-            max_date=max_date,
-            limit=limit
+            max_date=max_date
         )
-        
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Contributions"
-        
-        # Header style
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF")
-        header_alignment = Alignment(horizontal="center", vertical="center")
-        
-        # Write headers
-        headers = [
-            'Contribution ID', 'Candidate ID', 'Committee ID', 'Contributor Name',
-            'Contributor City', 'Contributor State', 'Contributor Zip',
-            'Contributor Employer', 'Contributor Occupation', 'Amount',
-            'Date', 'Type', 'Receipt Type'
-        ]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col)
-            cell.value = header
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = header_alignment
-        
-        # Write data
-        for row_idx, contrib in enumerate(contributions, 2):
-            ws.cell(row=row_idx, column=1, value=contrib.get('sub_id') or contrib.get('contribution_id', ''))
-            ws.cell(row=row_idx, column=2, value=contrib.get('candidate_id', ''))
-            ws.cell(row=row_idx, column=3, value=contrib.get('committee_id', ''))
-            ws.cell(row=row_idx, column=4, value=contrib.get('contributor_name', ''))
-            ws.cell(row=row_idx, column=5, value=contrib.get('contributor_city', ''))
-            ws.cell(row=row_idx, column=6, value=contrib.get('contributor_state', ''))
-            ws.cell(row=row_idx, column=7, value=contrib.get('contributor_zip', ''))
-            ws.cell(row=row_idx, column=8, value=contrib.get('contributor_employer', ''))
-            ws.cell(row=row_idx, column=9, value=contrib.get('contributor_occupation', ''))
-            ws.cell(row=row_idx, column=10, value=contrib.get('contribution_amount', 0))
-            ws.cell(row=row_idx, column=11, value=contrib.get('contribution_receipt_date') or contrib.get('contribution_date', ''))
-            ws.cell(row=row_idx, column=12, value=contrib.get('contribution_type', ''))
-            ws.cell(row=row_idx, column=13, value=contrib.get('receipt_type', ''))
-        
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except Exception as e:
-                    logger.debug(f"Error reading cell value for column width calculation: {e}")
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-        filename = "contributions_export.xlsx"
-        
-        return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        frames = stream_contribution_frames(
+            condition,
+            [Contribution.contribution_date.desc().nulls_last()],
+            candidate_id=candidate_id,
+            limit=limit
         )
+        return contribution_export_response(frames, format, compress, "contributions_export")
     except Exception as e:
-        logger.error(f"Error exporting contributions Excel: {e}", exc_info=True)
+        logger.error(f"Error exporting contributions {format}: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to export contributions: {str(e)}")
 
 
-@router.get("/out-of-state-contributions/csv")
-async def export_out_of_state_contributions_csv(
+@router.get("/out-of-state-contributions/{format}")
+async def export_out_of_state_contributions_stream(
+    format: str = Path(..., regex="^(csv|ndjson)$", description="Export format"),
     candidate_id: str = Query(..., description="Candidate ID"),
     min_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     max_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     cycle: Optional[int] = Query(None, description="Election cycle"),
-    limit: int = Query(10000, ge=1, le=100000, description="Maximum results"),
-    analysis_service: AnalysisService = Depends(get_analysis_service)
+    limit: Optional[int] = Query(None, ge=1, description="Maximum results (default: all)"),
+    compress: bool = Query(False, description="gzip the response (Content-Encoding: gzip)"),
+    fec_client: FECClient = Depends(get_fec_client)
 ):
-    """Export out-of-state contributions as CSV"""
+    """Export out-of-state contributions as CSV or NDJSON, streamed as rows are read"""
     try:
-        contributions = await analysis_service.get_out_of_state_contributions(
+        candidate = await fec_client.get_candidate(candidate_id)
+        candidate_state = candidate.get('state') if candidate else None
+        if candidate_state:
+            condition = and_(
+                await contributions_condition(
+                    candidate_id=candidate_id, min_date=min_date, max_date=max_date, cycle=cycle
+                ),
+                out_of_state_condition(candidate_state)
+            )
+        else:
+            # Without the candidate's state nothing counts as out-of-state
+            condition = false()
+        frames = stream_contribution_frames(
+            condition,
+            [Contribution.contribution_amount.desc().nulls_last(), Contribution.contribution_date.desc().nulls_last()],
             candidate_id=candidate_id,
-            min_date=min_date,
-            max_date=max_date,
-            cycle=cycle,
             limit=limit
         )
-        
-        output = StringIO()
-        writer = csv.writer(output)
-        
-        # Write headers
-        writer.writerow([
-            'Contribution ID', 'Candidate ID', 'Committee ID', 'Contributor Name',
-            'Contributor City', 'Contributor State', 'Contributor Zip',
-            'Contributor Employer', 'Contributor Occupation', 'Amount',
-            'Date', 'Type', 'Receipt Type'
-        ])
-        
-        # Write data
-        for contrib in contributions:
-            writer.writerow([
-                contrib.get('contribution_id') or contrib.get('sub_id', ''),
-                contrib.get('candidate_id', ''),
-                contrib.get('committee_id', ''),
-                contrib.get('contributor_name', ''),
-                contrib.get('contributor_city', ''),
-                contrib.get('contributor_state', ''),
-                contrib.get('contributor_zip', ''),
-                contrib.get('contributor_employer', ''),
-                contrib.get('contributor_occupation', ''),
-                contrib.get('contribution_amount', 0),
-                contrib.get('contribution_date') or contrib.get('contribution_receipt_date', ''),
-                contrib.get('contribution_type', ''),
-                contrib.get('receipt_type', '')
-            ])
-        
-        output.seek(0)
-        buffer = BytesIO(output.getvalue().encode('utf-8'))
-        filename = f"out_of_state_contributions_{candidate_id}.csv"
-        
-        return StreamingResponse(
-            buffer,
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        return contribution_export_response(
+            frames, format, compress, f"out_of_state_contributions_{candidate_id}"
         )
     except Exception as e:
-        logger.error(f"Error exporting out-of-state contributions CSV: {e}", exc_info=True)
+        logger.error(f"Error exporting out-of-state contributions {format}: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to export out-of-state contributions: {str(e)}")
 
 
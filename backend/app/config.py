@@ -73,6 +73,8 @@ class Config:
     LOG_TO_FILE: bool = os.getenv("LOG_TO_FILE", "true").lower() in ("true", "1", "yes")
     LOG_FILE_MAX_BYTES: int = int(os.getenv("LOG_FILE_MAX_BYTES", "10485760"))  # 10MB default
     LOG_FILE_BACKUP_COUNT: int = int(os.getenv("LOG_FILE_BACKUP_COUNT", "5"))  # Keep 5 backup files
+    # Prometheus /metrics endpoint (bulk import throughput and stage timing)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "false").lower() in ("true", "1", "yes")
     
     # CORS Configuration
     CORS_ORIGINS: List[str] = [
@@ -92,11 +94,34 @@ class Config:
     CACHE_TTL_FINANCIALS_HOURS: int = int(os.getenv("CACHE_TTL_FINANCIALS_HOURS", "24"))
     CACHE_TTL_CONTRIBUTIONS_HOURS: int = int(os.getenv("CACHE_TTL_CONTRIBUTIONS_HOURS", "24"))
     CACHE_TTL_EXPENDITURES_HOURS: int = int(os.getenv("CACHE_TTL_EXPENDITURES_HOURS", "24"))
+    # In-memory tier in front of the api_cache table (size of the JSON-encoded responses)
+    API_CACHE_MEMORY_MB: int = int(os.getenv("API_CACHE_MEMORY_MB", "64"))
+    # api_cache writes are buffered and committed in batches after this delay
+    API_CACHE_WRITE_BATCH_SIZE: int = int(os.getenv("API_CACHE_WRITE_BATCH_SIZE", "100"))
+    API_CACHE_WRITE_DELAY_SECONDS: float = float(os.getenv("API_CACHE_WRITE_DELAY_SECONDS", "1.0"))
+    # Contributions missing a date are queued and backfilled in batches
+    DATE_BACKFILL_MAX_QUEUE: int = int(os.getenv("DATE_BACKFILL_MAX_QUEUE", "10000"))
+    DATE_BACKFILL_BATCH_SIZE: int = int(os.getenv("DATE_BACKFILL_BATCH_SIZE", "500"))
+    DATE_BACKFILL_DELAY_SECONDS: float = float(os.getenv("DATE_BACKFILL_DELAY_SECONDS", "2.0"))
+    # Bulk import progress: pushed to WebSocket/SSE subscribers at most this often,
+    # written to bulk_import_jobs at most this often (status changes are immediate)
+    PROGRESS_BROADCAST_INTERVAL_SECONDS: float = float(os.getenv("PROGRESS_BROADCAST_INTERVAL_SECONDS", "0.5"))
+    PROGRESS_DB_WRITE_INTERVAL_SECONDS: float = float(os.getenv("PROGRESS_DB_WRITE_INTERVAL_SECONDS", "5.0"))
     
     # Bulk Data Configuration
     BULK_DATA_ENABLED: bool = os.getenv("BULK_DATA_ENABLED", "true").lower() in ("true", "1", "yes")
     BULK_DATA_DIR: str = os.getenv("BULK_DATA_DIR", "./data/bulk")
     BULK_DATA_UPDATE_INTERVAL_HOURS: int = int(os.getenv("BULK_DATA_UPDATE_INTERVAL_HOURS", "24"))
+    # Native SQLite fast path for Schedule A imports into an empty contributions table
+    BULK_LOAD_FAST_PATH: bool = os.getenv("BULK_LOAD_FAST_PATH", "true").lower() in ("true", "1", "yes")
+    BULK_LOAD_MERGE_WINDOW_ROWS: int = int(os.getenv("BULK_LOAD_MERGE_WINDOW_ROWS", "1000000"))
+    # Multi-process parsing of pipe-delimited bulk files (0 = one worker per CPU minus one, 1 = disabled)
+    BULK_PARSE_WORKERS: int = int(os.getenv("BULK_PARSE_WORKERS", "0"))
+    BULK_PARSE_SHARD_MB: int = int(os.getenv("BULK_PARSE_SHARD_MB", "64"))
+    # Serve donor search and top-donor queries from the contributor_rollups table
+    USE_CONTRIBUTOR_ROLLUPS: bool = os.getenv("USE_CONTRIBUTOR_ROLLUPS", "true").lower() in ("true", "1", "yes")
+    # In-process cache of candidate -> committee IDs (also dropped when linkage data is imported)
+    CANDIDATE_COMMITTEE_CACHE_TTL_SECONDS: int = int(os.getenv("CANDIDATE_COMMITTEE_CACHE_TTL_SECONDS", "300"))
     
     # Contribution Configuration
     CONTRIBUTION_LOOKBACK_DAYS: int = int(os.getenv("CONTRIBUTION_LOOKBACK_DAYS", "30"))
@@ -105,16 +130,46 @@ class Config:
     
     # Pre-computed Analysis Configuration
     ENABLE_PRECOMPUTED_ANALYSIS: bool = os.getenv("ENABLE_PRECOMPUTED_ANALYSIS", "true").lower() in ("true", "1", "yes")
-    ANALYSIS_COMPUTATION_BATCH_SIZE: int = int(os.getenv("ANALYSIS_COMPUTATION_BATCH_SIZE", "10"))
+    # Candidates whose analyses are aggregated from one scan of the cycle's contributions
+    ANALYSIS_COMPUTATION_BATCH_SIZE: int = int(os.getenv("ANALYSIS_COMPUTATION_BATCH_SIZE", "100"))
+    # Candidate batches computed at once by the precomputation scheduler
+    ANALYSIS_PRECOMPUTE_WORKERS: int = int(os.getenv("ANALYSIS_PRECOMPUTE_WORKERS", "2"))
     ANALYSIS_STALE_THRESHOLD_HOURS: int = int(os.getenv("ANALYSIS_STALE_THRESHOLD_HOURS", "24"))
     
+    # Report Export Configuration
+    # Report sections (analyses) computed at once across all exports
+    REPORT_SECTION_CONCURRENCY: int = int(os.getenv("REPORT_SECTION_CONCURRENCY", "4"))
+    # Computed sections are reused by later exports of the same candidate/cycle until the data changes
+    REPORT_SECTION_CACHE_TTL_SECONDS: int = int(os.getenv("REPORT_SECTION_CACHE_TTL_SECONDS", "900"))
+    REPORT_SECTION_CACHE_MAX_ENTRIES: int = int(os.getenv("REPORT_SECTION_CACHE_MAX_ENTRIES", "512"))
+    # Chart and PDF/DOCX rendering processes (0 = render in the thread pool)
+    REPORT_RENDER_WORKERS: int = int(os.getenv("REPORT_RENDER_WORKERS", "2"))
+    # Rendered chart PNGs kept in memory, by content hash of the plotted data
+    REPORT_CHART_CACHE_MAX_BYTES: int = int(os.getenv("REPORT_CHART_CACHE_MAX_BYTES", "67108864"))  # 64MB
+    # Documents of background report jobs, kept for download this long after they finish
+    REPORT_JOB_DIR: str = os.getenv("REPORT_JOB_DIR", "")  # Empty = <system temp>/fec_reports
+    REPORT_JOB_TTL_SECONDS: int = int(os.getenv("REPORT_JOB_TTL_SECONDS", "3600"))
+    # Rows read, mapped and encoded per batch by streaming contribution exports (CSV/NDJSON)
+    EXPORT_STREAM_BATCH_SIZE: int = int(os.getenv("EXPORT_STREAM_BATCH_SIZE", "5000"))
+    # Excel exports size their columns from this many leading rows of each sheet
+    EXCEL_WIDTH_SAMPLE_ROWS: int = int(os.getenv("EXCEL_WIDTH_SAMPLE_ROWS", "1000"))
+    
     # Background Task Configuration
     WAL_CHECKPOINT_INTERVAL_SECONDS: int = int(os.getenv("WAL_CHECKPOINT_INTERVAL_SECONDS", "1800"))  # 30 minutes
     INTEGRITY_CHECK_INTERVAL_HOURS: int = int(os.getenv("INTEGRITY_CHECK_INTERVAL_HOURS", "24"))
     
     # Rate Limiting Configuration
     RATE_LIMIT_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", "100"))
+    # Hourly FEC API quota of each key
     RATE_LIMIT_PER_HOUR: int = int(os.getenv("RATE_LIMIT_PER_HOUR", "1000"))
+    # Requests per key that may be sent back to back before pacing applies
+    FEC_API_BURST: int = int(os.getenv("FEC_API_BURST", "10"))
+    # Additional FEC API keys (comma-separated); requests rotate over all keys
+    FEC_API_KEYS: List[str] = [
+        key.strip()
+        for key in os.getenv("FEC_API_KEYS", "").split(",")
+        if key.strip()
+    ]
     
     # Retry Configuration
     DEFAULT_MAX_RETRIES: int = int(os.getenv("DEFAULT_MAX_RETRIES", "3"))
@@ -148,6 +203,9 @@ class Config:
         if cls.THREAD_POOL_WORKERS < 1:
             warnings.append("THREAD_POOL_WORKERS must be at least 1")
         
+        if cls.BULK_PARSE_SHARD_MB < 1:
+            warnings.append("BULK_PARSE_SHARD_MB must be at least 1")
+        
         return warnings
     
     @classmethod
@@ -9,6 +9,7 @@ Models:
 - Contribution: Individual contribution records
 - Candidate: Candidate information
 - Committee: Committee information
+- CandidateCommittee: Candidate-committee links
 - BulkDataMetadata: Metadata for bulk data imports
 - BulkImportJob: Tracks bulk import progress
 - OperatingExpenditure: Operating expenditure records
@@ -37,7 +38,7 @@ Example:
 """
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from sqlalchemy import Column, String, Float, DateTime, Integer, Text, JSON, Index, text, UniqueConstraint, Boolean, event
+from sqlalchemy import Column, String, Float, DateTime, Integer, BigInteger, Text, JSON, Index, text, UniqueConstraint, Boolean, event
 from datetime import datetime
 import os
 from dotenv import load_dotenv
@@ -104,6 +105,16 @@ class Contribution(Base):
     )
 
 
+class ContributionDateBackfill(Base):
+    """Contributions waiting for their missing contribution_date to be backfilled"""
+    __tablename__ = "contribution_date_backfill"
+    
+    contribution_id = Column(String, primary_key=True)
+    committee_id = Column(String, index=True)  # Narrows the FEC API lookup
+    contribution_date = Column(DateTime)  # Set when the date is known (from raw_data) and only needs writing
+    queued_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
 class BulkDataMetadata(Base):
     """Metadata for bulk CSV downloads"""
     __tablename__ = "bulk_data_metadata"
@@ -187,6 +198,22 @@ class Committee(Base):
     )
 
 
+class CandidateCommittee(Base):
+    """Candidate-committee links (normalized from Committee.candidate_ids and linkage imports)"""
+    __tablename__ = "candidate_committee"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    candidate_id = Column(String, nullable=False)
+    committee_id = Column(String, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint('candidate_id', 'committee_id', name='uq_candidate_committee'),
+        Index('idx_candidate_committee_candidate', 'candidate_id'),
+        Index('idx_candidate_committee_committee', 'committee_id'),
+    )
+
+
 class FinancialTotal(Base):
     """Stored financial totals for candidates"""
     __tablename__ = "financial_totals"
@@ -228,7 +255,9 @@ class BulkImportJob(Base):
     skipped_records = Column(Integer, default=0)
     current_chunk = Column(Integer, default=0)
     total_chunks = Column(Integer, default=0)
-    file_position = Column(Integer, default=0)  # File position in bytes for resumable imports
+    file_position = Column(BigInteger, default=0)  # Byte offset after the last committed chunk (resume point)
+    checkpoint_start = Column(BigInteger, nullable=True)  # Byte offset where the last committed chunk starts
+    checkpoint_hash = Column(String, nullable=True)  # Digest of the last committed chunk's bytes
     data_type = Column(String, nullable=True)  # Data type being imported (e.g., 'individual_contributions')
     file_path = Column(String, nullable=True)  # Path to file being imported
     error_message = Column(Text, nullable=True)
@@ -516,6 +545,31 @@ class PreComputedAnalysis(Base):
     )
 
 
+class ContributorRollup(Base):
+    """Contribution totals per normalized contributor name, recipient and cycle"""
+    __tablename__ = "contributor_rollups"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name_key = Column(String, nullable=False)  # UPPER(TRIM(contributor_name))
+    contributor_name = Column(String)  # Representative spelling of the name
+    candidate_id = Column(String, nullable=False, default='')  # '' when the contribution has none
+    committee_id = Column(String, nullable=False, default='')  # '' when the contribution has none
+    cycle = Column(Integer, nullable=False)  # Election cycle of contribution_date, 0 when undated
+    contributor_state = Column(String)
+    total_amount = Column(Float, nullable=False, default=0.0)
+    contribution_count = Column(Integer, nullable=False, default=0)
+    first_date = Column(DateTime)
+    last_date = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint('name_key', 'candidate_id', 'committee_id', 'cycle', name='uq_contributor_rollup'),
+        Index('idx_rollup_candidate_cycle', 'candidate_id', 'cycle'),
+        Index('idx_rollup_committee_cycle', 'committee_id', 'cycle'),
+        Index('idx_rollup_name_key', 'name_key'),
+    )
+
+
 class AnalysisComputationJob(Base):
     """Track analysis computation job progress"""
     __tablename__ = "analysis_computation_jobs"
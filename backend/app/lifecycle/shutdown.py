@@ -13,10 +13,13 @@ logger = logging.getLogger(__name__)
 async def cancel_running_jobs():
     """Mark all running jobs as cancelled in database"""
     from app.services.bulk_data import BulkDataService
+    from app.services.bulk_data.job_manager import flush_job_progress
     from app.db.database import AsyncSessionLocal, BulkImportJob
     from sqlalchemy import select
     
     try:
+        # Keep the latest checkpoints for resuming
+        await flush_job_progress()
         async with AsyncSessionLocal() as session:
             result = await session.execute(
                 select(BulkImportJob).where(BulkImportJob.status.in_(['pending', 'running']))
@@ -112,7 +115,25 @@ async def setup_shutdown_handlers():
     except Exception as e:
         logger.warning(f"Error cleaning up bulk data service: {e}")
     
-    # Step 5: Close database connections gracefully
+    # Step 5: Commit API responses still buffered by the cache's write-behind
+    try:
+        from app.services.container import get_service_container
+        container = get_service_container()
+        if container._fec_client:
+            await container._fec_client.cache_manager.close()
+    except Exception as e:
+        logger.warning(f"Error flushing API cache: {e}")
+    
+    # Step 6: Save queued contribution date backfills for the next start
+    try:
+        from app.services.container import get_service_container
+        container = get_service_container()
+        if container._fec_client:
+            await container._fec_client.date_backfill.close()
+    except Exception as e:
+        logger.warning(f"Error saving contribution date backfill queue: {e}")
+    
+    # Step 7: Close database connections gracefully
     await close_database_connections()
     
     logger.info(f"Shutdown complete. Cancelled {cancelled_count} tasks.")
@@ -43,6 +43,15 @@ async def start_contact_updater():
     return _contact_updater_service
 
 
+async def resume_date_backfill():
+    """Resume contribution date backfills saved at the last shutdown"""
+    try:
+        from app.services.container import get_service_container
+        get_service_container().get_fec_client().date_backfill.start()
+    except Exception as e:
+        logger.warning(f"Could not resume contribution date backfill: {e}")
+
+
 def setup_signal_handlers():
     """Set up signal handlers for graceful shutdown"""
     logger.info("Setting up signal handlers...")
@@ -82,6 +91,9 @@ async def setup_startup_tasks(running_tasks: set):
     # Start contact updater
     await start_contact_updater()
     
+    # Pick up missing contribution dates queued before the last shutdown
+    await resume_date_backfill()
+    
     # Set up signal handlers
     setup_signal_handlers()
     
@@ -193,6 +193,10 @@ async def startup_event():
     thread_pool = get_thread_pool()
     logger.info(f"Thread pool initialized with {config.THREAD_POOL_WORKERS} workers")
     
+    # Start report render workers (matplotlib/reportlab imported once per worker)
+    from app.services.report_rendering import warm_render_pool
+    warm_render_pool()
+    
     # Log uvicorn worker configuration (if available)
     import multiprocessing
     try:
@@ -215,6 +219,14 @@ async def shutdown_event():
     from app.utils.thread_pool import shutdown_thread_pool
     shutdown_thread_pool()
     
+    # Shutdown bulk parse worker processes (created on first sharded import)
+    from app.utils.process_pool import shutdown_process_pool
+    shutdown_process_pool()
+    
+    # Shutdown report render worker processes
+    from app.services.report_rendering import shutdown_render_pool
+    shutdown_render_pool()
+    
     await setup_shutdown_handlers()
 
 
@@ -31,12 +31,13 @@ import httpx
 import asyncio
 import os
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+import pandas as pd
+from typing import Dict, List, Optional, Any, AsyncIterator, Tuple, Union
 from datetime import datetime, timedelta
 from app.utils.api_config import get_fec_api_key, get_fec_api_base_url
 from app.db.database import (
     AsyncSessionLocal, APICache, Contribution, BulkDataMetadata,
-    Candidate, Committee, FinancialTotal
+    Candidate, CandidateCommittee, Committee, FinancialTotal
 )
 from sqlalchemy import select, and_, or_, func
 import json
@@ -47,6 +48,8 @@ from collections import defaultdict
 # Import from package to use refactored modules
 from app.services.fec_client.api_client import APIClient
 from app.services.fec_client.cache import CacheManager
+from app.services.fec_client.contribution_rows import map_contribution_rows, select_contribution_columns
+from app.services.fec_client.date_backfill import DateBackfillQueue
 from app.services.fec_client.rate_limiter import RateLimiter
 from app.services.fec_client.storage import StorageManager
 
@@ -58,13 +61,6 @@ _contact_info_check_cache: Dict[str, Tuple[bool, datetime]] = {}
 _contact_info_check_cache_ttl = 300  # 5 minutes
 _contact_info_check_cache_lock = asyncio.Lock()
 
-# Track ongoing backfill operations to prevent duplicates
-_backfill_in_progress: Dict[str, asyncio.Task] = {}
-_backfill_lock = asyncio.Lock()
-# Limit concurrent backfill tasks to prevent overwhelming the system
-# Max 10 concurrent backfill operations to avoid blocking database/API
-_backfill_semaphore = asyncio.Semaphore(10)
-
 class FECClient:
     """Client for interacting with OpenFEC API with caching and rate limiting"""
     
@@ -96,7 +92,8 @@ class FECClient:
         self.rate_limiter = RateLimiter(
             rate_limit_delay=0.5,
             rate_limit_retry_delay=60,
-            max_concurrent=5
+            max_concurrent=5,
+            api_keys=config.FEC_API_KEYS
         )
         self.cache_manager = CacheManager(cache_ttls)
         self.storage_manager = StorageManager()
@@ -109,6 +106,12 @@ class FECClient:
         
         # Database write semaphore (shared with storage manager)
         self._db_write_semaphore = self.storage_manager._db_write_semaphore
+        # Missing contribution dates are backfilled in batches by one worker
+        self.date_backfill = DateBackfillQueue(
+            fetch_func=self._fetch_contributions_by_ids,
+            smart_merge_func=self._smart_merge_contribution,
+            db_write_semaphore=self._db_write_semaphore
+        )
         
         # Keep for backward compatibility
         self.client = self.api_client.client
@@ -605,56 +608,31 @@ class FECClient:
             logger.debug(f"Error getting latest contribution date: {e}")
             return None
     
-    async def _fetch_contribution_by_id(
+    async def _fetch_contributions_by_ids(
         self,
-        contribution_id: str,
-        committee_id: Optional[str] = None,
-        candidate_id: Optional[str] = None
-    ) -> Optional[Dict]:
+        committee_id: Optional[str],
+        contribution_ids: List[str]
+    ) -> List[Dict]:
         """
-        Fetch a single contribution from FEC API by contribution ID (sub_id).
+        Fetch contributions from FEC API by contribution ID (sub_id), in one request.
         
         Args:
-            contribution_id: The contribution sub_id to fetch
-            committee_id: Optional committee ID to narrow the search
-            candidate_id: Optional candidate ID to narrow the search
+            committee_id: Committee the contributions were made to (narrows the search), if known
+            contribution_ids: Contribution sub_ids to fetch (at most 100, the API's page size limit)
             
         Returns:
-            Dictionary with contribution data, or None if not found
+            The schedule_a records found (missing IDs are left out)
         """
-        try:
-            params = {
-                "per_page": 1,
-                "sub_id": contribution_id
-            }
-            
-            # Add optional filters to narrow search
-            if committee_id:
-                params["committee_id"] = committee_id
-            if candidate_id:
-                params["candidate_id"] = candidate_id
-            
-            # Add two_year_transaction_period if we have candidate_id
-            if candidate_id:
-                current_year = datetime.now().year
-                two_year_transaction_period = (current_year // 2) * 2
-                params["two_year_transaction_period"] = two_year_transaction_period
-            
-            logger.debug(f"Fetching contribution {contribution_id} from FEC API")
-            data = await self._make_request("schedules/schedule_a", params, use_cache=False)
-            results = data.get("results", [])
-            
-            if results:
-                contrib = results[0]
-                logger.debug(f"Found contribution {contribution_id} in FEC API")
-                return contrib
-            else:
-                logger.debug(f"Contribution {contribution_id} not found in FEC API")
-                return None
-                
-        except Exception as e:
-            logger.warning(f"Error fetching contribution {contribution_id} from FEC API: {e}")
-            return None
+        params = {
+            "per_page": len(contribution_ids),
+            "sub_id": list(contribution_ids)
+        }
+        if committee_id:
+            params["committee_id"] = committee_id
+        
+        logger.debug(f"Fetching {len(contribution_ids)} contributions from FEC API (committee {committee_id})")
+        data = await self._make_request("schedules/schedule_a", params, use_cache=False)
+        return data.get("results", [])
     
     async def get_contribution_date(
         self,
@@ -672,11 +650,12 @@ class FECClient:
             contribution_id: The contribution sub_id
             contribution_obj: Optional Contribution object (if already loaded)
             committee_id: Optional committee ID for API queries
-            candidate_id: Optional candidate ID for API queries
+            candidate_id: Optional candidate ID (unused: API lookups are narrowed by committee)
             raw_data: Optional raw_data dict (if already loaded)
             
         Returns:
-            datetime object if date found, None otherwise
+            datetime object if date found, None otherwise (an API lookup is then
+            queued on ``date_backfill``)
         """
         from app.utils.date_utils import extract_date_from_raw_data
         
@@ -712,12 +691,9 @@ class FECClient:
             date_from_raw = extract_date_from_raw_data(raw_data)
             if date_from_raw:
                 logger.debug(f"get_contribution_date: Found date in raw_data for {contribution_id}: {date_from_raw}")
-                # If we found date in raw_data, update DB field for future queries (in background to avoid blocking)
-                # Schedule background update to avoid blocking the current query
+                # If we found date in raw_data, queue writing it to the DB field for future queries
                 if contribution_obj:
-                    asyncio.create_task(
-                        self._update_contribution_date_from_raw_data(contribution_id, date_from_raw)
-                    )
+                    self.date_backfill.enqueue_date(contribution_id, date_from_raw)
                 return date_from_raw
             else:
                 # More detailed logging about why extraction failed
@@ -744,44 +720,14 @@ class FECClient:
         else:
             logger.debug(f"get_contribution_date: No raw_data available for {contribution_id}, will try API fetch")
         
-        # Step 3: Schedule API query in background (non-blocking)
-        # Only do this if we don't have bulk import data, or if bulk import data might have a date from API
-        # Don't block - schedule background task to fetch and store
-        # Note: Concurrency is limited by semaphore in _backfill_contribution_date
-        logger.debug(f"get_contribution_date: Date not in DB or raw_data, scheduling API fetch for {contribution_id}")
-        try:
-            asyncio.create_task(
-                self._backfill_contribution_date(contribution_id, committee_id, candidate_id)
-            )
-        except Exception as e:
-            # If task creation fails, log but don't block
-            logger.warning(f"Failed to create backfill task for {contribution_id}: {e}")
+        # Step 3: Queue an API lookup (non-blocking)
+        # The backfill queue batches lookups by committee and stores the responses
+        logger.debug(f"get_contribution_date: Date not in DB or raw_data, queueing API lookup for {contribution_id}")
+        self.date_backfill.enqueue_lookup(contribution_id, committee_id)
         
-        # Return None immediately - date will be available on next query after background task completes
+        # Return None immediately - date will be available on a later query once the backfill has run
         return None
     
-    async def _update_contribution_date_from_raw_data(
-        self,
-        contribution_id: str,
-        date_value: datetime
-    ):
-        """
-        Background task to update contribution_date field from raw_data.
-        This ensures dates found in raw_data are persisted to the DB field.
-        """
-        try:
-            async with AsyncSessionLocal() as session:
-                result = await session.execute(
-                    select(Contribution).where(Contribution.contribution_id == contribution_id)
-                )
-                contrib = result.scalar_one_or_none()
-                if contrib and not contrib.contribution_date:
-                    contrib.contribution_date = date_value
-                    await session.commit()
-                    logger.debug(f"_update_contribution_date_from_raw_data: Updated DB field for {contribution_id}")
-        except Exception as e:
-            logger.warning(f"_update_contribution_date_from_raw_data: Error updating date for {contribution_id}: {e}")
-    
     async def _store_api_response_in_db(
         self,
         contribution_id: str,
@@ -830,94 +776,6 @@ class FECClient:
         except Exception as e:
             logger.error(f"_store_api_response_in_db: Error storing API response for {contribution_id}: {e}", exc_info=True)
     
-    async def _backfill_contribution_date(
-        self,
-        contribution_id: str,
-        committee_id: Optional[str] = None,
-        candidate_id: Optional[str] = None
-    ):
-        """
-        Background task to fetch contribution date from FEC API and update database.
-        This runs asynchronously and doesn't block the main query.
-        Always stores the API response in DB to avoid future API calls.
-        Uses deduplication to prevent multiple concurrent API calls for the same contribution_id.
-        
-        Args:
-            contribution_id: The contribution sub_id to fetch
-            committee_id: Optional committee ID to narrow the search
-            candidate_id: Optional candidate ID to narrow the search
-        """
-        # Check if already in progress
-        async with _backfill_lock:
-            if contribution_id in _backfill_in_progress:
-                existing_task = _backfill_in_progress[contribution_id]
-                # Check if task is still running
-                if not existing_task.done():
-                    logger.debug(f"_backfill_contribution_date: Already in progress for {contribution_id}, skipping duplicate call")
-                    return
-                else:
-                    # Task completed, remove it
-                    _backfill_in_progress.pop(contribution_id, None)
-        
-        # Create the task with semaphore to limit concurrency
-        async def _do_backfill():
-            # Acquire semaphore to limit concurrent operations
-            async with _backfill_semaphore:
-                try:
-                    logger.debug(f"_backfill_contribution_date: Starting background fetch for contribution_id: {contribution_id}")
-                    
-                    # First, check if date is already in DB or raw_data (might have been updated)
-                    async with AsyncSessionLocal() as session:
-                        result = await session.execute(
-                            select(Contribution).where(Contribution.contribution_id == contribution_id)
-                        )
-                        contrib = result.scalar_one_or_none()
-                        if contrib:
-                            # Check if date is now available
-                            if contrib.contribution_date:
-                                logger.debug(f"_backfill_contribution_date: Date already available in DB for {contribution_id}, skipping API call")
-                                return
-                            
-                            # Check raw_data
-                            if contrib.raw_data:
-                                from app.utils.date_utils import extract_date_from_raw_data
-                                date_from_raw = extract_date_from_raw_data(contrib.raw_data)
-                                if date_from_raw:
-                                    logger.debug(f"_backfill_contribution_date: Date found in raw_data for {contribution_id}, updating DB field")
-                                    contrib.contribution_date = date_from_raw
-                                    await session.commit()
-                                    return
-                    
-                    # Fetch from FEC API
-                    api_contrib = await self._fetch_contribution_by_id(contribution_id, committee_id, candidate_id)
-                    
-                    if not api_contrib:
-                        logger.debug(f"_backfill_contribution_date: FEC API returned no data for contribution_id: {contribution_id}")
-                        return
-                    
-                    # Extract date from API response
-                    from app.utils.date_utils import extract_date_from_raw_data
-                    api_date = extract_date_from_raw_data(api_contrib)
-                    
-                    # Always store API response in DB (even if no date found) to avoid future API calls
-                    await self._store_api_response_in_db(contribution_id, api_contrib, api_date)
-                    
-                    if api_date:
-                        logger.debug(f"_backfill_contribution_date: Successfully fetched and stored date {api_date} for {contribution_id}")
-                    else:
-                        logger.debug(f"_backfill_contribution_date: No date found for {contribution_id} (API response was still stored)")
-                except Exception as e:
-                    logger.warning(f"_backfill_contribution_date: Error in background task for contribution_id {contribution_id}: {e}")
-                finally:
-                    # Remove from in-progress tracking
-                    async with _backfill_lock:
-                        _backfill_in_progress.pop(contribution_id, None)
-        
-        # Track the task
-        async with _backfill_lock:
-            task = asyncio.create_task(_do_backfill())
-            _backfill_in_progress[contribution_id] = task
-    
     async def _query_local_contributions(
         self,
         candidate_id: Optional[str] = None,
@@ -928,36 +786,28 @@ class FECClient:
         min_date: Optional[str] = None,
         max_date: Optional[str] = None,
         limit: int = 100,
-        two_year_transaction_period: Optional[int] = None
-    ) -> Optional[List[Dict]]:
-        """Query contributions from local database"""
+        two_year_transaction_period: Optional[int] = None,
+        include_raw_data: bool = True,
+        as_frame: bool = False
+    ) -> Optional[Union[List[Dict], "pd.DataFrame"]]:
+        """
+        Query contributions from local database
+        
+        Plain columns are selected and mapped column-wise (see
+        fec_client.contribution_rows); raw_data is only read in full when
+        include_raw_data is set, otherwise just for rows missing a value.
+        
+        Args:
+            include_raw_data: Add the raw_data keys to each contribution (as the
+                              API records have); analysis callers can skip them
+            as_frame: Return a DataFrame with the same columns instead of dictionaries
+        """
         if not self.bulk_data_enabled:
             return None
         
         try:
             async with AsyncSessionLocal() as session:
-                # Build query - use load_only to only load columns that exist
-                # Some columns (amendment_indicator, report_type, etc.) may not exist if migrations haven't been run
-                from sqlalchemy.orm import load_only
-                query = select(Contribution).options(
-                    load_only(
-                        Contribution.id,
-                        Contribution.contribution_id,
-                        Contribution.candidate_id,
-                        Contribution.committee_id,
-                        Contribution.contributor_name,
-                        Contribution.contributor_city,
-                        Contribution.contributor_state,
-                        Contribution.contributor_zip,
-                        Contribution.contributor_employer,
-                        Contribution.contributor_occupation,
-                        Contribution.contribution_amount,
-                        Contribution.contribution_date,
-                        Contribution.contribution_type,
-                        Contribution.raw_data,
-                        Contribution.created_at
-                    )
-                )
+                query = select_contribution_columns(include_raw_data)
                 conditions = []
                 
                 if candidate_id:
@@ -1010,102 +860,23 @@ class FECClient:
                 query = query.limit(limit)
                 
                 result = await session.execute(query)
-                contributions = result.scalars().all()
+                rows = result.all()
                 
                 # Log how many contributions were found
-                logger.debug(f"Database query found {len(contributions)} contributions for candidate_id={candidate_id}, limit={limit}")
+                logger.debug(f"Database query found {len(rows)} contributions for candidate_id={candidate_id}, limit={limit}")
                 
-                if contributions:
+                if rows:
                     # Convert to dict format matching API response
-                    result_list = []
-                    for c in contributions:
-                        # Try to get amount from raw_data if stored amount is 0
-                        amount = float(c.contribution_amount) if c.contribution_amount else 0.0
-                        if amount == 0.0 and c.raw_data and isinstance(c.raw_data, dict):
-                            # Try to extract from raw_data (for data imported with old mapping)
-                            for amt_key in ['TRANSACTION_AMT', 'CONTB_AMT', 'contribution_amount', 'transaction_amt']:
-                                if amt_key in c.raw_data:
-                                    try:
-                                        amt_val = str(c.raw_data[amt_key]).strip()
-                                        amt_val = amt_val.replace('$', '').replace(',', '').strip()
-                                        if amt_val:
-                                            amount = float(amt_val)
-                                            break
-                                    except (ValueError, TypeError):
-                                        continue
-                        
-                        # Try to get candidate_id from raw_data if missing
-                        contrib_candidate_id = c.candidate_id
-                        if not contrib_candidate_id and c.raw_data and isinstance(c.raw_data, dict):
-                            contrib_candidate_id = c.raw_data.get('CAND_ID') or c.raw_data.get('candidate_id')
-                        
-                        # Use the candidate_id from the contribution, or fall back to query parameter
-                        final_candidate_id = contrib_candidate_id or candidate_id
-                        
-                        # Extract date using centralized method: DB -> raw_data -> API (background) -> store
-                        # This method ensures:
-                        # 1. Checks DB field first
-                        # 2. Checks raw_data second
-                        # 3. If missing, schedules background API fetch (non-blocking)
-                        # 4. API response is always stored in DB for future queries
-                        contrib_date = await self.get_contribution_date(
-                            contribution_id=c.contribution_id,
-                            contribution_obj=c,
-                            committee_id=c.committee_id,
-                            candidate_id=final_candidate_id
-                        )
-                        
-                        # Format date as string
-                        date_str = None
-                        if contrib_date:
-                            if isinstance(contrib_date, datetime):
-                                date_str = contrib_date.strftime("%Y-%m-%d")
-                                logger.debug(f"_query_local_contributions: Formatted datetime to string: {date_str}")
-                            else:
-                                from app.utils.date_utils import serialize_date
-                                date_str = serialize_date(contrib_date)
-                                if date_str:
-                                    logger.debug(f"_query_local_contributions: Serialized date to string: {date_str}")
-                                else:
-                                    logger.warning(f"_query_local_contributions: serialize_date returned None for: {contrib_date}")
-                        else:
-                            logger.debug(f"_query_local_contributions: contrib_date is None, date_str will be None")
-                        
-                        # Extract contributor_state from raw_data if missing
-                        contributor_state = c.contributor_state
-                        if not contributor_state and c.raw_data and isinstance(c.raw_data, dict):
-                            contributor_state = c.raw_data.get('STATE') or c.raw_data.get('contributor_state') or c.raw_data.get('state')
-                        
-                        # Extract contributor_name from raw_data if missing
-                        contributor_name = c.contributor_name
-                        if not contributor_name and c.raw_data and isinstance(c.raw_data, dict):
-                            contributor_name = c.raw_data.get('NAME') or c.raw_data.get('contributor_name') or c.raw_data.get('name')
-                        
-                        contrib_dict = {
-                            "sub_id": c.contribution_id,
-                            "contribution_id": c.contribution_id,
-                            "candidate_id": final_candidate_id,
-                            "committee_id": c.committee_id,
-                            "contributor_name": contributor_name,
-                            "contributor_city": c.contributor_city,
-                            "contributor_state": contributor_state,
-                            "contributor_zip": c.contributor_zip,
-                            "contributor_employer": c.contributor_employer,
-                            "contributor_occupation": c.contributor_occupation,
-                            "contribution_amount": amount,
-                            "contribution_receipt_date": date_str,
-                            "contribution_date": date_str,
-                            "contribution_type": c.contribution_type,
-                            "receipt_type": None
-                        }
-                        # Add raw_data fields if available (but don't overwrite corrected values)
-                        if c.raw_data and isinstance(c.raw_data, dict):
-                            # Only add fields that aren't already set
-                            for key, value in c.raw_data.items():
-                                if key not in contrib_dict or not contrib_dict[key]:
-                                    contrib_dict[key] = value
-                        result_list.append(contrib_dict)
-                    return result_list
+                    # Missing amounts, names, states, candidates and dates fall back to raw_data;
+                    # dates still missing are queued on the date backfill
+                    return await map_contribution_rows(
+                        session,
+                        rows,
+                        include_raw_data=include_raw_data,
+                        candidate_id=candidate_id,
+                        date_backfill=self.date_backfill,
+                        as_frame=as_frame
+                    )
                 
                 return None
                 
@@ -1125,9 +896,15 @@ class FECClient:
         limit: int = 100,
         two_year_transaction_period: Optional[int] = None,
         fetch_new_only: bool = True,
-        fetch_all: bool = False
+        fetch_all: bool = False,
+        include_raw_data: bool = True
     ) -> List[Dict]:
-        """Get contributions/schedules/schedule_a - queries local DB first, falls back to API for new data only"""
+        """
+        Get contributions/schedules/schedule_a - queries local DB first, falls back to API for new data only
+        
+        include_raw_data=False leaves the raw_data keys out of contributions read
+        from the local database (callers that only use the mapped fields).
+        """
         local_data = []
         latest_db_date = None
         
@@ -1144,7 +921,8 @@ class FECClient:
                     min_date=min_date,
                     max_date=max_date,
                     limit=limit,
-                    two_year_transaction_period=two_year_transaction_period
+                    two_year_transaction_period=two_year_transaction_period,
+                    include_raw_data=include_raw_data
                 ) or []
                 
                 # If we have a candidate_id but no committee_id, also query by committees
@@ -1159,12 +937,9 @@ class FECClient:
                             committee_ids = [c.get('committee_id') for c in committees if c.get('committee_id')]
                             
                             if committee_ids:
-                                from app.db.database import AsyncSessionLocal, Contribution
-                                from sqlalchemy import select, and_, in_
-                                
                                 async with AsyncSessionLocal() as session:
                                     # Build query with IN clause for all committee IDs (limit to 50 to avoid huge queries)
-                                    query = select(Contribution).where(
+                                    query = select_contribution_columns(include_raw_data).where(
                                         Contribution.committee_id.in_(committee_ids[:50])
                                     )
                                     
@@ -1177,14 +952,12 @@ class FECClient:
                                     if max_amount:
                                         conditions.append(Contribution.contribution_amount <= max_amount)
                                     if min_date:
-                                        from datetime import datetime
                                         try:
                                             min_date_obj = datetime.strptime(min_date, "%Y-%m-%d")
                                             conditions.append(Contribution.contribution_date >= min_date_obj)
                                         except ValueError:
                                             pass
                                     if max_date:
-                                        from datetime import datetime
                                         try:
                                             max_date_obj = datetime.strptime(max_date, "%Y-%m-%d")
                                             conditions.append(Contribution.contribution_date <= max_date_obj)
@@ -1201,85 +974,22 @@ class FECClient:
                                         query = query.limit(remaining_limit * 2)  # Get more to account for filtering
                                     
                                     result = await session.execute(query)
-                                    committee_contribs_objs = result.scalars().all()
+                                    rows = result.all()
+                                    committee_contribs = await map_contribution_rows(
+                                        session,
+                                        rows,
+                                        include_raw_data=include_raw_data,
+                                        candidate_id=candidate_id,
+                                        date_backfill=self.date_backfill
+                                    ) if rows else []
                                     
-                                    # Convert to dict format and merge with existing data
+                                    # Merge with existing data
                                     existing_ids = {c.get('contribution_id') or c.get('sub_id') for c in local_data}
-                                    for c in committee_contribs_objs:
-                                        contrib_id = c.contribution_id
+                                    for contrib_dict in committee_contribs:
+                                        contrib_id = contrib_dict['contribution_id']
                                         if contrib_id not in existing_ids:
-                                            # Convert contribution object to dict (reuse logic from _query_local_contributions)
-                                            amount = float(c.contribution_amount) if c.contribution_amount else 0.0
-                                            if amount == 0.0 and c.raw_data and isinstance(c.raw_data, dict):
-                                                for amt_key in ['TRANSACTION_AMT', 'CONTB_AMT', 'contribution_amount', 'transaction_amt']:
-                                                    if amt_key in c.raw_data:
-                                                        try:
-                                                            amt_val = str(c.raw_data[amt_key]).strip()
-                                                            amt_val = amt_val.replace('$', '').replace(',', '').strip()
-                                                            if amt_val:
-                                                                amount = float(amt_val)
-                                                                break
-                                                        except (ValueError, TypeError):
-                                                            continue
-                                            
-                                            contrib_candidate_id = c.candidate_id
-                                            if not contrib_candidate_id and c.raw_data and isinstance(c.raw_data, dict):
-                                                contrib_candidate_id = c.raw_data.get('CAND_ID') or c.raw_data.get('candidate_id')
-                                            
-                                            final_candidate_id = contrib_candidate_id or candidate_id
-                                            
-                                            # Get date
-                                            contrib_date = await self.get_contribution_date(
-                                                contribution_id=c.contribution_id,
-                                                contribution_obj=c,
-                                                committee_id=c.committee_id,
-                                                candidate_id=final_candidate_id
-                                            )
-                                            
-                                            date_str = None
-                                            if contrib_date:
-                                                if isinstance(contrib_date, datetime):
-                                                    date_str = contrib_date.strftime("%Y-%m-%d")
-                                                else:
-                                                    from app.utils.date_utils import serialize_date
-                                                    date_str = serialize_date(contrib_date)
-                                            
-                                            contributor_state = c.contributor_state
-                                            if not contributor_state and c.raw_data and isinstance(c.raw_data, dict):
-                                                contributor_state = c.raw_data.get('STATE') or c.raw_data.get('contributor_state') or c.raw_data.get('state')
-                                            
-                                            contributor_name_val = c.contributor_name
-                                            if not contributor_name_val and c.raw_data and isinstance(c.raw_data, dict):
-                                                contributor_name_val = c.raw_data.get('NAME') or c.raw_data.get('contributor_name') or c.raw_data.get('name')
-                                            
-                                            contrib_dict = {
-                                                "sub_id": c.contribution_id,
-                                                "contribution_id": c.contribution_id,
-                                                "candidate_id": final_candidate_id,
-                                                "committee_id": c.committee_id,
-                                                "contributor_name": contributor_name_val,
-                                                "contributor_city": c.contributor_city,
-                                                "contributor_state": contributor_state,
-                                                "contributor_zip": c.contributor_zip,
-                                                "contributor_employer": c.contributor_employer,
-                                                "contributor_occupation": c.contributor_occupation,
-                                                "contribution_amount": amount,
-                                                "contribution_receipt_date": date_str,
-                                                "contribution_date": date_str,
-                                                "contribution_type": c.contribution_type,
-                                                "receipt_type": None
-                                            }
-                                            
-                                            if c.raw_data and isinstance(c.raw_data, dict):
-                                                for key, value in c.raw_data.items():
-                                                    if key not in contrib_dict or not contrib_dict[key]:
-                                                        contrib_dict[key] = value
-                                            
-                                            # Only include if candidate_id matches or is missing (will be set to requested candidate_id)
-                                            contrib_candidate_id = contrib_dict.get('candidate_id')
-                                            if not contrib_candidate_id or contrib_candidate_id == candidate_id:
-                                                if not contrib_dict.get('candidate_id'):
-                                                    contrib_dict['candidate_id'] = candidate_id
+                                            # Only include if candidate_id matches (missing ones were set to the requested candidate_id)
+                                            if contrib_dict.get('candidate_id') == candidate_id:
                                                 local_data.append(contrib_dict)
                                                 existing_ids.add(contrib_id)
                                                 if len(local_data) >= limit:
@@ -1571,6 +1281,76 @@ class FECClient:
                 return local_data[:limit]
             return []
     
+    async def iter_contributions(
+        self,
+        candidate_id: Optional[str] = None,
+        committee_id: Optional[str] = None,
+        contributor_name: Optional[str] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        min_date: Optional[str] = None,
+        max_date: Optional[str] = None,
+        two_year_transaction_period: Optional[int] = None,
+        max_results: Optional[int] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Stream contributions from the API (schedules/schedule_a) one page at a time
+        
+        Unlike get_contributions(fetch_all=True), pages are yielded as they
+        arrive (the next page downloads while the caller processes the current
+        one) and the local database and API cache are not consulted. A candidate
+        without committee_id is queried through their committees, like
+        get_contributions does.
+        
+        Yields:
+            Lists of contribution dictionaries (API format)
+        """
+        committee_ids: List[Optional[str]] = [committee_id]
+        if candidate_id and not committee_id:
+            if not two_year_transaction_period:
+                candidate = await self.get_candidate(candidate_id)
+                if candidate and candidate.get('election_years'):
+                    two_year_transaction_period = max(candidate['election_years'])
+            committees = await self.get_committees(candidate_id=candidate_id, limit=100)
+            linked = [c.get('committee_id') for c in (committees or [])[:50] if c.get('committee_id')]
+            if linked:
+                committee_ids = linked
+        
+        params: Dict[str, Any] = {
+            "per_page": 100,
+            "sort": "-contribution_receipt_date",
+            # API requires two_year_transaction_period for schedule_a (must be even year)
+            "two_year_transaction_period": two_year_transaction_period or (datetime.now().year // 2) * 2
+        }
+        for key, value in [("contributor_name", contributor_name), ("min_amount", min_amount),
+                           ("max_amount", max_amount), ("min_date", min_date), ("max_date", max_date)]:
+            if value:
+                params[key] = value
+        
+        remaining = max_results
+        for comm_id in committee_ids:
+            query = dict(params)
+            if comm_id:
+                query["committee_id"] = comm_id
+            elif candidate_id:
+                query["candidate_id"] = candidate_id
+            
+            pages = self.api_client.iter_pages("schedules/schedule_a", query, get_fec_api_key, remaining)
+            try:
+                async for page in pages:
+                    if candidate_id:
+                        for contrib in page:
+                            # Ensure candidate_id is set when contributions are fetched via committee
+                            if not contrib.get('candidate_id'):
+                                contrib['candidate_id'] = candidate_id
+                    yield page
+                    if remaining is not None:
+                        remaining -= len(page)
+            finally:
+                await pages.aclose()
+            if remaining is not None and remaining <= 0:
+                return
+    
     async def get_expenditures(
         self,
         candidate_id: Optional[str] = None,
@@ -1686,8 +1466,11 @@ class FECClient:
                 if committee_id:
                     conditions.append(Committee.committee_id == committee_id)
                 if candidate_id:
-                    # Check if candidate_id is in candidate_ids JSON array
-                    conditions.append(Committee.candidate_ids.contains([candidate_id]))
+                    # Linked committees, through the indexed candidate_committee table
+                    conditions.append(Committee.committee_id.in_(
+                        select(CandidateCommittee.committee_id)
+                        .where(CandidateCommittee.candidate_id == candidate_id)
+                    ))
                 
                 if conditions:
                     query = query.where(and_(*conditions))
@@ -1741,6 +1524,9 @@ class FECClient:
         - For amendments: API data takes precedence (amendment_indicator check)
         - Merge raw_data intelligently (preserve bulk fields, add API fields)
         
+        Bulk imports apply the same rules in SQL (bulk_data.contribution_merge);
+        keep the two in sync.
+        
         Args:
             existing: Existing Contribution object from database
             new_data: New contribution data dictionary
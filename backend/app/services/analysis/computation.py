@@ -1,22 +1,20 @@
 """Analysis computation service for pre-computing and storing analysis results"""
 import logging
-import json
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set, Tuple
 from datetime import datetime, timedelta
-from sqlalchemy import select, and_, or_
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_
 
 from app.db.database import AsyncSessionLocal, PreComputedAnalysis
 from app.services.fec_client import FECClient
 from app.services.analysis.contribution_analysis import ContributionAnalysisService
 from app.services.analysis.donor_analysis import DonorAnalysisService
-from app.models.schemas import (
-    EmployerAnalysis, ContributionVelocity, DonorStateAnalysis
-)
 from app.config import config
 
 logger = logging.getLogger(__name__)
 
+# Candidate IDs per IN (...) lookup of stored results
+KEY_BATCH_SIZE = 500
+
 
 class AnalysisComputationService:
     """Service for computing, storing, and retrieving pre-computed analysis results"""
@@ -57,7 +55,8 @@ class AnalysisComputationService:
                 existing = await self.get_precomputed_analysis(
                     analysis_type, candidate_id, cycle, committee_id
                 )
-                if existing and not self._is_stale(existing):
+                # Stale results are not returned here
+                if existing:
                     logger.debug(
                         f"Analysis {analysis_type} already exists and is fresh, skipping computation"
                     )
@@ -509,7 +508,6 @@ class AnalysisComputationService:
         # Extract velocity data from new contributions
         new_velocity_by_date = {}
         new_velocity_by_week = {}
-        new_peak_days = []
         
         for contrib in new_contributions:
             date_str = contrib.get('contribution_date')
@@ -581,6 +579,110 @@ class AnalysisComputationService:
             'average_daily_velocity': updated_average_daily_velocity
         }
     
+    async def get_fresh_analysis_keys(
+        self,
+        analysis_types: List[str],
+        candidate_ids: List[str],
+        cycle: int
+    ) -> Set[Tuple[str, str]]:
+        """
+        Find the candidate analyses of a cycle that have a fresh stored result.
+
+        Args:
+            analysis_types: Analysis types to check
+            candidate_ids: Candidates to check
+            cycle: Cycle year
+
+        Returns:
+            Set of (analysis_type, candidate_id) pairs that need no recomputation
+        """
+        threshold = datetime.utcnow() - timedelta(hours=config.ANALYSIS_STALE_THRESHOLD_HOURS)
+        fresh: Set[Tuple[str, str]] = set()
+        async with AsyncSessionLocal() as session:
+            for start in range(0, len(candidate_ids), KEY_BATCH_SIZE):
+                result = await session.execute(
+                    select(PreComputedAnalysis.analysis_type, PreComputedAnalysis.candidate_id).where(
+                        and_(
+                            PreComputedAnalysis.analysis_type.in_(analysis_types),
+                            PreComputedAnalysis.candidate_id.in_(candidate_ids[start:start + KEY_BATCH_SIZE]),
+                            PreComputedAnalysis.committee_id.is_(None),
+                            PreComputedAnalysis.cycle == cycle,
+                            PreComputedAnalysis.computed_at >= threshold
+                        )
+                    )
+                )
+                fresh.update((row.analysis_type, row.candidate_id) for row in result)
+        return fresh
+
+    async def store_analyses(
+        self,
+        cycle: int,
+        results: List[Tuple[str, str, Dict[str, Any]]]
+    ) -> None:
+        """
+        Store many candidate results of a cycle in one transaction.
+
+        Same rules as _store_analysis: an existing result is updated (older
+        duplicates are removed), otherwise a new one is added.
+
+        Args:
+            cycle: Cycle year
+            results: (analysis_type, candidate_id, result_data) tuples
+        """
+        if not results:
+            return
+        now = datetime.utcnow()
+        try:
+            async with AsyncSessionLocal() as session:
+                existing: Dict[Tuple[str, str], PreComputedAnalysis] = {}
+                candidate_ids = sorted({candidate_id for _, candidate_id, _ in results})
+                analysis_types = sorted({analysis_type for analysis_type, _, _ in results})
+                for start in range(0, len(candidate_ids), KEY_BATCH_SIZE):
+                    stored = await session.execute(
+                        select(PreComputedAnalysis).where(
+                            and_(
+                                PreComputedAnalysis.analysis_type.in_(analysis_types),
+                                PreComputedAnalysis.candidate_id.in_(candidate_ids[start:start + KEY_BATCH_SIZE]),
+                                PreComputedAnalysis.committee_id.is_(None),
+                                PreComputedAnalysis.cycle == cycle
+                            )
+                        ).order_by(PreComputedAnalysis.computed_at.desc())
+                    )
+                    for analysis in stored.scalars():
+                        key = (analysis.analysis_type, analysis.candidate_id)
+                        if key in existing:
+                            await session.delete(analysis)
+                        else:
+                            existing[key] = analysis
+
+                for analysis_type, candidate_id, result_data in results:
+                    analysis = existing.get((analysis_type, candidate_id))
+                    if analysis:
+                        analysis.result_data = result_data
+                        analysis.computed_at = now
+                        analysis.last_updated = now
+                        analysis.data_version += 1
+                    else:
+                        session.add(PreComputedAnalysis(
+                            analysis_type=analysis_type,
+                            candidate_id=candidate_id,
+                            committee_id=None,
+                            cycle=cycle,
+                            result_data=result_data,
+                            computed_at=now,
+                            last_updated=now,
+                            data_version=1
+                        ))
+
+                await session.commit()
+
+        except Exception as e:
+            logger.error(
+                f"Error storing {len(results)} analyses for cycle {cycle}: {e}",
+                exc_info=True
+            )
+            raise
+
     async def _store_analysis(
         self,
         analysis_type: str,
@@ -632,9 +734,9 @@ class AnalysisComputationService:
                             await session.delete(dup)
                         await session.commit()
                     
-                    if existing:
-                    # Update existing
+                    # Update existing (a recomputed result is fresh again)
                     existing.result_data = result_data
+                    existing.computed_at = datetime.utcnow()
                     existing.last_updated = datetime.utcnow()
                     existing.data_version += 1
                 else:
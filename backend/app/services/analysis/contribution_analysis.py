@@ -2,24 +2,173 @@
 import pandas as pd
 import re
 import logging
-from typing import Optional
+from typing import Any, Iterable, Optional, Tuple
 from datetime import datetime
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, or_, case, false
 
-from app.db.database import AsyncSessionLocal, Contribution
+from app.db.database import AsyncSessionLocal, Contribution, ContributorRollup
 from app.services.fec_client import FECClient
 from app.models.schemas import (
     ContributionAnalysis, EmployerAnalysis, ContributionVelocity, CumulativeTotals
 )
 from app.services.shared.query_builders import ContributionQueryBuilder
 from app.services.shared.cycle_utils import convert_cycle_to_date_range, should_convert_cycle
-from app.services.shared.aggregation_helpers import calculate_distribution_bins
-from app.utils.thread_pool import async_to_numeric, async_dataframe_operation, async_aggregation
+from app.services.shared.aggregation_helpers import calculate_distribution_bins, ContributionAggregator
+from app.services.shared.chunked_processor import ChunkedProcessor
+from app.services.shared.contributor_rollups import are_rollups_ready
+from app.utils.thread_pool import async_to_numeric, async_dataframe_operation, async_aggregation, run_in_thread_pool
 from app.config import config
 
 logger = logging.getLogger(__name__)
 
 
+def normalize_employer_name(employer: str) -> str:
+    """Normalize employer name for better aggregation"""
+    if not employer or pd.isna(employer):
+        return 'Unknown Employer'
+    
+    # Convert to string and strip whitespace
+    normalized = str(employer).strip()
+    
+    # Convert to uppercase for consistent comparison
+    normalized = normalized.upper()
+    
+    # Remove common business suffixes and variations (with optional comma before)
+    # This handles cases like "COMPANY, INC.", "COMPANY INC", "COMPANY, INC", etc.
+    normalized = re.sub(r',?\s*(INC|LLC|CORP|LTD|CO|CORPORATION|COMPANY|INCORPORATED)\.?$', '', normalized, flags=re.IGNORECASE)
+    
+    # Remove all punctuation (commas, periods, etc.)
+    normalized = re.sub(r'[^\w\s]', '', normalized)
+    
+    # Normalize whitespace (multiple spaces to single space)
+    normalized = re.sub(r'\s+', ' ', normalized).strip()
+    
+    return normalized if normalized else 'Unknown Employer'
+
+
+def summarize_employers(employer_totals: Iterable[Tuple[str, float, int]], total_contributions: float) -> EmployerAnalysis:
+    """
+    Build an employer analysis from per-employer totals
+
+    Args:
+        employer_totals: (employer, total, count) per employer name as stored
+        total_contributions: Sum of all contribution amounts (with or without employer)
+
+    Employers are grouped by normalized name and shown under the first stored
+    name of the group.
+    """
+    employer_data = [
+        {
+            'employer': employer,
+            'total': float(total),
+            'count': int(count)
+        }
+        for employer, total, count in employer_totals
+        if employer
+    ]
+    
+    if not employer_data:
+        return EmployerAnalysis(
+            total_by_employer={},
+            top_employers=[],
+            employer_count=0,
+            total_contributions=total_contributions
+        )
+    
+    df = pd.DataFrame(employer_data)
+    
+    # Normalize employer names for better aggregation
+    df['normalized_employer'] = df['employer'].apply(normalize_employer_name)
+    
+    # Group by normalized employer name and aggregate
+    employer_grouped = df.groupby('normalized_employer').agg({
+        'total': 'sum',
+        'count': 'sum',
+        'employer': 'first'  # Keep first original name for display
+    }).reset_index()
+    employer_grouped.columns = ['normalized_employer', 'total', 'count', 'display_name']
+    employer_grouped = employer_grouped.sort_values('total', ascending=False)
+    
+    # Use display name (original) for the output, but grouping was done on normalized name
+    total_by_employer = {row['display_name']: float(row['total']) for _, row in employer_grouped.iterrows()}
+    top_employers = [
+        {
+            'employer': row['display_name'],
+            'total': float(row['total']),
+            'count': int(row['count'])
+        }
+        for _, row in employer_grouped.head(50).iterrows()
+    ]
+    
+    return EmployerAnalysis(
+        total_by_employer=total_by_employer,
+        top_employers=top_employers,
+        employer_count=int(employer_grouped['normalized_employer'].nunique()),
+        total_contributions=total_contributions
+    )
+
+
+def summarize_velocity(day_totals: Iterable[Tuple[Any, float, int]]) -> ContributionVelocity:
+    """
+    Build a velocity analysis from per-day totals
+
+    Args:
+        day_totals: (date, amount, count) per contribution day, in date order
+    """
+    velocity_data = [
+        {
+            'date': date,
+            'amount': float(amount),
+            'count': int(count)
+        }
+        for date, amount, count in day_totals
+        if date
+    ]
+    
+    if not velocity_data:
+        return ContributionVelocity(
+            velocity_by_date={},
+            velocity_by_week={},
+            peak_days=[],
+            average_daily_velocity=0.0
+        )
+    
+    df = pd.DataFrame(velocity_data)
+    df['date'] = pd.to_datetime(df['date'])
+    
+    # Velocity by date
+    velocity_by_date = {
+        str(row['date'].date()): float(row['amount'])
+        for _, row in df.iterrows()
+    }
+    
+    # Velocity by week (group by week)
+    df['week'] = df['date'].dt.to_period('W').astype(str)
+    week_grouped = df.groupby('week')['amount'].sum()
+    velocity_by_week = {str(k): float(v) for k, v in week_grouped.items()}
+    
+    # Peak days (top 10 by amount)
+    peak_days_df = df.nlargest(10, 'amount')[['date', 'amount', 'count']]
+    peak_days = [
+        {
+            'date': str(row['date'].date()),
+            'amount': float(row['amount']),
+            'count': int(row['count'])
+        }
+        for _, row in peak_days_df.iterrows()
+    ]
+    
+    # Average daily velocity
+    average_daily_velocity = float(df['amount'].mean()) if len(df) > 0 else 0.0
+    
+    return ContributionVelocity(
+        velocity_by_date=velocity_by_date,
+        velocity_by_week=velocity_by_week,
+        peak_days=peak_days,
+        average_daily_velocity=average_daily_velocity
+    )
+
+
 class ContributionAnalysisService:
     """Service for contribution analysis"""
     
@@ -28,26 +177,27 @@ class ContributionAnalysisService:
     
     def _normalize_employer_name(self, employer: str) -> str:
         """Normalize employer name for better aggregation"""
-        if not employer or pd.isna(employer):
-            return 'Unknown Employer'
-        
-        # Convert to string and strip whitespace
-        normalized = str(employer).strip()
-        
-        # Convert to uppercase for consistent comparison
-        normalized = normalized.upper()
-        
-        # Remove common business suffixes and variations (with optional comma before)
-        # This handles cases like "COMPANY, INC.", "COMPANY INC", "COMPANY, INC", etc.
-        normalized = re.sub(r',?\s*(INC|LLC|CORP|LTD|CO|CORPORATION|COMPANY|INCORPORATED)\.?$', '', normalized, flags=re.IGNORECASE)
-        
-        # Remove all punctuation (commas, periods, etc.)
-        normalized = re.sub(r'[^\w\s]', '', normalized)
-        
-        # Normalize whitespace (multiple spaces to single space)
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
-        
-        return normalized if normalized else 'Unknown Employer'
+        return normalize_employer_name(employer)
+    
+    async def _log_candidate_counts(self, session, candidate_id: str, query_builder: ContributionQueryBuilder):
+        """Log how a candidate's contributions are linked (direct, via committees, dated) in one query"""
+        committee_ids = query_builder.committee_ids
+        direct = Contribution.candidate_id == candidate_id
+        via_committees = Contribution.committee_id.in_(committee_ids) if committee_ids else false()
+        either = or_(direct, via_committees)
+        row = (await session.execute(
+            select(
+                func.sum(case((direct, 1), else_=0)).label('direct'),
+                func.sum(case((via_committees, 1), else_=0)).label('via_committees'),
+                func.count(Contribution.id).label('total'),
+                func.count(Contribution.contribution_date).label('dated')
+            ).where(either)
+        )).one()
+        logger.debug(
+            f"analyze_contributions for {candidate_id}: "
+            f"direct={row.direct or 0}, via_committees={row.via_committees or 0} (from {len(committee_ids)} committees), "
+            f"total={row.total or 0}, dated={row.dated or 0}"
+        )
     
     async def analyze_contributions(
         self,
@@ -57,9 +207,12 @@ class ContributionAnalysisService:
         max_date: Optional[str] = None,
         cycle: Optional[int] = None
     ) -> ContributionAnalysis:
-        """Analyze contributions with aggregations using efficient SQL queries"""
+        """Analyze contributions with aggregations computed in one pass over the filtered rows"""
         try:
             async with AsyncSessionLocal() as session:
+                # Donor figures come from contributor_rollups unless an explicit date range is requested
+                use_rollups = not (min_date or max_date) and await are_rollups_ready(session)
+                
                 # Convert cycle to date range if provided and no explicit dates given
                 if should_convert_cycle(cycle, min_date, max_date):
                     min_date, max_date = convert_cycle_to_date_range(cycle)
@@ -70,161 +223,64 @@ class ContributionAnalysisService:
                 query_builder.with_candidate(candidate_id).with_committee(committee_id).with_dates(min_date, max_date, cycle)
                 where_clause = await query_builder.build_where_clause()
                 
-                # Check if we have any contributions for this candidate (for debugging)
-                if candidate_id:
-                    from app.services.shared.query_builders import build_candidate_condition
-                    candidate_condition = await build_candidate_condition(candidate_id, fec_client=self.fec_client)
-                    
-                    # Check contributions with direct candidate_id
-                    direct_query = select(func.count(Contribution.id)).where(
-                        Contribution.candidate_id == candidate_id
-                    )
-                    direct_result = await session.execute(direct_query)
-                    direct_count = direct_result.scalar() or 0
-                    
-                    # Check contributions via committees
-                    from app.db.database import Committee
-                    committee_result = await session.execute(
-                        select(Committee.committee_id)
-                        .where(Committee.candidate_ids.contains([candidate_id]))
-                    )
-                    committee_ids = [row[0] for row in committee_result]
-                    committee_count = 0
-                    if committee_ids:
-                        committee_query = select(func.count(Contribution.id)).where(
-                            Contribution.committee_id.in_(committee_ids)
-                        )
-                        committee_result = await session.execute(committee_query)
-                        committee_count = committee_result.scalar() or 0
-                    
-                    # Total with combined condition
-                    total_check_query = select(func.count(Contribution.id)).where(candidate_condition)
-                    total_check_result = await session.execute(total_check_query)
-                    total_count = total_check_result.scalar() or 0
-                    
-                    logger.info(
-                        f"analyze_contributions for {candidate_id}: "
-                        f"direct={direct_count}, via_committees={committee_count} (from {len(committee_ids)} committees), "
-                        f"total={total_count}"
-                    )
-                    
-                    # Check contributions with dates
-                    dated_check_query = select(func.count(Contribution.id)).where(
-                        and_(
-                            candidate_condition,
-                            Contribution.contribution_date.isnot(None)
-                        )
-                    )
-                    dated_check_result = await session.execute(dated_check_query)
-                    dated_count = dated_check_result.scalar() or 0
-                    logger.debug(f"analyze_contributions: Found {dated_count} contributions with dates for candidate {candidate_id}")
+                if candidate_id and logger.isEnabledFor(logging.DEBUG):
+                    await self._log_candidate_counts(session, candidate_id, query_builder)
                 
-                # Get total contributions and count using aggregation
-                total_query = select(
-                    func.sum(Contribution.contribution_amount).label('total'),
-                    func.count(Contribution.id).label('count'),
-                    func.count(func.distinct(Contribution.contributor_name)).label('unique_donors')
+                rollup_where = query_builder.build_rollup_where_clause() if use_rollups else None
+                
+                # One pass over the filtered rows computes every aggregate: the rows are
+                # streamed in chunks, each reduced to partial group sums in a worker thread
+                scan_query = select(
+                    Contribution.contribution_date,
+                    Contribution.contributor_state,
+                    Contribution.contributor_name,
+                    Contribution.contribution_amount
                 ).where(
                     and_(
                         where_clause,
                         Contribution.contribution_amount.isnot(None)
                     )
                 )
-                
-                total_result = await session.execute(total_query)
-                total_row = total_result.first()
-                
-                total_contributions = float(total_row.total) if total_row.total else 0.0
-                total_count = int(total_row.count) if total_row.count else 0
-                total_contributors = int(total_row.unique_donors) if total_row.unique_donors else 0
+                aggregator = ContributionAggregator(top_n=20)
+                processor = ChunkedProcessor(chunk_size=config.ANALYSIS_CHUNK_SIZE)
+                async for chunk in processor.stream_chunks(session, scan_query, as_rows=True):
+                    await run_in_thread_pool(aggregator.add, chunk)
+                summary = await run_in_thread_pool(aggregator.result)
+                
+                total_contributions = summary['total']
+                total_count = summary['count']
                 average_contribution = total_contributions / total_count if total_count > 0 else 0.0
-                
-                # Contributions by date (aggregated)
-                date_query = select(
-                    func.date(Contribution.contribution_date).label('date'),
-                    func.sum(Contribution.contribution_amount).label('amount')
-                ).where(
-                    and_(
-                        where_clause,
-                        Contribution.contribution_date.isnot(None),
-                        Contribution.contribution_amount.isnot(None)
-                    )
-                ).group_by(func.date(Contribution.contribution_date))
-                
-                date_result = await session.execute(date_query)
-                contributions_by_date = {
-                    str(row.date): float(row.amount)
-                    for row in date_result
-                    if row.date
-                }
-                
-                # Contributions by state (aggregated)
-                state_query = select(
-                    Contribution.contributor_state.label('state'),
-                    func.sum(Contribution.contribution_amount).label('amount')
-                ).where(
-                    and_(
-                        where_clause,
-                        Contribution.contributor_state.isnot(None),
-                        Contribution.contribution_amount.isnot(None)
+                contributions_by_date = summary['by_date']
+                contributions_by_state = summary['by_state']
+                contribution_distribution = summary['distribution']
+                
+                if use_rollups:
+                    # Donor figures from contributor_rollups (names are merged by name_key there)
+                    unique_donors = await session.execute(
+                        select(func.count(func.distinct(ContributorRollup.name_key))).where(rollup_where)
                     )
-                ).group_by(Contribution.contributor_state)
-                
-                state_result = await session.execute(state_query)
-                contributions_by_state = {
-                    row.state: float(row.amount)
-                    for row in state_result
-                    if row.state
-                }
-                
-                # Top donors (aggregated)
-                top_donors_query = select(
-                    Contribution.contributor_name.label('name'),
-                    func.sum(Contribution.contribution_amount).label('total'),
-                    func.count(Contribution.id).label('count')
-                ).where(
-                    and_(
-                        where_clause,
-                        Contribution.contributor_name.isnot(None),
-                        Contribution.contribution_amount.isnot(None)
-                    )
-                ).group_by(Contribution.contributor_name).order_by(
-                    func.sum(Contribution.contribution_amount).desc()
-                ).limit(20)
-                
-                top_donors_result = await session.execute(top_donors_query)
-                top_donors = [
-                    {
-                        'name': row.name,
-                        'total': float(row.total),
-                        'count': int(row.count)
-                    }
-                    for row in top_donors_result
-                    if row.name
-                ]
-                
-                # Contribution distribution (bins) - need to fetch amounts for binning
-                # Use streaming for large datasets to avoid memory issues
-                # Sample up to 10k records for distribution calculation (sufficient for accurate bins)
-                from app.services.shared.chunked_processor import ChunkedProcessor
-                
-                amount_query = select(Contribution.contribution_amount).where(
-                    and_(
-                        where_clause,
-                        Contribution.contribution_amount.isnot(None),
-                        Contribution.contribution_amount > 0
-                    )
-                )
-                
-                # Stream amounts in chunks to avoid loading all into memory
-                processor = ChunkedProcessor(chunk_size=10000)
-                amounts = []
-                async for contribution in processor.stream_contributions(session, amount_query, max_records=10000):
-                    if contribution.contribution_amount:
-                        amounts.append(float(contribution.contribution_amount))
-                
-                # Calculate distribution bins
-                contribution_distribution = calculate_distribution_bins(amounts) if amounts else {}
+                    total_contributors = int(unique_donors.scalar() or 0)
+                    
+                    top_donors_query = select(
+                        func.min(ContributorRollup.contributor_name).label('name'),
+                        func.sum(ContributorRollup.total_amount).label('total'),
+                        func.sum(ContributorRollup.contribution_count).label('count')
+                    ).where(rollup_where).group_by(ContributorRollup.name_key).order_by(
+                        func.sum(ContributorRollup.total_amount).desc()
+                    ).limit(20)
+                    top_donors_result = await session.execute(top_donors_query)
+                    top_donors = [
+                        {
+                            'name': row.name,
+                            'total': float(row.total),
+                            'count': int(row.count)
+                        }
+                        for row in top_donors_result
+                        if row.name
+                    ]
+                else:
+                    total_contributors = summary['unique_donors']
+                    top_donors = summary['top_donors']
                 
                 # Get FEC API totals for comparison and data completeness calculation
                 data_completeness = None
@@ -315,7 +371,8 @@ class ContributionAnalysisService:
                 min_date=min_date,
                 max_date=max_date,
                 limit=10000,
-                two_year_transaction_period=cycle
+                two_year_transaction_period=cycle,
+                include_raw_data=False
             )
             
             if not contributions:
@@ -555,57 +612,9 @@ class ContributionAnalysisService:
                 ).group_by(Contribution.contributor_employer)
                 
                 employer_result = await session.execute(employer_query)
-                employer_rows = employer_result.all()
-                
-                if not employer_rows:
-                    return EmployerAnalysis(
-                        total_by_employer={},
-                        top_employers=[],
-                        employer_count=0,
-                        total_contributions=total_contributions
-                    )
-                
-                # Convert to DataFrame for normalization
-                employer_data = [
-                    {
-                        'employer': row.employer,
-                        'total': float(row.total),
-                        'count': int(row.count)
-                    }
-                    for row in employer_rows
-                    if row.employer
-                ]
-                
-                df = pd.DataFrame(employer_data)
-                
-                # Normalize employer names for better aggregation
-                df['normalized_employer'] = df['employer'].apply(self._normalize_employer_name)
-                
-                # Group by normalized employer name and aggregate
-                employer_grouped = df.groupby('normalized_employer').agg({
-                    'total': 'sum',
-                    'count': 'sum',
-                    'employer': 'first'  # Keep first original name for display
-                }).reset_index()
-                employer_grouped.columns = ['normalized_employer', 'total', 'count', 'display_name']
-                employer_grouped = employer_grouped.sort_values('total', ascending=False)
-                
-                # Use display name (original) for the output, but grouping was done on normalized name
-                total_by_employer = {row['display_name']: float(row['total']) for _, row in employer_grouped.iterrows()}
-                top_employers = [
-                    {
-                        'employer': row['display_name'],
-                        'total': float(row['total']),
-                        'count': int(row['count'])
-                    }
-                    for _, row in employer_grouped.head(50).iterrows()
-                ]
-                
-                result = EmployerAnalysis(
-                    total_by_employer=total_by_employer,
-                    top_employers=top_employers,
-                    employer_count=int(employer_grouped['normalized_employer'].nunique()),
-                    total_contributions=total_contributions
+                result = summarize_employers(
+                    ((row.employer, row.total, row.count) for row in employer_result),
+                    total_contributions
                 )
                 
                 # Store result for future use if pre-computation is enabled
@@ -632,7 +641,8 @@ class ContributionAnalysisService:
                 committee_id=committee_id,
                 min_date=min_date,
                 max_date=max_date,
-                limit=10000
+                limit=10000,
+                include_raw_data=False
             )
             
             if not contributions:
@@ -758,61 +768,7 @@ class ContributionAnalysisService:
                 ).group_by(func.date(Contribution.contribution_date))
                 
                 date_result = await session.execute(date_query)
-                date_rows = date_result.all()
-                
-                if not date_rows:
-                    return ContributionVelocity(
-                        velocity_by_date={},
-                        velocity_by_week={},
-                        peak_days=[],
-                        average_daily_velocity=0.0
-                    )
-                
-                # Convert to DataFrame for week grouping and peak day calculation
-                velocity_data = [
-                    {
-                        'date': row.date,
-                        'amount': float(row.amount),
-                        'count': int(row.count)
-                    }
-                    for row in date_rows
-                    if row.date
-                ]
-                
-                df = pd.DataFrame(velocity_data)
-                df['date'] = pd.to_datetime(df['date'])
-                
-                # Velocity by date
-                velocity_by_date = {
-                    str(row['date'].date()): float(row['amount'])
-                    for _, row in df.iterrows()
-                }
-                
-                # Velocity by week (group by week)
-                df['week'] = df['date'].dt.to_period('W').astype(str)
-                week_grouped = df.groupby('week')['amount'].sum()
-                velocity_by_week = {str(k): float(v) for k, v in week_grouped.items()}
-                
-                # Peak days (top 10 by amount)
-                peak_days_df = df.nlargest(10, 'amount')[['date', 'amount', 'count']]
-                peak_days = [
-                    {
-                        'date': str(row['date'].date()),
-                        'amount': float(row['amount']),
-                        'count': int(row['count'])
-                    }
-                    for _, row in peak_days_df.iterrows()
-                ]
-                
-                # Average daily velocity
-                average_daily_velocity = float(df['amount'].mean()) if len(df) > 0 else 0.0
-                
-                result = ContributionVelocity(
-                    velocity_by_date=velocity_by_date,
-                    velocity_by_week=velocity_by_week,
-                    peak_days=peak_days,
-                    average_daily_velocity=average_daily_velocity
-                )
+                result = summarize_velocity((row.date, row.amount, row.count) for row in date_result)
                 
                 # Store result for future use if pre-computation is enabled
                 if config.ENABLE_PRECOMPUTED_ANALYSIS and not min_date and not max_date:
@@ -838,7 +794,8 @@ class ContributionAnalysisService:
                 committee_id=committee_id,
                 min_date=min_date,
                 max_date=max_date,
-                limit=10000
+                limit=10000,
+                include_raw_data=False
             )
             
             if not contributions:
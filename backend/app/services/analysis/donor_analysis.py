@@ -19,6 +19,79 @@ logger = logging.getLogger(__name__)
 ANALYSIS_CHUNK_SIZE = config.ANALYSIS_CHUNK_SIZE
 
 
+def summarize_donor_states(
+    state_donor_counts: Dict[str, int],
+    state_amounts: Dict[str, float],
+    total_contributions: float,
+    candidate_state: Optional[str]
+) -> DonorStateAnalysis:
+    """
+    Build a donor state analysis from per-state tallies
+
+    Args:
+        state_donor_counts: Number of unique donors per primary donor state
+        state_amounts: Amount given by those donors per state
+        total_contributions: Sum of all their contributions
+        candidate_state: The candidate's state (in/out-of-state split)
+    """
+    total_unique_donors = sum(state_donor_counts.values())
+    if total_unique_donors == 0:
+        return DonorStateAnalysis(
+            donors_by_state={},
+            donor_percentages_by_state={},
+            amounts_by_state={},
+            amount_percentages_by_state={},
+            candidate_state=candidate_state,
+            in_state_donor_percentage=0.0,
+            in_state_amount_percentage=0.0,
+            out_of_state_donor_percentage=0.0,
+            out_of_state_amount_percentage=0.0,
+            total_unique_donors=0,
+            total_contributions=0.0,
+            is_highly_out_of_state=False
+        )
+    
+    donor_percentages = {}
+    amount_percentages = {}
+    
+    for state, count in state_donor_counts.items():
+        donor_percentages[state] = (count / total_unique_donors * 100) if total_unique_donors > 0 else 0.0
+    
+    for state, amount in state_amounts.items():
+        amount_percentages[state] = (amount / total_contributions * 100) if total_contributions > 0 else 0.0
+    
+    in_state_donor_count = state_donor_counts.get(candidate_state, 0) if candidate_state else 0
+    in_state_amount = state_amounts.get(candidate_state, 0.0) if candidate_state else 0.0
+    
+    in_state_donor_percentage = (in_state_donor_count / total_unique_donors * 100) if total_unique_donors > 0 else 0.0
+    in_state_amount_percentage = (in_state_amount / total_contributions * 100) if total_contributions > 0 else 0.0
+    
+    out_of_state_donor_percentage = 100.0 - in_state_donor_percentage if candidate_state else 0.0
+    out_of_state_amount_percentage = 100.0 - in_state_amount_percentage if candidate_state else 0.0
+    
+    is_highly_out_of_state = False
+    if candidate_state:
+        is_highly_out_of_state = (
+            out_of_state_donor_percentage > 50.0 or 
+            out_of_state_amount_percentage > 50.0
+        )
+    
+    return DonorStateAnalysis(
+        donors_by_state={k: int(v) for k, v in state_donor_counts.items()},
+        donor_percentages_by_state={k: float(v) for k, v in donor_percentages.items()},
+        amounts_by_state={k: float(v) for k, v in state_amounts.items()},
+        amount_percentages_by_state={k: float(v) for k, v in amount_percentages.items()},
+        candidate_state=candidate_state,
+        in_state_donor_percentage=float(in_state_donor_percentage),
+        in_state_amount_percentage=float(in_state_amount_percentage),
+        out_of_state_donor_percentage=float(out_of_state_donor_percentage),
+        out_of_state_amount_percentage=float(out_of_state_amount_percentage),
+        total_unique_donors=int(total_unique_donors),
+        total_contributions=float(total_contributions),
+        is_highly_out_of_state=is_highly_out_of_state
+    )
+
+
 class DonorAnalysisService:
     """Service for donor analysis"""
     
@@ -201,7 +274,8 @@ class DonorAnalysisService:
                 min_date=min_date,
                 max_date=max_date,
                 limit=ANALYSIS_CHUNK_SIZE,  # Use chunk size as limit
-                two_year_transaction_period=cycle if not min_date and not max_date else None
+                two_year_transaction_period=cycle if not min_date and not max_date else None,
+                include_raw_data=False
             )
             logger.debug(f"analyze_donor_states: Retrieved {len(contributions)} contributions from FEC client for candidate {candidate_id}, cycle {cycle}")
         
@@ -354,48 +428,8 @@ class DonorAnalysisService:
             state_donor_counts[state] += 1
             state_amounts[state] += donor_amounts[donor_key]
         
-        total_unique_donors = len(donor_states)
         total_contributions = await async_dataframe_operation(df, lambda d: d['contribution_amount'].sum())
-        
-        donor_percentages = {}
-        amount_percentages = {}
-        
-        for state, count in state_donor_counts.items():
-            donor_percentages[state] = (count / total_unique_donors * 100) if total_unique_donors > 0 else 0.0
-        
-        for state, amount in state_amounts.items():
-            amount_percentages[state] = (amount / total_contributions * 100) if total_contributions > 0 else 0.0
-        
-        in_state_donor_count = state_donor_counts.get(candidate_state, 0) if candidate_state else 0
-        in_state_amount = state_amounts.get(candidate_state, 0.0) if candidate_state else 0.0
-        
-        in_state_donor_percentage = (in_state_donor_count / total_unique_donors * 100) if total_unique_donors > 0 else 0.0
-        in_state_amount_percentage = (in_state_amount / total_contributions * 100) if total_contributions > 0 else 0.0
-        
-        out_of_state_donor_percentage = 100.0 - in_state_donor_percentage if candidate_state else 0.0
-        out_of_state_amount_percentage = 100.0 - in_state_amount_percentage if candidate_state else 0.0
-        
-        is_highly_out_of_state = False
-        if candidate_state:
-            is_highly_out_of_state = (
-                out_of_state_donor_percentage > 50.0 or 
-                out_of_state_amount_percentage > 50.0
-            )
-        
-        result = DonorStateAnalysis(
-            donors_by_state={k: int(v) for k, v in state_donor_counts.items()},
-            donor_percentages_by_state={k: float(v) for k, v in donor_percentages.items()},
-            amounts_by_state={k: float(v) for k, v in state_amounts.items()},
-            amount_percentages_by_state={k: float(v) for k, v in amount_percentages.items()},
-            candidate_state=candidate_state,
-            in_state_donor_percentage=float(in_state_donor_percentage),
-            in_state_amount_percentage=float(in_state_amount_percentage),
-            out_of_state_donor_percentage=float(out_of_state_donor_percentage),
-            out_of_state_amount_percentage=float(out_of_state_amount_percentage),
-            total_unique_donors=int(total_unique_donors),
-            total_contributions=float(total_contributions),
-            is_highly_out_of_state=is_highly_out_of_state
-        )
+        result = summarize_donor_states(state_donor_counts, state_amounts, total_contributions, candidate_state)
         
         # Store result for future use if pre-computation is enabled
         if config.ENABLE_PRECOMPUTED_ANALYSIS and not min_date and not max_date:
@@ -523,7 +557,8 @@ class DonorAnalysisService:
                 min_date=min_date,
                 max_date=max_date,
                 limit=limit,
-                two_year_transaction_period=cycle
+                two_year_transaction_period=cycle,
+                include_raw_data=False
             )
             
             if not contributions:
@@ -69,7 +69,8 @@ class MoneyFlowService:
         contributions = await self.fec_client.get_contributions(
             candidate_id=candidate_id,
             min_amount=min_amount,
-            limit=5000
+            limit=5000,
+            include_raw_data=False
         )
         
         if aggregate_by_employer:
@@ -4,12 +4,13 @@ import asyncio
 import uuid
 from typing import Optional, List, Dict, Any, Set
 from datetime import datetime
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import AsyncSessionLocal, AnalysisComputationJob, Contribution, Candidate
 from app.services.fec_client import FECClient
 from app.services.analysis.computation import AnalysisComputationService
+from app.services.analysis.scheduler import AnalysisPrecomputeScheduler
 from app.config import config
 
 logger = logging.getLogger(__name__)
@@ -21,6 +22,7 @@ class AnalysisOrchestratorService:
     def __init__(self, fec_client: FECClient):
         self.fec_client = fec_client
         self._computation_service = AnalysisComputationService(fec_client)
+        self._scheduler = AnalysisPrecomputeScheduler(fec_client)
         self._running_jobs: Set[str] = set()
     
     async def schedule_analysis_after_import(
@@ -91,14 +93,23 @@ class AnalysisOrchestratorService:
     async def compute_analyses_for_cycle(
         self,
         cycle: int,
-        analysis_types: Optional[List[str]] = None
+        analysis_types: Optional[List[str]] = None,
+        force_recompute: bool = False,
+        candidate_ids: Optional[List[str]] = None,
+        job_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Compute all analyses for a cycle.
         
+        Candidate analyses are computed in batches by AnalysisPrecomputeScheduler
+        (most viewed candidates first), then the cycle-level analyses.
+        
         Args:
             cycle: The cycle to compute analyses for
             analysis_types: Optional list of analysis types to compute (default: all)
+            force_recompute: If True, recompute results that are still fresh
+            candidate_ids: Optional candidates to compute (default: all with contributions in the cycle)
+            job_id: Optional AnalysisComputationJob to record progress in
         
         Returns:
             Dict with computation results
@@ -114,81 +125,31 @@ class AnalysisOrchestratorService:
         }
         
         try:
-            # Get all candidates with contributions in this cycle
-            # Cycle covers (cycle-1)-01-01 to cycle-12-31
-            from datetime import datetime
-            cycle_start = datetime(cycle - 1, 1, 1)
-            cycle_end = datetime(cycle, 12, 31)
-            
-            async with AsyncSessionLocal() as session:
-                query = select(Contribution.candidate_id).where(
-                    and_(
-                        Contribution.candidate_id.isnot(None),
-                        or_(
-                            and_(
-                                Contribution.contribution_date >= cycle_start,
-                                Contribution.contribution_date <= cycle_end
-                            ),
-                            Contribution.contribution_date.is_(None)  # Include undated contributions
-                        )
-                    )
-                ).distinct()
-                
-                result = await session.execute(query)
-                candidate_ids = [row[0] for row in result if row[0]]
-            
-            logger.info(
-                f"Computing analyses for cycle {cycle}: "
-                f"{len(candidate_ids)} candidates, types={analysis_types}"
+            results = await self._scheduler.run(
+                cycle=cycle,
+                candidate_ids=candidate_ids,
+                analysis_types=analysis_types,
+                force_recompute=force_recompute,
+                job_id=job_id
             )
             
-            # Compute analyses for each candidate
-            for candidate_id in candidate_ids:
-                for analysis_type in analysis_types:
-                    try:
-                        if analysis_type == 'donor_states' and not candidate_id:
-                            continue
-                        
-                        result = await self._computation_service.compute_and_store_analysis(
-                            analysis_type=analysis_type,
-                            candidate_id=candidate_id,
-                            cycle=cycle
-                        )
-                        
-                        if result:
-                            if analysis_type not in results['analysis_types']:
-                                results['analysis_types'][analysis_type] = {
-                                    'computed': 0,
-                                    'failed': 0
-                                }
-                            results['analysis_types'][analysis_type]['computed'] += 1
-                            results['total_computed'] += 1
-                        else:
-                            if analysis_type not in results['analysis_types']:
-                                results['analysis_types'][analysis_type] = {
-                                    'computed': 0,
-                                    'failed': 0
-                                }
-                            results['analysis_types'][analysis_type]['failed'] += 1
-                            results['total_failed'] += 1
-                            
-                    except Exception as e:
-                        logger.error(
-                            f"Error computing {analysis_type} for candidate {candidate_id}, "
-                            f"cycle {cycle}: {e}",
-                            exc_info=True
-                        )
-                        results['total_failed'] += 1
+            if candidate_ids is not None:
+                return results
             
             # Also compute cycle-level analyses (without candidate_id)
             for analysis_type in ['employer', 'velocity']:
+                if analysis_type not in analysis_types:
+                    continue
                 try:
                     result = await self._computation_service.compute_and_store_analysis(
                         analysis_type=analysis_type,
-                        cycle=cycle
+                        cycle=cycle,
+                        force_recompute=force_recompute
                     )
                     if result:
                         results['total_computed'] += 1
+                    else:
+                        results['total_failed'] += 1
                 except Exception as e:
                     logger.error(
                         f"Error computing cycle-level {analysis_type} for cycle {cycle}: {e}",
@@ -349,21 +310,17 @@ class AnalysisOrchestratorService:
             
             logger.info(f"Starting analysis computation job {job_id} for cycle {cycle}")
             
-            # Compute analyses
-            if affected_candidates:
-                # Compute for specific candidates
-                for candidate_id in affected_candidates:
-                    await self.compute_analyses_for_candidate(
-                        candidate_id=candidate_id,
-                        cycles=[cycle],
-                        analysis_types=['employer', 'velocity', 'donor_states']
-                    )
-            else:
-                # Compute for entire cycle
-                await self.compute_analyses_for_cycle(
-                    cycle=cycle,
-                    analysis_types=['employer', 'velocity', 'donor_states']
-                )
+            # Compute analyses (for the affected candidates, or the entire cycle);
+            # the import changed the data, so stored results are recomputed
+            results = await self.compute_analyses_for_cycle(
+                cycle=cycle,
+                analysis_types=['employer', 'velocity', 'donor_states'],
+                force_recompute=True,
+                candidate_ids=affected_candidates or None,
+                job_id=job_id
+            )
+            if 'error' in results:
+                raise RuntimeError(results['error'])
             
             # Update job status to completed
             async with AsyncSessionLocal() as session:
@@ -0,0 +1,423 @@
+"""
+Batched precomputation of candidate analyses
+
+Instead of running the employer, velocity and donor-state analyses candidate
+by candidate (three contribution queries each), the scheduler:
+
+- splits the candidates of a cycle into batches of
+  ``ANALYSIS_COMPUTATION_BATCH_SIZE`` and computes up to
+  ``ANALYSIS_PRECOMPUTE_WORKERS`` batches at once
+- reads a batch's contributions in the cycle with one scan grouped by
+  (candidate, committee, day, employer, donor, state); each group is
+  attributed to the batch candidates it belongs to (directly or through a
+  linked committee) and feeds all three analyses
+- builds the results with the same summarize_* functions as the
+  per-candidate services and stores a batch in one transaction
+- hands out the most viewed candidates first (``record_candidate_view``),
+  re-evaluated for every batch, so results users look at are ready soonest
+- records progress in the job's ``AnalysisComputationJob`` row
+
+Donor rows whose amount or state only live in raw_data are read
+individually, with the fallbacks of DonorAnalysisService.analyze_donor_states.
+"""
+import asyncio
+import heapq
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import and_, case, func, or_, select
+
+from app.config import config
+from app.db.database import AnalysisComputationJob, AsyncSessionLocal, Candidate, Contribution
+from app.services.analysis.computation import AnalysisComputationService
+from app.services.analysis.contribution_analysis import summarize_employers, summarize_velocity
+from app.services.analysis.donor_analysis import summarize_donor_states
+from app.services.fec_client import FECClient
+from app.services.shared.candidate_committees import get_candidate_committee_ids
+from app.services.shared.chunked_processor import ChunkedProcessor
+from app.utils.thread_pool import run_in_thread_pool
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_TYPES = ('employer', 'velocity', 'donor_states')
+
+# Candidates whose views are remembered (least recently viewed are dropped first)
+MAX_TRACKED_VIEWS = 10000
+
+# raw_data keys tried for donor amounts, in analyze_donor_states' order
+RAW_AMOUNT_KEYS = (
+    'TRANSACTION_AMT', 'CONTB_AMT', 'contb_receipt_amt', 'contribution_amount',
+    'transaction_amt', 'contribution_receipt_amount', 'amount'
+)
+RAW_STATE_KEYS = ('STATE', 'contributor_state', 'state')
+
+# candidate_id -> number of views
+_candidate_views: 'OrderedDict[str, int]' = OrderedDict()
+
+
+def record_candidate_view(candidate_id: str) -> None:
+    """Count a view of a candidate; viewed candidates are precomputed first"""
+    if not candidate_id:
+        return
+    _candidate_views[candidate_id] = _candidate_views.pop(candidate_id, 0) + 1
+    if len(_candidate_views) > MAX_TRACKED_VIEWS:
+        _candidate_views.popitem(last=False)
+
+
+def candidate_view_count(candidate_id: str) -> int:
+    return _candidate_views.get(candidate_id, 0)
+
+
+def clear_candidate_views() -> None:
+    _candidate_views.clear()
+
+
+def cycle_window(cycle: int):
+    """Contributions of a cycle: dated (cycle-1)-01-01 to cycle-12-31, or undated"""
+    cycle_start = datetime(cycle - 1, 1, 1)
+    cycle_end = datetime(cycle, 12, 31)
+    return or_(
+        and_(
+            Contribution.contribution_date >= cycle_start,
+            Contribution.contribution_date <= cycle_end
+        ),
+        Contribution.contribution_date.is_(None)
+    )
+
+
+def _raw_amount(amount: Optional[float], raw_data: Any) -> float:
+    if amount is not None and amount > 0:
+        return float(amount)
+    if isinstance(raw_data, dict):
+        for key in RAW_AMOUNT_KEYS:
+            if key in raw_data:
+                try:
+                    value = float(str(raw_data[key]).replace('$', '').replace(',', '').strip())
+                except (ValueError, TypeError):
+                    continue
+                if value > 0:
+                    return value
+    return 0.0
+
+
+def _raw_state(state: Optional[str], raw_data: Any) -> str:
+    if not state and isinstance(raw_data, dict):
+        state = next((raw_data[key] for key in RAW_STATE_KEYS if raw_data.get(key)), None)
+    return 'Unknown' if state is None else state
+
+
+class CandidateTotals:
+    """Running aggregates of one candidate's contributions in the cycle"""
+
+    __slots__ = ('dated_total', 'employers', 'days', 'donors')
+
+    def __init__(self):
+        self.dated_total = 0.0
+        self.employers: Dict[str, List[float]] = {}  # employer -> [total, count]
+        self.days: Dict[str, List[float]] = {}  # YYYY-MM-DD -> [amount, count]
+        self.donors: Dict[Tuple[str, str], float] = {}  # (name, state) -> amount
+
+    def add_donor(self, name: str, state: str, amount: float) -> None:
+        key = (name, state)
+        self.donors[key] = self.donors.get(key, 0.0) + amount
+
+    def analyses(self, candidate_state: Optional[str]) -> Dict[str, Any]:
+        """Results in the shapes of analyze_by_employer, analyze_velocity and analyze_donor_states"""
+        state_donor_counts: Dict[str, int] = {}
+        state_amounts: Dict[str, float] = {}
+        for (_, state), amount in self.donors.items():
+            state_donor_counts[state] = state_donor_counts.get(state, 0) + 1
+            state_amounts[state] = state_amounts.get(state, 0.0) + amount
+        return {
+            'employer': summarize_employers(
+                ((employer, total, count) for employer, (total, count) in sorted(self.employers.items())),
+                self.dated_total
+            ),
+            'velocity': summarize_velocity(
+                (day, amount, count) for day, (amount, count) in sorted(self.days.items())
+            ),
+            'donor_states': summarize_donor_states(
+                state_donor_counts, state_amounts, sum(self.donors.values()), candidate_state
+            ),
+        }
+
+
+class CandidateBatchAggregator:
+    """Folds contribution rows of a batch scan into per-candidate totals"""
+
+    def __init__(self, committee_ids: Dict[str, Sequence[str]]):
+        self.totals = {candidate_id: CandidateTotals() for candidate_id in committee_ids}
+        self._owners: Dict[str, List[str]] = {}
+        for candidate_id, committees in committee_ids.items():
+            for committee_id in committees:
+                self._owners.setdefault(committee_id, []).append(candidate_id)
+        self._targets: Dict[Tuple[Optional[str], Optional[str]], Tuple[CandidateTotals, ...]] = {}
+
+    def _targets_of(self, candidate_id: Optional[str], committee_id: Optional[str]) -> Tuple[CandidateTotals, ...]:
+        key = (candidate_id, committee_id)
+        targets = self._targets.get(key)
+        if targets is None:
+            direct = [candidate_id] if candidate_id in self.totals else []
+            names = dict.fromkeys(direct + self._owners.get(committee_id, []))
+            targets = self._targets[key] = tuple(self.totals[name] for name in names)
+        return targets
+
+    def add_groups(self, rows: Iterable[Sequence[Any]]) -> None:
+        """
+        Add rows of the grouped scan: (candidate_id, committee_id, day, employer,
+        name, state, needs_raw, total, count, donor_total)
+        """
+        for candidate_id, committee_id, day, employer, name, state, needs_raw, total, count, donor_total in rows:
+            for totals in self._targets_of(candidate_id, committee_id):
+                # Employer and velocity: dated contributions with an amount
+                if day is not None and count:
+                    totals.dated_total += total
+                    if employer:
+                        entry = totals.employers.setdefault(employer, [0.0, 0])
+                        entry[0] += total
+                        entry[1] += count
+                    entry = totals.days.setdefault(day, [0.0, 0])
+                    entry[0] += total
+                    entry[1] += count
+                # Donor states: named donors, dated or not
+                if name and not needs_raw:
+                    totals.add_donor(name, state, donor_total or 0.0)
+
+    def add_raw_rows(self, rows: Iterable[Sequence[Any]]) -> None:
+        """Add donor rows read individually: (candidate_id, committee_id, name, state, amount, raw_data)"""
+        for candidate_id, committee_id, name, state, amount, raw_data in rows:
+            donor_state = _raw_state(state, raw_data)
+            donor_amount = _raw_amount(amount, raw_data)
+            for totals in self._targets_of(candidate_id, committee_id):
+                totals.add_donor(name, donor_state, donor_amount)
+
+
+class AnalysisPrecomputeScheduler:
+    """Computes and stores the per-candidate analyses of a cycle in batches"""
+
+    def __init__(
+        self,
+        fec_client: FECClient,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.fec_client = fec_client
+        self.workers = max(1, workers or config.ANALYSIS_PRECOMPUTE_WORKERS)
+        self.batch_size = max(1, batch_size or config.ANALYSIS_COMPUTATION_BATCH_SIZE)
+        self._computation_service = AnalysisComputationService(fec_client)
+
+    async def cycle_candidates(self, cycle: int) -> Dict[str, int]:
+        """Candidates with contributions in the cycle and their number of contributions"""
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(Contribution.candidate_id, func.count(Contribution.id))
+                .where(and_(Contribution.candidate_id.isnot(None), cycle_window(cycle)))
+                .group_by(Contribution.candidate_id)
+            )
+            return {candidate_id: count for candidate_id, count in result if candidate_id}
+
+    async def run(
+        self,
+        cycle: int,
+        candidate_ids: Optional[List[str]] = None,
+        analysis_types: Optional[List[str]] = None,
+        force_recompute: bool = False,
+        job_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Compute and store candidate analyses for a cycle.
+
+        Args:
+            cycle: Cycle year
+            candidate_ids: Candidates to compute (default: all with contributions in the cycle)
+            analysis_types: Analysis types to compute (default: all)
+            force_recompute: Recompute results that are still fresh
+            job_id: AnalysisComputationJob to record progress in
+
+        Returns:
+            Dict with per-type computed/failed counts
+        """
+        analysis_types = [t for t in (analysis_types or ANALYSIS_TYPES) if t in ANALYSIS_TYPES]
+        results: Dict[str, Any] = {
+            'cycle': cycle,
+            'analysis_types': {t: {'computed': 0, 'failed': 0} for t in analysis_types},
+            'total_computed': 0,
+            'total_failed': 0,
+            'skipped': 0,
+            'candidates': 0
+        }
+        if not config.ENABLE_PRECOMPUTED_ANALYSIS:
+            logger.debug("Pre-computed analysis is disabled, skipping computation")
+            return results
+
+        sizes = await self.cycle_candidates(cycle)
+        if candidate_ids is not None:
+            sizes = {candidate_id: sizes.get(candidate_id, 0) for candidate_id in candidate_ids if candidate_id}
+        needed: Dict[str, Set[str]] = {candidate_id: set(analysis_types) for candidate_id in sizes}
+
+        skipped = 0
+        if not force_recompute and needed:
+            fresh = await self._computation_service.get_fresh_analysis_keys(analysis_types, list(needed), cycle)
+            for analysis_type, candidate_id in fresh:
+                needed[candidate_id].discard(analysis_type)
+            skipped = len(fresh)
+            needed = {candidate_id: types for candidate_id, types in needed.items() if types}
+
+        results['skipped'] = skipped
+        results['candidates'] = len(needed)
+        logger.info(
+            f"Precomputing analyses for cycle {cycle}: {len(needed)} candidates "
+            f"({skipped} fresh results kept), types={analysis_types}, "
+            f"batches of {self.batch_size}, {self.workers} workers"
+        )
+        await self._update_job(job_id, total_items=len(needed), completed_items=0)
+
+        completed = 0
+
+        async def worker() -> None:
+            nonlocal completed
+            while True:
+                batch = self._next_batch(needed, sizes)
+                if not batch:
+                    return
+                await self._update_job(job_id, current_item=f"{len(batch)} candidates from {next(iter(batch))}")
+                try:
+                    computed = await self._compute_batch(cycle, batch)
+                except Exception as e:
+                    logger.error(f"Error precomputing analyses for {len(batch)} candidates, cycle {cycle}: {e}", exc_info=True)
+                    computed = {}
+                for candidate_id, types in batch.items():
+                    for analysis_type in types:
+                        outcome = 'computed' if analysis_type in computed.get(candidate_id, ()) else 'failed'
+                        results['analysis_types'][analysis_type][outcome] += 1
+                        results[f'total_{outcome}'] += 1
+                completed += len(batch)
+                await self._update_job(
+                    job_id,
+                    completed_items=completed,
+                    progress_data={'analysis_types': results['analysis_types'], 'skipped': skipped}
+                )
+
+        batches = -(-len(needed) // self.batch_size)
+        await asyncio.gather(*(worker() for _ in range(min(self.workers, batches))))
+
+        logger.info(
+            f"Precomputed analyses for cycle {cycle}: "
+            f"{results['total_computed']} computed, {results['total_failed']} failed"
+        )
+        return results
+
+    def _next_batch(self, needed: Dict[str, Set[str]], sizes: Dict[str, int]) -> Dict[str, Set[str]]:
+        """Take the most viewed (then largest) remaining candidates off the queue"""
+        chosen = heapq.nsmallest(
+            self.batch_size,
+            needed,
+            key=lambda candidate_id: (-candidate_view_count(candidate_id), -sizes.get(candidate_id, 0), candidate_id)
+        )
+        return {candidate_id: needed.pop(candidate_id) for candidate_id in chosen}
+
+    async def _candidate_states(self, candidate_ids: List[str]) -> Dict[str, Optional[str]]:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(Candidate.candidate_id, Candidate.state).where(Candidate.candidate_id.in_(candidate_ids))
+            )
+            states = {candidate_id: state for candidate_id, state in result}
+        for candidate_id in candidate_ids:
+            if candidate_id not in states:
+                candidate = await self.fec_client.get_candidate(candidate_id)
+                states[candidate_id] = candidate.get('state') if candidate else None
+        return states
+
+    async def _compute_batch(self, cycle: int, batch: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
+        """Compute and store one batch; returns the analysis types stored per candidate"""
+        candidate_ids = list(batch)
+        committee_ids = {
+            candidate_id: await get_candidate_committee_ids(candidate_id, self.fec_client)
+            for candidate_id in candidate_ids
+        }
+        all_committees = sorted({c for committees in committee_ids.values() for c in committees})
+        candidate_condition = Contribution.candidate_id.in_(candidate_ids)
+        if all_committees:
+            candidate_condition = or_(candidate_condition, Contribution.committee_id.in_(all_committees))
+        where = and_(candidate_condition, cycle_window(cycle))
+
+        wants_donors = any('donor_states' in types for types in batch.values())
+        states = await self._candidate_states(candidate_ids) if wants_donors else {}
+
+        amount = Contribution.contribution_amount
+        state = func.coalesce(Contribution.contributor_state, 'Unknown')
+        day = func.date(Contribution.contribution_date)
+        # Donor amount/state only in raw_data: read those rows individually
+        needs_raw = and_(
+            Contribution.raw_data.isnot(None),
+            or_(
+                amount.is_(None), amount <= 0,
+                Contribution.contributor_state.is_(None), Contribution.contributor_state == ''
+            )
+        )
+        needs_raw_flag = case((needs_raw, 1), else_=0)
+        group_columns = (
+            Contribution.candidate_id, Contribution.committee_id, day, Contribution.contributor_employer,
+            Contribution.contributor_name, state, needs_raw_flag
+        )
+        grouped = select(
+            *group_columns,
+            func.sum(amount),
+            func.count(amount),
+            func.sum(case((amount > 0, amount), else_=0.0))
+        ).where(where).group_by(*group_columns)
+
+        aggregator = CandidateBatchAggregator(committee_ids)
+        processor = ChunkedProcessor(chunk_size=config.ANALYSIS_CHUNK_SIZE)
+        async with AsyncSessionLocal() as session:
+            chunks = processor.stream_chunks(session, grouped, as_rows=True)
+            try:
+                async for rows in chunks:
+                    await run_in_thread_pool(aggregator.add_groups, rows)
+            finally:
+                await chunks.aclose()
+
+            if wants_donors:
+                raw_rows = select(
+                    Contribution.candidate_id, Contribution.committee_id, Contribution.contributor_name,
+                    Contribution.contributor_state, amount, Contribution.raw_data
+                ).where(and_(
+                    where, needs_raw,
+                    Contribution.contributor_name.isnot(None), Contribution.contributor_name != ''
+                ))
+                chunks = processor.stream_chunks(session, raw_rows, as_rows=True)
+                try:
+                    async for rows in chunks:
+                        await run_in_thread_pool(aggregator.add_raw_rows, rows)
+                finally:
+                    await chunks.aclose()
+
+        def build_results() -> List[Tuple[str, str, Dict[str, Any]]]:
+            stored = []
+            for candidate_id, types in batch.items():
+                analyses = aggregator.totals[candidate_id].analyses(states.get(candidate_id))
+                stored.extend((t, candidate_id, analyses[t].model_dump()) for t in sorted(types))
+            return stored
+
+        stored = await run_in_thread_pool(build_results)
+        await self._computation_service.store_analyses(cycle, stored)
+        return {candidate_id: set(types) for candidate_id, types in batch.items()}
+
+    async def _update_job(self, job_id: Optional[str], progress_data: Optional[Dict[str, Any]] = None, **fields) -> None:
+        """Record progress on the job row (merging progress_data); never fails the run"""
+        if not job_id:
+            return
+        try:
+            async with AsyncSessionLocal() as session:
+                job = await session.get(AnalysisComputationJob, job_id)
+                if not job:
+                    return
+                for name, value in fields.items():
+                    setattr(job, name, value)
+                if progress_data:
+                    job.progress_data = {**(job.progress_data or {}), **progress_data}
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Could not update analysis job {job_id}: {e}")
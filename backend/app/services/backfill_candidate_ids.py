@@ -9,6 +9,8 @@ the FEC API if committee linkages aren't in the database.
 from app.db.database import AsyncSessionLocal, Contribution, Committee
 from sqlalchemy import select, update
 from app.services.fec_client import FECClient
+from app.services.shared.candidate_committees import link_candidate_committees, mark_linkage_changed
+from app.services.shared.contributor_rollups import apply_committee_rollup_delta
 import logging
 from typing import Optional, Dict
 
@@ -120,7 +122,9 @@ async def backfill_candidate_ids_from_committees(
                                     .where(Committee.committee_id == comm_id)
                                     .values(candidate_ids=candidate_ids)
                                 )
+                                await link_candidate_committees(session, [(cid, comm_id) for cid in candidate_ids])
                                 await session.commit()
+                                mark_linkage_changed()
                                 logger.debug(f"Updated committee {comm_id} with candidate_ids: {candidate_ids} from API")
                     except Exception as e:
                         logger.debug(f"Error fetching committee {comm_id} from API: {e}")
@@ -181,6 +185,8 @@ async def backfill_candidate_ids_from_committees(
             if limit:
                 batch_limit = min(batch_limit, limit - total_updated)
             
+            # Rollups are keyed by candidate_id: move the committee's totals with the update
+            await apply_committee_rollup_delta(session, committee_id, sign=-1)
             result = await session.execute(
                 update(Contribution)
                 .where(
@@ -191,6 +197,8 @@ async def backfill_candidate_ids_from_committees(
                 .execution_options(synchronize_session=False)
             )
             
+            await apply_committee_rollup_delta(session, committee_id, sign=1)
+            
             updated_count = result.rowcount
             total_updated += updated_count
             committees_processed += 1
@@ -0,0 +1,82 @@
+"""
+In-memory committee -> candidate lookup for Schedule A imports
+
+Many Schedule A rows have no CAND_ID but can be attributed through the
+committee that received them. Committee master and candidate-committee
+linkage imports record that relationship in ``Committee.candidate_ids``; this
+module loads it once per import and backfills a whole chunk with a single
+``Series.map`` instead of querying and looping per chunk.
+
+Parsers that change ``Committee.candidate_ids`` call ``mark_linkage_changed``
+(from ``app.services.shared.candidate_committees``) so running imports reload
+the lookup before their next chunk.
+"""
+import logging
+from typing import Dict, Tuple
+
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import Committee
+from app.services.shared.candidate_committees import linkage_generation, mark_linkage_changed  # noqa: F401 (re-exported)
+
+logger = logging.getLogger(__name__)
+
+
+class CommitteeCandidateLookup:
+    """Maps committee_id to its primary (first linked) candidate_id"""
+
+    def __init__(self, mapping: Dict[str, str] = None):
+        self._map: Dict[str, str] = dict(mapping or {})
+        # Lookups built from an explicit mapping never go stale
+        self._generation = linkage_generation() if mapping is not None else None
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+    @property
+    def is_stale(self) -> bool:
+        """True if not loaded yet or linkage data changed since the last load"""
+        return self._generation != linkage_generation()
+
+    async def refresh(self, session: AsyncSession) -> None:
+        """Load the committee -> candidate mapping from the Committee table"""
+        generation = linkage_generation()
+        result = await session.execute(
+            select(Committee.committee_id, Committee.candidate_ids)
+            .where(Committee.candidate_ids.isnot(None))
+        )
+        mapping = {}
+        for committee_id, candidate_ids in result:
+            if committee_id and candidate_ids:
+                mapping[committee_id] = candidate_ids[0]  # Use first candidate
+        self._map = mapping
+        self._generation = generation
+        logger.debug(f"Loaded committee->candidate lookup with {len(mapping)} committees")
+
+    async def ensure_current(self, session: AsyncSession) -> None:
+        """Reload the mapping if it was never loaded or linkage data changed"""
+        if self.is_stale:
+            await self.refresh(session)
+
+    def backfill(self, candidate_ids: pd.Series, committee_ids: pd.Series) -> Tuple[pd.Series, int]:
+        """
+        Fill missing candidate IDs from the committee linkage.
+
+        Args:
+            candidate_ids: Cleaned candidate IDs (None/NaN where missing)
+            committee_ids: Cleaned committee IDs aligned with candidate_ids
+
+        Returns:
+            Tuple of (backfilled candidate IDs, number of rows filled)
+        """
+        missing = candidate_ids.isna() | (candidate_ids == '')
+        if not self._map or not missing.any():
+            return candidate_ids, 0
+        linked = committee_ids[missing].map(self._map).dropna()
+        if linked.empty:
+            return candidate_ids, 0
+        result = candidate_ids.copy()
+        result.loc[linked.index] = linked
+        return result, len(linked)
@@ -0,0 +1,203 @@
+"""
+Set-based smart merge for bulk contribution imports
+
+Re-imports of a cycle file are almost entirely updates. Instead of loading
+every existing Contribution as an ORM object and calling
+``FECClient._smart_merge_contribution`` on it, the rules of that method (for
+``source='bulk'``) are expressed as one
+``INSERT ... ON CONFLICT(contribution_id) DO UPDATE`` statement so the
+database merges each row in place. The statement works on SQLite (3.24+) and
+PostgreSQL.
+
+Merge rules (kept in sync with ``_smart_merge_contribution``):
+- contributor fields, IDs and FEC metadata: new non-empty values win
+- amount: new value wins if > 0, otherwise it only fills a NULL/0 amount
+- date: new value wins; an existing NULL date falls back to one parsed from raw_data
+- amendment_indicator: bulk data only fills an empty value
+- entity_type/memo_text: left unchanged (not mapped by ``normalize_from_bulk``)
+- raw_data: bulk keys overwrite existing keys, other keys are preserved
+- data_source becomes 'both' when the row came from another source
+"""
+import logging
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from sqlalchemy import JSON, DateTime, bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import TextClause
+
+from app.services.shared.contributor_index import index_contributor_names
+from app.services.shared.contributor_rollups import apply_rollup_delta
+from app.services.shared.import_metrics import timed_stage
+
+logger = logging.getLogger(__name__)
+
+# FEC Schedule A columns (pipe-delimited, no headers, 21 fields)
+SCHEDULE_A_COLUMNS = [
+    'CMTE_ID', 'AMNDT_IND', 'RPT_TP', 'IMAGE_NUM', 'TRAN_ID',
+    'ENTITY_TP_CODE', 'ENTITY_TP_DESC', 'NAME',
+    'CITY', 'STATE', 'ZIP_CODE', 'EMPLOYER', 'OCCUPATION', 'TRANSACTION_DT',
+    'TRANSACTION_AMT', 'OTHER_ID', 'CAND_ID', 'TRAN_TP', 'FILE_NUM',
+    'MEMO_CD', 'SUB_ID'
+]
+
+# Contribution columns written by bulk imports, in insert order
+CONTRIBUTION_COLUMNS = [
+    'contribution_id', 'candidate_id', 'committee_id', 'contributor_name',
+    'contributor_city', 'contributor_state', 'contributor_zip',
+    'contributor_employer', 'contributor_occupation', 'contribution_amount',
+    'contribution_date', 'contribution_type', 'amendment_indicator',
+    'report_type', 'transaction_id', 'entity_type', 'other_id',
+    'file_number', 'memo_code', 'memo_text', 'raw_data', 'created_at',
+    'data_source', 'last_updated_from'
+]
+
+# Columns where a new non-empty value replaces the existing one
+_PREFER_NEW_COLUMNS = [
+    'contributor_name', 'contributor_city', 'contributor_state', 'contributor_zip',
+    'contributor_employer', 'contributor_occupation',
+    'candidate_id', 'committee_id', 'transaction_id',
+    'report_type', 'other_id', 'file_number', 'memo_code', 'contribution_type'
+]
+
+SOURCE = 'bulk'
+
+
+def _raw_data_merge_expr(dialect_name: str) -> str:
+    """SQL expression overlaying the new raw_data keys onto the existing object"""
+    if dialect_name == 'postgresql':
+        return (
+            "CASE WHEN json_typeof(contributions.raw_data) = 'object' "
+            "THEN (contributions.raw_data::jsonb || excluded.raw_data::jsonb)::json "
+            "ELSE excluded.raw_data END"
+        )
+    # SQLite: json_patch() would drop keys whose new value is null, so set the
+    # Schedule A keys one by one (null values are kept, like dict.update)
+    base = (
+        "CASE WHEN json_valid(contributions.raw_data) = 0 THEN '{}' "
+        "WHEN json_type(contributions.raw_data) = 'object' THEN contributions.raw_data "
+        "ELSE '{}' END"
+    )
+    assignments = ", ".join(
+        f"'$.{col}', json_extract(excluded.raw_data, '$.{col}')" for col in SCHEDULE_A_COLUMNS
+    )
+    return f"json_set({base}, {assignments})"
+
+
+def build_merge_set_clause(dialect_name: str, fallback_date: str = ":fallback_date") -> str:
+    """
+    Build the DO UPDATE SET clause implementing the bulk smart-merge rules.
+
+    Args:
+        dialect_name: SQLAlchemy dialect name ('sqlite' or 'postgresql')
+        fallback_date: SQL expression used when neither the new nor the existing
+            row has a contribution_date
+
+    Returns:
+        Comma-separated ``column = expression`` assignments
+    """
+    assignments = [
+        f"{col} = COALESCE(NULLIF(excluded.{col}, ''), contributions.{col})"
+        for col in _PREFER_NEW_COLUMNS
+    ]
+    assignments.append(
+        "contribution_amount = CASE "
+        "WHEN excluded.contribution_amount > 0 THEN excluded.contribution_amount "
+        "WHEN (contributions.contribution_amount IS NULL OR contributions.contribution_amount = 0) "
+        "AND excluded.contribution_amount IS NOT NULL THEN excluded.contribution_amount "
+        "ELSE contributions.contribution_amount END"
+    )
+    assignments.append(
+        "contribution_date = COALESCE(excluded.contribution_date, "
+        f"contributions.contribution_date, {fallback_date})"
+    )
+    assignments.append(
+        "amendment_indicator = CASE "
+        "WHEN COALESCE(contributions.amendment_indicator, '') = '' "
+        "AND COALESCE(excluded.amendment_indicator, '') <> '' THEN excluded.amendment_indicator "
+        "ELSE contributions.amendment_indicator END"
+    )
+    assignments.append(f"raw_data = {_raw_data_merge_expr(dialect_name)}")
+    assignments.append(
+        "data_source = CASE "
+        f"WHEN COALESCE(contributions.data_source, '') = '' THEN '{SOURCE}' "
+        f"WHEN contributions.data_source <> '{SOURCE}' THEN 'both' "
+        "ELSE contributions.data_source END"
+    )
+    assignments.append(f"last_updated_from = '{SOURCE}'")
+    return ",\n    ".join(assignments)
+
+
+@lru_cache(maxsize=None)
+def build_upsert_statement(dialect_name: str) -> TextClause:
+    """
+    Build the INSERT ... ON CONFLICT DO UPDATE statement for a dialect.
+
+    Date and JSON parameters are typed so they are stored exactly as the ORM
+    would store them.
+    """
+    columns = ", ".join(CONTRIBUTION_COLUMNS)
+    values = ", ".join(f":{col}" for col in CONTRIBUTION_COLUMNS)
+    sql = (
+        f"INSERT INTO contributions ({columns})\n"
+        f"VALUES ({values})\n"
+        "ON CONFLICT (contribution_id) DO UPDATE SET\n"
+        f"    {build_merge_set_clause(dialect_name)}"
+    )
+    return text(sql).bindparams(
+        bindparam('contribution_date', type_=DateTime),
+        bindparam('created_at', type_=DateTime),
+        bindparam('fallback_date', type_=DateTime),
+        bindparam('raw_data', type_=JSON),
+    )
+
+
+def _fallback_date(record: Dict[str, Any]):
+    """Date extracted from raw_data, used only if the existing row has no date"""
+    if record.get('contribution_date') is not None or not isinstance(record.get('raw_data'), dict):
+        return None
+    from app.utils.date_utils import extract_date_from_raw_data
+    return extract_date_from_raw_data(record['raw_data'])
+
+
+async def upsert_contributions(session: AsyncSession, records: List[Dict[str, Any]]) -> int:
+    """
+    Insert new contributions and smart-merge existing ones in one statement.
+
+    Contributor names are added to the donor search index and the contributor
+    rollups are updated (delta of the merged rows) in the same transaction.
+
+    Args:
+        session: Database session (the caller commits)
+        records: Contribution dicts keyed by contribution column name, with
+            ``raw_data`` holding the Schedule A fields
+
+    Returns:
+        Number of records written (inserted or merged)
+    """
+    if not records:
+        return 0
+
+    dialect_name = session.get_bind().dialect.name
+    statement = build_upsert_statement(dialect_name)
+    now = datetime.utcnow()
+    params = []
+    for record in records:
+        row = {col: record.get(col) for col in CONTRIBUTION_COLUMNS}
+        row['created_at'] = now
+        row['data_source'] = SOURCE
+        row['last_updated_from'] = SOURCE
+        row['fallback_date'] = _fallback_date(record)
+        params.append(row)
+
+    contribution_ids = [row['contribution_id'] for row in params]
+    with timed_stage('rollup_delta'):
+        await apply_rollup_delta(session, contribution_ids, sign=-1)
+    with timed_stage('merge'):
+        await session.execute(statement, params)
+    with timed_stage('rollup_delta'):
+        await apply_rollup_delta(session, contribution_ids, sign=1)
+    with timed_stage('name_index'):
+        await index_contributor_names(session, (row['contributor_name'] for row in params))
+    return len(params)
@@ -1,12 +1,22 @@
 """
 Job management for bulk data imports
+
+Progress updates are published to the in-process progress bus right away and
+written to ``bulk_import_jobs`` at most once per
+``PROGRESS_DB_WRITE_INTERVAL_SECONDS`` per job. Status changes, errors and
+completed cycles are written immediately; in between, the latest values are
+kept in ``_pending_progress`` (reads through JobManager include them) and
+written by a delayed flush.
 """
 import asyncio
 import logging
-from typing import Optional, Set, List
+import time
+from typing import Dict, Optional, Set, List
 from datetime import datetime
 from sqlalchemy import select, and_, desc
+from app.config import config
 from app.db.database import AsyncSessionLocal, BulkImportJob, BulkDataImportStatus
+from app.services.bulk_data.progress_bus import get_progress_bus
 from app.services.bulk_data_config import DataType
 
 logger = logging.getLogger(__name__)
@@ -17,6 +27,69 @@ _cancelled_jobs: Set[str] = set()
 # Global set to track running background tasks for graceful shutdown
 _running_tasks: Set[asyncio.Task] = set()
 
+# Progress fields not written to the database yet, by job ID
+_pending_progress: Dict[str, Dict] = {}
+_last_progress_write: Dict[str, float] = {}
+_flush_tasks: Dict[str, asyncio.Task] = {}
+
+# Fields that are written without throttling
+_IMMEDIATE_FIELDS = ('status', 'error_message', 'completed_cycles')
+
+
+def _apply_pending(job: Optional[BulkImportJob]) -> Optional[BulkImportJob]:
+    """Overlay progress not written yet on a job read from the database"""
+    if job is not None:
+        for field, value in _pending_progress.get(job.id, {}).items():
+            setattr(job, field, value)
+    return job
+
+
+async def _write_progress(job_id: str) -> None:
+    """Write a job's pending progress fields"""
+    fields = _pending_progress.pop(job_id, None)
+    _last_progress_write[job_id] = time.monotonic()
+    if not fields:
+        return
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(BulkImportJob).where(BulkImportJob.id == job_id)
+            )
+            job = result.scalar_one_or_none()
+            if not job:
+                logger.warning(f"Job {job_id} not found for progress update")
+                return
+            for field, value in fields.items():
+                setattr(job, field, value)
+            await session.commit()
+    except Exception:
+        # Keep the values for the next write (newer updates win)
+        _pending_progress[job_id] = {**fields, **_pending_progress.get(job_id, {})}
+        raise
+    if fields.get('status') in ('completed', 'failed', 'cancelled'):
+        _last_progress_write.pop(job_id, None)
+
+
+async def _delayed_flush(job_id: str, delay: float) -> None:
+    try:
+        await asyncio.sleep(delay)
+        _flush_tasks.pop(job_id, None)
+        await _write_progress(job_id)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.warning(f"Error writing progress for job {job_id}: {e}")
+
+
+async def flush_job_progress(job_id: Optional[str] = None) -> None:
+    """Write pending progress now (of one job, or all jobs)"""
+    job_ids = [job_id] if job_id else list(_pending_progress)
+    for pending_id in job_ids:
+        task = _flush_tasks.pop(pending_id, None)
+        if task:
+            task.cancel()
+        await _write_progress(pending_id)
+
 
 class JobManager:
     """Manages bulk import job tracking and status"""
@@ -59,7 +132,7 @@ class JobManager:
             result = await session.execute(
                 select(BulkImportJob).where(BulkImportJob.id == job_id)
             )
-            return result.scalar_one_or_none()
+            return _apply_pending(result.scalar_one_or_none())
     
     async def update_job_progress(
         self,
@@ -73,47 +146,46 @@ class JobManager:
         total_chunks: Optional[int] = None,
         file_position: Optional[int] = None,
         progress_data: Optional[dict] = None,
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        checkpoint_start: Optional[int] = None,
+        checkpoint_hash: Optional[str] = None
     ):
-        """Update job progress"""
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(BulkImportJob).where(BulkImportJob.id == job_id)
-            )
-            job = result.scalar_one_or_none()
-            if not job:
-                logger.warning(f"Job {job_id} not found for progress update")
-                return
-            
-            if status:
-                job.status = status
-            if imported_records is not None:
-                job.imported_records = imported_records
-            if skipped_records is not None:
-                job.skipped_records = skipped_records
-            if current_cycle is not None:
-                job.current_cycle = current_cycle
-            if completed_cycles is not None:
-                job.completed_cycles = completed_cycles
-            if current_chunk is not None:
-                job.current_chunk = current_chunk
-            if total_chunks is not None:
-                job.total_chunks = total_chunks
-            if file_position is not None:
-                job.file_position = file_position
-            if progress_data is not None:
-                job.progress_data = progress_data
-            if error_message is not None:
-                job.error_message = error_message
-            
-            if status in ['completed', 'failed', 'cancelled']:
-                job.completed_at = datetime.utcnow()
-            
-            await session.commit()
+        """Update job progress (published immediately, written to the database throttled)"""
+        fields = {
+            'status': status,
+            'imported_records': imported_records,
+            'skipped_records': skipped_records,
+            'current_cycle': current_cycle,
+            'completed_cycles': completed_cycles,
+            'current_chunk': current_chunk,
+            'total_chunks': total_chunks,
+            'file_position': file_position,
+            'checkpoint_start': checkpoint_start,
+            'checkpoint_hash': checkpoint_hash,
+            'progress_data': progress_data,
+            'error_message': error_message,
+        }
+        fields = {field: value for field, value in fields.items() if value is not None}
+        if status in ['completed', 'failed', 'cancelled']:
+            fields['completed_at'] = datetime.utcnow()
+        if not fields:
+            return
+        
+        get_progress_bus().publish(job_id, **fields)
+        _pending_progress.setdefault(job_id, {}).update(fields)
+        
+        elapsed = time.monotonic() - _last_progress_write.get(job_id, float('-inf'))
+        interval = config.PROGRESS_DB_WRITE_INTERVAL_SECONDS
+        if any(field in fields for field in _IMMEDIATE_FIELDS) or elapsed >= interval:
+            await flush_job_progress(job_id)
+        elif job_id not in _flush_tasks:
+            # Counters stop changing during long phases; write them anyway
+            _flush_tasks[job_id] = asyncio.create_task(_delayed_flush(job_id, interval - elapsed))
     
     async def cancel_job(self, job_id: str) -> bool:
         """Cancel a job"""
         self._cancelled_jobs.add(job_id)
+        await flush_job_progress(job_id)
         async with AsyncSessionLocal() as session:
             result = await session.execute(
                 select(BulkImportJob).where(BulkImportJob.id == job_id)
@@ -123,6 +195,7 @@ class JobManager:
                 job.status = 'cancelled'
                 job.completed_at = datetime.utcnow()
                 await session.commit()
+                get_progress_bus().publish(job_id, status='cancelled', completed_at=job.completed_at)
                 return True
             return False
     
@@ -134,7 +207,7 @@ class JobManager:
                     BulkImportJob.status.in_(['pending', 'running'])
                 ).order_by(desc(BulkImportJob.started_at))
             )
-            return list(result.scalars().all())
+            return [_apply_pending(job) for job in result.scalars().all()]
     
     async def get_recent_jobs(self, limit: int = 10) -> List[BulkImportJob]:
         """Get recent jobs"""
@@ -142,7 +215,7 @@ class JobManager:
             result = await session.execute(
                 select(BulkImportJob).order_by(desc(BulkImportJob.started_at)).limit(limit)
             )
-            return list(result.scalars().all())
+            return [_apply_pending(job) for job in result.scalars().all()]
     
     def is_job_cancelled(self, job_id: str) -> bool:
         """Check if a job is cancelled"""
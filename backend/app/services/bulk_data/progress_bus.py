@@ -0,0 +1,199 @@
+"""
+In-process progress bus for bulk import jobs
+
+WebSocket and SSE clients watching a job subscribe here instead of polling
+``bulk_import_jobs`` (a SQLite file the import itself is writing).
+``JobManager.update_job_progress`` publishes every update; the bus merges it
+into the job's latest snapshot and broadcasts it to all subscribers:
+
+- updates are coalesced to at most one broadcast per
+  ``PROGRESS_BROADCAST_INTERVAL_SECONDS`` per job; status changes and errors
+  go out immediately
+- a subscription holds only the newest message, so a slow client skips to
+  the latest state instead of building a backlog
+- the snapshot of a finished job is dropped after its final broadcast; late
+  subscribers seed from the database
+- a job imported by another worker process never publishes here
+  (``has_publisher``); its subscribers fall back to reading the database
+"""
+import asyncio
+import logging
+from typing import Dict, Optional, Set
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ('completed', 'failed', 'cancelled')
+
+# BulkImportJob columns included in progress messages
+JOB_FIELDS = (
+    'status', 'cycle', 'current_cycle', 'total_cycles', 'completed_cycles',
+    'imported_records', 'skipped_records', 'current_chunk', 'total_chunks',
+    'progress_data', 'error_message',
+)
+
+
+def job_snapshot(job) -> Dict:
+    """Progress fields of a BulkImportJob"""
+    return {field: getattr(job, field, None) for field in JOB_FIELDS}
+
+
+def progress_message(job_id: str, data: Dict) -> Dict:
+    """WebSocket/SSE message for a job snapshot"""
+    current_chunk = data.get('current_chunk') or 0
+    total_chunks = data.get('total_chunks') or 0
+    completed_cycles = data.get('completed_cycles') or 0
+    total_cycles = data.get('total_cycles') or 0
+    overall_progress = 0.0
+    if total_chunks > 0:
+        overall_progress = (current_chunk / total_chunks) * 100
+    elif total_cycles > 0:
+        overall_progress = (completed_cycles / total_cycles) * 100
+
+    status = data.get('status')
+    return {
+        "type": "progress" if status == "running" else status,
+        "job_id": job_id,
+        "data": {
+            **{field: data.get(field) for field in JOB_FIELDS},
+            "progress_data": data.get('progress_data') or {},
+            "overall_progress": overall_progress,
+        }
+    }
+
+
+class ProgressSubscription:
+    """Latest progress message of one job for one client"""
+
+    def __init__(self, bus: 'JobProgressBus', job_id: str):
+        self._bus = bus
+        self.job_id = job_id
+        self.message: Optional[Dict] = None
+        self._event = asyncio.Event()
+
+    def deliver(self, message: Dict) -> None:
+        """Replace the pending message (called by the bus)"""
+        self.message = message
+        self._event.set()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """
+        Wait for the next message.
+
+        Returns:
+            The newest message, or None if nothing arrived within timeout
+        """
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._event.clear()
+        return self.message
+
+    def close(self) -> None:
+        self._bus.unsubscribe(self)
+
+    def __enter__(self) -> 'ProgressSubscription':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class JobProgressBus:
+    """Broadcasts coalesced job progress to in-process subscribers"""
+
+    def __init__(self):
+        self._snapshots: Dict[str, Dict] = {}
+        self._subscribers: Dict[str, Set[ProgressSubscription]] = {}
+        self._scheduled: Dict[str, asyncio.TimerHandle] = {}
+        # Unfinished jobs that published progress in this process
+        self._publishing: Set[str] = set()
+
+    def has_publisher(self, job_id: str) -> bool:
+        """Whether the job is running in this process (it published and has not finished)"""
+        return job_id in self._publishing
+
+    def snapshot(self, job_id: str) -> Optional[Dict]:
+        """Latest known progress fields of a job (None if nothing was published)"""
+        snapshot = self._snapshots.get(job_id)
+        return dict(snapshot) if snapshot is not None else None
+
+    def seed(self, job_id: str, data: Dict) -> Dict:
+        """
+        Fill fields not published yet (e.g. from the database row) so
+        broadcasts carry the whole job state.
+
+        Published values are newer than database rows, so they are kept.
+        Finished jobs are not seeded.
+        """
+        if data.get('status') in TERMINAL_STATUSES:
+            return {**data, **self._snapshots.get(job_id, {})}
+        snapshot = self._snapshots.setdefault(job_id, {})
+        for field, value in data.items():
+            snapshot.setdefault(field, value)
+        return dict(snapshot)
+
+    def publish(self, job_id: str, **fields) -> None:
+        """Merge a progress update into the job snapshot and schedule a broadcast"""
+        self._snapshots.setdefault(job_id, {}).update(fields)
+        if fields.get('status') in TERMINAL_STATUSES:
+            self._publishing.discard(job_id)
+        else:
+            self._publishing.add(job_id)
+        if not self._subscribers.get(job_id):
+            if fields.get('status') in TERMINAL_STATUSES:
+                self._snapshots.pop(job_id, None)
+            return
+        if fields.get('status') or fields.get('error_message'):
+            self._broadcast(job_id)
+        elif job_id not in self._scheduled:
+            loop = asyncio.get_running_loop()
+            self._scheduled[job_id] = loop.call_later(
+                config.PROGRESS_BROADCAST_INTERVAL_SECONDS, self._broadcast, job_id
+            )
+
+    def subscribe(self, job_id: str) -> ProgressSubscription:
+        """Subscribe to a job's progress (use as a context manager or call close())"""
+        subscription = ProgressSubscription(self, job_id)
+        self._subscribers.setdefault(job_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: ProgressSubscription) -> None:
+        subscribers = self._subscribers.get(subscription.job_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.job_id]
+            handle = self._scheduled.pop(subscription.job_id, None)
+            if handle:
+                handle.cancel()
+
+    def subscriber_count(self, job_id: str) -> int:
+        return len(self._subscribers.get(job_id, ()))
+
+    def _broadcast(self, job_id: str) -> None:
+        handle = self._scheduled.pop(job_id, None)
+        if handle:
+            handle.cancel()
+        snapshot = self._snapshots.get(job_id)
+        if snapshot is None:
+            return
+        message = progress_message(job_id, snapshot)
+        for subscription in list(self._subscribers.get(job_id, ())):
+            subscription.deliver(message)
+        if snapshot.get('status') in TERMINAL_STATUSES:
+            self._snapshots.pop(job_id, None)
+
+
+_progress_bus: Optional[JobProgressBus] = None
+
+
+def get_progress_bus() -> JobProgressBus:
+    """Process-wide progress bus"""
+    global _progress_bus
+    if _progress_bus is None:
+        _progress_bus = JobProgressBus()
+    return _progress_bus
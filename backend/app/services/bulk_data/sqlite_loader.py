@@ -0,0 +1,378 @@
+"""
+Native SQLite bulk-load fast path for Schedule A imports
+
+The regular import path builds pandas DataFrames and per-row dicts for every
+chunk and sends them through aiosqlite. For an empty (or partitioned)
+contributions table that work is unnecessary: the pipe-delimited file can be
+streamed into a staging table with ``executemany`` on a raw sqlite3
+connection and moved into ``contributions`` with a single set-based
+``INSERT ... SELECT ... ON CONFLICT(contribution_id) DO UPDATE`` per merge
+window, using the smart-merge rules from ``contribution_merge``.
+
+Contributor names of each window are added to the donor search index
+(``contributor_names``) and the window's contributions are applied to
+``contributor_rollups`` when those tables exist.
+
+While loading, the loader:
+- drops the non-unique secondary indexes on ``contributions`` and rebuilds them afterwards
+- relaxes ``synchronous``/``journal_mode`` and restores the original values afterwards
+
+All methods are synchronous and are meant to run in a worker thread
+(see ``app.utils.thread_pool.run_in_thread_pool``).
+"""
+import logging
+import os
+import sqlite3
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from app.services.shared.contributor_index import FTS_TABLE, NAMES_TABLE
+from app.services.shared.contributor_rollups import ROLLUPS_TABLE, build_delta_sql
+
+from .contribution_merge import CONTRIBUTION_COLUMNS, SCHEDULE_A_COLUMNS, build_merge_set_clause
+
+logger = logging.getLogger(__name__)
+
+STAGING_TABLE = "contributions_bulk_stage"
+
+# Strings pandas.read_csv treats as missing by default. The pandas import path
+# turns these into None, so the SQL cleaning below does the same.
+_NA_STRINGS = (
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a',
+    'nan', 'null'
+)
+_NA_SQL_LIST = ", ".join("'" + s.replace("'", "''") + "'" for s in _NA_STRINGS)
+
+
+def _clean(column: str) -> str:
+    """SQL expression: strip a staged text column and map missing markers to NULL"""
+    return f"(CASE WHEN TRIM(s.{column}) IN ({_NA_SQL_LIST}) THEN NULL ELSE TRIM(s.{column}) END)"
+
+
+def _raw(column: str) -> str:
+    """SQL expression: raw staged value with missing markers mapped to NULL"""
+    return f"(CASE WHEN s.{column} IN ({_NA_SQL_LIST}) THEN NULL ELSE s.{column} END)"
+
+
+def _date_expr(column: str) -> str:
+    """
+    SQL expression parsing an 8-digit MMDDYYYY (falling back to YYYYMMDD) date
+    into SQLAlchemy's SQLite DateTime storage format.
+    """
+    value = f"TRIM(s.{column})"
+    mdy = f"(substr({value}, 5, 4) || '-' || substr({value}, 1, 2) || '-' || substr({value}, 3, 2))"
+    ymd = f"(substr({value}, 1, 4) || '-' || substr({value}, 5, 2) || '-' || substr({value}, 7, 2))"
+    is_8_digits = f"(length({value}) = 8 AND {value} NOT GLOB '*[^0-9]*')"
+    return (
+        f"(CASE WHEN NOT {is_8_digits} THEN NULL "
+        f"WHEN date({mdy}) = {mdy} THEN {mdy} || ' 00:00:00.000000' "
+        f"WHEN date({ymd}) = {ymd} THEN {ymd} || ' 00:00:00.000000' "
+        f"ELSE NULL END)"
+    )
+
+
+def _select_from_staging() -> str:
+    """SELECT that transforms staged raw rows into contribution rows"""
+    entity_type = (
+        "NULLIF(TRIM(COALESCE(" + _clean('ENTITY_TP_CODE') + ", '') || "
+        "COALESCE(" + _clean('ENTITY_TP_DESC') + ", '')), '')"
+    )
+    amount = (
+        "COALESCE(CAST(NULLIF(REPLACE(REPLACE(" + _clean('TRANSACTION_AMT') +
+        ", '$', ''), ',', ''), '') AS REAL), 0.0)"
+    )
+    # Backfill candidate_id from the committee linkage (first linked candidate)
+    candidate_id = (
+        "COALESCE(" + _clean('CAND_ID') + ", "
+        "(SELECT json_extract(c.candidate_ids, '$[0]') FROM committees c "
+        "WHERE c.committee_id = " + _clean('CMTE_ID') + " "
+        "AND json_valid(c.candidate_ids) AND json_array_length(c.candidate_ids) > 0))"
+    )
+    raw_data = "json_object(" + ", ".join(
+        f"'{col}', {_raw(col)}" for col in SCHEDULE_A_COLUMNS
+    ) + ")"
+    expressions = [
+        "TRIM(s.SUB_ID)",
+        candidate_id,
+        _clean('CMTE_ID'),
+        _clean('NAME'),
+        _clean('CITY'),
+        _clean('STATE'),
+        _clean('ZIP_CODE'),
+        _clean('EMPLOYER'),
+        _clean('OCCUPATION'),
+        amount,
+        _date_expr('TRANSACTION_DT'),
+        _clean('TRAN_TP'),
+        _clean('AMNDT_IND'),
+        _clean('RPT_TP'),
+        _clean('TRAN_ID'),
+        entity_type,
+        _clean('OTHER_ID'),
+        _clean('FILE_NUM'),
+        _clean('MEMO_CD'),
+        "NULL",
+        raw_data,
+        "strftime('%Y-%m-%d %H:%M:%f000', 'now')",
+        "'bulk'",
+        "'bulk'",
+    ]
+    return (
+        "SELECT " + ",\n       ".join(expressions) + "\n"
+        f"FROM {STAGING_TABLE} s\n"
+        f"WHERE s.SUB_ID IS NOT NULL AND TRIM(s.SUB_ID) NOT IN ({_NA_SQL_LIST})"
+    )
+
+
+def build_merge_sql() -> str:
+    """
+    Set-based merge of the staging table into contributions.
+
+    Conflicting rows (including repeated SUB_IDs within the file) go through
+    the same smart-merge rules as the regular import path. Dates are already
+    parsed in SQL, so there is no raw_data date fallback here.
+    """
+    return (
+        f"INSERT INTO contributions ({', '.join(CONTRIBUTION_COLUMNS)})\n"
+        f"{_select_from_staging()}\n"
+        "ON CONFLICT(contribution_id) DO UPDATE SET\n"
+        f"    {build_merge_set_clause('sqlite', fallback_date='NULL')}"
+    )
+
+
+def build_index_names_sql() -> str:
+    """Add the staged contributor names to the donor search index"""
+    name = _clean('NAME')
+    return (
+        f"INSERT OR IGNORE INTO {NAMES_TABLE} (name)\n"
+        f"SELECT DISTINCT {name} FROM {STAGING_TABLE} s\n"
+        f"WHERE {name} IS NOT NULL AND s.SUB_ID IS NOT NULL AND TRIM(s.SUB_ID) NOT IN ({_NA_SQL_LIST})"
+    )
+
+
+def build_rollup_delta_sql(sign: int) -> str:
+    """Add (1) or subtract (-1) the rollup aggregates of the staged contributions"""
+    staged_ids = (
+        f"SELECT TRIM(s.SUB_ID) FROM {STAGING_TABLE} s "
+        f"WHERE s.SUB_ID IS NOT NULL AND TRIM(s.SUB_ID) NOT IN ({_NA_SQL_LIST})"
+    )
+    return build_delta_sql('sqlite', sign, f"contribution_id IN ({staged_ids})")
+
+
+@dataclass
+class BulkLoadResult:
+    """Outcome of a fast-path load"""
+    rows_read: int = 0
+    rows_inserted: int = 0
+    rows_merged: int = 0
+    rows_skipped: int = 0
+    windows: int = 0
+    cancelled: bool = False
+
+
+def resolve_sqlite_path(database_url) -> Optional[str]:
+    """
+    Resolve the on-disk SQLite file for a database URL (string or URL object).
+
+    Returns None for non-SQLite URLs and in-memory databases, which cannot be
+    opened from a second connection.
+    """
+    from sqlalchemy.engine import make_url
+
+    url = make_url(database_url)
+    if not url.drivername.startswith("sqlite"):
+        return None
+    if not url.database or url.database == ":memory:":
+        return None
+    return os.path.abspath(url.database)
+
+
+class SQLiteBulkLoader:
+    """Streams Schedule A files into SQLite through a staging table"""
+
+    def __init__(self, db_path: str, batch_size: int = 50000, merge_window_rows: int = 1000000):
+        """
+        Initialize loader
+
+        Args:
+            db_path: Path to the SQLite database file
+            batch_size: Rows per executemany call into the staging table
+            merge_window_rows: Rows staged before each INSERT ... SELECT merge
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.merge_window_rows = max(merge_window_rows, batch_size)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a raw connection in autocommit mode so transactions are explicit"""
+        conn = sqlite3.connect(self.db_path, timeout=60.0, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout=60000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-262144")  # 256MB page cache for the load window
+        return conn
+
+    @staticmethod
+    def _iter_rows(file_path: str) -> Iterator[Tuple[Optional[str], ...]]:
+        """Yield 21-field tuples from a pipe-delimited file, skipping malformed lines"""
+        width = len(SCHEDULE_A_COLUMNS)
+        with open(file_path, "r", encoding="utf-8", errors="replace", newline="") as f:
+            for line in f:
+                fields = line.rstrip("\r\n").split("|")
+                if len(fields) == width:
+                    yield tuple(fields)
+                elif 0 < len(fields) < width and fields != [""]:
+                    yield tuple(fields) + (None,) * (width - len(fields))
+                # Lines with too many fields are skipped (on_bad_lines='skip')
+
+    @staticmethod
+    def _secondary_indexes(conn: sqlite3.Connection) -> List[Tuple[str, str]]:
+        """Return (name, sql) for droppable secondary indexes on contributions"""
+        rows = conn.execute(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = 'contributions' AND sql IS NOT NULL"
+        ).fetchall()
+        # Unique indexes back ON CONFLICT(contribution_id) and must stay in place
+        return [(name, sql) for name, sql in rows if "UNIQUE" not in sql.upper()]
+
+    @staticmethod
+    def _set_load_pragmas(conn: sqlite3.Connection) -> Tuple[int, str]:
+        """Relax durability for the load window, returning the original settings"""
+        original_sync = conn.execute("PRAGMA synchronous").fetchone()[0]
+        original_journal = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        conn.execute("PRAGMA synchronous=OFF")
+        try:
+            mode = conn.execute("PRAGMA journal_mode=MEMORY").fetchone()[0]
+            if mode.lower() != "memory":
+                logger.debug(f"journal_mode stayed '{mode}' during bulk load (database in use)")
+        except sqlite3.OperationalError as e:
+            logger.debug(f"Could not switch journal_mode for bulk load: {e}")
+        return original_sync, original_journal
+
+    @staticmethod
+    def _restore_pragmas(conn: sqlite3.Connection, original_sync: int, original_journal: str):
+        """Restore the settings captured by _set_load_pragmas"""
+        try:
+            conn.execute(f"PRAGMA journal_mode={original_journal}")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Could not restore journal_mode={original_journal}: {e}")
+        conn.execute(f"PRAGMA synchronous={int(original_sync)}")
+
+    @staticmethod
+    def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+        """Check whether a table exists in the main database"""
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone() is not None
+
+    @staticmethod
+    def _max_rowid(conn: sqlite3.Connection) -> int:
+        """Highest rowid in contributions (0 when empty)"""
+        return conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM contributions").fetchone()[0]
+
+    def table_is_empty(self) -> bool:
+        """Check whether contributions has no rows"""
+        conn = sqlite3.connect(self.db_path, timeout=60.0)
+        try:
+            return conn.execute("SELECT 1 FROM contributions LIMIT 1").fetchone() is None
+        finally:
+            conn.close()
+
+    def load_contributions(
+        self,
+        file_path: str,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        on_progress: Optional[Callable[[BulkLoadResult], None]] = None
+    ) -> BulkLoadResult:
+        """
+        Load a Schedule A file into contributions.
+
+        Args:
+            file_path: Path to the pipe-delimited itcont file
+            should_cancel: Optional callable checked between batches
+            on_progress: Optional callable invoked after each merge window
+
+        Returns:
+            BulkLoadResult with row counts
+        """
+        result = BulkLoadResult()
+        column_defs = ", ".join(f"{col} TEXT" for col in SCHEDULE_A_COLUMNS)
+        placeholders = ", ".join("?" for _ in SCHEDULE_A_COLUMNS)
+        stage_insert = f"INSERT INTO {STAGING_TABLE} VALUES ({placeholders})"
+        merge_sql = build_merge_sql()
+        index_names_sql = build_index_names_sql()
+        subtract_rollups_sql = build_rollup_delta_sql(-1)
+        add_rollups_sql = build_rollup_delta_sql(1)
+
+        conn = self._connect()
+        dropped_indexes: List[Tuple[str, str]] = []
+        original_sync, original_journal = self._set_load_pragmas(conn)
+        try:
+            conn.execute(f"DROP TABLE IF EXISTS temp.{STAGING_TABLE}")
+            conn.execute(f"CREATE TEMP TABLE {STAGING_TABLE} ({column_defs})")
+            index_names = self._has_table(conn, FTS_TABLE)
+            update_rollups = self._has_table(conn, ROLLUPS_TABLE)
+
+            dropped_indexes = self._secondary_indexes(conn)
+            for name, _ in dropped_indexes:
+                conn.execute(f'DROP INDEX IF EXISTS "{name}"')
+            if dropped_indexes:
+                logger.info(f"Dropped {len(dropped_indexes)} secondary indexes for bulk load")
+
+            rows = self._iter_rows(file_path)
+            staged = 0
+            while True:
+                if should_cancel and should_cancel():
+                    result.cancelled = True
+                    break
+
+                batch = list(islice(rows, self.batch_size))
+                if batch:
+                    conn.executemany(stage_insert, batch)
+                    staged += len(batch)
+                    result.rows_read += len(batch)
+
+                if staged and (staged >= self.merge_window_rows or not batch):
+                    conn.execute("BEGIN IMMEDIATE")
+                    try:
+                        # New rows get rowids above the current maximum, so the
+                        # rowid delta separates inserts from merged updates
+                        max_rowid = self._max_rowid(conn)
+                        if update_rollups:
+                            conn.execute(subtract_rollups_sql)
+                        before = conn.total_changes
+                        conn.execute(merge_sql)
+                        written = conn.total_changes - before
+                        inserted = self._max_rowid(conn) - max_rowid
+                        if update_rollups:
+                            conn.execute(add_rollups_sql)
+                        if index_names:
+                            conn.execute(index_names_sql)
+                        conn.execute(f"DELETE FROM {STAGING_TABLE}")
+                        conn.execute("COMMIT")
+                    except Exception:
+                        conn.execute("ROLLBACK")
+                        raise
+                    result.rows_inserted += inserted
+                    result.rows_merged += written - inserted
+                    result.rows_skipped += staged - written
+                    result.windows += 1
+                    staged = 0
+                    if on_progress:
+                        on_progress(result)
+
+                if not batch:
+                    break
+
+            return result
+        finally:
+            try:
+                conn.execute(f"DROP TABLE IF EXISTS temp.{STAGING_TABLE}")
+                for name, sql in dropped_indexes:
+                    conn.execute(sql.replace("CREATE INDEX", "CREATE INDEX IF NOT EXISTS", 1))
+                if dropped_indexes:
+                    logger.info(f"Rebuilt {len(dropped_indexes)} secondary indexes after bulk load")
+            finally:
+                self._restore_pragmas(conn, original_sync, original_journal)
+                conn.close()
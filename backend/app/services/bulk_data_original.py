@@ -46,12 +46,24 @@ from app.services.bulk_data_config import (
     get_high_priority_types,
 )
 from app.services.bulk_data_parsers import GenericBulkDataParser
+from app.services.shared.contributor_rollups import clear_contributor_rollups
+from app.services.shared.import_metrics import current_metrics, timed_chunks, timed_stage, track_import
+from app.services.bulk_data_transforms import (
+    SCHEDULE_A_RECORD_COLUMNS,
+    normalize_schedule_a_chunk,
+    parse_fec_dates,
+)
+from app.utils.process_pool import async_read_bulk_csv, read_chunk_digest
 
 # Import refactored modules
 # Use relative imports to avoid circular dependency
+from .bulk_data.committee_lookup import CommitteeCandidateLookup
+from .bulk_data.progress_bus import get_progress_bus
+from .bulk_data.contribution_merge import upsert_contributions
 from .bulk_data.cycle_manager import CycleManager
 from .bulk_data.downloader import BulkDataDownloader
 from .bulk_data.job_manager import JobManager, _cancelled_jobs, _running_tasks
+from .bulk_data.sqlite_loader import SCHEDULE_A_COLUMNS, SQLiteBulkLoader, resolve_sqlite_path
 from .bulk_data.storage import BulkDataStorage
 
 logger = logging.getLogger(__name__)
@@ -545,41 +557,7 @@ class BulkDataService:
     
     def _parse_date_vectorized(self, date_series: pd.Series) -> pd.Series:
         """Parse dates vectorized - handles MMDDYYYY and YYYYMMDD formats"""
-        result = pd.Series([None] * len(date_series), dtype='object')
-        
-        # Convert to string and strip
-        date_strs = date_series.astype(str).str.strip()
-        
-        # Filter out obviously non-date values (common data quality issues)
-        # Skip values that contain letters (except for valid date formats)
-        # Skip common non-date strings
-        non_date_patterns = ['NOT EMPLOYED', 'N/A', 'NA', 'NULL', 'NONE', 'UNKNOWN', 'RETIRED', 'SELF']
-        is_not_date = date_strs.str.upper().isin([p.upper() for p in non_date_patterns])
-        
-        # Filter valid 8-digit dates (must be exactly 8 digits, all numeric)
-        valid_mask = (date_strs.str.len() == 8) & date_strs.str.isdigit() & ~is_not_date
-        
-        if valid_mask.any():
-            valid_dates = date_strs[valid_mask]
-            
-            # Try MMDDYYYY format first
-            try:
-                parsed_mmddyyyy = pd.to_datetime(valid_dates, format='%m%d%Y', errors='coerce')
-                result[valid_mask] = parsed_mmddyyyy
-            except Exception as e:
-                logger.debug(f"Date parsing failed for MMDDYYYY format, trying next: {e}")
-            
-            # For any that failed, try YYYYMMDD
-            failed_mask = valid_mask & result.isna()
-            if failed_mask.any():
-                try:
-                    failed_dates = date_strs[failed_mask]
-                    parsed_yyyymmdd = pd.to_datetime(failed_dates, format='%Y%m%d', errors='coerce')
-                    result[failed_mask] = parsed_yyyymmdd
-                except Exception as e:
-                    logger.debug(f"Date parsing failed for YYYYMMDD format: {e}")
-        
-        return result
+        return parse_fec_dates(date_series)
 
     async def parse_and_store_csv(
         self,
@@ -587,7 +565,26 @@ class BulkDataService:
         cycle: int,
         job_id: Optional[str] = None,
         batch_size: int = 50000,
-        resume: bool = False
+        resume: bool = False,
+        bulk_load: Optional[bool] = None
+    ) -> int:
+        """
+        Parse and store Schedule A (individual contributions) CSV file.
+        
+        Throughput and stage timing are tracked for the job (see
+        shared.import_metrics); the import itself is _parse_and_store_csv.
+        """
+        async with track_import(job_id, DataType.INDIVIDUAL_CONTRIBUTIONS.value, cycle, file_path):
+            return await self._parse_and_store_csv(file_path, cycle, job_id, batch_size, resume, bulk_load)
+    
+    async def _parse_and_store_csv(
+        self,
+        file_path: str,
+        cycle: int,
+        job_id: Optional[str] = None,
+        batch_size: int = 50000,
+        resume: bool = False,
+        bulk_load: Optional[bool] = None
     ) -> int:
         """
         Parse and store Schedule A (individual contributions) CSV file.
@@ -601,6 +598,8 @@ class BulkDataService:
         - Supports resuming from a previous position
         
         Uses optimized bulk inserts with vectorized operations for performance.
+        On SQLite, imports into an empty contributions table use the native
+        bulk-load fast path (see bulk_data.sqlite_loader) instead.
         
         Args:
             file_path: Path to CSV file
@@ -608,6 +607,9 @@ class BulkDataService:
             job_id: Optional job ID for progress tracking
             batch_size: Number of records per chunk
             resume: If True, resume from last checkpoint (for job_id)
+            bulk_load: Force (True) or disable (False) the SQLite fast path.
+                None uses it automatically when the contributions table is empty.
+                Pass True for partitioned loads whose rows do not overlap existing data.
         """
         logger.info(f"Parsing CSV file: {file_path} (resume={resume})")
         
@@ -617,18 +619,12 @@ class BulkDataService:
         # Field 6: ENTITY_TP code (e.g., "15")
         # Field 7: ENTITY_TP description (e.g., "IND" for Individual)
         # Field 21: SUB_ID (contribution ID) - this is the last field
-        # Updated to match actual file structure (21 fields)
-        fec_columns = [
-            'CMTE_ID', 'AMNDT_IND', 'RPT_TP', 'IMAGE_NUM', 'TRAN_ID', 
-            'ENTITY_TP_CODE', 'ENTITY_TP_DESC', 'NAME',
-            'CITY', 'STATE', 'ZIP_CODE', 'EMPLOYER', 'OCCUPATION', 'TRANSACTION_DT',
-            'TRANSACTION_AMT', 'OTHER_ID', 'CAND_ID', 'TRAN_TP', 'FILE_NUM',
-            'MEMO_CD', 'SUB_ID'  # Note: MEMO_TEXT was removed - file only has 21 fields, SUB_ID is last
-        ]
+        # Note: MEMO_TEXT was removed - file only has 21 fields, SUB_ID is last
+        fec_columns = SCHEDULE_A_COLUMNS
         
         try:
             # Check for resume checkpoint
-            rows_to_skip = 0
+            start_offset = 0
             initial_records = 0
             if resume and job_id:
                 async with AsyncSessionLocal() as session:
@@ -637,10 +633,22 @@ class BulkDataService:
                     )
                     job = result.scalar_one_or_none()
                     if job and job.file_position > 0:
-                        # file_position stores rows processed (not bytes for CSV)
-                        rows_to_skip = job.file_position
-                        initial_records = job.imported_records or 0
-                        logger.info(f"Resuming import from row {rows_to_skip} ({initial_records} records already imported)")
+                        if await self._checkpoint_matches_file(job, file_path):
+                            # file_position is the byte offset after the last committed chunk
+                            start_offset = job.file_position
+                            initial_records = job.imported_records or 0
+                            logger.info(f"Resuming import at byte {start_offset} ({initial_records} records already imported)")
+                        else:
+                            # Re-imported rows are merged, not duplicated, so restarting is safe
+                            logger.warning(
+                                f"Checkpoint for job {job_id} does not match {file_path}; "
+                                f"restarting import from the beginning"
+                            )
+            
+            if start_offset == 0:
+                bulk_load_path = await self._get_bulk_load_path(bulk_load)
+                if bulk_load_path:
+                    return await self._bulk_load_csv(file_path, cycle, bulk_load_path, job_id, batch_size)
             
             chunk_count = 0
             total_records = initial_records
@@ -662,26 +670,29 @@ class BulkDataService:
                 )
             
             async with AsyncSessionLocal() as session:
-                # Read CSV in chunks - optimized for memory
-                # Use skiprows to resume from checkpoint (use callable for efficiency)
-                skiprows_func = None
-                if rows_to_skip > 0:
-                    # Create a callable that returns True for rows to skip
-                    skiprows_func = lambda x: x < rows_to_skip
+                # Committee -> candidate mapping, loaded once and reloaded only if linkage data changes
+                committee_lookup = CommitteeCandidateLookup()
+                await committee_lookup.refresh(session)
                 
-                from app.utils.thread_pool import async_read_csv
-                chunk_reader = await async_read_csv(
+                # Read CSV in chunks - optimized for memory
+                # Parsing and normalization run in worker processes for large files
+                # (see app.utils.process_pool); this loop is the single DB writer.
+                # Each chunk carries its byte range, so resume seeks to the checkpoint.
+                chunk_reader = await async_read_bulk_csv(
                     file_path,
+                    chunksize=batch_size,
+                    transform=normalize_schedule_a_chunk,
+                    start_offset=start_offset,
+                    with_checkpoints=True,
                     sep='|',
                     header=None,
                     names=fec_columns,
-                    chunksize=batch_size,
                     dtype=str,
                     low_memory=False,
-                    on_bad_lines='skip',
-                    skiprows=skiprows_func
+                    on_bad_lines='skip'
                 )
-                async for chunk in chunk_reader:
+                async for parsed in timed_chunks(chunk_reader):
+                    chunk = parsed.frame
                     # Check for cancellation before processing each chunk
                     if job_id and job_id in _cancelled_jobs:
                         logger.info(f"Import cancelled for job {job_id} during chunk processing")
@@ -690,109 +701,27 @@ class BulkDataService:
                     
                     chunk_count += 1
                     
-                    # Vectorized processing with pandas - MUCH faster than iterrows()
-                    # Filter out rows without SUB_ID
-                    chunk = chunk[chunk['SUB_ID'].notna() & (chunk['SUB_ID'].astype(str).str.strip() != '')]
+                    # Rows without SUB_ID were dropped by normalize_schedule_a_chunk
                     if len(chunk) == 0:
                         del chunk
                         gc.collect()
                         continue
                     
-                    # Vectorized field transformations
-                    chunk['contribution_id'] = chunk['SUB_ID'].astype(str).str.strip()
-                    
-                    # Handle nullable string fields - convert to string, strip, then replace empty with None
-                    def clean_str_field(series):
-                        """Convert series to string, strip, and replace empty strings with None"""
-                        result = series.astype(str).str.strip()
-                        result = result.replace('', None).replace('nan', None)
-                        return result
-                    
-                    chunk['candidate_id'] = clean_str_field(chunk['CAND_ID'])
-                    chunk['committee_id'] = clean_str_field(chunk['CMTE_ID'])
-                    
-                    # Backfill candidate_id from Committee table for rows where it's missing
+                    # Backfill candidate_id from the committee linkage for rows where it's missing
                     # Many contributions in bulk data don't have CAND_ID but are linked via committee_id
-                    missing_candidate_mask = chunk['candidate_id'].isna() | (chunk['candidate_id'].astype(str) == '')
-                    if missing_candidate_mask.any():
-                        # Get unique committee_ids that need lookup
-                        committees_to_lookup = chunk.loc[missing_candidate_mask, 'committee_id'].dropna().unique().tolist()
-                        
-                        if committees_to_lookup:
-                            # Query Committee table for candidate_ids
-                            # Note: select is already imported at module level
-                            from app.db.database import Committee
-                            
-                            # Use the same session to avoid nested async context issues
-                            result = await session.execute(
-                                select(Committee.committee_id, Committee.candidate_ids)
-                                .where(Committee.committee_id.in_(committees_to_lookup))
-                            )
-                            # Create mapping: committee_id -> candidate_id (use first candidate if multiple)
-                            committee_map = {}
-                            for row in result:
-                                if row.candidate_ids and len(row.candidate_ids) > 0:
-                                    committee_map[row.committee_id] = row.candidate_ids[0]  # Use first candidate
-                            
-                            # Backfill candidate_id using the mapping
-                            if committee_map:
-                                # Update only rows that need backfilling
-                                for idx in chunk.index:
-                                    if missing_candidate_mask.loc[idx]:
-                                        comm_id = chunk.loc[idx, 'committee_id']
-                                        if pd.notna(comm_id) and comm_id in committee_map:
-                                            chunk.loc[idx, 'candidate_id'] = committee_map[comm_id]
-                                
-                                backfilled_count = chunk.loc[missing_candidate_mask, 'candidate_id'].notna().sum()
-                                if backfilled_count > 0:
-                                    logger.debug(f"Backfilled candidate_id for {int(backfilled_count)} contributions using committee linkages")
-                    chunk['contributor_name'] = clean_str_field(chunk['NAME'])
-                    chunk['contributor_city'] = clean_str_field(chunk['CITY'])
-                    chunk['contributor_state'] = clean_str_field(chunk['STATE'])
-                    chunk['contributor_zip'] = clean_str_field(chunk['ZIP_CODE'])
-                    chunk['contributor_employer'] = clean_str_field(chunk['EMPLOYER'])
-                    chunk['contributor_occupation'] = clean_str_field(chunk['OCCUPATION'])
-                    chunk['contribution_type'] = clean_str_field(chunk['TRAN_TP'])
-                    
-                    # Extract additional FEC fields
-                    chunk['amendment_indicator'] = clean_str_field(chunk.get('AMNDT_IND', pd.Series([''] * len(chunk))))
-                    chunk['report_type'] = clean_str_field(chunk.get('RPT_TP', pd.Series([''] * len(chunk))))
-                    chunk['transaction_id'] = clean_str_field(chunk.get('TRAN_ID', pd.Series([''] * len(chunk))))
-                    # Combine ENTITY_TP_CODE and ENTITY_TP_DESC for entity_type
-                    # Use CODE if available, otherwise use DESC, or combine both
-                    entity_tp_code = chunk.get('ENTITY_TP_CODE', pd.Series([''] * len(chunk)))
-                    entity_tp_desc = chunk.get('ENTITY_TP_DESC', pd.Series([''] * len(chunk)))
-                    # Combine code and description (e.g., "15|IND" or just use code)
-                    chunk['entity_type'] = (entity_tp_code.astype(str).str.strip() + 
-                                           entity_tp_desc.astype(str).str.strip().replace('', '')).str.strip()
-                    chunk['entity_type'] = chunk['entity_type'].replace('', None)
-                    chunk['other_id'] = clean_str_field(chunk.get('OTHER_ID', pd.Series([''] * len(chunk))))
-                    chunk['file_number'] = clean_str_field(chunk.get('FILE_NUM', pd.Series([''] * len(chunk))))
-                    chunk['memo_code'] = clean_str_field(chunk.get('MEMO_CD', pd.Series([''] * len(chunk))))
-                    # MEMO_TEXT is not a separate field in the 21-field format - set to None
-                    chunk['memo_text'] = None
-                    
-                    # Vectorized amount parsing
-                    chunk['contribution_amount'] = pd.to_numeric(
-                        chunk['TRANSACTION_AMT'].astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False).str.strip(),
-                        errors='coerce'
-                    ).fillna(0.0)
-                    
-                    # Vectorized date parsing
-                    chunk['contribution_date'] = self._parse_date_vectorized(chunk['TRANSACTION_DT'])
-                    # Convert pandas NaN to None for SQLite compatibility
-                    chunk['contribution_date'] = chunk['contribution_date'].where(pd.notna(chunk['contribution_date']), None)
+                    with timed_stage('backfill'):
+                        await committee_lookup.ensure_current(session)
+                        chunk['candidate_id'], backfilled_count = committee_lookup.backfill(
+                            chunk['candidate_id'], chunk['committee_id']
+                        )
+                    if backfilled_count > 0:
+                        logger.debug(f"Backfilled candidate_id for {backfilled_count} contributions using committee linkages")
                     
                     # Build raw_data more efficiently - prepare columns for raw_data dict
                     # Convert to records list using vectorized operations
-                    records_df = chunk[[
-                        'contribution_id', 'candidate_id', 'committee_id', 'contributor_name',
-                        'contributor_city', 'contributor_state', 'contributor_zip',
-                        'contributor_employer', 'contributor_occupation', 'contribution_amount',
-                        'contribution_date', 'contribution_type', 'amendment_indicator',
-                        'report_type', 'transaction_id', 'entity_type', 'other_id',
-                        'file_number', 'memo_code', 'memo_text'
-                    ]].copy()
+                    records_df = chunk[SCHEDULE_A_RECORD_COLUMNS].copy()
+                    # Missing values -> None (string columns keep NaN under pandas' string dtype)
+                    records_df = records_df.astype(object).where(records_df.notna(), None)
                     
                     # Convert to dict records
                     records = records_df.to_dict('records')
@@ -836,125 +765,23 @@ class BulkDataService:
                     })
                     
                     # Convert to dict records and add to main records
+                    raw_data_df = raw_data_df.astype(object).where(raw_data_df.notna(), None)
                     raw_data_records = raw_data_df.to_dict('records')
                     for i, record in enumerate(records):
                         record['raw_data'] = raw_data_records[i]
                     
-                    # Bulk insert/update with smart merge (SQLite)
+                    # Set-based insert/update with smart merge (see bulk_data.contribution_merge)
                     if records:
                         try:
-                            # Get contribution IDs for this batch
-                            contribution_ids = [r['contribution_id'] for r in records]
-                            
-                            # Fetch existing contributions in this batch
-                            existing_query = select(Contribution).where(
-                                Contribution.contribution_id.in_(contribution_ids)
-                            )
-                            existing_result = await session.execute(existing_query)
-                            existing_contribs = {c.contribution_id: c for c in existing_result.scalars().all()}
-                            
-                            # Separate new and existing records
-                            new_records = []
-                            updated_count = 0
-                            
-                            # Import FECClient for smart merge
-                            from app.services.fec_client import FECClient
-                            fec_client = FECClient()
-                            
-                            for record in records:
-                                contrib_id = record['contribution_id']
-                                
-                                if contrib_id in existing_contribs:
-                                    # Use smart merge for existing records
-                                    # Clean NaN dates before smart merge
-                                    merge_record = {**record}
-                                    if 'contribution_date' in merge_record and (pd.isna(merge_record['contribution_date']) or merge_record['contribution_date'] is pd.NA):
-                                        merge_record['contribution_date'] = None
-                                    
-                                    existing_contrib = existing_contribs[contrib_id]
-                                    fec_client._smart_merge_contribution(existing_contrib, merge_record, 'bulk')
-                                    updated_count += 1
-                                else:
-                                    # New record - prepare for insert
-                                    # Clean NaN dates before adding to new_records
-                                    new_record = {**record}
-                                    if 'contribution_date' in new_record and (pd.isna(new_record['contribution_date']) or new_record['contribution_date'] is pd.NA):
-                                        new_record['contribution_date'] = None
-                                    
-                                    new_records.append({
-                                        **new_record,
-                                        'raw_data': new_record['raw_data'],  # Store as dict, SQLAlchemy JSON handles it
-                                        'created_at': datetime.utcnow(),
-                                        'data_source': 'bulk',
-                                        'last_updated_from': 'bulk'
-                                    })
-                            
                             # Use savepoint for error recovery - if this chunk fails, rollback just this chunk
-                            try:
-                                async with session.begin_nested():
-                                    # Bulk insert new records
-                                    if new_records:
-                                        await session.execute(
-                                            text("""
-                                                INSERT INTO contributions 
-                                                (contribution_id, candidate_id, committee_id, contributor_name, 
-                                                 contributor_city, contributor_state, contributor_zip, 
-                                                 contributor_employer, contributor_occupation, contribution_amount,
-                                                 contribution_date, contribution_type, amendment_indicator,
-                                                 report_type, transaction_id, entity_type, other_id,
-                                                 file_number, memo_code, memo_text, raw_data, created_at,
-                                                 data_source, last_updated_from)
-                                                VALUES 
-                                                (:contribution_id, :candidate_id, :committee_id, :contributor_name,
-                                                 :contributor_city, :contributor_state, :contributor_zip,
-                                                 :contributor_employer, :contributor_occupation, :contribution_amount,
-                                                 :contribution_date, :contribution_type, :amendment_indicator,
-                                                 :report_type, :transaction_id, :entity_type, :other_id,
-                                                 :file_number, :memo_code, :memo_text, :raw_data, :created_at,
-                                                 :data_source, :last_updated_from)
-                                            """),
-                                            new_records
-                                        )
-                                    
-                                    # Commit the savepoint (nested transaction)
-                                    # The outer transaction will be committed below
-                            except Exception as e:
-                                # Rollback to savepoint (automatic with begin_nested context)
-                                logger.warning(f"Failed to insert contribution chunk {chunk_count}: {e}. Skipping this chunk.")
-                                # Continue with next chunk instead of failing entire operation
-                                continue
+                            async with session.begin_nested():
+                                await upsert_contributions(session, records)
                             
                             # Commit outer transaction after successful chunk processing
-                            await session.commit()
-                            
-                            inserted = len(new_records) if new_records else 0
-                            total_records += inserted + updated_count
+                            with timed_stage('commit'):
+                                await session.commit()
                             
-                            # Update progress every 5 chunks to reduce overhead
-                            # Track file position as rows processed (for resume capability)
-                            rows_processed = total_records
-                            if job_id and chunk_count % 5 == 0:
-                                # Calculate estimated progress percentage
-                                estimated_progress = 0.0
-                                if estimated_chunks > 0:
-                                    estimated_progress = (chunk_count / estimated_chunks) * 100
-                                
-                                await self._update_job_progress(
-                                    job_id,
-                                    current_chunk=chunk_count,
-                                    imported_records=total_records,
-                                    file_position=rows_processed,  # Store rows processed for resume
-                                    progress_data={
-                                        "status": "importing",
-                                        "cycle": cycle,
-                                        "chunks_processed": chunk_count,
-                                        "total_chunks_estimated": estimated_chunks,
-                                        "records_imported": total_records,
-                                        "records_skipped": skipped_duplicates,
-                                        "rows_processed": rows_processed,
-                                        "estimated_progress": min(100, estimated_progress)
-                                    }
-                                )
+                            total_records += len(records)
                             
                             # Log every 10 chunks to reduce I/O
                             if chunk_count % 10 == 0:
@@ -964,67 +791,42 @@ class BulkDataService:
                         except Exception as e:
                             await session.rollback()
                             logger.error(f"Error committing chunk {chunk_count}: {e}")
-                            # Fallback: try individual inserts/updates with smart merge for this chunk
-                            # Import select with alias to avoid scoping issues
-                            from sqlalchemy import select as sql_select
-                            from app.services.fec_client import FECClient
-                            fec_client = FECClient()
-                            
+                            # Fallback: merge records individually so one bad row doesn't drop the chunk
                             for record in records:
                                 try:
-                                    contrib_id = record['contribution_id']
-                                    
-                                    # Check if exists
-                                    existing_query = sql_select(Contribution).where(
-                                        Contribution.contribution_id == contrib_id
-                                    )
-                                    existing_result = await session.execute(existing_query)
-                                    existing_contrib = existing_result.scalar_one_or_none()
-                                    
-                                    if existing_contrib:
-                                        # Use smart merge
-                                        fec_client._smart_merge_contribution(existing_contrib, record, 'bulk')
-                                        await session.commit()
-                                        total_records += 1
-                                    else:
-                                        # Insert new
-                                        # Clean NaN dates before insert
-                                        insert_record = {**record}
-                                        if 'contribution_date' in insert_record and (pd.isna(insert_record['contribution_date']) or insert_record['contribution_date'] is pd.NA):
-                                            insert_record['contribution_date'] = None
-                                        
-                                        await session.execute(
-                                            text("""
-                                                INSERT INTO contributions 
-                                                (contribution_id, candidate_id, committee_id, contributor_name, 
-                                                 contributor_city, contributor_state, contributor_zip, 
-                                                 contributor_employer, contributor_occupation, contribution_amount,
-                                                 contribution_date, contribution_type, amendment_indicator,
-                                                 report_type, transaction_id, entity_type, other_id,
-                                                 file_number, memo_code, memo_text, raw_data, created_at,
-                                                 data_source, last_updated_from)
-                                                VALUES 
-                                                (:contribution_id, :candidate_id, :committee_id, :contributor_name,
-                                                 :contributor_city, :contributor_state, :contributor_zip,
-                                                 :contributor_employer, :contributor_occupation, :contribution_amount,
-                                                 :contribution_date, :contribution_type, :amendment_indicator,
-                                                 :report_type, :transaction_id, :entity_type, :other_id,
-                                                 :file_number, :memo_code, :memo_text, :raw_data, :created_at,
-                                                 :data_source, :last_updated_from)
-                                            """),
-                                            {
-                                                **insert_record,
-                                                'raw_data': insert_record['raw_data'],  # Store as dict, SQLAlchemy JSON handles it
-                                                'created_at': datetime.utcnow(),
-                                                'data_source': 'bulk',
-                                                'last_updated_from': 'bulk'
-                                            }
-                                        )
-                                        await session.commit()
-                                        total_records += 1
+                                    await upsert_contributions(session, [record])
+                                    await session.commit()
+                                    total_records += 1
                                 except Exception:
                                     await session.rollback()
                                     skipped_duplicates += 1
+                        
+                        # Checkpoint after every committed chunk: resume seeks past its bytes
+                        if job_id:
+                            progress_data = None
+                            # Refresh detailed progress every 5 chunks to reduce overhead
+                            if chunk_count % 5 == 0:
+                                progress_data = {
+                                    "status": "importing",
+                                    "cycle": cycle,
+                                    "chunks_processed": chunk_count,
+                                    "total_chunks_estimated": estimated_chunks,
+                                    "records_imported": total_records,
+                                    "records_skipped": skipped_duplicates,
+                                    "bytes_processed": parsed.end,
+                                    "estimated_progress": min(100, parsed.end / max(1, file_size) * 100)
+                                }
+                            with timed_stage('checkpoint'):
+                                await self._update_job_progress(
+                                    job_id,
+                                    current_chunk=chunk_count,
+                                    imported_records=total_records,
+                                    skipped_records=skipped_duplicates,
+                                    file_position=parsed.end,
+                                    checkpoint_start=parsed.start,
+                                    checkpoint_hash=parsed.digest,
+                                    progress_data=progress_data
+                                )
                     
                     # Clear memory explicitly after processing each chunk
                     # This helps prevent memory buildup during large imports
@@ -1118,7 +920,7 @@ class BulkDataService:
                     status='completed',
                     imported_records=total_records,
                     skipped_records=skipped_duplicates,
-                    file_position=total_records,  # Final position
+                    file_position=file_size,  # Final position
                     completed_at=datetime.utcnow()
                 )
             
@@ -1126,15 +928,149 @@ class BulkDataService:
         except Exception as e:
             logger.error(f"Error parsing CSV file {file_path}: {e}", exc_info=True)
             if job_id:
-                # Save current progress before marking as failed
+                # The checkpoint of the last committed chunk is kept for resume
                 await self._update_job_progress(
                     job_id, 
                     status='failed', 
-                    error_message=str(e),
-                    file_position=total_records  # Save progress for potential resume
+                    error_message=str(e)
                 )
             raise
     
+    async def _checkpoint_matches_file(self, job: BulkImportJob, file_path: str) -> bool:
+        """Whether the job's last committed chunk still has the same bytes in file_path"""
+        if job.checkpoint_hash is None or job.checkpoint_start is None:
+            # Row-count positions from older jobs cannot be verified
+            return False
+        from app.utils.thread_pool import run_in_thread_pool
+        digest = await run_in_thread_pool(
+            read_chunk_digest, file_path, job.checkpoint_start, job.file_position
+        )
+        return digest == job.checkpoint_hash
+    
+    async def _get_bulk_load_path(self, bulk_load: Optional[bool]) -> Optional[str]:
+        """Return the SQLite database file when the native bulk-load fast path applies"""
+        if bulk_load is False:
+            return None
+        
+        from app.config import config
+        from app.db.database import engine
+        
+        db_path = resolve_sqlite_path(engine.url)
+        if not db_path:
+            if bulk_load:
+                logger.warning("Bulk-load fast path requested but database is not a SQLite file; using chunked import")
+            return None
+        
+        if bulk_load is None:
+            if not config.BULK_LOAD_FAST_PATH:
+                return None
+            from app.utils.thread_pool import run_in_thread_pool
+            loader = SQLiteBulkLoader(db_path)
+            if not await run_in_thread_pool(loader.table_is_empty):
+                return None
+        
+        return db_path
+    
+    async def _bulk_load_csv(
+        self,
+        file_path: str,
+        cycle: int,
+        db_path: str,
+        job_id: Optional[str] = None,
+        batch_size: int = 50000
+    ) -> int:
+        """
+        Import a Schedule A file with the native SQLite bulk-load fast path.
+        
+        The load itself runs in a worker thread on a raw sqlite3 connection;
+        progress and cancellation are bridged back to the event loop.
+        """
+        from app.config import config
+        from app.utils.thread_pool import run_in_thread_pool
+        
+        logger.info(f"Using SQLite bulk-load fast path for {file_path} (cycle {cycle})")
+        loop = asyncio.get_running_loop()
+        loader = SQLiteBulkLoader(
+            db_path,
+            batch_size=batch_size,
+            merge_window_rows=config.BULK_LOAD_MERGE_WINDOW_ROWS
+        )
+        
+        if job_id:
+            await self._update_job_progress(
+                job_id,
+                current_cycle=cycle,
+                data_type='individual_contributions',
+                file_path=file_path,
+                progress_data={"status": "parsing", "cycle": cycle, "mode": "bulk_load"}
+            )
+        
+        def should_cancel() -> bool:
+            return bool(job_id) and job_id in _cancelled_jobs
+        
+        def on_progress(result) -> None:
+            logger.info(
+                f"Bulk load window {result.windows}: {result.rows_inserted} inserted, "
+                f"{result.rows_merged} merged, {result.rows_read} rows read"
+            )
+            if job_id:
+                asyncio.run_coroutine_threadsafe(
+                    self._update_job_progress(
+                        job_id,
+                        current_chunk=result.windows,
+                        imported_records=result.rows_inserted + result.rows_merged,
+                        skipped_records=result.rows_skipped,
+                        progress_data={
+                            "status": "importing",
+                            "cycle": cycle,
+                            "mode": "bulk_load",
+                            "records_imported": result.rows_inserted + result.rows_merged,
+                            "records_skipped": result.rows_skipped,
+                            "rows_processed": result.rows_read
+                        }
+                    ),
+                    loop
+                )
+        
+        with timed_stage('bulk_load'):
+            result = await run_in_thread_pool(loader.load_contributions, file_path, should_cancel, on_progress)
+        total_records = result.rows_inserted + result.rows_merged
+        metrics = current_metrics()
+        if metrics:
+            metrics.add_rows(result.rows_read)
+        
+        if result.cancelled:
+            logger.info(f"Bulk load cancelled for job {job_id} after {total_records} records")
+            if job_id:
+                await self._update_job_progress(job_id, status='cancelled', imported_records=total_records)
+            return total_records
+        
+        logger.info(
+            f"Bulk load complete: {total_records} records imported, "
+            f"{result.rows_skipped} rows skipped, {result.rows_read} rows read for cycle {cycle}"
+        )
+        
+        if total_records > 10000:
+            try:
+                from app.lifecycle.tasks import checkpoint_wal_after_import
+                await checkpoint_wal_after_import()
+            except Exception as e:
+                logger.warning(f"Could not checkpoint WAL after import: {e}")
+        
+        await self._extract_and_cache_committees()
+        await self._update_metadata(cycle, file_path, total_records)
+        
+        if job_id:
+            await self._update_job_progress(
+                job_id,
+                status='completed',
+                imported_records=total_records,
+                skipped_records=result.rows_skipped,
+                completed_at=datetime.utcnow()
+            )
+        
+        return total_records
+    
     def _is_valid_committee_id(self, committee_id: str) -> bool:
         """Validate committee ID format: must start with 'C' followed by 8 digits"""
         if not committee_id or not isinstance(committee_id, str):
@@ -1830,6 +1766,7 @@ class BulkDataService:
                 result = await session.execute(delete(Contribution))
             else:
                 result = await session.execute(delete(Contribution))
+            await clear_contributor_rollups(session)
             
             await session.commit()
             deleted_count = result.rowcount
@@ -1862,6 +1799,7 @@ class BulkDataService:
                 result = await session.execute(delete(Contribution))
                 deleted_counts['contributions'] = result.rowcount
                 logger.info(f"Cleared {result.rowcount} contributions")
+                await clear_contributor_rollups(session)
                 
                 # Clear financial totals
                 result = await session.execute(delete(FinancialTotal))
@@ -1942,7 +1880,9 @@ class BulkDataService:
         file_path: Optional[str] = None,
         error_message: Optional[str] = None,
         completed_at: Optional[datetime] = None,
-        progress_data: Optional[Dict] = None
+        progress_data: Optional[Dict] = None,
+        checkpoint_start: Optional[int] = None,
+        checkpoint_hash: Optional[str] = None
     ):
         """Update job progress using job manager"""
         await self.job_manager.update_job_progress(
@@ -1955,7 +1895,9 @@ class BulkDataService:
             skipped_records=skipped_records,
             file_position=file_position,
             progress_data=progress_data,
-            error_message=error_message
+            error_message=error_message,
+            checkpoint_start=checkpoint_start,
+            checkpoint_hash=checkpoint_hash
         )
     
     async def _update_download_progress(
@@ -1967,28 +1909,21 @@ class BulkDataService:
     ):
         """Update download progress for a cycle"""
         try:
-            async with AsyncSessionLocal() as session:
-                result = await session.execute(
-                    select(BulkImportJob).where(BulkImportJob.id == job_id)
-                )
-                job = result.scalar_one_or_none()
+            job = await self.get_job(job_id)
+            if job:
+                progress_data = dict(job.progress_data or {})
+                cycle_progress = dict(progress_data.get('cycle_progress', {}))
                 
-                if job:
-                    progress_data = job.progress_data or {}
-                    cycle_progress = progress_data.get('cycle_progress', {})
-                    
-                    cycle_progress[str(cycle)] = {
-                        "status": "downloading",
-                        "downloaded_mb": downloaded_mb,
-                        "total_mb": total_mb,
-                        "progress_pct": (downloaded_mb / total_mb * 100) if total_mb else None
-                    }
-                    
-                    progress_data['cycle_progress'] = cycle_progress
-                    progress_data['current_cycle'] = cycle
-                    job.progress_data = progress_data
-                    
-                    await session.commit()
+                cycle_progress[str(cycle)] = {
+                    "status": "downloading",
+                    "downloaded_mb": downloaded_mb,
+                    "total_mb": total_mb,
+                    "progress_pct": (downloaded_mb / total_mb * 100) if total_mb else None
+                }
+                
+                progress_data['cycle_progress'] = cycle_progress
+                progress_data['current_cycle'] = cycle
+                await self._update_job_progress(job_id, progress_data=progress_data)
         except Exception as e:
             logger.warning(f"Error updating download progress: {e}")
     
@@ -2031,6 +1966,7 @@ class BulkDataService:
             logger.info(f"Resuming job {job_id}: {job.data_type} for cycle {job.cycle}")
             job.status = 'running'
             await session.commit()
+            get_progress_bus().publish(job_id, status='running')
             
             # Start the import in background
             try:
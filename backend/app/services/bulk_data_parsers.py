@@ -16,9 +16,11 @@ from app.db.database import (
     IndependentExpenditure, OperatingExpenditure, CandidateSummary, CommitteeSummary,
     ElectioneeringComm, CommunicationCost
 )
+from app.services.shared.import_metrics import timed_chunks, timed_stage, track_import
 from app.services.bulk_data_config import DataType, get_config
 from app.services.shared.exceptions import BulkDataError
 from app.services.shared.retry import retry_on_db_lock
+from app.utils.process_pool import async_read_bulk_csv
 from app.utils.thread_pool import async_read_csv, async_to_numeric
 
 logger = logging.getLogger(__name__)
@@ -116,7 +118,8 @@ class GenericBulkDataParser:
                 # Create savepoint for this batch
                 async with session.begin_nested():
                     insert_stmt = insert_stmt_factory(batch)
-                    await session.execute(insert_stmt)
+                    with timed_stage('insert'):
+                        await session.execute(insert_stmt)
                     inserted_count += len(batch)
             except SQLAlchemyError as e:
                 # Rollback to savepoint (automatic with begin_nested context)
@@ -127,7 +130,8 @@ class GenericBulkDataParser:
         # Commit periodically (every commit_frequency batches or at the end)
         if batch_num % commit_frequency == 0 or batch_num == len(record_batches):
             try:
-                await session.commit()
+                with timed_stage('commit'):
+                    await session.commit()
             except SQLAlchemyError as e:
                 logger.error(f"Failed to commit after batch {batch_num}: {e}")
                 await session.rollback()
@@ -170,8 +174,21 @@ class GenericBulkDataParser:
         
         # Route to specific parser based on data type
         if data_type == DataType.INDIVIDUAL_CONTRIBUTIONS:
+            # Tracks its own import metrics (it is also called directly)
             return await self.bulk_data_service.parse_and_store_csv(file_path, cycle, job_id, batch_size)
-        elif data_type == DataType.CANDIDATE_MASTER:
+        async with track_import(job_id, data_type.value, cycle, file_path):
+            return await self._parse_data_type(data_type, file_path, cycle, job_id, batch_size)
+    
+    async def _parse_data_type(
+        self,
+        data_type: DataType,
+        file_path: str,
+        cycle: int,
+        job_id: Optional[str],
+        batch_size: int
+    ) -> int:
+        """Run the parser of a data type other than individual contributions"""
+        if data_type == DataType.CANDIDATE_MASTER:
             return await self.parse_candidate_master(file_path, cycle, job_id, batch_size)
         elif data_type == DataType.COMMITTEE_MASTER:
             return await self.parse_committee_master(file_path, cycle, job_id, batch_size)
@@ -248,7 +265,7 @@ class GenericBulkDataParser:
             chunk_count = 0
             
             # Read CSV in chunks
-            chunk_reader = await async_read_csv(
+            chunk_reader = await async_read_bulk_csv(
                 file_path,
                 sep='|',
                 header=0 if has_header else None,
@@ -258,7 +275,7 @@ class GenericBulkDataParser:
                 low_memory=False,
                 on_bad_lines='skip'
             )
-            async for chunk in chunk_reader:
+            async for chunk in timed_chunks(chunk_reader):
                 if job_id and job_id in self.bulk_data_service._cancelled_jobs:
                     logger.info(f"Import cancelled for job {job_id}")
                     return total_records
@@ -319,7 +336,7 @@ class GenericBulkDataParser:
             data_age_days = calculate_data_age(cycle)
             
             async with AsyncSessionLocal() as session:
-                chunk_reader = await async_read_csv(
+                chunk_reader = await async_read_bulk_csv(
                     file_path,
                     sep='|',
                     header=None,
@@ -329,7 +346,7 @@ class GenericBulkDataParser:
                     low_memory=False,
                     on_bad_lines='skip'
                 )
-                async for chunk in chunk_reader:
+                async for chunk in timed_chunks(chunk_reader):
                     if job_id and hasattr(self.bulk_data_service, '_cancelled_jobs') and job_id in self.bulk_data_service._cancelled_jobs:
                         logger.info(f"Import cancelled for job {job_id}")
                         return total_records
@@ -409,7 +426,8 @@ class GenericBulkDataParser:
                                                 'updated_at': func.datetime('now')
                                             }
                                         )
-                                        await session.execute(upsert_stmt)
+                                        with timed_stage('insert'):
+                                            await session.execute(upsert_stmt)
                                         batch_inserted += len(batch)
                                 except Exception as e:
                                     # Rollback to savepoint (automatic with begin_nested context)
@@ -419,7 +437,8 @@ class GenericBulkDataParser:
                         
                         # Commit after processing all batches in this chunk (every chunk)
                         try:
-                            await session.commit()
+                            with timed_stage('commit'):
+                                await session.commit()
                             total_records += batch_inserted
                             skipped += batch_failed
                         except Exception as e:
@@ -458,6 +477,8 @@ class GenericBulkDataParser:
         batch_size: int = 50000
     ) -> int:
         """Parse committee master file (cm*.zip -> cm.txt)"""
+        from app.services.shared.candidate_committees import link_candidate_committees, mark_linkage_changed
+        
         logger.info(f"Parsing committee master file for cycle {cycle}")
         
         # Get column names from header file
@@ -478,7 +499,7 @@ class GenericBulkDataParser:
             data_age_days = calculate_data_age(cycle)
             
             async with AsyncSessionLocal() as session:
-                chunk_reader = await async_read_csv(
+                chunk_reader = await async_read_bulk_csv(
                     file_path,
                     sep='|',
                     header=None,
@@ -488,7 +509,7 @@ class GenericBulkDataParser:
                     low_memory=False,
                     on_bad_lines='skip'
                 )
-                async for chunk in chunk_reader:
+                async for chunk in timed_chunks(chunk_reader):
                     if job_id and hasattr(self.bulk_data_service, '_cancelled_jobs') and job_id in self.bulk_data_service._cancelled_jobs:
                         logger.info(f"Import cancelled for job {job_id}")
                         return total_records
@@ -550,8 +571,15 @@ class GenericBulkDataParser:
                                     'updated_at': func.datetime('now')
                                 }
                             )
-                            await session.execute(upsert_stmt)
-                        await session.commit()
+                            with timed_stage('insert'):
+                                await session.execute(upsert_stmt)
+                        await link_candidate_committees(session, [
+                            (record['candidate_ids'][0], record['committee_id'])
+                            for record in records if record['candidate_ids']
+                        ])
+                        with timed_stage('commit'):
+                            await session.commit()
+                        mark_linkage_changed()
                         total_records += len(records)
                         
                         # Log every 10 chunks
@@ -585,6 +613,8 @@ class GenericBulkDataParser:
         batch_size: int = 50000
     ) -> int:
         """Parse candidate-committee linkage file (ccl*.zip -> ccl.txt)"""
+        from app.services.shared.candidate_committees import link_candidate_committees, mark_linkage_changed
+        
         logger.info(f"Parsing candidate-committee linkage file for cycle {cycle}")
         
         # Get column names from header file
@@ -609,7 +639,7 @@ class GenericBulkDataParser:
             
             async with AsyncSessionLocal() as session:
                 # Read the file in chunks
-                chunk_reader = await async_read_csv(
+                chunk_reader = await async_read_bulk_csv(
                     file_path,
                     sep='|',
                     header=None,
@@ -619,7 +649,7 @@ class GenericBulkDataParser:
                     low_memory=False,
                     on_bad_lines='skip'
                 )
-                async for chunk in chunk_reader:
+                async for chunk in timed_chunks(chunk_reader):
                     if job_id and hasattr(self.bulk_data_service, '_cancelled_jobs') and job_id in self.bulk_data_service._cancelled_jobs:
                         logger.info(f"Import cancelled for job {job_id}")
                         return total_records
@@ -657,60 +687,70 @@ class GenericBulkDataParser:
                                 update_batch.append((comm_id, candidate_ids))
                         
                         # Update committees in batches
-                        for comm_id, candidate_ids in update_batch:
-                            try:
-                                # Get existing candidate_ids and merge
-                                result = await session.execute(
-                                    select(Committee.candidate_ids)
-                                    .where(Committee.committee_id == comm_id)
-                                )
-                                existing = result.scalar_one_or_none()
+                        with timed_stage('update_committees'):
+                            for comm_id, candidate_ids in update_batch:
+                                try:
+                                    # Get existing candidate_ids and merge
+                                    result = await session.execute(
+                                        select(Committee.candidate_ids)
+                                        .where(Committee.committee_id == comm_id)
+                                    )
+                                    existing = result.scalar_one_or_none()
                                 
-                                # Merge existing and new candidate_ids, removing duplicates
-                                if existing and existing:
-                                    merged_ids = list(set(existing + candidate_ids))
-                                else:
-                                    merged_ids = candidate_ids
+                                    # Merge existing and new candidate_ids, removing duplicates
+                                    if existing and existing:
+                                        merged_ids = list(set(existing + candidate_ids))
+                                    else:
+                                        merged_ids = candidate_ids
                                 
-                                # Update the committee
-                                await session.execute(
-                                    update(Committee)
-                                    .where(Committee.committee_id == comm_id)
-                                    .values(candidate_ids=merged_ids)
-                                )
-                            except Exception as e:
-                                logger.debug(f"Error updating committee {comm_id}: {e}")
-                                continue
+                                    # Update the committee
+                                    await session.execute(
+                                        update(Committee)
+                                        .where(Committee.committee_id == comm_id)
+                                        .values(candidate_ids=merged_ids)
+                                    )
+                                except Exception as e:
+                                    logger.debug(f"Error updating committee {comm_id}: {e}")
+                                    continue
                         
                         # Also update contributions with candidate_id based on committee_id
                         # Use the first candidate_id for each committee (most committees have one primary candidate)
                         
                         contribution_updates = 0
-                        for comm_id, candidate_ids in update_batch:
-                            if candidate_ids:
-                                # Use first candidate_id (primary candidate)
-                                primary_candidate_id = candidate_ids[0]
+                        with timed_stage('update_contributions'):
+                            for comm_id, candidate_ids in update_batch:
+                                if candidate_ids:
+                                    # Use first candidate_id (primary candidate)
+                                    primary_candidate_id = candidate_ids[0]
                                 
-                                try:
-                                    # Update contributions missing candidate_id for this committee
-                                    result = await session.execute(
-                                        update(Contribution)
-                                        .where(
-                                            Contribution.committee_id == comm_id,
-                                            ((Contribution.candidate_id.is_(None)) | (Contribution.candidate_id == ''))
+                                    try:
+                                        # Update contributions missing candidate_id for this committee
+                                        result = await session.execute(
+                                            update(Contribution)
+                                            .where(
+                                                Contribution.committee_id == comm_id,
+                                                ((Contribution.candidate_id.is_(None)) | (Contribution.candidate_id == ''))
+                                            )
+                                            .values(candidate_id=primary_candidate_id)
+                                            .execution_options(synchronize_session=False)
                                         )
-                                        .values(candidate_id=primary_candidate_id)
-                                        .execution_options(synchronize_session=False)
-                                    )
-                                    contribution_updates += result.rowcount
-                                except Exception as e:
-                                    logger.debug(f"Error updating contributions for committee {comm_id}: {e}")
-                                    continue
+                                        contribution_updates += result.rowcount
+                                    except Exception as e:
+                                        logger.debug(f"Error updating contributions for committee {comm_id}: {e}")
+                                        continue
                         
                         if contribution_updates > 0:
                             logger.info(f"Updated {contribution_updates} contributions with candidate_id from linkage data")
                         
-                        await session.commit()
+                        # Links are recorded even for committees not imported yet
+                        await link_candidate_committees(session, [
+                            (candidate_id, comm_id)
+                            for comm_id, candidate_ids in update_batch
+                            for candidate_id in candidate_ids
+                        ])
+                        with timed_stage('commit'):
+                            await session.commit()
+                        mark_linkage_changed()
                         total_records += len(update_batch)
                     
                     # Log progress
@@ -754,7 +794,7 @@ class GenericBulkDataParser:
             
             async with AsyncSessionLocal() as session:
                 # CSV files typically have headers
-                chunk_reader = await async_read_csv(
+                chunk_reader = await async_read_bulk_csv(
                     file_path,
                     sep=',',  # CSV files are comma-separated
                     chunksize=batch_size,
@@ -762,7 +802,7 @@ class GenericBulkDataParser:
                     low_memory=False,
                     on_bad_lines='skip'
                 )
-                async for chunk in chunk_reader:
+                async for chunk in timed_chunks(chunk_reader):
                     if job_id and hasattr(self.bulk_data_service, '_cancelled_jobs') and job_id in self.bulk_data_service._cancelled_jobs:
                         logger.info(f"Import cancelled for job {job_id}")
                         return total_records
@@ -903,8 +943,10 @@ class GenericBulkDataParser:
                                     'updated_at': func.datetime('now')
                                 }
                             )
-                            await session.execute(upsert_stmt)
-                        await session.commit()
+                            with timed_stage('insert'):
+                                await session.execute(upsert_stmt)
+                        with timed_stage('commit'):
+                            await session.commit()
                         total_records += len(records)
                         
                         # Log every 10 chunks
@@ -962,7 +1004,7 @@ class GenericBulkDataParser:
             data_age_days = calculate_data_age(cycle)
             
             async with AsyncSessionLocal() as session:
-                chunk_reader = await async_read_csv(
+                chunk_reader = await async_read_bulk_csv(
                     file_path,
                     sep='|',
                     header=None,
@@ -972,7 +1014,7 @@ class GenericBulkDataParser:
                     low_memory=False,
                     on_bad_lines='skip'
                 )
-                async for chunk in chunk_reader:
+                async for chunk in timed_chunks(chunk_reader):
                     if job_id and hasattr(self.bulk_data_service, '_cancelled_jobs') and job_id in self.bulk_data_service._cancelled_jobs:
                         logger.info(f"Import cancelled for job {job_id}")
                         return total_records
@@ -1128,8 +1170,10 @@ class GenericBulkDataParser:
                                     'updated_at': func.datetime('now', 'utc')
                                 }
                             )
-                            await session.execute(upsert_stmt)
-                        await session.commit()
+                            with timed_stage('insert'):
+                                await session.execute(upsert_stmt)
+                        with timed_stage('commit'):
+                            await session.commit()
                         total_records += len(records)
                         
                         # Log every 10 chunks
@@ -1173,14 +1217,14 @@ class GenericBulkDataParser:
             
             async with AsyncSessionLocal() as session:
                 # CSV files typically have headers
-                for chunk in pd.read_csv(
+                for chunk in timed_chunks(pd.read_csv(
                     file_path,
                     sep=',',
                     chunksize=batch_size,
                     dtype=str,
                     low_memory=False,
                     on_bad_lines='skip'
-                ):
+                )):
                     if job_id and hasattr(self.bulk_data_service, '_cancelled_jobs') and job_id in self.bulk_data_service._cancelled_jobs:
                         logger.info(f"Import cancelled for job {job_id}")
                         return total_records
@@ -1278,8 +1322,10 @@ class GenericBulkDataParser:
                                     'updated_at': func.datetime('now')
                                 }
                             )
-                            await session.execute(upsert_stmt)
-                        await session.commit()
+                            with timed_stage('insert'):
+                                await session.execute(upsert_stmt)
+                        with timed_stage('commit'):
+                            await session.commit()
                         total_records += len(records)
                         
                         # Log every 10 chunks
@@ -1323,14 +1369,14 @@ class GenericBulkDataParser:
             
             async with AsyncSessionLocal() as session:
                 # CSV files typically have headers
-                for chunk in pd.read_csv(
+                for chunk in timed_chunks(pd.read_csv(
                     file_path,
                     sep=',',
                     chunksize=batch_size,
                     dtype=str,
                     low_memory=False,
                     on_bad_lines='skip'
-                ):
+                )):
                     if job_id and hasattr(self.bulk_data_service, '_cancelled_jobs') and job_id in self.bulk_data_service._cancelled_jobs:
                         logger.info(f"Import cancelled for job {job_id}")
                         return total_records
@@ -1419,8 +1465,10 @@ class GenericBulkDataParser:
                                     'updated_at': func.datetime('now')
                                 }
                             )
-                            await session.execute(upsert_stmt)
-                        await session.commit()
+                            with timed_stage('insert'):
+                                await session.execute(upsert_stmt)
+                        with timed_stage('commit'):
+                            await session.commit()
                         total_records += len(records)
                         
                         # Log every 10 chunks
@@ -1473,7 +1521,7 @@ class GenericBulkDataParser:
             data_age_days = calculate_data_age(cycle)
             
             async with AsyncSessionLocal() as session:
-                chunk_reader = await async_read_csv(
+                chunk_reader = await async_read_bulk_csv(
                     file_path,
                     sep='|',
                     header=None,
@@ -1483,7 +1531,7 @@ class GenericBulkDataParser:
                     low_memory=False,
                     on_bad_lines='skip'
                 )
-                async for chunk in chunk_reader:
+                async for chunk in timed_chunks(chunk_reader):
                     if job_id and hasattr(self.bulk_data_service, '_cancelled_jobs') and job_id in self.bulk_data_service._cancelled_jobs:
                         logger.info(f"Import cancelled for job {job_id}")
                         return total_records
@@ -1599,8 +1647,10 @@ class GenericBulkDataParser:
                                     'updated_at': func.datetime('now')
                                 }
                             )
-                            await session.execute(upsert_stmt)
-                        await session.commit()
+                            with timed_stage('insert'):
+                                await session.execute(upsert_stmt)
+                        with timed_stage('commit'):
+                            await session.commit()
                         total_records += len(records)
                         
                         # Log every 10 chunks
@@ -1650,7 +1700,7 @@ class GenericBulkDataParser:
             data_age_days = calculate_data_age(cycle)
             
             async with AsyncSessionLocal() as session:
-                chunk_reader = await async_read_csv(
+                chunk_reader = await async_read_bulk_csv(
                     file_path,
                     sep='|',
                     header=None,
@@ -1660,7 +1710,7 @@ class GenericBulkDataParser:
                     low_memory=False,
                     on_bad_lines='skip'
                 )
-                async for chunk in chunk_reader:
+                async for chunk in timed_chunks(chunk_reader):
                     if job_id and hasattr(self.bulk_data_service, '_cancelled_jobs') and job_id in self.bulk_data_service._cancelled_jobs:
                         logger.info(f"Import cancelled for job {job_id}")
                         return total_records
@@ -1722,7 +1772,7 @@ class GenericBulkDataParser:
             data_age_days = calculate_data_age(cycle)
             
             async with AsyncSessionLocal() as session:
-                chunk_reader = await async_read_csv(
+                chunk_reader = await async_read_bulk_csv(
                     file_path,
                     sep='|',
                     header=None,
@@ -1732,7 +1782,7 @@ class GenericBulkDataParser:
                     low_memory=False,
                     on_bad_lines='skip'
                 )
-                async for chunk in chunk_reader:
+                async for chunk in timed_chunks(chunk_reader):
                     if job_id and hasattr(self.bulk_data_service, '_cancelled_jobs') and job_id in self.bulk_data_service._cancelled_jobs:
                         logger.info(f"Import cancelled for job {job_id}")
                         return total_records
@@ -1788,14 +1838,14 @@ class GenericBulkDataParser:
             
             async with AsyncSessionLocal() as session:
                 # CSV files typically have headers
-                for chunk in pd.read_csv(
+                for chunk in timed_chunks(pd.read_csv(
                     file_path,
                     sep=',',
                     chunksize=batch_size,
                     dtype=str,
                     low_memory=False,
                     on_bad_lines='skip'
-                ):
+                )):
                     if job_id and hasattr(self.bulk_data_service, '_cancelled_jobs') and job_id in self.bulk_data_service._cancelled_jobs:
                         logger.info(f"Import cancelled for job {job_id}")
                         return total_records
@@ -1891,8 +1941,10 @@ class GenericBulkDataParser:
                                     'updated_at': func.datetime('now')
                                 }
                             )
-                            await session.execute(upsert_stmt)
-                        await session.commit()
+                            with timed_stage('insert'):
+                                await session.execute(upsert_stmt)
+                        with timed_stage('commit'):
+                            await session.commit()
                         total_records += len(records)
                         
                         # Log every 10 chunks
@@ -1936,14 +1988,14 @@ class GenericBulkDataParser:
             
             async with AsyncSessionLocal() as session:
                 # CSV files typically have headers
-                for chunk in pd.read_csv(
+                for chunk in timed_chunks(pd.read_csv(
                     file_path,
                     sep=',',
                     chunksize=batch_size,
                     dtype=str,
                     low_memory=False,
                     on_bad_lines='skip'
-                ):
+                )):
                     if job_id and hasattr(self.bulk_data_service, '_cancelled_jobs') and job_id in self.bulk_data_service._cancelled_jobs:
                         logger.info(f"Import cancelled for job {job_id}")
                         return total_records
@@ -2039,8 +2091,10 @@ class GenericBulkDataParser:
                                     'updated_at': func.datetime('now')
                                 }
                             )
-                            await session.execute(upsert_stmt)
-                        await session.commit()
+                            with timed_stage('insert'):
+                                await session.execute(upsert_stmt)
+                        with timed_stage('commit'):
+                            await session.commit()
                         total_records += len(records)
                         
                         # Log every 10 chunks
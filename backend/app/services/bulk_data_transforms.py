@@ -0,0 +1,130 @@
+"""
+Vectorized normalization of FEC bulk data chunks
+
+These functions only depend on pandas so they can run inside parse worker
+processes (see app.utils.process_pool) as well as in the thread pool.
+"""
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Contribution columns built from a Schedule A chunk, in record order
+SCHEDULE_A_RECORD_COLUMNS = [
+    'contribution_id', 'candidate_id', 'committee_id', 'contributor_name',
+    'contributor_city', 'contributor_state', 'contributor_zip',
+    'contributor_employer', 'contributor_occupation', 'contribution_amount',
+    'contribution_date', 'contribution_type', 'amendment_indicator',
+    'report_type', 'transaction_id', 'entity_type', 'other_id',
+    'file_number', 'memo_code', 'memo_text'
+]
+
+
+def clean_str_field(series: pd.Series) -> pd.Series:
+    """Convert series to string, strip, and replace empty strings with None"""
+    result = series.astype(str).str.strip()
+    result = result.replace('', None).replace('nan', None)
+    return result
+
+
+def parse_fec_dates(date_series: pd.Series) -> pd.Series:
+    """Parse dates vectorized - handles MMDDYYYY and YYYYMMDD formats"""
+    # Keep the input index so boolean masks from later chunks stay aligned
+    result = pd.Series([None] * len(date_series), index=date_series.index, dtype='object')
+
+    # Convert to string and strip
+    date_strs = date_series.astype(str).str.strip()
+
+    # Filter out obviously non-date values (common data quality issues)
+    # Skip values that contain letters (except for valid date formats)
+    # Skip common non-date strings
+    non_date_patterns = ['NOT EMPLOYED', 'N/A', 'NA', 'NULL', 'NONE', 'UNKNOWN', 'RETIRED', 'SELF']
+    is_not_date = date_strs.str.upper().isin([p.upper() for p in non_date_patterns])
+
+    # Filter valid 8-digit dates (must be exactly 8 digits, all numeric)
+    valid_mask = (date_strs.str.len() == 8) & date_strs.str.isdigit() & ~is_not_date
+
+    if valid_mask.any():
+        valid_dates = date_strs[valid_mask]
+
+        # Try MMDDYYYY format first
+        try:
+            parsed_mmddyyyy = pd.to_datetime(valid_dates, format='%m%d%Y', errors='coerce')
+            result[valid_mask] = parsed_mmddyyyy
+        except Exception as e:
+            logger.debug(f"Date parsing failed for MMDDYYYY format, trying next: {e}")
+
+        # For any that failed, try YYYYMMDD
+        failed_mask = valid_mask & result.isna()
+        if failed_mask.any():
+            try:
+                failed_dates = date_strs[failed_mask]
+                parsed_yyyymmdd = pd.to_datetime(failed_dates, format='%Y%m%d', errors='coerce')
+                result[failed_mask] = parsed_yyyymmdd
+            except Exception as e:
+                logger.debug(f"Date parsing failed for YYYYMMDD format: {e}")
+
+    return result
+
+
+def normalize_schedule_a_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Clean a raw Schedule A chunk and add the contribution columns.
+
+    Rows without SUB_ID are dropped. The raw FEC columns are kept for raw_data;
+    candidate_id is not yet backfilled from committee linkages.
+
+    Args:
+        chunk: DataFrame read with the Schedule A column names and dtype=str
+
+    Returns:
+        DataFrame with the raw columns plus SCHEDULE_A_RECORD_COLUMNS
+    """
+    # Filter out rows without SUB_ID
+    chunk = chunk[chunk['SUB_ID'].notna() & (chunk['SUB_ID'].astype(str).str.strip() != '')].copy()
+    if len(chunk) == 0:
+        return chunk
+
+    # Vectorized field transformations
+    chunk['contribution_id'] = chunk['SUB_ID'].astype(str).str.strip()
+    chunk['candidate_id'] = clean_str_field(chunk['CAND_ID'])
+    chunk['committee_id'] = clean_str_field(chunk['CMTE_ID'])
+    chunk['contributor_name'] = clean_str_field(chunk['NAME'])
+    chunk['contributor_city'] = clean_str_field(chunk['CITY'])
+    chunk['contributor_state'] = clean_str_field(chunk['STATE'])
+    chunk['contributor_zip'] = clean_str_field(chunk['ZIP_CODE'])
+    chunk['contributor_employer'] = clean_str_field(chunk['EMPLOYER'])
+    chunk['contributor_occupation'] = clean_str_field(chunk['OCCUPATION'])
+    chunk['contribution_type'] = clean_str_field(chunk['TRAN_TP'])
+
+    # Extract additional FEC fields
+    chunk['amendment_indicator'] = clean_str_field(chunk.get('AMNDT_IND', pd.Series([''] * len(chunk))))
+    chunk['report_type'] = clean_str_field(chunk.get('RPT_TP', pd.Series([''] * len(chunk))))
+    chunk['transaction_id'] = clean_str_field(chunk.get('TRAN_ID', pd.Series([''] * len(chunk))))
+    # Combine ENTITY_TP_CODE and ENTITY_TP_DESC for entity_type
+    # Use CODE if available, otherwise use DESC, or combine both
+    entity_tp_code = chunk.get('ENTITY_TP_CODE', pd.Series([''] * len(chunk)))
+    entity_tp_desc = chunk.get('ENTITY_TP_DESC', pd.Series([''] * len(chunk)))
+    # Combine code and description (e.g., "15|IND" or just use code)
+    chunk['entity_type'] = (entity_tp_code.astype(str).str.strip() +
+                           entity_tp_desc.astype(str).str.strip().replace('', '')).str.strip()
+    chunk['entity_type'] = chunk['entity_type'].replace('', None)
+    chunk['other_id'] = clean_str_field(chunk.get('OTHER_ID', pd.Series([''] * len(chunk))))
+    chunk['file_number'] = clean_str_field(chunk.get('FILE_NUM', pd.Series([''] * len(chunk))))
+    chunk['memo_code'] = clean_str_field(chunk.get('MEMO_CD', pd.Series([''] * len(chunk))))
+    # MEMO_TEXT is not a separate field in the 21-field format - set to None
+    chunk['memo_text'] = None
+
+    # Vectorized amount parsing
+    chunk['contribution_amount'] = pd.to_numeric(
+        chunk['TRANSACTION_AMT'].astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False).str.strip(),
+        errors='coerce'
+    ).fillna(0.0)
+
+    # Vectorized date parsing
+    chunk['contribution_date'] = parse_fec_dates(chunk['TRANSACTION_DT'])
+    # Convert pandas NaN to None for SQLite compatibility
+    chunk['contribution_date'] = chunk['contribution_date'].where(pd.notna(chunk['contribution_date']), None)
+
+    return chunk
@@ -0,0 +1,182 @@
+"""
+Streaming CSV/NDJSON export of local contributions
+
+Exports read the filtered ``contributions`` query once through a
+server-side cursor (``ChunkedProcessor.stream_chunks``) and yield encoded
+bytes batch by batch, so the response starts with the first batch and
+memory stays flat however many rows match:
+
+- each batch of ``EXPORT_STREAM_BATCH_SIZE`` rows is mapped like the other
+  local contribution queries (raw_data fallbacks, see
+  fec_client.contribution_rows) and encoded in the thread pool
+- raw_data for the fallbacks is read on a second session, as the streaming
+  session must not run other statements
+- with ``compress`` the bytes are gzip-compressed on the fly
+"""
+import csv
+import io
+import json
+import logging
+import zlib
+from typing import Any, AsyncIterator, Callable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from sqlalchemy import and_, func
+
+from app.config import config
+from app.db.database import AsyncSessionLocal, Contribution
+from app.services.fec_client.contribution_rows import map_contribution_rows, select_contribution_columns
+from app.services.shared.chunked_processor import ChunkedProcessor
+from app.services.shared.query_builders import ContributionQueryBuilder
+from app.utils.thread_pool import run_in_thread_pool
+
+logger = logging.getLogger(__name__)
+
+# (CSV header, API-format key) of the exported columns
+EXPORT_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ('Contribution ID', 'contribution_id'),
+    ('Candidate ID', 'candidate_id'),
+    ('Committee ID', 'committee_id'),
+    ('Contributor Name', 'contributor_name'),
+    ('Contributor City', 'contributor_city'),
+    ('Contributor State', 'contributor_state'),
+    ('Contributor Zip', 'contributor_zip'),
+    ('Contributor Employer', 'contributor_employer'),
+    ('Contributor Occupation', 'contributor_occupation'),
+    ('Amount', 'contribution_amount'),
+    ('Date', 'contribution_date'),
+    ('Type', 'contribution_type'),
+    ('Receipt Type', 'receipt_type'),
+)
+
+EXPORT_MEDIA_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+async def contributions_condition(
+    candidate_id: Optional[str] = None,
+    committee_id: Optional[str] = None,
+    contributor_name: Optional[str] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    min_date: Optional[str] = None,
+    max_date: Optional[str] = None,
+    cycle: Optional[int] = None
+):
+    """WHERE clause of a contributions export (candidates include their committees)"""
+    builder = ContributionQueryBuilder().with_candidate(candidate_id).with_committee(committee_id)
+    builder.with_dates(min_date, max_date, cycle)
+    if contributor_name:
+        builder.conditions.append(Contribution.contributor_name.ilike(f"%{contributor_name}%"))
+    if min_amount is not None:
+        builder.conditions.append(Contribution.contribution_amount >= min_amount)
+    if max_amount is not None:
+        builder.conditions.append(Contribution.contribution_amount <= max_amount)
+    return await builder.build_where_clause()
+
+
+def out_of_state_condition(candidate_state: str):
+    """Contributions from donors outside candidate_state"""
+    return and_(
+        Contribution.contributor_state.isnot(None),
+        Contribution.contributor_state != '',
+        Contribution.contributor_state != 'Unknown',
+        func.upper(Contribution.contributor_state) != candidate_state.upper()
+    )
+
+
+def _csv_rows(frame: pd.DataFrame) -> List[List[Any]]:
+    columns = [frame[key].tolist() for _, key in EXPORT_COLUMNS]
+    return [list(row) for row in zip(*columns)]
+
+
+def encode_csv(frame: pd.DataFrame) -> bytes:
+    """CSV lines of a mapped batch (None as empty fields)"""
+    output = io.StringIO()
+    csv.writer(output).writerows(_csv_rows(frame))
+    return output.getvalue().encode('utf-8')
+
+
+def encode_ndjson(frame: pd.DataFrame) -> bytes:
+    """One JSON object per line for a mapped batch"""
+    keys = [key for _, key in EXPORT_COLUMNS]
+    lines = [json.dumps(dict(zip(keys, row)), default=str) for row in _csv_rows(frame)]
+    return ('\n'.join(lines) + '\n').encode('utf-8') if lines else b''
+
+
+def csv_header() -> bytes:
+    output = io.StringIO()
+    csv.writer(output).writerow([header for header, _ in EXPORT_COLUMNS])
+    return output.getvalue().encode('utf-8')
+
+
+async def stream_contribution_frames(
+    condition,
+    order_by: Sequence[Any],
+    candidate_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    batch_size: Optional[int] = None
+) -> AsyncIterator[pd.DataFrame]:
+    """
+    Mapped contributions matching condition, one batch at a time
+
+    Args:
+        condition: WHERE clause on contributions
+        order_by: ORDER BY of the export
+        candidate_id: Candidate for rows that have none
+        limit: Maximum number of rows (None = all)
+        batch_size: Rows per batch (default EXPORT_STREAM_BATCH_SIZE)
+
+    Yields:
+        API-format DataFrames (see map_contribution_rows)
+    """
+    processor = ChunkedProcessor(chunk_size=batch_size or config.EXPORT_STREAM_BATCH_SIZE)
+    query = select_contribution_columns().where(condition).order_by(*order_by)
+    async with AsyncSessionLocal() as session, AsyncSessionLocal() as raw_data_session:
+        chunks = processor.stream_chunks(session, query, max_records=limit, as_rows=True)
+        try:
+            async for rows in chunks:
+                yield await map_contribution_rows(
+                    raw_data_session, rows, candidate_id=candidate_id, as_frame=True
+                )
+        finally:
+            await chunks.aclose()
+
+
+async def stream_export(
+    frames: AsyncIterator[pd.DataFrame],
+    format: str = 'csv',
+    compress: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    Encode mapped batches as CSV (with header) or NDJSON, optionally gzipped
+
+    Errors after the first bytes cannot change the response status; they are
+    logged and re-raised, so the server aborts the response instead of ending
+    a truncated export cleanly.
+    """
+    encode: Callable[[pd.DataFrame], bytes] = encode_csv if format == 'csv' else encode_ndjson
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+
+    def output(data: bytes) -> bytes:
+        return compressor.compress(data) if compressor else data
+
+    rows = 0
+    try:
+        if format == 'csv':
+            yield output(csv_header())
+        async for frame in frames:
+            data = output(await run_in_thread_pool(encode, frame))
+            rows += len(frame)
+            if data:
+                yield data
+    except Exception as e:
+        logger.error(f"Contribution export stopped after {rows} rows: {e}", exc_info=True)
+        raise
+    finally:
+        await frames.aclose()
+    if compressor:
+        yield compressor.flush()
+    logger.info(f"Streamed contribution export: {rows} rows ({format}{', gzip' if compress else ''})")
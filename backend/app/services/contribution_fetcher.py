@@ -2,7 +2,7 @@
 Service for fetching contributions from FEC API and storing them in the database.
 
 This service handles:
-- Fetching all contributions from FEC API with pagination
+- Fetching all contributions from FEC API page by page (FECClient.iter_contributions)
 - Storing contributions in database (avoiding duplicates)
 - Triggering analysis refresh after storing new data
 """
@@ -29,48 +29,6 @@ class ContributionFetcherService:
         self.fec_client = fec_client
         self.analysis_service = analysis_service
     
-    async def fetch_all_contributions(
-        self,
-        candidate_id: Optional[str] = None,
-        committee_id: Optional[str] = None,
-        cycle: Optional[int] = None,
-        min_date: Optional[str] = None,
-        max_date: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """
-        Fetch all contributions from FEC API using pagination.
-        
-        Args:
-            candidate_id: Candidate ID to fetch contributions for
-            committee_id: Committee ID to fetch contributions for
-            cycle: Election cycle (two_year_transaction_period)
-            min_date: Minimum date filter
-            max_date: Maximum date filter
-            
-        Returns:
-            List of all contribution dictionaries from API
-        """
-        logger.info(
-            f"Fetching all contributions from API: "
-            f"candidate_id={candidate_id}, committee_id={committee_id}, cycle={cycle}"
-        )
-        
-        # Use the FEC client's get_contributions with fetch_all=True
-        # This will fetch all pages automatically
-        all_contributions = await self.fec_client.get_contributions(
-            candidate_id=candidate_id,
-            committee_id=committee_id,
-            min_date=min_date,
-            max_date=max_date,
-            limit=999999,  # Very large limit to get all
-            two_year_transaction_period=cycle,
-            fetch_new_only=False,  # Get all contributions, not just new ones
-            fetch_all=True  # Signal to fetch all pages
-        )
-        
-        logger.info(f"Fetched {len(all_contributions)} total contributions from API")
-        return all_contributions
-    
     async def store_contributions(self, contributions: List[Dict[str, Any]]) -> int:
         """
         Store contributions in database, avoiding duplicates.
@@ -129,8 +87,8 @@ class ContributionFetcherService:
         max_date: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Fetch all contributions from API and store them in database.
-        After storing, triggers analysis refresh.
+        Fetch all contributions from API and store them in database, one page
+        at a time. After storing, triggers analysis refresh.
         
         Args:
             candidate_id: Candidate ID to fetch contributions for
@@ -142,19 +100,19 @@ class ContributionFetcherService:
         Returns:
             Dictionary with fetch results and updated analysis
         """
-        # Fetch all contributions
-        contributions = await self.fetch_all_contributions(
+        # Stream all contributions from the API, storing each page while the next one downloads
+        fetched_count = 0
+        stored_count = 0
+        async for page in self.fec_client.iter_contributions(
             candidate_id=candidate_id,
             committee_id=committee_id,
-            cycle=cycle,
             min_date=min_date,
-            max_date=max_date
-        )
-        
-        fetched_count = len(contributions)
-        
-        # Store contributions
-        stored_count = await self.store_contributions(contributions)
+            max_date=max_date,
+            two_year_transaction_period=cycle
+        ):
+            fetched_count += len(page)
+            stored_count += await self.store_contributions(page)
+        logger.info(f"Fetched {fetched_count} contributions from API, stored {stored_count}")
         
         # Rerun analysis with updated data
         updated_analysis = None
@@ -2,7 +2,7 @@
 Service for managing FEC contribution limits by year and contributor category
 """
 import logging
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -169,6 +169,48 @@ class ContributionLimitsService:
             limit_type=self.LIMIT_TYPE_PER_ELECTION
         )
     
+    async def get_limits_table(
+        self,
+        recipient_category: str = RECIPIENT_CANDIDATE,
+        limit_type: str = LIMIT_TYPE_PER_ELECTION
+    ) -> Dict[Tuple[int, str], float]:
+        """
+        Load every limit for a recipient category and limit type in one query.
+    
+        Callers checking many contributions look limits up in this table with
+        ``lookup_limit`` instead of querying per contribution.
+    
+        Returns:
+            Mapping of (effective_year, contributor_category) to limit amount
+            (empty if the limits cannot be loaded)
+        """
+        try:
+            result = await self.db.execute(
+                select(
+                    ContributionLimit.effective_year,
+                    ContributionLimit.contributor_category,
+                    ContributionLimit.limit_amount
+                ).where(
+                    and_(
+                        ContributionLimit.recipient_category == recipient_category,
+                        ContributionLimit.limit_type == limit_type
+                    )
+                )
+            )
+            return {(year, category): float(amount) for year, category, amount in result.all()}
+        except Exception as e:
+            logger.error(f"Error loading contribution limits: {e}")
+            return {}
+    
+    def lookup_limit(
+        self,
+        limits: Dict[Tuple[int, str], float],
+        date: datetime,
+        contributor_category: str
+    ) -> Optional[float]:
+        """Limit for a date and contributor category from a ``get_limits_table`` table, or None"""
+        return limits.get((self._get_effective_year(date), contributor_category))
+    
     async def add_limit(
         self,
         effective_year: int,
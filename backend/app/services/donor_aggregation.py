@@ -1,17 +1,54 @@
 import re
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
+import numpy as np
+from app.services.shared.entity_resolution import UnionFind, similarity_matrix, sorted_neighbourhood_pairs
 from app.utils.date_utils import serialize_date
 from rapidfuzz import fuzz
 
 logger = logging.getLogger(__name__)
 
+_PUNCTUATION = re.compile(r'[^\w\s]')
+_WHITESPACE = re.compile(r'\s+')
+_NAME_SUFFIX = re.compile(r'\s+(jr|sr|ii|iii|iv|esq)\.?$', flags=re.IGNORECASE)
+_INITIAL = re.compile(r'\b([a-z])\.\s*')
+_EMPLOYER_SUFFIX = re.compile(r'\s+(inc|llc|corp|ltd|co)\.?$', flags=re.IGNORECASE)
+
+
+# Donor names, employers and occupations repeat across contributions, so the
+# normalizers are memoized
+@lru_cache(maxsize=262144)
+def _normalize_text(text: str) -> str:
+    # Lowercase, remove extra whitespace, remove punctuation
+    text = text.lower().strip()
+    text = _PUNCTUATION.sub('', text)
+    return _WHITESPACE.sub(' ', text)
+
+
+@lru_cache(maxsize=262144)
+def _normalize_name(name: str) -> str:
+    normalized = _normalize_text(name)
+    # Remove common suffixes
+    normalized = _NAME_SUFFIX.sub('', normalized)
+    # Handle initials (e.g., "J. Smith" -> "j smith")
+    return _INITIAL.sub(r'\1 ', normalized)
+
+
+@lru_cache(maxsize=262144)
+def _normalize_employer(employer: str) -> str:
+    # Remove common business suffixes
+    return _EMPLOYER_SUFFIX.sub('', _normalize_text(employer))
+
 
 class DonorAggregationService:
     """Service for aggregating contributions from the same donor across name variations"""
     
+    # Largest employer/occupation similarity matrix scored at once
+    MAX_MATRIX_CELLS = 1_000_000
+    
     def __init__(
         self,
         name_similarity_threshold: float = 0.85,
@@ -34,31 +71,19 @@ class DonorAggregationService:
         """Normalize text for comparison"""
         if not text:
             return ""
-        # Lowercase, remove extra whitespace, remove punctuation
-        text = str(text).lower().strip()
-        text = re.sub(r'[^\w\s]', '', text)
-        text = re.sub(r'\s+', ' ', text)
-        return text
+        return _normalize_text(str(text))
     
     def normalize_name(self, name: Optional[str]) -> str:
         """Normalize name for better matching"""
         if not name:
             return ""
-        normalized = self.normalize_text(name)
-        # Remove common suffixes
-        normalized = re.sub(r'\s+(jr|sr|ii|iii|iv|esq)\.?$', '', normalized, flags=re.IGNORECASE)
-        # Handle initials (e.g., "J. Smith" -> "j smith")
-        normalized = re.sub(r'\b([a-z])\.\s*', r'\1 ', normalized)
-        return normalized
+        return _normalize_name(str(name))
     
     def normalize_employer(self, employer: Optional[str]) -> str:
         """Normalize employer name"""
         if not employer:
             return ""
-        normalized = self.normalize_text(employer)
-        # Remove common business suffixes
-        normalized = re.sub(r'\s+(inc|llc|corp|ltd|co)\.?$', '', normalized, flags=re.IGNORECASE)
-        return normalized
+        return _normalize_employer(str(employer))
     
     def create_donor_key(self, contrib: Dict[str, Any], strategy: str = "exact") -> str:
         """
@@ -130,6 +155,93 @@ class DonorAggregationService:
         
         return min(1.0, max(0.0, confidence))
     
+    def _group_fields(self, contribs: List[Dict[str, Any]]) -> Tuple[str, str, str, str]:
+        """Normalized (name, state, employer, occupation) of a group's first contribution"""
+        canonical = contribs[0] if contribs else {}
+        return (
+            self.normalize_name(canonical.get('contributor_name', '')),
+            self.normalize_text(canonical.get('contributor_state', '')),
+            self.normalize_employer(canonical.get('contributor_employer', '')),
+            self.normalize_text(canonical.get('contributor_occupation', '')),
+        )
+    
+    def _confidence_matrix(
+        self,
+        name_sim: float,
+        state_match: bool,
+        employer_sim: np.ndarray,
+        occupation_sim: np.ndarray
+    ) -> np.ndarray:
+        """calculate_match_confidence for every employer/occupation pair of two name groups"""
+        confidence = name_sim * 0.4 + (0.3 if state_match else 0.0) + employer_sim * 0.2 + occupation_sim * 0.1
+        if name_sim < self.name_similarity_threshold:
+            confidence = confidence * 0.5
+        if not state_match:
+            confidence = confidence * 0.7
+        return np.clip(confidence, 0.0, 1.0)
+    
+    def _link_groups(
+        self,
+        clusters: UnionFind,
+        fields: List[Tuple[str, str, str, str]],
+        left: List[int],
+        right: List[int],
+        name_sim: float,
+        state_match: bool
+    ):
+        """Union every pair of groups from left x right whose confidence reaches the threshold"""
+        right_employers = [fields[g][2] for g in right]
+        right_occupations = [fields[g][3] for g in right]
+        step = max(1, self.MAX_MATRIX_CELLS // len(right))
+        for start in range(0, len(left), step):
+            rows_groups = left[start:start + step]
+            confidence = self._confidence_matrix(
+                name_sim,
+                state_match,
+                similarity_matrix([fields[g][2] for g in rows_groups], right_employers),
+                similarity_matrix([fields[g][3] for g in rows_groups], right_occupations)
+            )
+            rows, cols = np.nonzero(confidence >= self.name_similarity_threshold)
+            for row, col in zip(rows, cols):
+                clusters.union(rows_groups[row], right[col])
+    
+    def cluster_donor_groups(self, groups: List[List[Dict[str, Any]]]) -> List[List[int]]:
+        """
+        Cluster donor groups that are likely the same donor
+        
+        Groups are blocked by state (groups in different states cannot reach the
+        default threshold) and, within a state, candidate name pairs come from
+        sorted-neighbourhood blocking scored with ``rapidfuzz.process.cdist``.
+        Only name pairs at or above ``name_similarity_threshold`` are scored
+        further, since lower name similarity halves the confidence. Matches are
+        merged transitively.
+        
+        Args:
+            groups: Lists of contributions, each list one donor group
+        
+        Returns:
+            Clusters as lists of group indexes, each sorted and ordered by first index
+        """
+        fields = [self._group_fields(contribs) for contribs in groups]
+        clusters = UnionFind(len(groups))
+        
+        by_state: Dict[str, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+        for index, (name, state, _, _) in enumerate(fields):
+            if name:
+                by_state[state][name].append(index)
+        
+        for state, by_name in by_state.items():
+            names = list(by_name)
+            name_pairs = sorted_neighbourhood_pairs(names, score_cutoff=self.name_similarity_threshold * 100)
+            # Groups with the same name (differing employer/occupation) are candidates too
+            name_pairs.update({(i, i): 100.0 for i, name in enumerate(names) if len(by_name[name]) > 1})
+            for (a, b), score in name_pairs.items():
+                self._link_groups(
+                    clusters, fields, by_name[names[a]], by_name[names[b]], score / 100.0, bool(state)
+                )
+        
+        return clusters.clusters()
+    
     def merge_similar_donors(
         self,
         donor_groups: Dict[str, List[Dict[str, Any]]]
@@ -141,44 +253,14 @@ class DonorAggregationService:
             donor_groups: Dictionary mapping donor keys to lists of contributions
         
         Returns:
-            Merged donor groups
+            Merged donor groups, keyed by the first key of each cluster
         """
-        merged = {}
-        processed_keys = set()
-        
-        # Convert to list of (key, contributions) for easier processing
-        groups = list(donor_groups.items())
-        
-        for i, (key1, contribs1) in enumerate(groups):
-            if key1 in processed_keys:
-                continue
-            
-            # Use first contribution as canonical
-            canonical1 = contribs1[0] if contribs1 else {}
-            merged_key = key1
-            merged_contribs = contribs1.copy()
-            
-            # Check for similar groups
-            for j, (key2, contribs2) in enumerate(groups[i+1:], start=i+1):
-                if key2 in processed_keys:
-                    continue
-                
-                canonical2 = contribs2[0] if contribs2 else {}
-                confidence = self.calculate_match_confidence(canonical1, canonical2)
-                
-                # Merge if confidence is high enough
-                if confidence >= self.name_similarity_threshold:
-                    # Use the key with more complete information
-                    if len(merged_key.split('|')) < len(key2.split('|')):
-                        merged_key = key2
-                    
-                    merged_contribs.extend(contribs2)
-                    processed_keys.add(key2)
-            
-            merged[merged_key] = merged_contribs
-            processed_keys.add(key1)
-        
-        return merged
+        keys = list(donor_groups)
+        groups = [donor_groups[key] for key in keys]
+        return {
+            keys[cluster[0]]: [contrib for index in cluster for contrib in groups[index]]
+            for cluster in self.cluster_donor_groups(groups)
+        }
     
     def aggregate_donors(
         self,
@@ -208,14 +290,18 @@ class DonorAggregationService:
         logger.debug(f"Initial grouping: {initial_count} donor groups")
         
         # Second pass: merge similar donors using fuzzy matching
-        merged_groups = self.merge_similar_donors(dict(donor_groups))
+        keys = list(donor_groups)
+        groups = [donor_groups[key] for key in keys]
+        clusters = self.cluster_donor_groups(groups)
         
-        final_count = len(merged_groups)
+        final_count = len(clusters)
         logger.info(f"After merging: {final_count} unique donors (reduced from {initial_count})")
         
         # Build aggregated donor objects
         aggregated = []
-        for key, contribs in merged_groups.items():
+        for cluster in clusters:
+            key = keys[cluster[0]]
+            contribs = [contrib for index in cluster for contrib in groups[index]]
             if not contribs:
                 continue
             
@@ -249,7 +335,7 @@ class DonorAggregationService:
                             if 'T' in date_str:
                                 parsed = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
                             elif len(date_str) == 10 and date_str.count('-') == 2:
-                                parsed = datetime.strptime(date_str, '%Y-%m-%d')
+                                parsed = datetime.fromisoformat(date_str)
                             else:
                                 # Try other common formats
                                 parsed = datetime.fromisoformat(date_str)
@@ -270,13 +356,15 @@ class DonorAggregationService:
                 sample_contrib = contribs[0]
                 logger.debug(f"Sample contribution date fields: contribution_date={sample_contrib.get('contribution_date')}, contribution_receipt_date={sample_contrib.get('contribution_receipt_date')}")
             
-            # Calculate match confidence (average of all pairwise confidences)
+            # Calculate match confidence (average confidence of the other contributions
+            # against the canonical record). Contributions of an exact-key group share
+            # their normalized fields, so one comparison per group covers all of them.
             if len(contribs) > 1:
-                confidences = []
-                for i, c1 in enumerate(contribs):
-                    for c2 in contribs[i+1:]:
-                        confidences.append(self.calculate_match_confidence(c1, c2))
-                match_confidence = sum(confidences) / len(confidences) if confidences else 1.0
+                total_confidence = sum(
+                    len(groups[index]) * self.calculate_match_confidence(groups[index][0], canonical)
+                    for index in cluster
+                ) - self.calculate_match_confidence(canonical, canonical)
+                match_confidence = total_confidence / (len(contribs) - 1)
             else:
                 match_confidence = 1.0
             
@@ -2,21 +2,38 @@
 Simplified Donor Search Service
 
 Provides reliable, simple donor search functionality.
+
+Searches read the pre-aggregated ``contributor_rollups`` table when it is
+filled (see ``app.services.shared.contributor_rollups``) and otherwise
+aggregate the contributions table. Names are matched with the contributor
+name trigram index (see ``app.services.shared.contributor_index``) when it
+exists, and with ``ILIKE`` scans otherwise.
 """
 import asyncio
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from app.db.database import Contribution, AsyncSessionLocal
-from app.services.shared.exceptions import DonorSearchError, QueryTimeoutError
+from sqlalchemy import select, func, and_
+from app.db.database import Contribution, ContributorRollup, AsyncSessionLocal
+from app.services.shared.contributor_index import is_contributor_index_available, matching_names_query
+from app.services.shared.contributor_rollups import are_rollups_ready
+from app.services.shared.exceptions import DonorSearchError, QueryTimeoutError, FTS5UnavailableError
 
 logger = logging.getLogger(__name__)
 
 
 class DonorSearchService:
     """Simple service for searching unique contributors/donors"""
-    
+
+    def __init__(self, session: Optional[AsyncSession] = None):
+        """
+        Initialize donor search service
+
+        Args:
+            session: Optional database session; a new session is opened per search if omitted
+        """
+        self.session = session
+
     async def search_unique_contributors(
         self,
         search_term: str,
@@ -25,97 +42,41 @@ class DonorSearchService:
     ) -> List[Dict[str, Any]]:
         """
         Search for unique contributors matching the search term.
-        
-        Uses a simple ilike query with proper timeout and error handling.
-        
+
+        Every word of the search term must appear in the contributor name
+        (case-insensitive). Uses the trigram name index when available.
+
         Args:
             search_term: Search term for contributor name
             limit: Maximum number of results to return
             timeout: Maximum time for search operation (default: 10s)
-            
+
         Returns:
             List of contributor dicts with keys: name, total_amount, contribution_count
-            
+
         Raises:
             DonorSearchError: If search fails
             QueryTimeoutError: If query times out
         """
         search_term = search_term.strip()
-        
+
         if not search_term or len(search_term) > 200:
             raise DonorSearchError(
                 f"Search term must be between 1 and 200 characters",
                 search_term=search_term
             )
-        
+
         # Sanitize search term to prevent SQL injection
         search_term = search_term.replace(";", "").replace("--", "").replace("/*", "").replace("*/", "")
-        
+
         logger.info(f"Searching for donors matching '{search_term}' (limit={limit})")
-        
+
         try:
+            if self.session is not None:
+                return await self._search(self.session, search_term, limit, timeout)
             async with AsyncSessionLocal() as session:
-                # For multi-word searches, match all words (AND logic)
-                # This handles full names like "Angela Smith" or "Fredericksburg Tea Party"
-                search_words = search_term.split()
-                
-                if len(search_words) > 1:
-                    # Multi-word: all words must be present (case-insensitive)
-                    # This handles "Angela Smith" matching "Smith, Angela" or "Angela M. Smith"
-                    from sqlalchemy import and_
-                    conditions = [
-                        Contribution.contributor_name.ilike(f"%{word}%")
-                        for word in search_words
-                    ]
-                    name_condition = and_(*conditions)
-                else:
-                    # Single word: simple substring match
-                    name_condition = Contribution.contributor_name.ilike(f"%{search_term}%")
-                
-                query = select(
-                    Contribution.contributor_name,
-                    func.sum(Contribution.contribution_amount).label('total_amount'),
-                    func.count(Contribution.id).label('contribution_count')
-                ).where(
-                    name_condition
-                ).where(
-                    Contribution.contributor_name.isnot(None),
-                    Contribution.contributor_name != ''
-                ).group_by(
-                    Contribution.contributor_name
-                ).order_by(
-                    func.sum(Contribution.contribution_amount).desc()
-                ).limit(limit)
-                
-                # Execute with timeout
-                result = await asyncio.wait_for(
-                    session.execute(query),
-                    timeout=timeout
-                )
-                
-                rows = result.fetchall()
-                logger.info(f"Search completed, found {len(rows)} unique contributors")
-                
-                # Process results
-                contributors = []
-                for row in rows:
-                    try:
-                        name = row.contributor_name
-                        total = row.total_amount or 0
-                        count = row.contribution_count or 0
-                        
-                        if name:
-                            contributors.append({
-                                "name": str(name),
-                                "total_amount": float(total),
-                                "contribution_count": int(count)
-                            })
-                    except Exception as e:
-                        logger.warning(f"Error processing result row: {e}")
-                        continue
-                
-                return contributors
-                
+                return await self._search(session, search_term, limit, timeout)
+
         except asyncio.TimeoutError:
             logger.error(f"Search timed out after {timeout}s for '{search_term}'")
             raise QueryTimeoutError(
@@ -131,3 +92,146 @@ class DonorSearchService:
                 f"Failed to search donors: {str(e)}",
                 search_term=search_term
             )
+
+    async def _search(
+        self,
+        session: AsyncSession,
+        search_term: str,
+        limit: int,
+        timeout: float
+    ) -> List[Dict[str, Any]]:
+        """Search the rollups or the name index, falling back to a substring scan"""
+        if await are_rollups_ready(session):
+            return await self._search_rollups(session, search_term, limit, timeout)
+        try:
+            return await self._search_with_index(session, search_term, limit, timeout)
+        except FTS5UnavailableError:
+            return await self._search_with_substring(session, search_term, limit, timeout)
+
+    async def _search_with_index(
+        self,
+        session: AsyncSession,
+        search_term: str,
+        limit: int = 100,
+        timeout: float = 10.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Find matching names in the trigram index, then aggregate only their contributions.
+
+        Raises:
+            FTS5UnavailableError: If the index has not been created in this database
+        """
+        if not await is_contributor_index_available(session):
+            raise FTS5UnavailableError(search_term=search_term)
+
+        dialect_name = session.get_bind().dialect.name
+        matching_names = matching_names_query(dialect_name, search_term.split())
+        query = self._aggregate_query(Contribution.contributor_name.in_(matching_names), limit)
+        return await self._execute(session, query, timeout)
+
+    async def _search_with_substring(
+        self,
+        session: AsyncSession,
+        search_term: str,
+        limit: int = 100,
+        timeout: float = 10.0
+    ) -> List[Dict[str, Any]]:
+        """Match every word with ILIKE '%word%' (scans contributions)"""
+        # For multi-word searches, match all words (AND logic)
+        # This handles "Angela Smith" matching "Smith, Angela" or "Angela M. Smith"
+        conditions = [
+            Contribution.contributor_name.ilike(f"%{word}%")
+            for word in search_term.split()
+        ]
+        query = self._aggregate_query(and_(*conditions), limit)
+        return await self._execute(session, query, timeout)
+
+    async def _search_rollups(
+        self,
+        session: AsyncSession,
+        search_term: str,
+        limit: int = 100,
+        timeout: float = 10.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Sum contributor_rollups rows of the matching names.
+
+        Names are grouped by their normalized key, so spellings that differ
+        only in case or surrounding whitespace are one contributor.
+        """
+        words = search_term.split()
+        if await is_contributor_index_available(session):
+            dialect_name = session.get_bind().dialect.name
+            matching = matching_names_query(dialect_name, words).subquery()
+            name_condition = ContributorRollup.name_key.in_(
+                select(func.upper(func.trim(matching.c.name)))
+            )
+        else:
+            # name_key is upper case, so LIKE matches case-insensitively on every dialect
+            name_condition = and_(*[ContributorRollup.name_key.like(f"%{word.upper()}%") for word in words])
+
+        query = select(
+            func.min(ContributorRollup.contributor_name),
+            func.sum(ContributorRollup.total_amount).label('total_amount'),
+            func.sum(ContributorRollup.contribution_count).label('contribution_count')
+        ).where(
+            name_condition,
+            ContributorRollup.contribution_count > 0
+        ).group_by(
+            ContributorRollup.name_key
+        ).order_by(
+            func.sum(ContributorRollup.total_amount).desc()
+        ).limit(limit)
+        return await self._execute(session, query, timeout)
+
+    def _aggregate_query(self, name_condition, limit: int):
+        """Contributors matching name_condition, ordered by total amount"""
+        return select(
+            Contribution.contributor_name,
+            func.sum(Contribution.contribution_amount).label('total_amount'),
+            func.count(Contribution.id).label('contribution_count')
+        ).where(
+            name_condition
+        ).where(
+            Contribution.contributor_name.isnot(None),
+            Contribution.contributor_name != ''
+        ).group_by(
+            Contribution.contributor_name
+        ).order_by(
+            func.sum(Contribution.contribution_amount).desc()
+        ).limit(limit)
+
+    async def _execute(self, session: AsyncSession, query, timeout: float) -> List[Dict[str, Any]]:
+        """Execute a search query with timeout"""
+        result = await asyncio.wait_for(
+            session.execute(query),
+            timeout=timeout
+        )
+
+        rows = result.fetchall()
+        logger.info(f"Search completed, found {len(rows)} unique contributors")
+        return self._process_query_results(rows)
+
+    def _process_query_results(self, rows) -> List[Dict[str, Any]]:
+        """Convert (name, total_amount, contribution_count) rows into contributor dicts"""
+        contributors = []
+        for row in rows:
+            try:
+                if isinstance(row, dict):
+                    name = row.get('contributor_name') or row.get('name')
+                    total = row.get('total_amount') or 0
+                    count = row.get('contribution_count') or 0
+                else:
+                    name, total, count = row[0], row[1] or 0, row[2] or 0
+
+                if name:
+                    contributors.append({
+                        "name": str(name),
+                        "total_amount": float(total),
+                        "contribution_count": int(count)
+                    })
+            except Exception as e:
+                logger.warning(f"Error processing result row: {e}")
+                continue
+
+        return contributors
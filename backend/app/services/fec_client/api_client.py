@@ -4,10 +4,11 @@ HTTP client for FEC API requests
 import asyncio
 import httpx
 import logging
-from typing import Dict, Any, Optional
+from collections import deque
+from typing import Dict, Any, AsyncIterator, Deque, List, Optional, Tuple
 from app.services.shared.exceptions import FECAPIError, RateLimitError
 from .rate_limiter import RateLimiter
-from .cache import CacheManager
+from .cache import CacheManager, cover_request, is_complete
 
 logger = logging.getLogger(__name__)
 
@@ -89,176 +90,390 @@ class APIClient:
         if cache_ttl is None:
             cache_ttl = self.cache_manager.get_cache_ttl(endpoint)
         
-        # Check cache first
-        cache_key = None
-        cached_data = None
-        if use_cache:
-            cache_key = self.cache_manager.generate_cache_key(endpoint, params)
+        if not use_cache:
+            return await self._fetch(endpoint, params, None, cache_ttl, max_retries)
+        
+        limit = params.get("_original_limit")
+        cache_key = self.cache_manager.generate_cache_key(endpoint, params)
+        
+        # Memory tier first (no I/O). A cached response covering more results than
+        # requested (e.g. limit=1000 for a limit=500 request) is sliced.
+        cached_data = await self.cache_manager.get_from_cache(cache_key, include_database=False)
+        if cached_data is not None:
+            covered = cover_request(cached_data, limit)
+            if covered is not None:
+                await self._revalidate_if_stale(endpoint, params, cache_key, cache_ttl, cached_data, max_retries)
+                return covered
+        
+        # Request deduplication - identical requests share one database read and one API call
+        in_flight = self._in_flight_requests.get(cache_key)
+        if in_flight is not None:
+            try:
+                logger.debug(f"Waiting for in-flight request: {cache_key}")
+                covered = cover_request(await asyncio.shield(in_flight), limit)
+                if covered is not None:
+                    return covered
+            except Exception as e:
+                logger.warning(f"In-flight request failed: {e}")
+        
+        request_task = asyncio.create_task(self._load_or_fetch(
+            endpoint, params, cache_key, cache_ttl, max_retries,
+            # The database holds the same entry as memory, so re-reading it cannot help
+            read_database=cached_data is None
+        ))
+        self._register_in_flight(cache_key, request_task)
+        data = await asyncio.shield(request_task)
+        covered = cover_request(data, limit)
+        return data if covered is None else covered
+    
+    def _register_in_flight(self, cache_key: str, task: asyncio.Task):
+        """Track ``task`` as the in-flight request for ``cache_key`` until it finishes"""
+        self._in_flight_requests[cache_key] = task
+        
+        def forget(done: asyncio.Task):
+            if self._in_flight_requests.get(cache_key) is done:
+                del self._in_flight_requests[cache_key]
+            if not done.cancelled() and done.exception() is not None:
+                logger.debug(f"Request for {cache_key} failed: {done.exception()}")
+        
+        task.add_done_callback(forget)
+    
+    async def _load_or_fetch(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        cache_key: str,
+        cache_ttl: int,
+        max_retries: int,
+        read_database: bool = True
+    ) -> Dict:
+        """Cached response from the database if it covers the request, otherwise fetch it"""
+        if read_database:
             cached_data = await self.cache_manager.get_from_cache(cache_key)
-            
-            # Request deduplication - check if same request is in flight
-            if cache_key in self._in_flight_requests:
-                try:
-                    logger.debug(f"Waiting for in-flight request: {cache_key}")
-                    return await self._in_flight_requests[cache_key]
-                except Exception as e:
-                    logger.warning(f"In-flight request failed: {e}")
-                    self._in_flight_requests.pop(cache_key, None)
-            
-            # Stale-while-revalidate: return cached data immediately if available
-            if cached_data:
-                # Check if cache is stale but not expired (for background refresh)
-                is_stale = await self.cache_manager.check_cache_staleness(cache_key, cache_ttl)
-                if is_stale:
-                    # Trigger background refresh (don't wait)
-                    asyncio.create_task(self._refresh_cache_in_background(
-                        endpoint, params, cache_key, cache_ttl, get_api_key_func
-                    ))
+            if cached_data is not None and cover_request(cached_data, params.get("_original_limit")) is not None:
+                await self._revalidate_if_stale(endpoint, params, cache_key, cache_ttl, cached_data, max_retries)
                 return cached_data
+        return await self._fetch(endpoint, params, cache_key, cache_ttl, max_retries)
+    
+    async def _revalidate_if_stale(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        cache_key: str,
+        cache_ttl: int,
+        cached_data: Dict,
+        max_retries: int = 3
+    ):
+        """
+        Stale-while-revalidate: when the cached response is stale but not expired,
+        refresh it in the background (as many results as it holds, so a request
+        for fewer does not shrink it)
+        """
+        if cache_key in self._in_flight_requests:
+            return
+        if not await self.cache_manager.check_cache_staleness(cache_key, cache_ttl):
+            return
         
-        # Create request task for deduplication
-        async def _do_request():
-            # Use semaphore to limit concurrent requests
-            async with self.rate_limiter.get_semaphore():
-                # Wait for rate limit
-                await self.rate_limiter.wait_for_rate_limit()
-                
-                # Make request with retry logic for rate limits
-                url = f"{self.base_url}/{endpoint}"
-                last_exception = None
-                
-                for attempt in range(max_retries):
-                    try:
-                        response = await self.client.get(url, params=params)
-                        
-                        # Handle rate limit (429) with retry
-                        if response.status_code == 429:
-                            if attempt < max_retries - 1:
-                                wait_time = self.rate_limiter.get_retry_delay(attempt)
-                                await asyncio.sleep(wait_time)
-                                continue
-                            else:
-                                # Last attempt failed, try to return cached data if available
-                                if cache_key:
-                                    cached_data = await self.cache_manager.get_from_cache(cache_key)
-                                    if cached_data:
-                                        return cached_data
-                                
-                                error_detail = "Rate limit exceeded. Please try again later."
-                                try:
-                                    error_data = response.json()
-                                    if isinstance(error_data, dict):
-                                        if "message" in error_data:
-                                            error_detail = error_data["message"]
-                                        elif "error" in error_data:
-                                            error_detail = error_data["error"]
-                                except Exception:
-                                    pass
-                                raise RateLimitError(error_detail)
-                        
-                        response.raise_for_status()
-                        data = response.json()
-                        
-                        # Handle pagination if needed
-                        max_results = params.get("_original_limit")
-                        if "pagination" in data and data["pagination"].get("pages", 0) > 1:
-                            data = await self._handle_pagination(endpoint, params.copy(), data, max_results)
-                        
-                        # Save to cache on success
-                        if use_cache and cache_key:
-                            await self.cache_manager.save_to_cache(cache_key, data, cache_ttl)
-                        
-                        return data
-                        
-                    except httpx.HTTPStatusError as e:
-                        if e.response.status_code == 429:
-                            last_exception = e
-                            if attempt < max_retries - 1:
-                                wait_time = self.rate_limiter.get_retry_delay(attempt)
-                                await asyncio.sleep(wait_time)
-                                continue
+        refresh_params = dict(params)
+        results = cached_data.get("results") if isinstance(cached_data, dict) else None
+        if isinstance(results, list):
+            refresh_params["_original_limit"] = None if is_complete(cached_data) else max(
+                len(results), params.get("_original_limit") or 0
+            )
+        logger.debug(f"Background refresh for {endpoint}")
+        self._register_in_flight(cache_key, asyncio.create_task(
+            self._fetch(endpoint, refresh_params, cache_key, cache_ttl, max_retries)
+        ))
+    
+    async def _fetch(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        cache_key: Optional[str],
+        cache_ttl: int,
+        max_retries: int = 3
+    ) -> Dict:
+        """Request ``endpoint`` (all pages, up to ``_original_limit``) and cache the response"""
+        data, fresh = await self._fetch_first_page(endpoint, params, cache_key, max_retries)
+        if not fresh:
+            return data
+        
+        # Handle pagination if needed (outside the semaphore: page requests acquire it themselves)
+        max_results = params.get("_original_limit")
+        if "pagination" in data and data["pagination"].get("pages", 0) > 1:
+            data = await self._handle_pagination(endpoint, params.copy(), data, max_results)
+        
+        # Save to cache on success
+        if cache_key:
+            await self.cache_manager.save_to_cache(cache_key, data, cache_ttl)
+        
+        return data
+    
+    async def _fetch_first_page(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        cache_key: Optional[str],
+        max_retries: int = 3
+    ) -> Tuple[Dict, bool]:
+        """First page and whether it is fresh (False: cached data returned after rate limiting)"""
+        # Use semaphore to limit concurrent requests
+        async with self.rate_limiter.get_semaphore():
+            # Make request with retry logic for rate limits
+            url = f"{self.base_url}/{endpoint}"
+            last_exception = None
+            
+            for attempt in range(max_retries):
+                try:
+                    response = await self._send(url, params)
+                    
+                    # Handle rate limit (429) with retry (the rate limiter paused the key,
+                    # so the retry waits for it or goes out with another key)
+                    if response.status_code == 429:
+                        if attempt < max_retries - 1:
+                            continue
                         else:
-                            error_detail = f"FEC API error: {e.response.status_code}"
+                            # Last attempt failed, try to return cached data if available
+                            if cache_key:
+                                cached_data = await self.cache_manager.get_from_cache(cache_key)
+                                if cached_data:
+                                    return cached_data, False
+                            
+                            error_detail = "Rate limit exceeded. Please try again later."
                             try:
-                                error_data = e.response.json()
+                                error_data = response.json()
                                 if isinstance(error_data, dict):
                                     if "message" in error_data:
-                                        error_detail = f"FEC API error: {error_data['message']}"
+                                        error_detail = error_data["message"]
                                     elif "error" in error_data:
-                                        error_detail = f"FEC API error: {error_data['error']}"
+                                        error_detail = error_data["error"]
                             except Exception:
                                 pass
-                            raise FECAPIError(error_detail, status_code=e.response.status_code) from e
-                    except (httpx.RequestError, httpx.TimeoutException) as e:
+                            raise RateLimitError(error_detail)
+                    
+                    response.raise_for_status()
+                    return response.json(), True
+                
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code == 429:
                         last_exception = e
-                        # Retry on network errors (transient)
                         if attempt < max_retries - 1:
-                            wait_time = 0.5 * (2 ** attempt)  # Exponential backoff for network errors
-                            logger.debug(f"Network error in API request, retrying in {wait_time}s (attempt {attempt + 1}/{max_retries})")
+                            wait_time = self.rate_limiter.get_retry_delay(attempt)
                             await asyncio.sleep(wait_time)
                             continue
-                        else:
-                            raise FECAPIError(f"Failed to connect to FEC API after {max_retries} attempts: {str(e)}") from e
-                
-                # All retries exhausted
-                if last_exception:
-                    # Try to return cached data as fallback
-                    if cache_key:
-                        cached_data = await self.cache_manager.get_from_cache(cache_key)
-                        if cached_data:
-                            return cached_data
-                    
-                    error_detail = "Rate limit exceeded. Please try again later."
-                    try:
-                        if hasattr(last_exception, 'response') and last_exception.response:
-                            error_data = last_exception.response.json()
-                            if isinstance(error_data, dict) and "message" in error_data:
-                                error_detail = error_data["message"]
-                    except Exception:
-                        pass
-                    raise RateLimitError(error_detail)
+                    else:
+                        error_detail = f"FEC API error: {e.response.status_code}"
+                        try:
+                            error_data = e.response.json()
+                            if isinstance(error_data, dict):
+                                if "message" in error_data:
+                                    error_detail = f"FEC API error: {error_data['message']}"
+                                elif "error" in error_data:
+                                    error_detail = f"FEC API error: {error_data['error']}"
+                        except Exception:
+                            pass
+                        raise FECAPIError(error_detail, status_code=e.response.status_code) from e
+                except (httpx.RequestError, httpx.TimeoutException) as e:
+                    last_exception = e
+                    # Retry on network errors (transient)
+                    if attempt < max_retries - 1:
+                        wait_time = 0.5 * (2 ** attempt)  # Exponential backoff for network errors
+                        logger.debug(f"Network error in API request, retrying in {wait_time}s (attempt {attempt + 1}/{max_retries})")
+                        await asyncio.sleep(wait_time)
+                        continue
+                    else:
+                        raise FECAPIError(f"Failed to connect to FEC API after {max_retries} attempts: {str(e)}") from e
+            
+            # All retries exhausted
+            if last_exception:
+                # Try to return cached data as fallback
+                if cache_key:
+                    cached_data = await self.cache_manager.get_from_cache(cache_key)
+                    if cached_data:
+                        return cached_data, False
                 
-                raise FECAPIError("Unexpected error in API request")
-        
-        # Register request for deduplication
-        if cache_key and use_cache:
-            request_task = asyncio.create_task(_do_request())
-            self._in_flight_requests[cache_key] = request_task
+                error_detail = "Rate limit exceeded. Please try again later."
+                try:
+                    if hasattr(last_exception, 'response') and last_exception.response:
+                        error_data = last_exception.response.json()
+                        if isinstance(error_data, dict) and "message" in error_data:
+                            error_detail = error_data["message"]
+                except Exception:
+                    pass
+                raise RateLimitError(error_detail)
             
-            try:
-                result = await request_task
-                return result
-            finally:
-                # Clean up
-                self._in_flight_requests.pop(cache_key, None)
-        else:
-            # No cache, just execute directly
-            return await _do_request()
+            raise FECAPIError("Unexpected error in API request")
+    
+    async def _send(self, url: str, params: Dict[str, Any]) -> httpx.Response:
+        """
+        GET ``url`` once the rate limiter allows it, with the API key it picks;
+        the response's rate limit headers update that key's budget
+        """
+        api_key = await self.rate_limiter.wait_for_rate_limit(params.get("api_key"))
+        if api_key:
+            params = {**params, "api_key": api_key}
+        sent_at = self.rate_limiter.clock()
+        response = await self.client.get(url, params=params)
+        self.rate_limiter.record_response(api_key, response.status_code, response.headers, sent_at)
+        return response
     
-    async def _refresh_cache_in_background(
+    async def _fetch_page(self, url: str, params: Dict[str, Any], max_retries: int = 3) -> Dict:
+        """Fetch one page within the rate limit, retrying rate-limited (429) responses"""
+        for attempt in range(max_retries):
+            async with self.rate_limiter.get_semaphore():
+                response = await self._send(url, params)
+            if response.status_code == 429 and attempt < max_retries - 1:
+                continue
+            response.raise_for_status()
+            return response.json()
+    
+    async def iter_pages(
         self,
         endpoint: str,
         params: Dict[str, Any],
-        cache_key: str,
-        cache_ttl: int,
-        get_api_key_func
-    ):
-        """Refresh cache in background without blocking"""
+        get_api_key_func,
+        max_results: Optional[int] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Stream the results of a paginated endpoint one page at a time (uncached)
+        
+        Args:
+            endpoint: API endpoint path
+            params: Request parameters
+            get_api_key_func: Async function to get API key
+            max_results: Stop after this many results (None = all pages)
+        
+        Yields:
+            The results of each page, in order
+        """
+        await self.ensure_api_key(get_api_key_func)
+        params = {k: v for k, v in params.items() if k != "_original_limit"}
+        params["api_key"] = self.api_key
+        params["per_page"] = min(max(1, params.get("per_page", 100)), 100)
+        
+        first_page = await self._fetch_page(f"{self.base_url}/{endpoint}", params)
+        results = first_page.get("results", [])
+        if max_results is not None:
+            results = results[:max_results]
+        if not results:
+            return
+        yield results
+        if max_results is not None and len(results) >= max_results:
+            return
+        
+        pages = self._iter_remaining_pages(
+            endpoint, params, first_page,
+            None if max_results is None else max_results - len(results)
+        )
         try:
-            # Remove API key from params for cache key generation
-            params_copy = {k: v for k, v in params.items() if k != "api_key"}
-            cache_key_check = self.cache_manager.generate_cache_key(endpoint, params_copy)
-            
-            # Only refresh if not already in flight
-            if cache_key_check not in self._in_flight_requests:
-                logger.debug(f"Background refresh for {endpoint}")
-                # Make request without waiting
-                asyncio.create_task(self.make_request(
-                    endpoint, params_copy, get_api_key_func,
-                    use_cache=True, cache_ttl=cache_ttl
-                ))
-        except Exception as e:
-            logger.debug(f"Background refresh failed (non-critical): {e}")
+            async for page_results in pages:
+                yield page_results
+        finally:
+            await pages.aclose()
+    
+    def _iter_remaining_pages(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        first_page: Dict,
+        max_results: Optional[int] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Results of the pages after ``first_page``. Keyset endpoints (whose
+        pagination has ``last_indexes``, e.g. schedules/schedule_a) follow the
+        cursor; the others are fetched by page number.
+        """
+        pagination = first_page.get("pagination") or {}
+        if "last_indexes" in pagination:
+            return self._iter_keyset_pages(endpoint, params, pagination, max_results)
+        return self._iter_offset_pages(endpoint, params, pagination, max_results)
+    
+    async def _iter_offset_pages(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        pagination: Dict,
+        max_results: Optional[int] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Pages 2..N fetched concurrently (up to ``rate_limiter.max_concurrent``
+        in flight) and yielded in page order
+        """
+        url = f"{self.base_url}/{endpoint}"
+        per_page = params.get("per_page", 100)
+        last_page = pagination.get("pages", 1)
+        if max_results is not None:
+            # Pages beyond the first that can hold max_results
+            last_page = min(last_page, 1 + (max_results + per_page - 1) // per_page)
+        
+        pages = iter(range(2, last_page + 1))
+        in_flight: Deque[asyncio.Task] = deque()
+        
+        def schedule_next() -> None:
+            page = next(pages, None)
+            if page is not None:
+                in_flight.append(asyncio.create_task(self._fetch_page(url, {**params, "page": page})))
+        
+        try:
+            for _ in range(self.rate_limiter.max_concurrent):
+                schedule_next()
+            remaining = max_results
+            while in_flight:
+                page_data = await in_flight.popleft()
+                schedule_next()
+                results = page_data.get("results", [])
+                if remaining is not None:
+                    results = results[:remaining]
+                    remaining -= len(results)
+                if not results:
+                    break
+                yield results
+                if remaining == 0:
+                    break
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+    
+    async def _iter_keyset_pages(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        pagination: Dict,
+        max_results: Optional[int] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Pages after the first following the ``last_indexes`` cursor. The next
+        page is requested before the current one is yielded, so it downloads
+        while the caller processes the current page.
+        """
+        url = f"{self.base_url}/{endpoint}"
+        base_params = {k: v for k, v in params.items() if k != "page"}
+        
+        def fetch_after(cursor: Optional[Dict]) -> Optional[asyncio.Task]:
+            if not cursor:
+                return None
+            return asyncio.create_task(self._fetch_page(url, {**base_params, **cursor}))
+        
+        next_page = fetch_after(pagination.get("last_indexes"))
+        remaining = max_results
+        try:
+            while next_page is not None:
+                page_data = await next_page
+                next_page = None
+                results = page_data.get("results", [])
+                if remaining is not None:
+                    results = results[:remaining]
+                    remaining -= len(results)
+                if not results:
+                    break
+                if remaining != 0:
+                    next_page = fetch_after((page_data.get("pagination") or {}).get("last_indexes"))
+                yield results
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+                await asyncio.gather(next_page, return_exceptions=True)
     
     async def _handle_pagination(
         self,
@@ -267,51 +482,30 @@ class APIClient:
         initial_data: Dict,
         max_results: Optional[int] = None
     ) -> Dict:
-        """Handle pagination for API responses"""
+        """Handle pagination for API responses: collect the results of every page"""
         if "pagination" not in initial_data:
             return initial_data
         
         pagination = initial_data["pagination"]
-        total_pages = pagination.get("pages", 1)
-        
-        if total_pages <= 1:
+        if pagination.get("pages", 1) <= 1:
             return initial_data
         
-        # Collect all results
         all_results = initial_data.get("results", [])
-        url = f"{self.base_url}/{endpoint}"
-        
-        # Fetch remaining pages
-        per_page = params.get("per_page", 100)
-        if max_results:
-            pages_needed = min(total_pages, (max_results + per_page - 1) // per_page)
-        else:
-            pages_needed = total_pages
+        if max_results and len(all_results) >= max_results:
+            return initial_data
         
-        for page in range(2, pages_needed + 1):
-            # Stop if we've reached the max_results limit
-            if max_results and len(all_results) >= max_results:
-                break
-            
-            params["page"] = page
-            await self.rate_limiter.wait_for_rate_limit()
-            
-            async with self.rate_limiter.get_semaphore():
-                try:
-                    response = await self.client.get(url, params=params)
-                    response.raise_for_status()
-                    page_data = response.json()
-                    page_results = page_data.get("results", [])
-                    all_results.extend(page_results)
-                    
-                    # Stop if we've reached the limit
-                    if max_results and len(all_results) >= max_results:
-                        all_results = all_results[:max_results]
-                        break
-                except Exception as e:
-                    # If pagination fails, return what we have
-                    logger.debug(f"Pagination error on page {page}: {e}")
-                    break
+        pages = self._iter_remaining_pages(
+            endpoint, params, initial_data,
+            max_results - len(all_results) if max_results else None
+        )
+        try:
+            async for page_results in pages:
+                all_results.extend(page_results)
+        except Exception as e:
+            # If pagination fails, return what we have
+            logger.debug(f"Pagination error after {len(all_results)} results: {e}")
+        finally:
+            await pages.aclose()
         
         initial_data["results"] = all_results
         return initial_data
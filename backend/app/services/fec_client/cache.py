@@ -1,70 +1,268 @@
 """
 Caching logic for FEC API responses
+
+Two tiers: a bounded in-memory LRU (``MemoryCache``) holding decoded responses
+with their creation and expiry times, in front of the ``api_cache`` table.
+Writes go to memory immediately and are committed to the table in batches
+(write-behind), so responses never wait on a SQLite commit.
 """
+import asyncio
 import hashlib
 import json
 import logging
-from typing import Dict, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, Optional
 from datetime import datetime, timedelta
 from sqlalchemy import select
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import IntegrityError, OperationalError
 from app.db.database import AsyncSessionLocal, APICache
 from app.services.shared.retry import retry_on_db_lock, retry_on_exception
 from app.config import config
 
 logger = logging.getLogger(__name__)
 
+# Request parameters left out of cache keys: credentials, and paging parameters
+# that change how results are fetched but not which results there are
+# (``_original_limit`` is handled by slicing, see ``cover_request``)
+NON_KEY_PARAMS = frozenset({"api_key", "per_page", "page", "_original_limit"})
+
+
+def is_complete(data: Any) -> bool:
+    """Whether a cached list response holds every result of its query"""
+    pagination = data.get("pagination") or {}
+    if pagination.get("pages", 1) <= 1:
+        return True
+    count = pagination.get("count")
+    return count is not None and len(data.get("results") or []) >= count
+
+
+def cover_request(data: Any, limit: Optional[int]) -> Optional[Any]:
+    """
+    The part of a cached response that answers a request for ``limit`` results
+    (None = all), or None if the response holds too few results
+    
+    Responses without a ``results`` list are returned as they are.
+    """
+    results = data.get("results") if isinstance(data, dict) else None
+    if not isinstance(results, list):
+        return data
+    if limit and len(results) > limit:
+        return {**data, "results": results[:limit]}
+    if is_complete(data) or (limit and len(results) >= limit):
+        return data
+    return None
+
+
+@dataclass
+class CacheEntry:
+    """A cached response and the metadata needed for expiry and staleness checks"""
+    data: Any
+    created_at: datetime
+    expires_at: datetime
+    size: int = 0
+
+
+def _detach(data: Any) -> Any:
+    """
+    Copy of a cached response whose top level and result records the caller
+    can modify without changing the cached entry.
+    """
+    if not isinstance(data, dict):
+        return data
+    copy = dict(data)
+    results = copy.get("results")
+    if isinstance(results, list):
+        copy["results"] = [dict(record) if isinstance(record, dict) else record for record in results]
+    return copy
+
+
+def _encoded_size(data: Any) -> int:
+    """Approximate memory cost of a response: the length of its JSON encoding"""
+    try:
+        return len(json.dumps(data, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class MemoryCache:
+    """In-memory LRU of cache entries, bounded by total (approximate) size in bytes"""
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: str, now: Optional[datetime] = None) -> Optional[CacheEntry]:
+        """Unexpired entry for ``key`` (marked most recently used), or None"""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= (now or datetime.utcnow()):
+            self._remove(key)
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+    
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """Entry for ``key`` without updating recency, expiry or metrics"""
+        return self._entries.get(key)
+    
+    def put(self, key: str, entry: CacheEntry) -> bool:
+        """
+        Store ``entry``, evicting least recently used entries to stay within
+        ``max_bytes``. Entries larger than the whole cache are not stored.
+        """
+        self._remove(key)
+        if entry.size > self.max_bytes:
+            return False
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        return True
+    
+    def purge_expired(self, now: Optional[datetime] = None) -> int:
+        """Drop expired entries; returns how many were dropped"""
+        now = now or datetime.utcnow()
+        expired = [key for key, entry in self._entries.items() if entry.expires_at <= now]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        return len(expired)
+    
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+    
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self._bytes,
+            "max_size_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
 
 class CacheManager:
     """Manages API response caching with metrics"""
     
-    def __init__(self, cache_ttls: Optional[Dict[str, int]] = None):
+    def __init__(
+        self,
+        cache_ttls: Optional[Dict[str, int]] = None,
+        memory_max_bytes: Optional[int] = None,
+        write_batch_size: Optional[int] = None,
+        write_delay: Optional[float] = None
+    ):
         """
         Initialize cache manager
         
         Args:
             cache_ttls: Dictionary of cache TTLs by data type (in hours)
                       If None, uses values from centralized config
+            memory_max_bytes: Size of the in-memory tier (default: API_CACHE_MEMORY_MB)
+            write_batch_size: Buffered writes committed per batch (default: API_CACHE_WRITE_BATCH_SIZE)
+            write_delay: Seconds writes are buffered before a partial batch is committed
+                         (default: API_CACHE_WRITE_DELAY_SECONDS)
         """
         self.cache_ttls = cache_ttls or config.get_cache_ttls()
+        self.memory = MemoryCache(
+            memory_max_bytes if memory_max_bytes is not None else config.API_CACHE_MEMORY_MB * 1024 * 1024
+        )
+        self.write_batch_size = max(1, write_batch_size or config.API_CACHE_WRITE_BATCH_SIZE)
+        self.write_delay = write_delay if write_delay is not None else config.API_CACHE_WRITE_DELAY_SECONDS
+        
+        # Write-behind buffer: entries saved to memory but not yet committed to api_cache
+        self._pending: Dict[str, CacheEntry] = {}
+        self._batch_ready = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._write_task: Optional[asyncio.Task] = None
         
         # Cache metrics
         self._hits = 0
         self._misses = 0
         self._errors = 0
+        self._database_hits = 0
+        self._write_batches = 0
+        self._write_errors = 0
     
     def generate_cache_key(self, endpoint: str, params: Dict) -> str:
-        """Generate cache key from endpoint and parameters"""
-        key_string = f"{endpoint}:{json.dumps(params, sort_keys=True)}"
+        """
+        Generate cache key from endpoint and parameters
+        
+        Credentials and paging-only parameters (``NON_KEY_PARAMS``) are left out
+        and values are normalized, so rotating the API key or asking for a
+        different page size or limit finds the same entry.
+        """
+        normalized = {
+            key: [str(item) for item in value] if isinstance(value, (list, tuple)) else str(value)
+            for key, value in params.items()
+            if key not in NON_KEY_PARAMS and value is not None
+        }
+        key_string = f"{endpoint.strip('/')}:{json.dumps(normalized, sort_keys=True)}"
         return hashlib.md5(key_string.encode()).hexdigest()
     
-    @retry_on_exception(
-        exception_types=(OperationalError,),
-        max_retries=3,
-        base_delay=0.1,
-        exponential_backoff=True
-    )
-    async def get_from_cache(self, cache_key: str) -> Optional[Dict]:
-        """Retrieve data from cache if not expired"""
-        try:
-            async with AsyncSessionLocal() as session:
-                # Use composite index for efficient lookup
-                result = await session.execute(
-                    select(APICache).where(
-                        APICache.cache_key == cache_key,
-                        APICache.expires_at > datetime.utcnow()
-                    )
-                )
-                cache_entry = result.scalar_one_or_none()
-                if cache_entry:
-                    self._hits += 1
-                    return cache_entry.response_data
-            self._misses += 1
+    def _get_local(self, cache_key: str) -> Optional[CacheEntry]:
+        """Unexpired entry from memory or the write-behind buffer"""
+        now = datetime.utcnow()
+        entry = self.memory.get(cache_key, now)
+        if entry is None:
+            entry = self._pending.get(cache_key)
+            if entry is not None and entry.expires_at <= now:
+                entry = None
+        return entry
+    
+    async def get_from_cache(self, cache_key: str, include_database: bool = True) -> Optional[Dict]:
+        """
+        Retrieve data from cache if not expired (memory first, then the api_cache table)
+        
+        Args:
+            cache_key: Key from ``generate_cache_key``
+            include_database: False to only check memory (a miss is then not counted)
+        """
+        entry = self._get_local(cache_key)
+        if entry is not None:
+            self._hits += 1
+            return _detach(entry.data)
+        if not include_database:
             return None
+        
+        try:
+            entry = await self._load_entry(cache_key)
         except Exception as e:
             self._errors += 1
             logger.debug(f"Error getting from cache: {e}")
             return None
+        if entry is None:
+            self._misses += 1
+            return None
+        
+        self._hits += 1
+        self._database_hits += 1
+        self.memory.put(cache_key, entry)
+        return _detach(entry.data)
     
     @retry_on_exception(
         exception_types=(OperationalError,),
@@ -72,32 +270,110 @@ class CacheManager:
         base_delay=0.1,
         exponential_backoff=True
     )
+    async def _load_entry(self, cache_key: str) -> Optional[CacheEntry]:
+        """Unexpired entry from the api_cache table"""
+        async with AsyncSessionLocal() as session:
+            # Use composite index for efficient lookup
+            result = await session.execute(
+                select(APICache.response_data, APICache.created_at, APICache.expires_at).where(
+                    APICache.cache_key == cache_key,
+                    APICache.expires_at > datetime.utcnow()
+                )
+            )
+            row = result.first()
+        if row is None:
+            return None
+        data, created_at, expires_at = row
+        return CacheEntry(data, created_at or datetime.utcnow(), expires_at, _encoded_size(data))
+    
     async def save_to_cache(self, cache_key: str, data: Dict, ttl_hours: int = 24):
-        """Save response to cache with retry logic"""
+        """
+        Save response to cache: immediately in memory, and to the api_cache
+        table by the write-behind task
+        """
+        data = _detach(data)
+        now = datetime.utcnow()
+        entry = CacheEntry(data, now, now + timedelta(hours=ttl_hours), _encoded_size(data))
+        self.memory.put(cache_key, entry)
+        self._pending[cache_key] = entry
+        
+        if len(self._pending) >= self.write_batch_size:
+            self._batch_ready.set()
+        if self._write_task is None or self._write_task.done():
+            self._write_task = asyncio.create_task(self._write_behind())
+    
+    async def _write_behind(self):
+        """Wait for a full batch (or the write delay), then commit buffered writes"""
         try:
-            async with AsyncSessionLocal() as session:
-                expires_at = datetime.utcnow() + timedelta(hours=ttl_hours)
-                cache_entry = APICache(
-                    cache_key=cache_key,
-                    response_data=data,
-                    expires_at=expires_at
-                )
-                session.add(cache_entry)
+            await asyncio.wait_for(self._batch_ready.wait(), timeout=self.write_delay)
+        except asyncio.TimeoutError:
+            pass
+        await self.flush()
+    
+    async def flush(self) -> int:
+        """
+        Commit all buffered writes to the api_cache table
+        
+        Returns:
+            Number of entries written
+        """
+        written = 0
+        async with self._flush_lock:
+            # Writes saved while a batch is committing are picked up by the next iteration
+            while self._pending:
+                self._batch_ready.clear()
+                batch = {key: self._pending.pop(key) for key in list(islice(self._pending, self.write_batch_size))}
                 try:
-                    await session.commit()
-                except Exception:
-                    await session.rollback()
-                    # If entry exists, update it
-                    result = await session.execute(
-                        select(APICache).where(APICache.cache_key == cache_key)
-                    )
-                    existing = result.scalar_one_or_none()
-                    if existing:
-                        existing.response_data = data
-                        existing.expires_at = expires_at
-                        await session.commit()
-        except Exception as e:
-            logger.debug(f"Error saving to cache: {e}")
+                    await self._write_batch(batch)
+                    written += len(batch)
+                    self._write_batches += 1
+                except Exception as e:
+                    self._write_errors += 1
+                    logger.debug(f"Error saving {len(batch)} entries to cache: {e}")
+        return written
+    
+    @retry_on_exception(
+        exception_types=(OperationalError, IntegrityError),
+        max_retries=3,
+        base_delay=0.1,
+        exponential_backoff=True
+    )
+    async def _write_batch(self, batch: Dict[str, CacheEntry]):
+        """Insert or update a batch of entries in one transaction"""
+        async with AsyncSessionLocal() as session:
+            try:
+                result = await session.execute(
+                    select(APICache).where(APICache.cache_key.in_(list(batch)))
+                )
+                existing = {row.cache_key: row for row in result.scalars()}
+                for cache_key, entry in batch.items():
+                    row = existing.get(cache_key)
+                    if row is None:
+                        session.add(APICache(
+                            cache_key=cache_key,
+                            response_data=entry.data,
+                            created_at=entry.created_at,
+                            expires_at=entry.expires_at
+                        ))
+                    else:
+                        row.response_data = entry.data
+                        row.created_at = entry.created_at
+                        row.expires_at = entry.expires_at
+                await session.commit()
+            except Exception:
+                # Another writer may have inserted one of the keys; retry re-reads them
+                await session.rollback()
+                raise
+    
+    async def close(self):
+        """Stop the write-behind task and commit any buffered writes"""
+        if self._write_task is not None and not self._write_task.done():
+            self._write_task.cancel()
+            try:
+                await self._write_task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
     
     def get_cache_ttl(self, endpoint: str) -> int:
         """Get appropriate cache TTL for endpoint type"""
@@ -117,9 +393,16 @@ class CacheManager:
         """
         Check if cache is stale (more than 50% expired)
         
+        Uses the creation time kept with the in-memory entry when there is one,
+        so a memory hit needs no database query.
+        
         Returns:
             True if cache is stale, False otherwise
         """
+        entry = self.memory.peek(cache_key) or self._pending.get(cache_key)
+        if entry is not None:
+            age = (datetime.utcnow() - entry.created_at).total_seconds()
+            return age > cache_ttl * 3600 * 0.5
         try:
             async with AsyncSessionLocal() as session:
                 result = await session.execute(
@@ -140,8 +423,9 @@ class CacheManager:
         Remove expired cache entries to free up space
         
         Returns:
-            Number of entries removed
+            Number of entries removed (from the api_cache table)
         """
+        self.memory.purge_expired()
         try:
             async with AsyncSessionLocal() as session:
                 from sqlalchemy import delete
@@ -173,7 +457,13 @@ class CacheManager:
             "errors": self._errors,
             "total_requests": total_requests,
             "hit_rate_percent": round(hit_rate, 2),
-            "miss_rate_percent": round(100 - hit_rate, 2)
+            "miss_rate_percent": round(100 - hit_rate, 2),
+            "memory_hits": self._hits - self._database_hits,
+            "database_hits": self._database_hits,
+            "memory": self.memory.get_stats(),
+            "pending_writes": len(self._pending),
+            "write_batches": self._write_batches,
+            "write_errors": self._write_errors
         }
     
     async def get_cache_size(self) -> Dict[str, int]:
@@ -0,0 +1,287 @@
+"""
+Columnar mapping of local contributions to API-format dictionaries
+
+Local contribution queries select plain columns instead of ORM entities and
+map the whole result set at once with pandas:
+
+- ``raw_data`` is selected only when the caller wants its keys in the
+  output; otherwise it is read in one extra query for the rows that need a
+  fallback (no amount, date, candidate, state or name)
+- values missing from their column are filled from ``raw_data`` column by
+  column, for those rows only
+- dates recovered from ``raw_data``, and API lookups for the rows still
+  undated, are queued on the date backfill in one pass
+"""
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import pandas as pd
+from sqlalchemy import select
+from app.db.database import Contribution
+from app.utils.date_utils import extract_date_from_raw_data
+from app.utils.thread_pool import run_in_thread_pool
+
+logger = logging.getLogger(__name__)
+
+# Columns selected for every local contribution query (raw_data is optional)
+CONTRIBUTION_COLUMNS = (
+    Contribution.contribution_id,
+    Contribution.candidate_id,
+    Contribution.committee_id,
+    Contribution.contributor_name,
+    Contribution.contributor_city,
+    Contribution.contributor_state,
+    Contribution.contributor_zip,
+    Contribution.contributor_employer,
+    Contribution.contributor_occupation,
+    Contribution.contribution_amount,
+    Contribution.contribution_date,
+    Contribution.contribution_type,
+)
+COLUMN_NAMES = [column.key for column in CONTRIBUTION_COLUMNS]
+
+# raw_data keys tried, in order, for values missing from their column
+AMOUNT_KEYS = ('TRANSACTION_AMT', 'CONTB_AMT', 'contribution_amount', 'transaction_amt')
+TEXT_FALLBACK_KEYS = {
+    'candidate_id': ('CAND_ID', 'candidate_id'),
+    'contributor_state': ('STATE', 'contributor_state', 'state'),
+    'contributor_name': ('NAME', 'contributor_name', 'name'),
+}
+
+# contribution_ids per raw_data query (below SQLite's bound parameter limit)
+RAW_DATA_BATCH_SIZE = 500
+
+
+def select_contribution_columns(include_raw_data: bool = False):
+    """SELECT of the mapped columns, plus raw_data if requested"""
+    columns = CONTRIBUTION_COLUMNS + ((Contribution.raw_data,) if include_raw_data else ())
+    return select(*columns)
+
+
+def _as_dict(raw_data: Any) -> Optional[Dict]:
+    """raw_data as a dict (bulk imports may have stored it as a JSON string)"""
+    if isinstance(raw_data, str):
+        try:
+            raw_data = json.loads(raw_data)
+        except (json.JSONDecodeError, TypeError):
+            return None
+    return raw_data if isinstance(raw_data, dict) and raw_data else None
+
+
+def _amount_from_raw(raw_data: Dict) -> Optional[float]:
+    """First parseable amount under AMOUNT_KEYS"""
+    for key in AMOUNT_KEYS:
+        if key in raw_data:
+            value = str(raw_data[key]).strip().replace('$', '').replace(',', '').strip()
+            if value:
+                try:
+                    return float(value)
+                except ValueError:
+                    continue
+    return None
+
+
+def _first_value(keys: Sequence[str]):
+    def first(raw_data: Dict) -> Any:
+        for key in keys:
+            value = raw_data.get(key)
+            if value:
+                return value
+        return None
+    return first
+
+
+def _is_blank(series: pd.Series) -> pd.Series:
+    return series.isna() | (series == '')
+
+
+def contributions_frame(rows: Sequence[Sequence[Any]], include_raw_data: bool = False) -> pd.DataFrame:
+    """DataFrame of rows selected with select_contribution_columns, built column-wise"""
+    names = COLUMN_NAMES + (['raw_data'] if include_raw_data else [])
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    frame = pd.DataFrame({name: pd.Series(values, dtype=object) for name, values in zip(names, columns)})
+    frame['contribution_amount'] = pd.to_numeric(frame['contribution_amount'], errors='coerce').fillna(0.0)
+    return frame
+
+
+def needs_raw_data(frame: pd.DataFrame) -> pd.Series:
+    """Rows with a value that may have to come from raw_data"""
+    mask = frame['contribution_date'].isna() | (frame['contribution_amount'] == 0.0)
+    for column in TEXT_FALLBACK_KEYS:
+        mask |= _is_blank(frame[column])
+    return mask
+
+
+def apply_raw_fallbacks(
+    frame: pd.DataFrame,
+    raw_data: pd.Series,
+    candidate_id: Optional[str] = None
+) -> Tuple[Dict[str, datetime], List[Tuple[str, Optional[str]]]]:
+    """
+    Fill missing values from raw_data, in place
+
+    Args:
+        frame: Frame from contributions_frame
+        raw_data: raw_data dicts aligned with frame (None where not loaded)
+        candidate_id: Candidate for rows with none in their column or raw_data
+
+    Returns:
+        (dates recovered from raw_data by contribution_id,
+         (contribution_id, committee_id) of the rows still undated)
+    """
+    has_raw = raw_data.notna()
+
+    missing = has_raw & (frame['contribution_amount'] == 0.0)
+    if missing.any():
+        amounts = raw_data[missing].map(_amount_from_raw).dropna()
+        frame.loc[amounts.index, 'contribution_amount'] = amounts.astype(float)
+
+    for column, keys in TEXT_FALLBACK_KEYS.items():
+        missing = has_raw & _is_blank(frame[column])
+        if missing.any():
+            values = raw_data[missing].map(_first_value(keys)).dropna()
+            frame.loc[values.index, column] = values
+    if candidate_id:
+        frame.loc[_is_blank(frame['candidate_id']), 'candidate_id'] = candidate_id
+
+    recovered: Dict[str, datetime] = {}
+    missing = has_raw & frame['contribution_date'].isna()
+    if missing.any():
+        # Bulk rows: parse TRANSACTION_DT (MMDDYYYY) for all of them at once,
+        # then try every date field of the rows left
+        transaction_dt = raw_data[missing].map(lambda raw: str(raw.get('TRANSACTION_DT') or '').strip().zfill(8))
+        parsed = pd.to_datetime(transaction_dt, format='%m%d%Y', errors='coerce')
+        parsed = parsed.dropna()
+        dates = pd.Series([value.to_pydatetime() for value in parsed], index=parsed.index, dtype=object)
+        rest = raw_data[missing & ~frame.index.isin(dates.index)]
+        if len(rest):
+            dates = pd.concat([dates, rest.map(extract_date_from_raw_data).dropna()])
+        frame.loc[dates.index, 'contribution_date'] = dates
+        recovered = dict(zip(frame.loc[dates.index, 'contribution_id'], dates))
+
+    undated = frame.loc[frame['contribution_date'].isna(), ['contribution_id', 'committee_id']]
+    lookups = list(zip(undated['contribution_id'], undated['committee_id'].where(undated['committee_id'].notna(), None)))
+    return recovered, lookups
+
+
+def api_format_frame(frame: pd.DataFrame, include_raw_data: bool = False) -> pd.DataFrame:
+    """Frame with the keys of FEC API schedule_a results (dates as YYYY-MM-DD strings)"""
+    dates = pd.to_datetime(frame['contribution_date'], errors='coerce').dt.strftime('%Y-%m-%d')
+    dates = dates.astype(object).where(dates.notna(), None)
+    output = pd.DataFrame({
+        'sub_id': frame['contribution_id'],
+        'contribution_id': frame['contribution_id'],
+        'candidate_id': frame['candidate_id'],
+        'committee_id': frame['committee_id'],
+        'contributor_name': frame['contributor_name'],
+        'contributor_city': frame['contributor_city'],
+        'contributor_state': frame['contributor_state'],
+        'contributor_zip': frame['contributor_zip'],
+        'contributor_employer': frame['contributor_employer'],
+        'contributor_occupation': frame['contributor_occupation'],
+        'contribution_amount': frame['contribution_amount'].astype(float),
+        'contribution_receipt_date': dates,
+        'contribution_date': dates,
+        'contribution_type': frame['contribution_type'],
+        'receipt_type': None,
+    })
+    if include_raw_data:
+        output['raw_data'] = frame['raw_data']
+    return output
+
+
+def to_records(output: pd.DataFrame) -> List[Dict]:
+    """
+    Dictionaries from api_format_frame; raw_data keys are added where the
+    mapped value is missing (as the API-format records always had)
+    """
+    raw_data = output.pop('raw_data') if 'raw_data' in output.columns else None
+    # Zipping plain column lists is several times faster than DataFrame.to_dict
+    # (the object columns already hold None for missing values)
+    columns = list(output.columns)
+    records = [dict(zip(columns, values)) for values in zip(*(output[column].tolist() for column in columns))]
+    if raw_data is not None:
+        for record, raw in zip(records, raw_data):
+            raw = _as_dict(raw)
+            if raw:
+                for key, value in raw.items():
+                    if not record.get(key):
+                        record[key] = value
+    return records
+
+
+async def load_raw_data(session, contribution_ids: Sequence[str]) -> Dict[str, Dict]:
+    """raw_data of the given contributions (as dicts), in batches"""
+    found: Dict[str, Dict] = {}
+    for start in range(0, len(contribution_ids), RAW_DATA_BATCH_SIZE):
+        batch = contribution_ids[start:start + RAW_DATA_BATCH_SIZE]
+        result = await session.execute(
+            select(Contribution.contribution_id, Contribution.raw_data)
+            .where(Contribution.contribution_id.in_(batch))
+        )
+        for contribution_id, raw in result.all():
+            raw = _as_dict(raw)
+            if raw:
+                found[contribution_id] = raw
+    return found
+
+
+def _map_frame(
+    frame: pd.DataFrame,
+    raw_data: pd.Series,
+    include_raw_data: bool,
+    candidate_id: Optional[str],
+    as_frame: bool
+):
+    dates, lookups = apply_raw_fallbacks(frame, raw_data, candidate_id)
+    output = api_format_frame(frame, include_raw_data)
+    return (output if as_frame else to_records(output)), dates, lookups
+
+
+async def map_contribution_rows(
+    session,
+    rows: Sequence[Sequence[Any]],
+    include_raw_data: bool = False,
+    candidate_id: Optional[str] = None,
+    date_backfill=None,
+    as_frame: bool = False
+) -> Union[List[Dict], pd.DataFrame]:
+    """
+    Map rows selected with select_contribution_columns to API-format contributions
+
+    Args:
+        session: Session the rows were read with (used to load raw_data for fallbacks)
+        rows: Result rows
+        include_raw_data: Whether the rows include raw_data; its keys are then
+                          added to the dictionaries (a ``raw_data`` column with as_frame)
+        candidate_id: Candidate for rows that have none (the queried candidate)
+        date_backfill: DateBackfillQueue for dates recovered from raw_data and
+                       rows that are still undated
+        as_frame: Return a DataFrame instead of dictionaries
+
+    Returns:
+        List of contribution dictionaries, or a DataFrame with the same columns
+    """
+    frame = contributions_frame(rows, include_raw_data)
+    if include_raw_data:
+        raw_data = frame['raw_data'].map(_as_dict)
+    else:
+        raw_data = pd.Series(None, index=frame.index, dtype=object)
+        needed = frame.loc[needs_raw_data(frame), 'contribution_id']
+        if len(needed):
+            loaded = await load_raw_data(session, needed.tolist())
+            if loaded:
+                raw_data.loc[needed.index] = needed.map(loaded.get)
+            logger.debug(f"map_contribution_rows: Loaded raw_data for {len(loaded)} of {len(needed)} rows needing fallbacks")
+
+    result, dates, lookups = await run_in_thread_pool(
+        _map_frame, frame, raw_data, include_raw_data, candidate_id, as_frame
+    )
+
+    if date_backfill is not None:
+        for contribution_id, contribution_date in dates.items():
+            date_backfill.enqueue_date(contribution_id, contribution_date)
+        for contribution_id, committee_id in lookups:
+            date_backfill.enqueue_lookup(contribution_id, committee_id)
+    return result
@@ -0,0 +1,422 @@
+"""
+Background backfill of missing contribution dates
+
+Contributions read without a ``contribution_date`` are queued here instead of
+each spawning its own task. A single worker drains the queue in batches:
+
+- dates already recovered from ``raw_data`` are written with one
+  ``UPDATE ... FROM (VALUES ...)`` statement per batch
+- the others are looked up in the FEC API with one schedule_a request per
+  committee (up to ``LOOKUP_IDS_PER_REQUEST`` sub_ids each), and the
+  responses are merged into the contributions in one transaction
+
+The queue is deduplicated by contribution_id and bounded. Work that does not
+fit in memory, and lookups still queued at shutdown, wait in the
+``contribution_date_backfill`` table and are picked up once the queue drains
+(also after a restart).
+"""
+import asyncio
+import logging
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import DateTime, bindparam, delete, func, select, text
+from sqlalchemy.orm.attributes import flag_modified
+from app.db.database import AsyncSessionLocal, Contribution, ContributionDateBackfill
+from app.services.shared.contributor_rollups import apply_rollup_delta
+from app.services.shared.retry import retry_on_db_lock
+from app.utils.date_utils import extract_date_from_raw_data
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+# sub_ids per schedule_a request (the API's largest page)
+LOOKUP_IDS_PER_REQUEST = 100
+
+
+def build_update_dates_sql(count: int):
+    """UPDATE setting contribution_date from ``count`` (id_N, date_N) pairs where it is missing"""
+    values = ", ".join(f"(:id_{n}, :date_{n})" for n in range(count))
+    return text(
+        "UPDATE contributions SET contribution_date = v.column2\n"
+        f"FROM (VALUES {values}) AS v\n"
+        "WHERE contributions.contribution_id = v.column1 AND contributions.contribution_date IS NULL"
+    ).bindparams(*(bindparam(f"date_{n}", type_=DateTime) for n in range(count)))
+
+
+class DateBackfillQueue:
+    """Bounded, deduplicated queue of contributions whose date is missing"""
+    
+    def __init__(
+        self,
+        fetch_func: Callable[[Optional[str], List[str]], Awaitable[List[Dict]]],
+        smart_merge_func: Callable[[Contribution, Dict, str], Any],
+        db_write_semaphore: Optional[asyncio.Semaphore] = None,
+        max_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        delay: Optional[float] = None
+    ):
+        """
+        Initialize the backfill queue
+        
+        Args:
+            fetch_func: Async function(committee_id, contribution_ids) returning
+                        the schedule_a records found for those sub_ids
+            smart_merge_func: Merges an API record into a Contribution (FECClient._smart_merge_contribution)
+            db_write_semaphore: Optional semaphore to serialize database writes
+            max_size: Contributions held in memory (default: DATE_BACKFILL_MAX_QUEUE)
+            batch_size: Contributions per batch (default: DATE_BACKFILL_BATCH_SIZE)
+            delay: Seconds to wait for a full batch (default: DATE_BACKFILL_DELAY_SECONDS)
+        """
+        self.fetch_func = fetch_func
+        self.smart_merge_func = smart_merge_func
+        self._db_write_semaphore = db_write_semaphore or asyncio.Semaphore(1)
+        self.max_size = config.DATE_BACKFILL_MAX_QUEUE if max_size is None else max_size
+        self.batch_size = max(1, batch_size or config.DATE_BACKFILL_BATCH_SIZE)
+        self.delay = config.DATE_BACKFILL_DELAY_SECONDS if delay is None else delay
+        
+        # contribution_id -> date recovered from raw_data
+        self._dates: "OrderedDict[str, datetime]" = OrderedDict()
+        # contribution_id -> committee_id, for API lookups
+        self._lookups: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        # Entries that did not fit, waiting to be saved to the table
+        self._overflow: Dict[str, Tuple[Optional[str], Optional[datetime]]] = {}
+        # Recently processed IDs (not queued again while remembered)
+        self._done: "OrderedDict[str, None]" = OrderedDict()
+        # Whether the table may hold work (checked once the memory queue drains)
+        self._stored = True
+        self._batch_ready = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        
+        # Metrics
+        self._dates_written = 0
+        self._lookups_done = 0
+        self._lookups_found = 0
+        self._api_requests = 0
+        self._batches = 0
+        self._saved = 0
+        self._restored = 0
+        self._dropped = 0
+        self._errors = 0
+    
+    def __len__(self) -> int:
+        return len(self._dates) + len(self._lookups)
+    
+    def enqueue_date(self, contribution_id: str, contribution_date: datetime) -> bool:
+        """
+        Queue writing a date recovered from raw_data
+        
+        Returns:
+            False if the contribution is already queued or was just processed
+        """
+        if contribution_id in self._dates or contribution_id in self._done:
+            return False
+        self._lookups.pop(contribution_id, None)
+        return self._add(contribution_id, None, contribution_date)
+    
+    def enqueue_lookup(self, contribution_id: str, committee_id: Optional[str] = None) -> bool:
+        """
+        Queue looking up a contribution's date in the FEC API
+        
+        Returns:
+            False if the contribution is already queued or was just processed
+        """
+        if contribution_id in self._lookups or contribution_id in self._dates or contribution_id in self._done:
+            return False
+        return self._add(contribution_id, committee_id, None)
+    
+    def _add(self, contribution_id: str, committee_id: Optional[str], contribution_date: Optional[datetime]) -> bool:
+        if len(self) >= self.max_size:
+            if contribution_id not in self._overflow and len(self._overflow) >= self.max_size:
+                self._dropped += 1
+                return False
+            self._overflow[contribution_id] = (committee_id, contribution_date)
+        elif contribution_date is not None:
+            self._dates[contribution_id] = contribution_date
+        else:
+            self._lookups[contribution_id] = committee_id
+        if len(self) >= self.batch_size or len(self._overflow) >= self.batch_size:
+            self._batch_ready.set()
+        self.start()
+        return True
+    
+    def start(self):
+        """
+        Start the worker if it is not running (needs a running event loop)
+        
+        The worker first picks up work saved in the table, so calling this at
+        startup resumes the backfills left from the last run.
+        """
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        except RuntimeError:
+            # No event loop: the work is processed by the next flush()
+            pass
+    
+    async def _run(self):
+        """Process batches until the queue and the table are empty"""
+        while True:
+            if self._overflow:
+                await self._save_overflow()
+            if not len(self) and not await self._restore():
+                return
+            if len(self) < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._batch_ready.wait(), timeout=self.delay)
+                except asyncio.TimeoutError:
+                    pass
+            await self._process_batch()
+    
+    async def flush(self) -> Dict[str, int]:
+        """
+        Process everything queued in memory now
+        
+        Returns:
+            Dictionary with the dates written and lookups made
+        """
+        dates_written, lookups = self._dates_written, self._lookups_done
+        while len(self):
+            await self._process_batch()
+        if self._overflow:
+            await self._save_overflow()
+        return {
+            "dates_written": self._dates_written - dates_written,
+            "lookups": self._lookups_done - lookups,
+        }
+    
+    async def close(self):
+        """Stop the worker, write queued dates and save queued lookups for the next start"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        async with self._lock:
+            while self._dates:
+                await self._write_dates(self._take(self._dates))
+            self._overflow.update((key, (committee_id, None)) for key, committee_id in self._lookups.items())
+            self._lookups.clear()
+        await self._save_overflow()
+    
+    def _take(self, queue: "OrderedDict[str, Any]") -> Dict[str, Any]:
+        return {key: queue.pop(key) for key in list(islice(queue, self.batch_size))}
+    
+    def _remember(self, contribution_ids):
+        for contribution_id in contribution_ids:
+            self._done[contribution_id] = None
+        while len(self._done) > max(self.max_size, self.batch_size):
+            self._done.popitem(last=False)
+    
+    async def _process_batch(self):
+        """Write one batch of known dates and make one batch of API lookups"""
+        async with self._lock:
+            self._batch_ready.clear()
+            dates = self._take(self._dates)
+            lookups = self._take(self._lookups)
+            if dates:
+                await self._write_dates(dates)
+            if lookups:
+                await self._look_up(lookups)
+            if dates or lookups:
+                self._batches += 1
+    
+    async def _write_dates(self, dates: Dict[str, datetime]):
+        self._remember(dates)
+        try:
+            self._dates_written += await self._update_dates(dates)
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"Error backfilling {len(dates)} contribution dates: {e}")
+    
+    @retry_on_db_lock(max_retries=3, base_delay=0.1)
+    async def _update_dates(self, dates: Dict[str, datetime]) -> int:
+        """Set contribution_date on the undated contributions of ``dates`` in one statement"""
+        params = {}
+        for n, (contribution_id, contribution_date) in enumerate(dates.items()):
+            params[f"id_{n}"] = contribution_id
+            params[f"date_{n}"] = contribution_date
+        async with self._db_write_semaphore:
+            async with AsyncSessionLocal() as session:
+                # The contributions move from the undated rollup cycle to their own
+                await apply_rollup_delta(session, list(dates), sign=-1)
+                result = await session.execute(build_update_dates_sql(len(dates)), params)
+                await apply_rollup_delta(session, list(dates), sign=1)
+                await session.commit()
+                return result.rowcount
+    
+    async def _look_up(self, lookups: Dict[str, Optional[str]]):
+        """Fetch a batch of contributions from the FEC API, grouped by committee, and store them"""
+        self._remember(lookups)
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(Contribution.contribution_id).where(
+                        Contribution.contribution_id.in_(list(lookups)),
+                        Contribution.contribution_date.isnot(None)
+                    )
+                )
+                dated = set(result.scalars())
+        except Exception as e:
+            logger.debug(f"Could not check dates before API lookup: {e}")
+            dated = set()
+        
+        by_committee: Dict[Optional[str], List[str]] = defaultdict(list)
+        for contribution_id, committee_id in lookups.items():
+            if contribution_id not in dated:
+                by_committee[committee_id].append(contribution_id)
+        requests = [
+            (committee_id, ids[start:start + LOOKUP_IDS_PER_REQUEST])
+            for committee_id, ids in by_committee.items()
+            for start in range(0, len(ids), LOOKUP_IDS_PER_REQUEST)
+        ]
+        responses = await asyncio.gather(
+            *(self.fetch_func(committee_id, ids) for committee_id, ids in requests),
+            return_exceptions=True
+        )
+        
+        found: Dict[str, Dict] = {}
+        for (committee_id, ids), response in zip(requests, responses):
+            self._lookups_done += len(ids)
+            if isinstance(response, BaseException):
+                self._errors += 1
+                logger.warning(f"Error looking up {len(ids)} contribution dates for committee {committee_id}: {response}")
+                continue
+            self._api_requests += 1
+            wanted = set(ids)
+            for record in response or []:
+                sub_id = str(record.get("sub_id") or "")
+                if sub_id in wanted:
+                    found[sub_id] = record
+        
+        if found:
+            try:
+                await self._store_records(found)
+                self._lookups_found += len(found)
+            except Exception as e:
+                self._errors += 1
+                logger.warning(f"Error storing {len(found)} contributions fetched for their dates: {e}")
+    
+    @retry_on_db_lock(max_retries=3, base_delay=0.1)
+    async def _store_records(self, records: Dict[str, Dict]):
+        """Merge API records into their contributions in one transaction (the date included)"""
+        async with self._db_write_semaphore:
+            async with AsyncSessionLocal() as session:
+                await apply_rollup_delta(session, list(records), sign=-1)
+                result = await session.execute(
+                    select(Contribution).where(Contribution.contribution_id.in_(list(records)))
+                )
+                for contrib in result.scalars():
+                    record = records[contrib.contribution_id]
+                    api_date = extract_date_from_raw_data(record)
+                    merge_data = {'raw_data': record}
+                    if api_date:
+                        merge_data['contribution_date'] = api_date
+                    self.smart_merge_func(contrib, merge_data, 'api')
+                    if api_date:
+                        contrib.contribution_date = api_date
+                    flag_modified(contrib, 'raw_data')
+                await session.flush()
+                await apply_rollup_delta(session, list(records), sign=1)
+                await session.commit()
+    
+    async def _save_overflow(self):
+        """Save the entries that did not fit in memory to the contribution_date_backfill table"""
+        entries, self._overflow = self._overflow, {}
+        if not entries:
+            return
+        try:
+            async with self._db_write_semaphore:
+                async with AsyncSessionLocal() as session:
+                    result = await session.execute(
+                        select(ContributionDateBackfill.contribution_id).where(
+                            ContributionDateBackfill.contribution_id.in_(list(entries))
+                        )
+                    )
+                    existing = set(result.scalars())
+                    session.add_all(
+                        ContributionDateBackfill(
+                            contribution_id=contribution_id,
+                            committee_id=committee_id,
+                            contribution_date=contribution_date
+                        )
+                        for contribution_id, (committee_id, contribution_date) in entries.items()
+                        if contribution_id not in existing
+                    )
+                    await session.commit()
+            self._saved += len(entries) - len(existing)
+            self._stored = True
+        except Exception as e:
+            self._errors += 1
+            self._dropped += len(entries)
+            logger.warning(f"Error saving {len(entries)} queued contribution date backfills: {e}")
+    
+    async def _restore(self) -> bool:
+        """Move saved work from the table back into memory; False if there was none"""
+        if not self._stored:
+            return False
+        try:
+            async with self._db_write_semaphore:
+                async with AsyncSessionLocal() as session:
+                    result = await session.execute(
+                        select(ContributionDateBackfill)
+                        .order_by(ContributionDateBackfill.queued_at)
+                        .limit(self.max_size)
+                    )
+                    rows = result.scalars().all()
+                    if rows:
+                        await session.execute(
+                            delete(ContributionDateBackfill).where(
+                                ContributionDateBackfill.contribution_id.in_([row.contribution_id for row in rows])
+                            )
+                        )
+                        await session.commit()
+        except Exception as e:
+            # Table missing (migrations not run) or unreadable: keep to memory
+            logger.debug(f"Could not restore queued contribution date backfills: {e}")
+            self._stored = False
+            return False
+        
+        if len(rows) < self.max_size:
+            self._stored = False
+        for row in rows:
+            if row.contribution_date is not None:
+                self._dates[row.contribution_id] = row.contribution_date
+            else:
+                self._lookups[row.contribution_id] = row.committee_id
+        self._restored += len(rows)
+        return bool(rows)
+    
+    async def count_stored(self) -> int:
+        """Number of contributions waiting in the contribution_date_backfill table"""
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(func.count()).select_from(ContributionDateBackfill))
+            return result.scalar_one()
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Queue depth and throughput
+        
+        Returns:
+            Dictionary with queued work and counters since startup
+        """
+        return {
+            "queue_depth": len(self),
+            "queued_dates": len(self._dates),
+            "queued_lookups": len(self._lookups),
+            "max_queue": self.max_size,
+            "overflow": len(self._overflow),
+            "dates_written": self._dates_written,
+            "lookups": self._lookups_done,
+            "lookups_found": self._lookups_found,
+            "api_requests": self._api_requests,
+            "batches": self._batches,
+            "saved": self._saved,
+            "restored": self._restored,
+            "dropped": self._dropped,
+            "errors": self._errors,
+        }
@@ -1,48 +1,274 @@
 """
 Rate limiting for FEC API requests
+
+OpenFEC allows each API key a rolling hourly quota (1,000 requests by default).
+Every key gets a ``KeyBudget``: a token bucket that paces requests evenly over
+the hour (with a small burst allowance), plus a log of the last hour's requests
+so the rolling quota itself is never exceeded. ``X-RateLimit-Remaining``
+headers reveal requests made with the key elsewhere (other processes, restarts),
+which are added to the log. Requests are spread round-robin over the keys.
 """
 import asyncio
+import bisect
 import logging
-from typing import Optional
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional
+from app.config import config
 
 logger = logging.getLogger(__name__)
 
+QUOTA_WINDOW_SECONDS = 3600
+# Extra wait before reusing a slot of the rolling window (the server counts a request when it arrives)
+WINDOW_MARGIN_SECONDS = 1.0
+
+
+def _header(headers: Optional[Mapping[str, str]], name: str) -> Optional[float]:
+    """Numeric header value, or None when missing or malformed"""
+    if not headers:
+        return None
+    value = headers.get(name)
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class KeyBudget:
+    """Request budget of one API key"""
+    
+    def __init__(self, requests_per_hour: int, burst: int, min_interval: float = 0.0):
+        """
+        Args:
+            requests_per_hour: Rolling hourly quota of the key
+            burst: Requests that may be sent back to back before pacing applies
+            min_interval: Minimum seconds between two requests on the key
+        """
+        self.burst = max(1, burst)
+        self.min_interval = min_interval
+        self.set_quota(requests_per_hour)
+        # Token bucket as a theoretical arrival time (GCRA): a request may go
+        # once the clock is within the burst allowance of it
+        self._tat = float("-inf")
+        self._last_send = float("-inf")
+        # Send times of the last `quota` requests (ascending; includes reservations)
+        self._sent: List[float] = []
+        self.blocked_until = float("-inf")
+        self._consecutive_throttles = 0
+        
+        # Metrics
+        self.requests = 0
+        self.throttled = 0
+        self.external_requests = 0
+        self.reported_remaining: Optional[int] = None
+    
+    def set_quota(self, requests_per_hour: int):
+        self.quota = max(1, int(requests_per_hour))
+        self.interval = QUOTA_WINDOW_SECONDS / self.quota
+    
+    def next_send_time(self, now: float) -> float:
+        """Earliest time a request on this key can be sent without exceeding its budget"""
+        send_at = max(
+            now,
+            self.blocked_until,
+            self._last_send + self.min_interval,
+            self._tat - (self.burst - 1) * self.interval
+        )
+        if len(self._sent) >= self.quota:
+            # The quota-th most recent request must have left the window
+            send_at = max(send_at, self._sent[-self.quota] + QUOTA_WINDOW_SECONDS + WINDOW_MARGIN_SECONDS)
+        return send_at
+    
+    def reserve(self, now: float) -> float:
+        """Reserve the next request slot; returns the time it may be sent"""
+        send_at = self.next_send_time(now)
+        self._tat = max(self._tat, send_at) + self.interval
+        self._last_send = send_at
+        self._record(send_at, 1)
+        self.requests += 1
+        return send_at
+    
+    def observe(self, sent_at: float, now: float, status_code: int, headers: Optional[Mapping[str, str]] = None,
+                max_backoff: float = 60.0):
+        """
+        Update the budget from a response to a request sent at ``sent_at``
+        
+        ``X-RateLimit-Limit`` updates the quota. ``X-RateLimit-Remaining``
+        lower than this budget accounts for means requests were made with the
+        key elsewhere; they are logged as if sent now (they leave the window no
+        earlier than that). A 429 blocks the key for ``Retry-After`` seconds,
+        or an exponential backoff capped at ``max_backoff``.
+        """
+        limit = _header(headers, "X-RateLimit-Limit")
+        if limit and int(limit) != self.quota:
+            self.set_quota(int(limit))
+            self._sent = self._sent[-self.quota:]
+        
+        remaining = _header(headers, "X-RateLimit-Remaining")
+        if remaining is not None:
+            self.reported_remaining = int(remaining)
+            start = bisect.bisect_right(self._sent, sent_at - QUOTA_WINDOW_SECONDS)
+            own = bisect.bisect_right(self._sent, sent_at) - start
+            external = self.quota - int(remaining) - own
+            if external > 0:
+                self.external_requests += external
+                self._record(now, external)
+        
+        if status_code == 429:
+            self.throttled += 1
+            self._consecutive_throttles += 1
+            retry_after = _header(headers, "Retry-After")
+            if retry_after is None:
+                retry_after = min(max_backoff, self.interval * 2 ** self._consecutive_throttles)
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+            logger.warning(f"FEC API rate limit hit, pausing key for {retry_after:.1f}s")
+        else:
+            self._consecutive_throttles = 0
+    
+    def _record(self, at: float, count: int):
+        position = bisect.bisect_right(self._sent, at)
+        self._sent[position:position] = [at] * count
+        if len(self._sent) > self.quota:
+            del self._sent[:len(self._sent) - self.quota]
+    
+    def get_metrics(self, now: float) -> Dict[str, Any]:
+        in_window = len(self._sent) - bisect.bisect_right(self._sent, now - QUOTA_WINDOW_SECONDS)
+        return {
+            "requests_per_hour": self.quota,
+            "used_in_window": in_window,
+            "available_in_window": max(0, self.quota - in_window),
+            "next_request_in_seconds": round(max(0.0, self.next_send_time(now) - now), 3),
+            "reported_remaining": self.reported_remaining,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "external_requests": self.external_requests,
+        }
+
 
 class RateLimiter:
-    """Handles rate limiting for API requests"""
+    """Handles rate limiting for API requests, across one or more API keys"""
     
     def __init__(
         self,
         rate_limit_delay: float = 0.5,
         rate_limit_retry_delay: int = 60,
-        max_concurrent: int = 5
+        max_concurrent: int = 5,
+        api_keys: Optional[List[str]] = None,
+        requests_per_hour: Optional[int] = None,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = asyncio.sleep
     ):
         """
         Initialize rate limiter
         
         Args:
-            rate_limit_delay: Delay in seconds between requests (default: 0.5)
-            rate_limit_retry_delay: Delay in seconds when rate limited (default: 60)
+            rate_limit_delay: Minimum delay in seconds between requests on one key (default: 0.5)
+            rate_limit_retry_delay: Longest pause in seconds for a key after a 429 without
+                                    Retry-After (default: 60)
             max_concurrent: Maximum concurrent requests (default: 5)
+            api_keys: API keys to spread requests over (more can be added with ``add_key``)
+            requests_per_hour: Hourly quota per key (default: RATE_LIMIT_PER_HOUR)
+            burst: Requests per key that may go back to back (default: FEC_API_BURST)
+            clock: Monotonic time source (seconds)
+            sleep: Async sleep function (replaceable together with ``clock`` in tests)
         """
         self.rate_limit_delay = rate_limit_delay
         self.rate_limit_retry_delay = rate_limit_retry_delay
+        self.max_concurrent = max_concurrent
+        self.requests_per_hour = requests_per_hour or config.RATE_LIMIT_PER_HOUR
+        self.burst = burst or config.FEC_API_BURST
+        self.clock = clock
+        self.sleep = sleep
         self.last_request_time = 0
         self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._budgets: Dict[Optional[str], KeyBudget] = {}
+        self._keys: List[Optional[str]] = []
+        self._next_key = 0
+        for api_key in api_keys or []:
+            self.add_key(api_key)
     
     def get_semaphore(self) -> asyncio.Semaphore:
         """Get the semaphore for limiting concurrent requests"""
         return self._semaphore
     
-    async def wait_for_rate_limit(self):
-        """Ensure we respect rate limits"""
-        current_time = asyncio.get_event_loop().time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.rate_limit_delay:
-            await asyncio.sleep(self.rate_limit_delay - time_since_last)
-        self.last_request_time = asyncio.get_event_loop().time()
+    def add_key(self, api_key: Optional[str]):
+        """Give ``api_key`` its own budget (no-op if it already has one)"""
+        if api_key not in self._budgets:
+            self._budgets[api_key] = KeyBudget(self.requests_per_hour, self.burst, self.rate_limit_delay)
+            self._keys.append(api_key)
+    
+    async def wait_for_rate_limit(self, api_key: Optional[str] = None) -> Optional[str]:
+        """
+        Wait until a request may be sent and reserve it
+        
+        Args:
+            api_key: Key to add to the rotation if it has no budget yet
+        
+        Returns:
+            The API key to send the request with: the key that can send soonest,
+            ties going round-robin
+        """
+        if api_key is not None or not self._keys:
+            self.add_key(api_key)
+        now = self.clock()
+        count = len(self._keys)
+        order = [(self._next_key + i) % count for i in range(count)]
+        index = min(order, key=lambda i: self._budgets[self._keys[i]].next_send_time(now))
+        self._next_key = (index + 1) % count
+        
+        chosen = self._keys[index]
+        send_at = self._budgets[chosen].reserve(now)
+        if send_at > now:
+            await self.sleep(send_at - now)
+        self.last_request_time = send_at
+        return chosen
+    
+    def record_response(
+        self,
+        api_key: Optional[str],
+        status_code: int,
+        headers: Optional[Mapping[str, str]] = None,
+        sent_at: Optional[float] = None
+    ):
+        """
+        Update the key's budget from a response (rate limit headers, 429s)
+        
+        Args:
+            api_key: Key the request was sent with
+            status_code: HTTP status of the response
+            headers: Response headers
+            sent_at: ``clock()`` time the request was sent (default: now)
+        """
+        budget = self._budgets.get(api_key)
+        if budget is not None:
+            now = self.clock()
+            budget.observe(
+                now if sent_at is None else sent_at, now, status_code, headers,
+                max_backoff=self.rate_limit_retry_delay
+            )
     
     def get_retry_delay(self, attempt: int) -> float:
-        """Get retry delay for a given attempt number"""
-        return self.rate_limit_retry_delay * (attempt + 1)
-
+        """Get retry delay for a given attempt number: until any key may send again"""
+        if not self._keys:
+            return self.rate_limit_delay * (2 ** attempt)
+        now = self.clock()
+        return max(0.0, min(self._budgets[key].next_send_time(now) for key in self._keys) - now)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Current budget of every key (keys shown by their last 4 characters)
+        
+        Returns:
+            Dictionary with per-key budgets and totals
+        """
+        now = self.clock()
+        keys = {}
+        for api_key in self._keys:
+            label = f"...{api_key[-4:]}" if api_key else "default"
+            keys[label] = self._budgets[api_key].get_metrics(now)
+        return {
+            "keys": keys,
+            "available_in_window": sum(k["available_in_window"] for k in keys.values()),
+            "requests": sum(k["requests"] for k in keys.values()),
+            "throttled": sum(k["throttled"] for k in keys.values()),
+        }
@@ -8,6 +8,9 @@ from datetime import datetime
 from sqlalchemy import select, and_
 from sqlalchemy.orm.attributes import flag_modified
 from app.db.database import AsyncSessionLocal, Candidate, Committee, Contribution, FinancialTotal
+from app.services.shared.candidate_committees import link_candidate_committees, mark_linkage_changed
+from app.services.shared.contributor_index import index_contributor_names
+from app.services.shared.contributor_rollups import apply_rollup_delta
 from app.services.shared.retry import retry_on_db_lock
 from app.utils.date_utils import extract_date_from_raw_data
 
@@ -184,6 +187,9 @@ class StorageManager:
                     logger.debug("Skipping contribution without ID")
                     return
                 
+                # Take the stored row out of the contributor rollups before it changes
+                await apply_rollup_delta(session, [contrib_id], sign=-1)
+                
                 # Check if contribution already exists
                 existing = await session.execute(
                     select(Contribution).where(Contribution.contribution_id == contrib_id)
@@ -243,6 +249,7 @@ class StorageManager:
                         logger.debug(f"Updated contribution_date for existing contribution {contrib_id} from API response (was {existing_contrib.contribution_date}, now {contrib_date})")
                     
                     logger.debug(f"Updated existing contribution {contrib_id} using smart merge (may be an amendment)")
+                    contrib_name = existing_contrib.contributor_name
                 else:
                     # Create new contribution
                     contribution = Contribution(
@@ -264,6 +271,9 @@ class StorageManager:
                     )
                     session.add(contribution)
                 
+                # Keep the donor search index and rollups in sync with the stored row
+                await index_contributor_names(session, [contrib_name])
+                await apply_rollup_delta(session, [contrib_id], sign=1)
                 await session.commit()
     
     @retry_on_db_lock(max_retries=3, base_delay=0.1)
@@ -370,6 +380,14 @@ class StorageManager:
                                 raise
                         else:
                             raise
+                
+                # Keep the candidate_committee links in sync (links are only added, like linkage imports)
+                candidate_ids = committee_data.get("candidate_ids") or []
+                if candidate_ids:
+                    linked = await link_candidate_committees(session, [(cid, committee_id) for cid in candidate_ids])
+                    await session.commit()
+                    if linked:
+                        mark_linkage_changed()
     
     def _extract_candidate_contact_info(self, candidate_data: Dict) -> Dict:
         """Extract contact information from candidate API response"""
@@ -1,13 +1,83 @@
+import asyncio
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict
 from difflib import SequenceMatcher
+from functools import lru_cache
+from rapidfuzz import fuzz, process
 from app.services.fec_client import FECClient
 from app.services.donor_aggregation import DonorAggregationService
 from app.services.contribution_limits import ContributionLimitsService
 from app.models.schemas import FraudPattern, FraudAnalysis
-from app.utils.thread_pool import async_to_numeric, async_dataframe_operation
+from app.utils.thread_pool import run_in_thread_pool
+
+REQUIRED_COLUMNS = ['contribution_amount', 'contributor_name', 'contributor_city',
+                    'contributor_state', 'contributor_employer', 'contribution_date']
+
+# Smurfing candidates are scored this many starting rows at a time
+SMURFING_BLOCK_SIZE = 256
+# Slack (on the 0-100 rapidfuzz scale) so float rounding never drops a candidate pair
+SCORE_MARGIN = 0.001
+
+
+# SequenceMatcher only discards "junk" characters from strings this long
+_AUTOJUNK_MIN_LENGTH = 200
+
+
+@lru_cache(maxsize=65536)
+def _sequence_ratio(first: str, second: str) -> float:
+    # Donors repeat, so the same pairs are compared many times
+    if first == second and len(first) < _AUTOJUNK_MIN_LENGTH:
+        return 1.0
+    return SequenceMatcher(None, first, second).ratio()
+
+
+class _DetectionFrame:
+    """
+    Contributions with the columns the detectors share (amounts, dates, round
+    numbers) normalized once per analysis. Read-only after construction, so the
+    detectors can run on it concurrently.
+    """
+    
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.amounts = pd.to_numeric(df['contribution_amount'], errors='coerce').fillna(0).to_numpy()
+        self.dates = pd.to_datetime(df['contribution_date'], errors='coerce')
+        # Positions of the rows with a parseable date, and their calendar day
+        self.dated = np.flatnonzero(self.dates.notna().to_numpy())
+        self.day_strings = self.dates.iloc[self.dated].dt.strftime('%Y-%m-%d')
+        # Round numbers: multiples of 100, 500, 1000
+        self.is_round = (self.amounts % 100 == 0) | (self.amounts % 500 == 0) | (self.amounts % 1000 == 0)
+
+
+def _records_by_group(df: pd.DataFrame, groups: List[np.ndarray]) -> List[List[Dict[str, Any]]]:
+    """Rows of ``df`` at each group's positions as dicts (one ``to_dict`` call for all groups)"""
+    if not groups:
+        return []
+    records = df.iloc[np.concatenate(groups)].to_dict('records')
+    offsets = np.cumsum([0] + [len(group) for group in groups])
+    return [records[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def _frequent_groups(grouped, min_count: int) -> Tuple[pd.DataFrame, List[np.ndarray]]:
+    """
+    Groups of an unsorted groupby with at least ``min_count`` contribution
+    amounts: their amount sum/count, sorted by group key (as a sorted groupby
+    would return them), and the row positions of each group.
+    """
+    totals = grouped['contribution_amount'].agg(['sum', 'count'])
+    selected = np.flatnonzero((totals['count'] >= min_count).to_numpy())
+    if len(selected) == 0:
+        return totals.iloc[:0], []
+    # Sorting only the selected keys is much cheaper than a sorted groupby
+    group_ids = grouped.ngroup().to_numpy()
+    positions = np.flatnonzero(np.isin(group_ids, selected))
+    positions = positions[np.argsort(group_ids[positions], kind='stable')]
+    members = np.split(positions, np.flatnonzero(np.diff(group_ids[positions])) + 1)
+    order = totals.index[selected].argsort()
+    return totals.iloc[selected[order]], [members[i] for i in order]
 
 
 class FraudDetectionService:
@@ -51,41 +121,84 @@ class FraudDetectionService:
             has_employer_occupation=has_employer_occupation
         )
     
-    async def _get_contribution_limit(self, contribution_date: datetime, contribution: Dict[str, Any]) -> float:
+    async def _load_limits(self) -> Dict[Tuple[int, str], float]:
+        """
+        Load the contribution limits table once per analysis (empty without a
+        limits service, so every lookup falls back to the default limit).
+        """
+        if not self.limits_service:
+            return {}
+        return await self.limits_service.get_limits_table()
+    
+    def _get_contribution_limit(
+        self,
+        contribution_date: datetime,
+        contribution: Dict[str, Any],
+        limits: Dict[Tuple[int, str], float]
+    ) -> float:
         """
         Get the appropriate contribution limit for a contribution based on its date and type.
         
         Args:
             contribution_date: Date of the contribution
             contribution: Contribution dictionary
+            limits: Limits table from ``_load_limits``
             
         Returns:
-            Limit amount in dollars (uses fallback if limits service not available)
+            Limit amount in dollars (uses fallback if the limit is not in the table)
         """
-        if not self.limits_service:
+        if not limits:
             return self.contribution_limit_individual
         
         contributor_category = self._determine_contributor_category(contribution)
-        
-        limit = await self.limits_service.get_limit_for_contribution(
-            contribution_date=contribution_date,
-            contributor_type=contributor_category,
-            contribution_type_code=contribution.get('contribution_type') or contribution.get('transaction_type'),
-            committee_type=contribution.get('committee_type'),
-            has_employer_occupation=bool(
-                contribution.get('contributor_employer') or 
-                contribution.get('contributor_occupation')
-            )
-        )
+        limit = self.limits_service.lookup_limit(limits, contribution_date, contributor_category)
         
         # Fallback to default if limit not found
         return limit if limit is not None else self.contribution_limit_individual
     
+    def _row_limits(self, frame: "_DetectionFrame", limits: Dict[Tuple[int, str], float]) -> np.ndarray:
+        """Contribution limit of each dated row of ``frame``, in ``frame.dated`` order"""
+        if not limits:
+            return np.full(len(frame.dated), self.contribution_limit_individual)
+        
+        df = frame.df.iloc[frame.dated]
+        
+        def column(name: str) -> List[Any]:
+            return df[name].tolist() if name in df.columns else [None] * len(df)
+        
+        dates = frame.dates.iloc[frame.dated].tolist()
+        type_codes = [code or transaction_type for code, transaction_type
+                      in zip(column('contribution_type'), column('transaction_type'))]
+        has_employer_occupation = [bool(employer or occupation) for employer, occupation
+                                   in zip(column('contributor_employer'), column('contributor_occupation'))]
+        
+        # Few distinct (year, type code, committee type, employer) combinations: look each up once
+        # (NaN codes parse like missing ones, so they share a key)
+        row_limits = np.empty(len(df))
+        cache: Dict[Tuple[Any, ...], float] = {}
+        for i, (date, code, committee_type, has_employer) in enumerate(
+            zip(dates, type_codes, column('committee_type'), has_employer_occupation)
+        ):
+            key = (
+                date.year,
+                code if code == code else None,
+                committee_type if committee_type == committee_type else None,
+                has_employer
+            )
+            if key not in cache:
+                cache[key] = self._get_contribution_limit(date, {
+                    'contribution_type': key[1],
+                    'committee_type': key[2],
+                    'contributor_employer': has_employer,
+                }, limits)
+            row_limits[i] = cache[key]
+        return row_limits
+    
     def _similarity(self, str1: str, str2: str) -> float:
         """Calculate string similarity"""
         if not str1 or not str2:
             return 0.0
-        return SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
+        return _sequence_ratio(str1.lower(), str2.lower())
     
     def _format_date_for_display(self, date_value: Any) -> Optional[str]:
         """Format date value to string for frontend display"""
@@ -221,6 +334,21 @@ class FraudDetectionService:
                 'contributor_state': fallback_state,
             }
     
+    def _contributions_frame(self, contributions: List[Dict[str, Any]]) -> pd.DataFrame:
+        """DataFrame of contributions with the columns the detectors read"""
+        df = pd.DataFrame(contributions)
+        for col in REQUIRED_COLUMNS:
+            if col not in df.columns:
+                df[col] = None
+        return df
+    
+    async def _run_detectors(self, frame: "_DetectionFrame", detectors: List[Tuple[Any, ...]]) -> List[FraudPattern]:
+        """Run synchronous detectors concurrently in the thread pool; patterns keep detector order"""
+        results = await asyncio.gather(*(
+            run_in_thread_pool(detector, frame, *args) for detector, *args in detectors
+        ))
+        return [pattern for patterns in results for pattern in patterns]
+    
     async def analyze_candidate(
         self,
         candidate_id: str,
@@ -232,7 +360,8 @@ class FraudDetectionService:
             candidate_id=candidate_id,
             min_date=min_date,
             max_date=max_date,
-            limit=10000
+            limit=10000,
+            include_raw_data=False
         )
         
         if not contributions:
@@ -243,43 +372,21 @@ class FraudDetectionService:
                 total_suspicious_amount=0.0
             )
         
-        df = pd.DataFrame(contributions)
-        
-        # Ensure required columns exist
-        required_cols = ['contribution_amount', 'contributor_name', 'contributor_city', 
-                        'contributor_state', 'contributor_employer', 'contribution_date']
-        for col in required_cols:
-            if col not in df.columns:
-                df[col] = None
-        
-        patterns = []
+        # Normalize amounts and dates once; the detectors share them
+        frame = await run_in_thread_pool(_DetectionFrame, self._contributions_frame(contributions))
+        limits = await self._load_limits()
         
-        # Detect smurfing patterns
-        smurfing_patterns = await self._detect_smurfing(df)
-        patterns.extend(smurfing_patterns)
-        
-        # Detect threshold clustering
-        threshold_patterns = await self._detect_threshold_clustering(df)
-        patterns.extend(threshold_patterns)
-        
-        # Detect temporal anomalies
-        temporal_patterns = await self._detect_temporal_anomalies(df)
-        patterns.extend(temporal_patterns)
-        
-        # Detect round number patterns
-        round_patterns = await self._detect_round_number_patterns(df)
-        patterns.extend(round_patterns)
-        
-        # Detect same-day multiple contributions
-        same_day_patterns = await self._detect_same_day_patterns(df)
-        patterns.extend(same_day_patterns)
+        patterns = await self._run_detectors(frame, [
+            (self._detect_smurfing,),
+            (self._detect_threshold_clustering, limits),
+            (self._detect_temporal_anomalies,),
+            (self._detect_round_number_patterns,),
+            (self._detect_same_day_patterns,),
+        ])
         
         # Calculate risk score
         total_suspicious = sum(p.total_amount for p in patterns)
-        # Convert to numeric and fill NaN values
-        contribution_amounts = await async_to_numeric(df['contribution_amount'], errors='coerce')
-        contribution_amounts = contribution_amounts.fillna(0)
-        total_contributions = await async_dataframe_operation(contribution_amounts, lambda s: s.sum())
+        total_contributions = float(frame.amounts.sum())
         risk_score = min(100.0, (total_suspicious / total_contributions * 100) if total_contributions > 0 else 0.0)
         
         return FraudAnalysis(
@@ -289,269 +396,232 @@ class FraudDetectionService:
             total_suspicious_amount=total_suspicious
         )
     
-    async def _detect_smurfing(self, df: pd.DataFrame) -> List[FraudPattern]:
+    def _detect_smurfing(self, frame: "_DetectionFrame") -> List[FraudPattern]:
         """Detect smurfing: multiple contributions just under reporting threshold"""
         patterns = []
         
-        # Convert to numeric and fill NaN values
-        contribution_amounts = await async_to_numeric(df['contribution_amount'], errors='coerce')
-        contribution_amounts = contribution_amounts.fillna(0)
-        
         # Find contributions just under threshold
-        smurf_contributions = df[
-            (contribution_amounts >= self.smurfing_threshold) &
-            (contribution_amounts < self.reporting_threshold)
-        ].copy()
+        positions = np.flatnonzero(
+            (frame.amounts >= self.smurfing_threshold) & (frame.amounts < self.reporting_threshold)
+        )
         
-        if len(smurf_contributions) < 3:
+        if len(positions) < 3:
             return patterns
         
-        # Group by similar names, addresses, employers
-        smurf_contributions['name_normalized'] = smurf_contributions['contributor_name'].fillna('').astype(str).str.lower().str.strip()
-        smurf_contributions['city_normalized'] = smurf_contributions['contributor_city'].fillna('').astype(str).str.lower().str.strip()
-        smurf_contributions['employer_normalized'] = smurf_contributions['contributor_employer'].fillna('').astype(str).str.lower().str.strip()
-        
-        # Find groups with similar attributes
-        groups = []
-        processed = set()
-        
-        for idx, row in smurf_contributions.iterrows():
-            if idx in processed:
-                continue
-            
-            group = [row.to_dict()]
-            processed.add(idx)
-            
-            # Find similar contributions
-            for idx2, row2 in smurf_contributions.iterrows():
-                if idx2 in processed:
-                    continue
-                
-                name_sim = self._similarity(
-                    str(row['contributor_name']),
-                    str(row2['contributor_name'])
-                )
-                city_sim = self._similarity(
-                    str(row['contributor_city']),
-                    str(row2['contributor_city'])
-                )
-                employer_sim = self._similarity(
-                    str(row['contributor_employer']),
-                    str(row2['contributor_employer'])
-                )
-                
-                # If similar enough, add to group
-                if (name_sim > 0.7 or (city_sim > 0.8 and employer_sim > 0.8)) and name_sim > 0.5:
-                    group.append(row2.to_dict())
-                    processed.add(idx2)
-            
-            if len(group) >= 3:
-                groups.append(group)
+        smurf_contributions = frame.df.iloc[positions]
+        groups = self._group_similar_sources(*(
+            [str(value) for value in smurf_contributions[col]]
+            for col in ('contributor_name', 'contributor_city', 'contributor_employer')
+        ))
+        
+        normalized = {
+            f'{field}_normalized': smurf_contributions[f'contributor_{field}'].fillna('').astype(str).str.lower().str.strip()
+            for field in ('name', 'city', 'employer')
+        }
+        amounts = smurf_contributions['contribution_amount'].tolist()
+        
+        # Significant groups: at least 2x threshold
+        totals = [sum(amounts[i] for i in group) for group in groups]
+        significant = [(group, total) for group, total in zip(groups, totals) if total >= self.reporting_threshold * 2]
+        contribs = _records_by_group(
+            smurf_contributions.assign(**{col: values.to_numpy() for col, values in normalized.items()}),
+            [np.array(group[:10], dtype=np.intp) for group, _ in significant]  # Limit to first 10
+        )
         
         # Create patterns for significant groups
-        for group in groups:
-            total_amount = sum(c.get('contribution_amount', 0) for c in group)
-            if total_amount >= self.reporting_threshold * 2:  # At least 2x threshold
-                patterns.append(FraudPattern(
-                    pattern_type="smurfing",
-                    severity="high" if len(group) >= 5 else "medium",
-                    description=f"Found {len(group)} contributions just under reporting threshold from similar sources",
-                    affected_contributions=group[:10],  # Limit to first 10
-                    total_amount=total_amount,
-                    confidence_score=0.8 if len(group) >= 5 else 0.6
-                ))
+        for (group, total_amount), group_contribs in zip(significant, contribs):
+            patterns.append(FraudPattern(
+                pattern_type="smurfing",
+                severity="high" if len(group) >= 5 else "medium",
+                description=f"Found {len(group)} contributions just under reporting threshold from similar sources",
+                affected_contributions=group_contribs,
+                total_amount=total_amount,
+                confidence_score=0.8 if len(group) >= 5 else 0.6
+            ))
         
         return patterns
     
-    async def _detect_threshold_clustering(self, df: pd.DataFrame) -> List[FraudPattern]:
-        """Detect contributions clustered near legal limits"""
-        patterns = []
+    def _similar_sources(self, first: Tuple[str, str, str], second: Tuple[str, str, str]) -> bool:
+        """Whether two (name, city, employer) triples look like the same source"""
+        name_sim = self._similarity(first[0], second[0])
+        if name_sim <= 0.5:
+            return False
+        return name_sim > 0.7 or (
+            self._similarity(first[1], second[1]) > 0.8 and self._similarity(first[2], second[2]) > 0.8
+        )
+    
+    def _group_similar_sources(self, names: List[str], cities: List[str], employers: List[str]) -> List[List[int]]:
+        """
+        Group rows from similar sources (``_similar_sources``), greedily in row
+        order: each row not yet grouped starts a group that takes every
+        ungrouped row similar to it.
         
-        # Convert to numeric and fill NaN values
-        contribution_amounts = await async_to_numeric(df['contribution_amount'], errors='coerce')
-        contribution_amounts = contribution_amounts.fillna(0)
+        Rather than comparing every pair with SequenceMatcher, each block of
+        starting rows is scored against all rows with rapidfuzz ``cdist``.
+        ``fuzz.ratio`` (longest common subsequence) is never below
+        SequenceMatcher's ratio, so the matrices give a superset of the similar
+        pairs, and only those are confirmed with ``_similar_sources``.
         
-        # Get limits for each contribution based on date
-        # Group by date to minimize database queries
-        df['date'] = pd.to_datetime(df['contribution_date'], errors='coerce')
-        df = df.dropna(subset=['date']).copy()
+        Returns:
+            Groups of 3 or more row indices, in order
+        """
+        columns = [[value.lower() for value in values] for values in (names, cities, employers)]
+        rows = list(zip(names, cities, employers))
+        codes = []
+        uniques = []
+        for values in columns:
+            column_codes, column_uniques = pd.factorize(pd.Series(values, dtype=object))
+            codes.append(column_codes)
+            uniques.append(list(column_uniques))
+        
+        def block_scores(column: int, block: slice, cutoff: float) -> np.ndarray:
+            # Score distinct values only, then expand to (block rows x all rows)
+            block_codes, inverse = np.unique(codes[column][block], return_inverse=True)
+            scores = process.cdist(
+                [uniques[column][code] for code in block_codes], uniques[column],
+                scorer=fuzz.ratio, score_cutoff=cutoff, dtype=np.float32, workers=-1
+            )
+            return scores[inverse][:, codes[column]]
+        
+        grouped = np.zeros(len(rows), dtype=bool)
+        groups = []
+        for start in range(0, len(rows), SMURFING_BLOCK_SIZE):
+            block = slice(start, min(len(rows), start + SMURFING_BLOCK_SIZE))
+            name_scores = block_scores(0, block, 50 - SCORE_MARGIN)
+            candidates = (name_scores >= 70 - SCORE_MARGIN) | (
+                (name_scores >= 50 - SCORE_MARGIN)
+                & (block_scores(1, block, 80 - SCORE_MARGIN) >= 80 - SCORE_MARGIN)
+                & (block_scores(2, block, 80 - SCORE_MARGIN) >= 80 - SCORE_MARGIN)
+            )
+            for offset, seed in enumerate(range(block.start, block.stop)):
+                if grouped[seed]:
+                    continue
+                grouped[seed] = True
+                group = [seed]
+                for other in np.flatnonzero(candidates[offset] & ~grouped):
+                    if self._similar_sources(rows[seed], rows[other]):
+                        group.append(int(other))
+                        grouped[other] = True
+                if len(group) >= 3:
+                    groups.append(group)
+        return groups
+    
+    def _detect_threshold_clustering(self, frame: "_DetectionFrame", limits: Dict[Tuple[int, str], float]) -> List[FraudPattern]:
+        """Detect contributions clustered near legal limits"""
+        patterns = []
         
-        if len(df) == 0:
+        if len(frame.dated) == 0:
             return patterns
         
-        # Get unique dates and determine limits
-        # For efficiency, we'll use the most common limit or check per contribution
-        # For now, use a simpler approach: check each contribution's limit
-        near_limit_rows = []
+        # Each dated contribution's limit, from the preloaded limits table
+        row_limits = self._row_limits(frame, limits)
+        amounts = frame.amounts[frame.dated]
+        near = frame.dated[(amounts >= row_limits * 0.9) & (amounts <= row_limits * 1.1)]
         
-        for idx, row in df.iterrows():
-            try:
-                contrib_dict = row.to_dict()
-                limit = await self._get_contribution_limit(row['date'], contrib_dict)
-                
-                amount = contribution_amounts.iloc[idx]
-                if (amount >= limit * 0.9) and (amount <= limit * 1.1):
-                    near_limit_rows.append((idx, row, limit))
-            except Exception as e:
-                # Skip if we can't determine limit
-                continue
-        
-        if len(near_limit_rows) > 0:
-            # Create DataFrame with near-limit contributions
-            near_limit_indices = [idx for idx, _, _ in near_limit_rows]
-            near_limit = df.loc[near_limit_indices].copy()
-            
-            # Group by contributor
-            grouped = await async_dataframe_operation(
-                near_limit,
-                lambda d: d.groupby('contributor_name').agg({
-                    'contribution_amount': ['sum', 'count']
-                }).reset_index()
-            )
-            grouped.columns = ['name', 'total', 'count']
+        if len(near) > 0:
+            near_limit = frame.df.iloc[near].assign(date=frame.dates.iloc[near].to_numpy())
             
-            # Find contributors with multiple near-limit contributions
-            suspicious = grouped[grouped['count'] >= 2]
+            # Group by contributor; find contributors with multiple near-limit contributions
+            suspicious, members = _frequent_groups(near_limit.groupby('contributor_name', sort=False), 2)
+            contribs = _records_by_group(near_limit, members)
             
-            for _, row in suspicious.iterrows():
-                contribs = near_limit[near_limit['contributor_name'] == row['name']].to_dict('records')
+            for (name, total, _), group_contribs in zip(suspicious.itertuples(), contribs):
                 patterns.append(FraudPattern(
                     pattern_type="threshold_clustering",
                     severity="medium",
-                    description=f"Multiple contributions near legal limit from {row['name']}",
-                    affected_contributions=contribs,
-                    total_amount=float(row['total']),
+                    description=f"Multiple contributions near legal limit from {name}",
+                    affected_contributions=group_contribs,
+                    total_amount=float(total),
                     confidence_score=0.7
                 ))
         
         return patterns
     
-    async def _detect_temporal_anomalies(self, df: pd.DataFrame) -> List[FraudPattern]:
+    def _detect_temporal_anomalies(self, frame: "_DetectionFrame") -> List[FraudPattern]:
         """Detect unusual timing patterns"""
         patterns = []
         
-        df['date'] = pd.to_datetime(df['contribution_date'], errors='coerce')
-        df = df.dropna(subset=['date']).copy()
-        
-        if len(df) == 0:
+        if len(frame.dated) == 0:
             return patterns
         
         # Group by contributor and date
-        df['date_str'] = df['date'].dt.date.astype(str)
-        grouped = await async_dataframe_operation(
-            df,
-            lambda d: d.groupby(['contributor_name', 'date_str']).agg({
-                'contribution_amount': ['sum', 'count']
-            }).reset_index()
+        df = frame.df.iloc[frame.dated].assign(
+            date=frame.dates.iloc[frame.dated].to_numpy(), date_str=frame.day_strings.to_numpy()
         )
-        grouped.columns = ['name', 'date', 'total', 'count']
         
         # Find contributors with many contributions on same day
-        same_day = grouped[grouped['count'] >= 5]
+        same_day, members = _frequent_groups(df.groupby(['contributor_name', 'date_str'], sort=False), 5)
+        contribs = _records_by_group(df, members)
         
-        for _, row in same_day.iterrows():
-            contribs = df[
-                (df['contributor_name'] == row['name']) &
-                (df['date_str'] == row['date'])
-            ].to_dict('records')
-            
+        for ((name, date_str), total, count), group_contribs in zip(same_day.itertuples(), contribs):
             patterns.append(FraudPattern(
                 pattern_type="temporal_anomaly",
                 severity="medium",
-                description=f"{row['count']} contributions from {row['name']} on {row['date']}",
-                affected_contributions=contribs,
-                total_amount=float(row['total']),
+                description=f"{count} contributions from {name} on {date_str}",
+                affected_contributions=group_contribs,
+                total_amount=float(total),
                 confidence_score=0.6
             ))
         
         return patterns
     
-    async def _detect_round_number_patterns(self, df: pd.DataFrame) -> List[FraudPattern]:
+    def _detect_round_number_patterns(self, frame: "_DetectionFrame") -> List[FraudPattern]:
         """Detect excessive round number contributions"""
         patterns = []
         
-        # Convert to numeric and fill NaN values
-        contribution_amounts = await async_to_numeric(df['contribution_amount'], errors='coerce')
-        contribution_amounts = contribution_amounts.fillna(0)
-        
-        # Round numbers: multiples of 100, 500, 1000
-        df['is_round'] = (
-            (contribution_amounts % 100 == 0) |
-            (contribution_amounts % 500 == 0) |
-            (contribution_amounts % 1000 == 0)
-        )
-        
-        round_contribs = df[df['is_round']].copy()
+        round_positions = np.flatnonzero(frame.is_round)
         
-        if len(round_contribs) > len(df) * 0.7:  # More than 70% are round numbers
-            # Group by contributor
-            grouped = await async_dataframe_operation(
-                round_contribs,
-                lambda d: d.groupby('contributor_name').agg({
-                    'contribution_amount': ['sum', 'count']
-                }).reset_index()
+        if len(round_positions) > len(frame.df) * 0.7:  # More than 70% are round numbers
+            round_contribs = frame.df.iloc[round_positions].assign(
+                date=frame.dates.iloc[round_positions].to_numpy(), is_round=True
             )
-            grouped.columns = ['name', 'total', 'count']
             
-            # Find contributors with many round number contributions
-            suspicious = grouped[grouped['count'] >= 10]
+            # Group by contributor; find contributors with many round number contributions
+            suspicious, members = _frequent_groups(round_contribs.groupby('contributor_name', sort=False), 10)
+            contribs = _records_by_group(round_contribs, [positions[:20] for positions in members])
             
-            for _, row in suspicious.iterrows():
-                contribs = round_contribs[
-                    round_contribs['contributor_name'] == row['name']
-                ].head(20).to_dict('records')
-                
+            for (name, total, _), group_contribs in zip(suspicious.itertuples(), contribs):
                 patterns.append(FraudPattern(
                     pattern_type="round_number_pattern",
                     severity="low",
-                    description=f"Many round number contributions from {row['name']}",
-                    affected_contributions=contribs,
-                    total_amount=float(row['total']),
+                    description=f"Many round number contributions from {name}",
+                    affected_contributions=group_contribs,
+                    total_amount=float(total),
                     confidence_score=0.5
                 ))
         
         return patterns
     
-    async def _detect_same_day_patterns(self, df: pd.DataFrame) -> List[FraudPattern]:
+    def _detect_same_day_patterns(self, frame: "_DetectionFrame") -> List[FraudPattern]:
         """Detect multiple contributions from same source on same day"""
         patterns = []
         
-        df['date'] = pd.to_datetime(df['contribution_date'], errors='coerce')
-        df = df.dropna(subset=['date']).copy()
-        
-        if len(df) == 0:
+        if len(frame.dated) == 0:
             return patterns
         
+        df = frame.df.iloc[frame.dated]
         # Group by name, address, and date
-        df['key'] = (
-            df['contributor_name'].astype(str) + "_" +
-            df['contributor_city'].astype(str) + "_" +
-            df['contributor_state'].astype(str) + "_" +
-            df['date'].dt.date.astype(str)
+        key = df['contributor_name'].astype(str).str.cat(
+            [df['contributor_city'].astype(str), df['contributor_state'].astype(str), frame.day_strings], sep="_"
         )
-        
-        grouped = await async_dataframe_operation(
-            df,
-            lambda d: d.groupby('key').agg({
-                'contribution_amount': ['sum', 'count']
-            }).reset_index()
+        df = df.assign(
+            date=frame.dates.iloc[frame.dated].to_numpy(),
+            is_round=frame.is_round[frame.dated],
+            key=key.to_numpy()
         )
-        grouped.columns = ['key', 'total', 'count']
         
         # Find groups with multiple contributions
-        multiple = grouped[grouped['count'] >= 3]
+        multiple, members = _frequent_groups(df.groupby('key', sort=False), 3)
+        contribs = _records_by_group(df, members)
         
-        for _, row in multiple.iterrows():
-            key_parts = row['key'].split('_')
-            contribs = df[df['key'] == row['key']].to_dict('records')
-            
+        for (group_key, total, count), group_contribs in zip(multiple.itertuples(), contribs):
             patterns.append(FraudPattern(
                 pattern_type="same_day_multiple",
-                severity="medium" if row['count'] >= 5 else "low",
-                description=f"{row['count']} contributions from same source on same day",
-                affected_contributions=contribs,
-                total_amount=float(row['total']),
-                confidence_score=0.65 if row['count'] >= 5 else 0.5
+                severity="medium" if count >= 5 else "low",
+                description=f"{count} contributions from same source on same day",
+                affected_contributions=group_contribs,
+                total_amount=float(total),
+                confidence_score=0.65 if count >= 5 else 0.5
             ))
         
         return patterns
@@ -567,7 +637,8 @@ class FraudDetectionService:
             candidate_id=candidate_id,
             min_date=min_date,
             max_date=max_date,
-            limit=10000
+            limit=10000,
+            include_raw_data=False
         )
         
         if not contributions:
@@ -601,40 +672,34 @@ class FraudDetectionService:
             contrib_dicts.append(contrib_dict)
         
         aggregation_service = DonorAggregationService()
-        aggregated_donors = aggregation_service.aggregate_donors(contrib_dicts)
+        aggregated_donors = await run_in_thread_pool(aggregation_service.aggregate_donors, contrib_dicts)
         aggregated_donors_count = len(aggregated_donors)
         
+        limits = await self._load_limits()
         patterns = []
         
         # Enhanced patterns using aggregated donors
-        patterns.extend(await self._detect_aggregate_limit_evasion(aggregated_donors, contributions))
-        patterns.extend(await self._detect_name_variation_fraud(aggregated_donors, contributions))
+        patterns.extend(self._detect_aggregate_limit_evasion(aggregated_donors, contributions, limits))
+        patterns.extend(self._detect_name_variation_fraud(aggregated_donors, contributions, limits))
         patterns.extend(self._detect_coordinated_contributions(aggregated_donors, contributions))
         patterns.extend(self._detect_rapid_sequential_contributions(aggregated_donors, contributions))
         
-        # Also run existing patterns on aggregated data
-        df = pd.DataFrame(contributions)
-        required_cols = ['contribution_amount', 'contributor_name', 'contributor_city', 
-                        'contributor_state', 'contributor_employer', 'contribution_date']
-        for col in required_cols:
-            if col not in df.columns:
-                df[col] = None
-        
         # Enhanced smurfing with aggregation
         patterns.extend(self._detect_smurfing_with_aggregation(aggregated_donors, contributions))
         # Enhanced threshold clustering with aggregation
-        patterns.extend(await self._detect_threshold_clustering_with_aggregation(aggregated_donors, contributions))
+        patterns.extend(self._detect_threshold_clustering_with_aggregation(aggregated_donors, contributions, limits))
         
         # Keep existing temporal and round number patterns
-        patterns.extend(await self._detect_temporal_anomalies(df))
-        patterns.extend(await self._detect_round_number_patterns(df))
-        patterns.extend(await self._detect_same_day_patterns(df))
+        frame = await run_in_thread_pool(_DetectionFrame, self._contributions_frame(contributions))
+        patterns.extend(await self._run_detectors(frame, [
+            (self._detect_temporal_anomalies,),
+            (self._detect_round_number_patterns,),
+            (self._detect_same_day_patterns,),
+        ]))
         
         # Calculate risk score
         total_suspicious = sum(p.total_amount for p in patterns)
-        contribution_amounts = await async_to_numeric(df['contribution_amount'], errors='coerce')
-        contribution_amounts = contribution_amounts.fillna(0)
-        total_contributions = await async_dataframe_operation(contribution_amounts, lambda s: s.sum())
+        total_contributions = float(frame.amounts.sum())
         risk_score = min(100.0, (total_suspicious / total_contributions * 100) if total_contributions > 0 else 0.0)
         
         return FraudAnalysis(
@@ -646,7 +711,12 @@ class FraudDetectionService:
             aggregation_enabled=True
         )
     
-    async def _detect_aggregate_limit_evasion(self, aggregated_donors: List[Dict[str, Any]], contributions: List[Dict[str, Any]]) -> List[FraudPattern]:
+    def _detect_aggregate_limit_evasion(
+        self,
+        aggregated_donors: List[Dict[str, Any]],
+        contributions: List[Dict[str, Any]],
+        limits: Dict[Tuple[int, str], float]
+    ) -> List[FraudPattern]:
         """Detect when aggregated donor exceeds contribution limit"""
         patterns = []
         
@@ -693,7 +763,7 @@ class FraudDetectionService:
                                 contrib_date = None
                             
                             if contrib_date:
-                                limit = await self._get_contribution_limit(contrib_date, contrib)
+                                limit = self._get_contribution_limit(contrib_date, contrib, limits)
                         except Exception:
                             pass  # Use fallback limit
             
@@ -729,7 +799,12 @@ class FraudDetectionService:
         
         return patterns
     
-    async def _detect_name_variation_fraud(self, aggregated_donors: List[Dict[str, Any]], contributions: List[Dict[str, Any]]) -> List[FraudPattern]:
+    def _detect_name_variation_fraud(
+        self,
+        aggregated_donors: List[Dict[str, Any]],
+        contributions: List[Dict[str, Any]],
+        limits: Dict[Tuple[int, str], float]
+    ) -> List[FraudPattern]:
         """Flag donors with 3+ name variations exceeding limit"""
         patterns = []
         
@@ -769,7 +844,7 @@ class FraudDetectionService:
                             if isinstance(contrib_date, str):
                                 contrib_date = datetime.fromisoformat(contrib_date.replace('Z', '+00:00'))
                             if contrib_date:
-                                limit = await self._get_contribution_limit(contrib_date, contrib)
+                                limit = self._get_contribution_limit(contrib_date, contrib, limits)
                         except Exception:
                             pass
             
@@ -979,7 +1054,12 @@ class FraudDetectionService:
         
         return patterns
     
-    async def _detect_threshold_clustering_with_aggregation(self, aggregated_donors: List[Dict[str, Any]], contributions: List[Dict[str, Any]]) -> List[FraudPattern]:
+    def _detect_threshold_clustering_with_aggregation(
+        self,
+        aggregated_donors: List[Dict[str, Any]],
+        contributions: List[Dict[str, Any]],
+        limits: Dict[Tuple[int, str], float]
+    ) -> List[FraudPattern]:
         """Enhanced threshold clustering using aggregated donors"""
         patterns = []
         
@@ -1018,7 +1098,7 @@ class FraudDetectionService:
                             if isinstance(contrib_date, str):
                                 contrib_date = datetime.fromisoformat(contrib_date.replace('Z', '+00:00'))
                             if contrib_date:
-                                limit = await self._get_contribution_limit(contrib_date, contrib)
+                                limit = self._get_contribution_limit(contrib_date, contrib, limits)
                         except Exception:
                             pass
             
@@ -0,0 +1,136 @@
+"""
+Background report export jobs
+
+Large PDF/DOCX reports take a while to collect and render, so export
+requests can run as jobs: ``submit`` starts the report in a background task
+and returns at once with a job ID. The finished document is written to
+``REPORT_JOB_DIR`` and served through a download handle until the job
+expires (``REPORT_JOB_TTL_SECONDS`` after it finished).
+
+Jobs are kept in process memory; a restart drops them (clients resubmit).
+"""
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+# (document bytes, filename, media type)
+RenderedReport = Tuple[bytes, str, str]
+
+
+@dataclass
+class ReportJob:
+    """State of one background report export"""
+    id: str
+    description: str
+    status: str = 'pending'  # pending, running, completed, failed
+    filename: Optional[str] = None
+    media_type: Optional[str] = None
+    path: Optional[str] = None
+    size: Optional[int] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    completed_at: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "description": self.description,
+            "status": self.status,
+            "filename": self.filename,
+            "media_type": self.media_type,
+            "size": self.size,
+            "error": self.error,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
+        }
+
+
+def _job_dir() -> str:
+    return config.REPORT_JOB_DIR or os.path.join(tempfile.gettempdir(), "fec_reports")
+
+
+class ReportJobManager:
+    """Runs report exports in the background and keeps their documents for download"""
+
+    def __init__(self):
+        self._jobs: Dict[str, ReportJob] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def submit(self, description: str, render: Callable[[], Awaitable[RenderedReport]]) -> ReportJob:
+        """
+        Start a report export in the background.
+
+        Args:
+            description: What is being exported (for status responses)
+            render: Coroutine function producing (document bytes, filename, media type)
+
+        Returns:
+            The pending job
+        """
+        self.expire()
+        job = ReportJob(id=str(uuid.uuid4()), description=description)
+        self._jobs[job.id] = job
+        task = asyncio.create_task(self._run(job, render))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: ReportJob, render: Callable[[], Awaitable[RenderedReport]]) -> None:
+        job.status = 'running'
+        try:
+            content, filename, media_type = await render()
+            directory = _job_dir()
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{job.id}{os.path.splitext(filename)[1]}")
+            with open(path, "wb") as f:
+                f.write(content)
+            job.path, job.filename, job.media_type, job.size = path, filename, media_type, len(content)
+            job.status = 'completed'
+        except Exception as e:
+            logger.error(f"Report job {job.id} ({job.description}) failed: {e}", exc_info=True)
+            job.error = str(e)
+            job.status = 'failed'
+        finally:
+            job.completed_at = time.time()
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        """Job by ID (None if unknown or expired)"""
+        self.expire()
+        return self._jobs.get(job_id)
+
+    def expire(self) -> None:
+        """Drop finished jobs older than REPORT_JOB_TTL_SECONDS and delete their documents"""
+        cutoff = time.time() - config.REPORT_JOB_TTL_SECONDS
+        for job_id, job in list(self._jobs.items()):
+            if job.completed_at is not None and job.completed_at < cutoff:
+                del self._jobs[job_id]
+                if job.path:
+                    try:
+                        os.remove(job.path)
+                    except OSError:
+                        pass
+
+    async def wait(self) -> None:
+        """Wait for all running jobs (used on shutdown and in tests)"""
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+
+_report_job_manager: Optional[ReportJobManager] = None
+
+
+def get_report_job_manager() -> ReportJobManager:
+    """Process-wide report job manager"""
+    global _report_job_manager
+    if _report_job_manager is None:
+        _report_job_manager = ReportJobManager()
+    return _report_job_manager
@@ -0,0 +1,831 @@
+"""
+Off-loop rendering of PDF and DOCX reports
+
+matplotlib charts and ReportLab/python-docx document builds are CPU-bound
+and used to run on the event loop, so one large report stalled every other
+request. They now run in a dedicated process pool:
+
+- workers are spawned with the Agg backend imported and warmed up
+  (fonts loaded) by ``warm_renderer``; ``warm_render_pool`` starts them at
+  application startup
+- a chart is described by a spec holding only the plotted data
+  (``ReportDocumentBuilder.chart_specs``); PNGs are cached in the API process
+  by a content hash of the spec, so re-exports and other formats of the same
+  report reuse them
+- the document build receives the rendered PNGs by chart name
+
+Everything a worker runs (``render_chart``, ``build_pdf_report``,
+``build_docx_report``) is a top-level function of this module, which only
+imports rendering libraries. ``REPORT_RENDER_WORKERS=0`` renders in the
+thread pool instead (still off the event loop).
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from io import BytesIO
+from typing import Any, Callable, Dict, List, Optional
+
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend
+from matplotlib.figure import Figure
+import numpy as np
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.lib.enums import TA_CENTER
+
+from docx import Document
+from docx.shared import Inches, Pt, RGBColor
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+from app.config import config
+from app.models.schemas import ContributionAnalysis, ExpenditureBreakdown, FraudAnalysis
+
+logger = logging.getLogger(__name__)
+
+
+def _new_figure(polar: bool = False):
+    # Figure objects (not pyplot) keep no global state and need no plt.close()
+    fig = Figure(figsize=(10, 6))
+    ax = fig.add_subplot(projection='polar' if polar else None)
+    return fig, ax
+
+
+def _rotate_x_labels(ax) -> None:
+    for label in ax.get_xticklabels():
+        label.set_rotation(45)
+        label.set_horizontalalignment('right')
+
+
+def _plot_line(ax, spec: Dict[str, Any]) -> None:
+    style = {'color': spec['color']} if spec.get('color') else {}
+    ax.plot(spec['x'], spec['y'], marker='o', linewidth=2, markersize=4, **style)
+    ax.set_title(spec['title'], fontsize=14, fontweight='bold')
+    ax.set_xlabel(spec['xlabel'], fontsize=12)
+    ax.set_ylabel(spec['ylabel'], fontsize=12)
+    ax.grid(True, alpha=0.3)
+    _rotate_x_labels(ax)
+
+
+def _plot_barh(ax, spec: Dict[str, Any]) -> None:
+    ax.barh(spec['labels'], spec['values'], color=spec['color'])
+    ax.set_title(spec['title'], fontsize=14, fontweight='bold')
+    ax.set_xlabel(spec['xlabel'], fontsize=12)
+    ax.set_ylabel(spec['ylabel'], fontsize=12)
+    ax.grid(True, alpha=0.3, axis='x')
+
+
+def _plot_pie(ax, spec: Dict[str, Any]) -> None:
+    if spec['values']:
+        ax.pie(spec['values'], labels=spec['labels'], autopct='%1.1f%%', startangle=90)
+        ax.set_title(spec['title'], fontsize=14, fontweight='bold')
+
+
+def _plot_radar(ax, spec: Dict[str, Any]) -> None:
+    categories = spec['categories']
+    if categories:
+        values = list(spec['values'])
+        angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False).tolist()
+        values += values[:1]  # Complete the circle
+        angles += angles[:1]
+        
+        ax.plot(angles, values, 'o-', linewidth=2)
+        ax.fill(angles, values, alpha=0.25)
+        ax.set_xticks(angles[:-1])
+        ax.set_xticklabels(categories)
+        ax.set_title(spec['title'], fontsize=14, fontweight='bold', pad=20)
+
+
+def _plot_bar(ax, spec: Dict[str, Any]) -> None:
+    if spec['values']:
+        ax.bar(spec['labels'], spec['values'], color='steelblue')
+        ax.set_title(spec['title'], fontsize=14, fontweight='bold')
+        ax.set_ylabel(spec['ylabel'], fontsize=12)
+        ax.set_xlabel(spec['xlabel'], fontsize=12)
+        _rotate_x_labels(ax)
+        ax.grid(True, alpha=0.3, axis='y')
+
+
+_PLOTTERS: Dict[str, Callable] = {
+    'line': _plot_line,
+    'barh': _plot_barh,
+    'pie': _plot_pie,
+    'radar': _plot_radar,
+    'bar': _plot_bar,
+}
+
+
+def render_chart(spec: Dict[str, Any]) -> bytes:
+    """Render a chart spec to PNG bytes"""
+    fig, ax = _new_figure(polar=spec['kind'] == 'radar')
+    _PLOTTERS[spec['kind']](ax, spec)
+    fig.tight_layout()
+    buf = BytesIO()
+    fig.savefig(buf, format='png', dpi=150, bbox_inches='tight')
+    return buf.getvalue()
+
+
+def chart_key(spec: Dict[str, Any]) -> str:
+    """Content hash of a chart spec (cache key of its PNG)"""
+    encoded = json.dumps(spec, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def warm_renderer() -> None:
+    """Worker initializer: load the Agg backend, fonts and document libraries once"""
+    render_chart({'kind': 'bar', 'title': '', 'xlabel': '', 'ylabel': '', 'labels': ['a'], 'values': [1.0]})
+    getSampleStyleSheet()
+    Document()
+
+
+class ChartCache:
+    """LRU of rendered chart PNGs by content hash, bounded by total size"""
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._size = 0
+    
+    def get(self, key: str) -> Optional[bytes]:
+        png = self._entries.get(key)
+        if png is not None:
+            self._entries.move_to_end(key)
+        return png
+    
+    def put(self, key: str, png: bytes) -> None:
+        if len(png) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        self._entries[key] = png
+        self._size += len(png)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_chart_cache: Optional[ChartCache] = None
+_render_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_chart_cache() -> ChartCache:
+    """Process-wide cache of rendered chart PNGs"""
+    global _chart_cache
+    if _chart_cache is None:
+        _chart_cache = ChartCache(config.REPORT_CHART_CACHE_MAX_BYTES)
+    return _chart_cache
+
+
+def get_render_pool() -> Optional[ProcessPoolExecutor]:
+    """Get or create the report render pool (None when REPORT_RENDER_WORKERS=0)"""
+    global _render_pool
+    if _render_pool is None and config.REPORT_RENDER_WORKERS > 0:
+        # spawn: forking a process that runs an event loop and DB threads is unsafe
+        _render_pool = ProcessPoolExecutor(
+            max_workers=config.REPORT_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=warm_renderer
+        )
+        logger.info(f"Initialized report render pool with {config.REPORT_RENDER_WORKERS} workers")
+    return _render_pool
+
+
+def warm_render_pool() -> None:
+    """Start the render workers now instead of on the first export"""
+    pool = get_render_pool()
+    if pool is not None:
+        # Submitting work spawns the workers; each runs warm_renderer first
+        for _ in range(config.REPORT_RENDER_WORKERS):
+            pool.submit(chart_key, {})
+
+
+def shutdown_render_pool() -> None:
+    """Shutdown the report render pool"""
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=True, cancel_futures=True)
+        _render_pool = None
+        logger.info("Report render pool shutdown complete")
+
+
+async def run_in_render_pool(func: Callable, *args) -> Any:
+    """Run a top-level function of this module off the event loop"""
+    pool = get_render_pool()
+    if pool is None:
+        from app.utils.thread_pool import run_in_thread_pool
+        return await run_in_thread_pool(func, *args)
+    return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+
+
+async def render_charts(specs: Dict[str, Dict[str, Any]]) -> Dict[str, bytes]:
+    """
+    Render chart specs concurrently, reusing cached PNGs.
+    
+    Returns:
+        PNG bytes by chart name (charts that failed to render are left out)
+    """
+    cache = get_chart_cache()
+    charts: Dict[str, bytes] = {}
+    missing: Dict[str, List[str]] = {}
+    for name, spec in specs.items():
+        key = chart_key(spec)
+        png = cache.get(key)
+        if png is not None:
+            charts[name] = png
+        else:
+            missing.setdefault(key, []).append(name)
+    
+    if missing:
+        keys = list(missing)
+        results = await asyncio.gather(
+            *(run_in_render_pool(render_chart, specs[missing[key][0]]) for key in keys),
+            return_exceptions=True
+        )
+        for key, result in zip(keys, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Error rendering chart {missing[key][0]}: {result}")
+                continue
+            cache.put(key, result)
+            for name in missing[key]:
+                charts[name] = result
+    return charts
+
+
+def comparison_rows(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Name, party and latest financials of the race candidates that have financials"""
+    comparison_data = []
+    for cand_data in candidates:
+        candidate = cand_data.get('candidate')
+        financials = cand_data.get('financials', [])
+        if candidate and financials:
+            latest = max(financials, key=lambda x: x.cycle)
+            comparison_data.append({
+                'name': candidate.name,
+                'party': candidate.party or 'N/A',
+                'financials': latest
+            })
+    return comparison_data
+
+
+class ReportDocumentBuilder:
+    """Chart specs and PDF/DOCX document builds of candidate and race reports"""
+    
+    def format_currency(self, amount: float) -> str:
+        """Format currency for display"""
+        if amount >= 1000000:
+            return f"${amount/1000000:.2f}M"
+        elif amount >= 1000:
+            return f"${amount/1000:.2f}K"
+        else:
+            return f"${amount:.2f}"
+    
+    def contribution_chart_spec(self, analysis: ContributionAnalysis) -> Dict[str, Any]:
+        """Contributions over time chart"""
+        dates = sorted(analysis.contributions_by_date.keys())
+        return {
+            'kind': 'line', 'title': 'Contributions Over Time', 'xlabel': 'Date', 'ylabel': 'Amount ($)',
+            'x': dates, 'y': [analysis.contributions_by_date[d] for d in dates],
+        }
+    
+    def contribution_state_chart_spec(self, analysis: ContributionAnalysis) -> Dict[str, Any]:
+        """Contributions by state chart"""
+        states = list(analysis.contributions_by_state.keys())[:10]  # Top 10
+        return {
+            'kind': 'barh', 'title': 'Top 10 States by Contributions', 'xlabel': 'Amount ($)', 'ylabel': 'State',
+            'labels': states, 'values': [analysis.contributions_by_state[s] for s in states], 'color': 'steelblue',
+        }
+    
+    def top_donors_chart_spec(self, analysis: ContributionAnalysis) -> Dict[str, Any]:
+        """Top donors chart"""
+        top_donors = sorted(analysis.top_donors, key=lambda x: x.get('total', 0), reverse=True)[:10]
+        return {
+            'kind': 'barh', 'title': 'Top 10 Donors', 'xlabel': 'Amount ($)', 'ylabel': 'Donor',
+            'labels': [d.get('name', 'Unknown')[:30] for d in top_donors],
+            'values': [d.get('total', 0) for d in top_donors], 'color': 'darkgreen',
+        }
+    
+    def expenditure_category_chart_spec(self, breakdown: ExpenditureBreakdown) -> Dict[str, Any]:
+        """Expenditure by category pie chart"""
+        categories = list(breakdown.expenditures_by_category.keys())
+        return {
+            'kind': 'pie', 'title': 'Expenditures by Category',
+            'labels': categories, 'values': [breakdown.expenditures_by_category[c] for c in categories],
+        }
+    
+    def expenditure_time_chart_spec(self, breakdown: ExpenditureBreakdown) -> Dict[str, Any]:
+        """Expenditures over time chart"""
+        dates = sorted(breakdown.expenditures_by_date.keys())
+        return {
+            'kind': 'line', 'title': 'Expenditures Over Time', 'xlabel': 'Date', 'ylabel': 'Amount ($)',
+            'x': dates, 'y': [breakdown.expenditures_by_date[d] for d in dates], 'color': 'red',
+        }
+    
+    def fraud_radar_chart_spec(self, fraud: FraudAnalysis) -> Dict[str, Any]:
+        """Fraud pattern radar chart (pattern count per type)"""
+        counts: Dict[str, int] = {}
+        for pattern in fraud.patterns:
+            counts[pattern.pattern_type] = counts.get(pattern.pattern_type, 0) + 1
+        return {
+            'kind': 'radar', 'title': 'Fraud Pattern Analysis',
+            'categories': list(counts.keys()), 'values': list(counts.values()),
+        }
+    
+    def comparison_chart_spec(self, comparison_data: List[Dict[str, Any]], metric: str, title: str) -> Dict[str, Any]:
+        """Comparison chart for race reports"""
+        attributes = {
+            'receipts': 'total_receipts',
+            'cash': 'cash_on_hand',
+            'disbursements': 'total_disbursements',
+            'individual': 'individual_contributions',
+            'pac': 'pac_contributions',
+        }
+        names = []
+        values = []
+        for comp in comparison_data:
+            financials = comp.get('financials')
+            if financials:
+                names.append(comp.get('name', 'Unknown')[:30])
+                values.append(getattr(financials, attributes[metric]) if metric in attributes else 0)
+        return {
+            'kind': 'bar', 'title': title, 'xlabel': 'Candidate', 'ylabel': 'Amount ($)',
+            'labels': names, 'values': values,
+        }
+    
+    def chart_specs(self, data: Dict[str, Any], is_race: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Specs of the charts in the PDF/DOCX report of data, by chart name"""
+        specs = {}
+        if is_race:
+            comparison_data = comparison_rows(data.get('candidates', []))
+            if comparison_data:
+                specs['comparison_receipts'] = self.comparison_chart_spec(
+                    comparison_data, 'receipts', 'Total Receipts Comparison'
+                )
+            return specs
+        
+        if data.get('contribution_analysis'):
+            specs['contributions_over_time'] = self.contribution_chart_spec(data['contribution_analysis'])
+        if data.get('expenditure_breakdown'):
+            specs['expenditure_categories'] = self.expenditure_category_chart_spec(data['expenditure_breakdown'])
+        fraud = data.get('fraud_analysis')
+        if fraud and fraud.patterns:
+            specs['fraud_patterns'] = self.fraud_radar_chart_spec(fraud)
+        return specs
+    
+    def chart_buffer(self, charts: Dict[str, bytes], name: str) -> BytesIO:
+        """Rendered chart as an image buffer"""
+        if name not in charts:
+            raise ValueError(f"chart {name} was not rendered")
+        return BytesIO(charts[name])
+    
+    def build_pdf(self, data: Dict[str, Any], is_race: bool = False, charts: Optional[Dict[str, bytes]] = None) -> bytes:
+        """Build a PDF report (charts: PNGs rendered from chart_specs, by name)"""
+        charts = charts or {}
+        buffer = BytesIO()
+        
+        if is_race:
+            doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72,
+                                   topMargin=72, bottomMargin=18)
+        else:
+            doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72,
+                                   topMargin=72, bottomMargin=18)
+        
+        styles = getSampleStyleSheet()
+        story = []
+        
+        # Title
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#1e40af'),
+            spaceAfter=30,
+            alignment=TA_CENTER
+        )
+        
+        if is_race:
+            office_names = {'P': 'President', 'S': 'Senate', 'H': 'House of Representatives'}
+            office_name = office_names.get(data['office'], data['office'])
+            title_text = f"{office_name} Race - {data['state']}"
+            if data.get('district'):
+                title_text += f" District {data['district']}"
+            if data.get('year'):
+                title_text += f" ({data['year']})"
+            story.append(Paragraph(title_text, title_style))
+            story.append(Spacer(1, 12))
+            
+            # Candidates comparison table
+            candidates = data.get('candidates', [])
+            if candidates:
+                story.append(Paragraph("Candidates Comparison", styles['Heading2']))
+                story.append(Spacer(1, 12))
+                
+                # Get latest financials for each candidate
+                comparison_data = comparison_rows(candidates)
+                
+                if comparison_data:
+                    table_data = [['Candidate', 'Party', 'Receipts', 'Disbursements', 'Cash on Hand', 'Individual', 'PAC']]
+                    for comp in comparison_data:
+                        fin = comp['financials']
+                        table_data.append([
+                            comp['name'][:30],
+                            comp['party'],
+                            self.format_currency(fin.total_receipts),
+                            self.format_currency(fin.total_disbursements),
+                            self.format_currency(fin.cash_on_hand),
+                            self.format_currency(fin.individual_contributions),
+                            self.format_currency(fin.pac_contributions)
+                        ])
+                    
+                    table = Table(table_data, colWidths=[2*inch, 0.8*inch, 1*inch, 1*inch, 1*inch, 1*inch, 0.8*inch])
+                    table.setStyle(TableStyle([
+                        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                        ('FONTSIZE', (0, 0), (-1, 0), 9),
+                        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                        ('FONTSIZE', (0, 1), (-1, -1), 8)
+                    ]))
+                    story.append(table)
+                    story.append(Spacer(1, 20))
+                    
+                    # Comparison charts
+                    try:
+                        chart_buf = self.chart_buffer(charts, 'comparison_receipts')
+                        img = Image(chart_buf, width=6*inch, height=3.6*inch)
+                        story.append(img)
+                        story.append(Spacer(1, 12))
+                    except Exception as e:
+                        logger.warning(f"Error adding image to report: {e}")
+        else:
+            candidate = data.get('candidate')
+            if candidate:
+                title_text = candidate.name
+                story.append(Paragraph(title_text, title_style))
+                
+                # Candidate info
+                info_text = f"Office: {candidate.office or 'N/A'} | "
+                info_text += f"Party: {candidate.party or 'N/A'} | "
+                info_text += f"State: {candidate.state or 'N/A'}"
+                if candidate.district:
+                    info_text += f" | District: {candidate.district}"
+                story.append(Paragraph(info_text, styles['Normal']))
+                story.append(Spacer(1, 12))
+        
+        # Financial Summary
+        financials = data.get('financials', [])
+        if financials:
+            story.append(Paragraph("Financial Summary", styles['Heading2']))
+            story.append(Spacer(1, 12))
+            
+            table_data = [['Cycle', 'Receipts', 'Disbursements', 'Cash on Hand', 'Individual', 'PAC']]
+            for fin in sorted(financials, key=lambda x: x.cycle, reverse=True):
+                table_data.append([
+                    str(fin.cycle),
+                    self.format_currency(fin.total_receipts),
+                    self.format_currency(fin.total_disbursements),
+                    self.format_currency(fin.cash_on_hand),
+                    self.format_currency(fin.individual_contributions),
+                    self.format_currency(fin.pac_contributions)
+                ])
+            
+            table = Table(table_data, colWidths=[1*inch, 1.2*inch, 1.2*inch, 1.2*inch, 1.2*inch, 1*inch])
+            table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black)
+            ]))
+            story.append(table)
+            story.append(Spacer(1, 20))
+        
+        # Contribution Analysis
+        contrib_analysis = data.get('contribution_analysis')
+        if contrib_analysis and not is_race:
+            story.append(Paragraph("Contribution Analysis", styles['Heading2']))
+            story.append(Spacer(1, 12))
+            
+            stats_text = f"Total Contributions: {self.format_currency(contrib_analysis.total_contributions)} | "
+            stats_text += f"Total Contributors: {contrib_analysis.total_contributors} | "
+            stats_text += f"Average Contribution: {self.format_currency(contrib_analysis.average_contribution)}"
+            story.append(Paragraph(stats_text, styles['Normal']))
+            story.append(Spacer(1, 12))
+            
+            # Charts
+            try:
+                chart_buf = self.chart_buffer(charts, 'contributions_over_time')
+                img = Image(chart_buf, width=6*inch, height=3.6*inch)
+                story.append(img)
+                story.append(Spacer(1, 12))
+            except Exception as e:
+                logger.warning(f"Error adding contribution chart to report: {e}")
+            
+            # Top donors table
+            if contrib_analysis.top_donors:
+                story.append(Paragraph("Top Donors", styles['Heading3']))
+                donor_data = [['Donor', 'Total', 'Count']]
+                for donor in contrib_analysis.top_donors[:10]:
+                    donor_data.append([
+                        donor.get('name', 'Unknown')[:40],
+                        self.format_currency(donor.get('total', 0)),
+                        str(donor.get('count', 0))
+                    ])
+                donor_table = Table(donor_data, colWidths=[4*inch, 1.5*inch, 1*inch])
+                donor_table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+                ]))
+                story.append(donor_table)
+                story.append(Spacer(1, 20))
+        
+        # Expenditure Breakdown
+        expenditure = data.get('expenditure_breakdown')
+        if expenditure and not is_race:
+            story.append(Paragraph("Expenditure Breakdown", styles['Heading2']))
+            story.append(Spacer(1, 12))
+            
+            stats_text = f"Total Expenditures: {self.format_currency(expenditure.total_expenditures)} | "
+            stats_text += f"Total Transactions: {expenditure.total_transactions} | "
+            stats_text += f"Average: {self.format_currency(expenditure.average_expenditure)}"
+            story.append(Paragraph(stats_text, styles['Normal']))
+            story.append(Spacer(1, 12))
+            
+            try:
+                chart_buf = self.chart_buffer(charts, 'expenditure_categories')
+                img = Image(chart_buf, width=6*inch, height=3.6*inch)
+                story.append(img)
+                story.append(Spacer(1, 12))
+            except Exception as e:
+                logger.warning(f"Error adding expenditure chart to report: {e}")
+        
+        # Fraud Analysis
+        fraud = data.get('fraud_analysis')
+        if fraud and fraud.patterns and not is_race:
+            story.append(Paragraph("Fraud Analysis", styles['Heading2']))
+            story.append(Spacer(1, 12))
+            
+            risk_text = f"Risk Score: {fraud.risk_score:.2f} | "
+            risk_text += f"Total Suspicious Amount: {self.format_currency(fraud.total_suspicious_amount)}"
+            story.append(Paragraph(risk_text, styles['Normal']))
+            story.append(Spacer(1, 12))
+            
+            try:
+                chart_buf = self.chart_buffer(charts, 'fraud_patterns')
+                img = Image(chart_buf, width=6*inch, height=3.6*inch)
+                story.append(img)
+                story.append(Spacer(1, 12))
+            except Exception as e:
+                logger.warning(f"Error adding fraud chart to report: {e}")
+            
+            # Fraud patterns table
+            pattern_data = [['Pattern Type', 'Severity', 'Amount', 'Confidence']]
+            for pattern in fraud.patterns[:10]:
+                pattern_data.append([
+                    pattern.pattern_type.replace('_', ' ').title(),
+                    pattern.severity.upper(),
+                    self.format_currency(pattern.total_amount),
+                    f"{pattern.confidence_score:.2f}"
+                ])
+            pattern_table = Table(pattern_data, colWidths=[2.5*inch, 1*inch, 1.5*inch, 1*inch])
+            pattern_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black)
+            ]))
+            story.append(pattern_table)
+            story.append(Spacer(1, 20))
+        
+        # Footer
+        story.append(Spacer(1, 20))
+        footer_style = ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=8,
+            textColor=colors.grey,
+            alignment=TA_CENTER
+        )
+        footer_text = f"Report generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | Data source: Federal Election Commission"
+        story.append(Paragraph(footer_text, footer_style))
+        
+        doc.build(story)
+        return buffer.getvalue()
+    
+    def build_docx(self, data: Dict[str, Any], is_race: bool = False, charts: Optional[Dict[str, bytes]] = None) -> bytes:
+        """Build a DOCX report (charts: PNGs rendered from chart_specs, by name)"""
+        charts = charts or {}
+        doc = Document()
+        
+        # Title
+        if is_race:
+            office_names = {'P': 'President', 'S': 'Senate', 'H': 'House of Representatives'}
+            office_name = office_names.get(data['office'], data['office'])
+            title_text = f"{office_name} Race - {data['state']}"
+            if data.get('district'):
+                title_text += f" District {data['district']}"
+            if data.get('year'):
+                title_text += f" ({data['year']})"
+        else:
+            candidate = data.get('candidate')
+            title_text = candidate.name if candidate else "Candidate Report"
+        
+        title = doc.add_heading(title_text, 0)
+        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        
+        if is_race:
+            # Candidates comparison table
+            candidates = data.get('candidates', [])
+            if candidates:
+                doc.add_heading('Candidates Comparison', 1)
+                
+                comparison_data = comparison_rows(candidates)
+                
+                if comparison_data:
+                    table = doc.add_table(rows=1, cols=7)
+                    table.style = 'Light Grid Accent 1'
+                    hdr_cells = table.rows[0].cells
+                    hdr_cells[0].text = 'Candidate'
+                    hdr_cells[1].text = 'Party'
+                    hdr_cells[2].text = 'Receipts'
+                    hdr_cells[3].text = 'Disbursements'
+                    hdr_cells[4].text = 'Cash on Hand'
+                    hdr_cells[5].text = 'Individual'
+                    hdr_cells[6].text = 'PAC'
+                    
+                    for comp in comparison_data:
+                        fin = comp['financials']
+                        row_cells = table.add_row().cells
+                        row_cells[0].text = comp['name'][:30]
+                        row_cells[1].text = comp['party']
+                        row_cells[2].text = self.format_currency(fin.total_receipts)
+                        row_cells[3].text = self.format_currency(fin.total_disbursements)
+                        row_cells[4].text = self.format_currency(fin.cash_on_hand)
+                        row_cells[5].text = self.format_currency(fin.individual_contributions)
+                        row_cells[6].text = self.format_currency(fin.pac_contributions)
+                    
+                    try:
+                        chart_buf = self.chart_buffer(charts, 'comparison_receipts')
+                        doc.add_picture(chart_buf, width=Inches(6))
+                    except Exception as e:
+                        logger.warning(f"Error adding comparison chart to report: {e}")
+        else:
+            candidate = data.get('candidate')
+            if candidate:
+                info_para = doc.add_paragraph()
+                info_para.add_run(f"Office: {candidate.office or 'N/A'} | ")
+                info_para.add_run(f"Party: {candidate.party or 'N/A'} | ")
+                info_para.add_run(f"State: {candidate.state or 'N/A'}")
+                if candidate.district:
+                    info_para.add_run(f" | District: {candidate.district}")
+        
+        # Financial Summary
+        financials = data.get('financials', [])
+        if financials:
+            doc.add_heading('Financial Summary', 1)
+            
+            table = doc.add_table(rows=1, cols=6)
+            table.style = 'Light Grid Accent 1'
+            hdr_cells = table.rows[0].cells
+            hdr_cells[0].text = 'Cycle'
+            hdr_cells[1].text = 'Receipts'
+            hdr_cells[2].text = 'Disbursements'
+            hdr_cells[3].text = 'Cash on Hand'
+            hdr_cells[4].text = 'Individual'
+            hdr_cells[5].text = 'PAC'
+            
+            for fin in sorted(financials, key=lambda x: x.cycle, reverse=True):
+                row_cells = table.add_row().cells
+                row_cells[0].text = str(fin.cycle)
+                row_cells[1].text = self.format_currency(fin.total_receipts)
+                row_cells[2].text = self.format_currency(fin.total_disbursements)
+                row_cells[3].text = self.format_currency(fin.cash_on_hand)
+                row_cells[4].text = self.format_currency(fin.individual_contributions)
+                row_cells[5].text = self.format_currency(fin.pac_contributions)
+        
+        # Contribution Analysis
+        contrib_analysis = data.get('contribution_analysis')
+        if contrib_analysis and not is_race:
+            doc.add_heading('Contribution Analysis', 1)
+            
+            stats_para = doc.add_paragraph()
+            stats_para.add_run(f"Total Contributions: {self.format_currency(contrib_analysis.total_contributions)} | ")
+            stats_para.add_run(f"Total Contributors: {contrib_analysis.total_contributors} | ")
+            stats_para.add_run(f"Average Contribution: {self.format_currency(contrib_analysis.average_contribution)}")
+            
+            # Add chart image
+            try:
+                chart_buf = self.chart_buffer(charts, 'contributions_over_time')
+                doc.add_picture(chart_buf, width=Inches(6))
+            except Exception as e:
+                logger.warning(f"Error adding contribution chart to report: {e}")
+            
+            # Top donors
+            if contrib_analysis.top_donors:
+                doc.add_heading('Top Donors', 2)
+                donor_table = doc.add_table(rows=1, cols=3)
+                donor_table.style = 'Light Grid Accent 1'
+                hdr = donor_table.rows[0].cells
+                hdr[0].text = 'Donor'
+                hdr[1].text = 'Total'
+                hdr[2].text = 'Count'
+                
+                for donor in contrib_analysis.top_donors[:10]:
+                    row = donor_table.add_row().cells
+                    row[0].text = donor.get('name', 'Unknown')[:40]
+                    row[1].text = self.format_currency(donor.get('total', 0))
+                    row[2].text = str(donor.get('count', 0))
+        
+        # Expenditure Breakdown
+        expenditure = data.get('expenditure_breakdown')
+        if expenditure and not is_race:
+            doc.add_heading('Expenditure Breakdown', 1)
+            
+            stats_para = doc.add_paragraph()
+            stats_para.add_run(f"Total Expenditures: {self.format_currency(expenditure.total_expenditures)} | ")
+            stats_para.add_run(f"Total Transactions: {expenditure.total_transactions} | ")
+            stats_para.add_run(f"Average: {self.format_currency(expenditure.average_expenditure)}")
+            
+            try:
+                chart_buf = self.chart_buffer(charts, 'expenditure_categories')
+                doc.add_picture(chart_buf, width=Inches(6))
+            except Exception as e:
+                logger.warning(f"Error adding expenditure chart to report: {e}")
+        
+        # Fraud Analysis
+        fraud = data.get('fraud_analysis')
+        if fraud and fraud.patterns and not is_race:
+            doc.add_heading('Fraud Analysis', 1)
+            
+            risk_para = doc.add_paragraph()
+            risk_para.add_run(f"Risk Score: {fraud.risk_score:.2f} | ")
+            risk_para.add_run(f"Total Suspicious Amount: {self.format_currency(fraud.total_suspicious_amount)}")
+            
+            try:
+                chart_buf = self.chart_buffer(charts, 'fraud_patterns')
+                doc.add_picture(chart_buf, width=Inches(6))
+            except Exception as e:
+                logger.warning(f"Error adding fraud chart to report: {e}")
+            
+            # Fraud patterns table
+            pattern_table = doc.add_table(rows=1, cols=4)
+            pattern_table.style = 'Light Grid Accent 1'
+            hdr = pattern_table.rows[0].cells
+            hdr[0].text = 'Pattern Type'
+            hdr[1].text = 'Severity'
+            hdr[2].text = 'Amount'
+            hdr[3].text = 'Confidence'
+            
+            for pattern in fraud.patterns[:10]:
+                row = pattern_table.add_row().cells
+                row[0].text = pattern.pattern_type.replace('_', ' ').title()
+                row[1].text = pattern.severity.upper()
+                row[2].text = self.format_currency(pattern.total_amount)
+                row[3].text = f"{pattern.confidence_score:.2f}"
+        
+        # Footer
+        doc.add_paragraph()
+        footer = doc.add_paragraph(
+            f"Report generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | Data source: Federal Election Commission"
+        )
+        footer.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        for run in footer.runs:
+            run.font.size = Pt(8)
+            run.font.color.rgb = RGBColor(128, 128, 128)
+        
+        buffer = BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
+
+
+def build_pdf_report(data: Dict[str, Any], is_race: bool, charts: Dict[str, bytes]) -> bytes:
+    """Build a PDF report (runs in the render pool)"""
+    return ReportDocumentBuilder().build_pdf(data, is_race, charts)
+
+
+def build_docx_report(data: Dict[str, Any], is_race: bool, charts: Dict[str, bytes]) -> bytes:
+    """Build a DOCX report (runs in the render pool)"""
+    return ReportDocumentBuilder().build_docx(data, is_race, charts)
@@ -0,0 +1,201 @@
+"""
+Concurrent, cached assembly of report sections
+
+A report is a set of ``ReportSection``s (candidate info, financials, each
+analysis) that declare the sections they depend on. ``assemble_sections``
+starts every section as soon as its dependencies are done, so independent
+analyses run concurrently:
+
+- at most ``REPORT_SECTION_CONCURRENCY`` sections are computed at once across
+  all exports, so a race report does not flood SQLite with parallel scans
+- computed sections are cached per (section, candidate, cycle) together with
+  the data version they were computed from; exporting the same candidate as
+  PDF, then DOCX, then Excel computes the analyses once
+- concurrent exports of the same candidate share sections being computed
+- a section that fails is logged and left empty (not cached); sections that
+  depend on it are skipped
+
+The data version changes when a bulk import completes, a pre-computed
+analysis of the candidate is refreshed or candidate/committee links change.
+``REPORT_SECTION_CACHE_TTL_SECONDS`` bounds how long API-backed data is reused.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+
+from app.config import config
+from app.db.database import AsyncSessionLocal, BulkImportJob, PreComputedAnalysis
+from app.services.shared.candidate_committees import linkage_generation
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ReportSection:
+    """
+    One section of a report.
+
+    ``build`` receives the results of ``depends_on`` by section name and
+    returns the section's data. A section runs only when all its
+    dependencies produced data (not None).
+    """
+    name: str
+    build: Callable[[Dict[str, Any]], Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+
+
+# (section, candidate_id, cycle) -> (expires at, data version, value)
+_cache: 'OrderedDict[Tuple[str, str, Optional[int]], Tuple[float, Hashable, Any]]' = OrderedDict()
+
+# Sections being computed, shared by concurrent exports
+_pending: Dict[Tuple[str, str, Optional[int], Hashable], asyncio.Future] = {}
+
+_semaphore: Optional[Tuple[asyncio.AbstractEventLoop, int, asyncio.Semaphore]] = None
+
+
+def clear_section_cache() -> None:
+    """Drop all cached report sections"""
+    _cache.clear()
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Process-wide limit on sections computed at once (one per event loop)"""
+    global _semaphore
+    loop = asyncio.get_running_loop()
+    limit = max(1, config.REPORT_SECTION_CONCURRENCY)
+    if _semaphore is None or _semaphore[0] is not loop or _semaphore[1] != limit:
+        _semaphore = (loop, limit, asyncio.Semaphore(limit))
+    return _semaphore[2]
+
+
+async def get_data_version(candidate_id: str) -> Optional[Hashable]:
+    """
+    Version of the data behind a candidate's report sections.
+
+    Returns:
+        A value that changes when the underlying data changes, or None if it
+        could not be determined (sections are then computed without caching)
+    """
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(
+                select(func.max(BulkImportJob.completed_at))
+                .where(BulkImportJob.status == 'completed')
+                .scalar_subquery(),
+                select(func.max(PreComputedAnalysis.last_updated))
+                .where(PreComputedAnalysis.candidate_id == candidate_id)
+                .scalar_subquery(),
+            ))
+            last_import, last_analysis = result.one()
+    except Exception as e:
+        logger.warning(f"Could not determine report data version for candidate {candidate_id}: {e}")
+        return None
+    return (linkage_generation(), last_import, last_analysis)
+
+
+def _ordered(sections: Sequence[ReportSection]) -> List[ReportSection]:
+    """Sections with every section after its dependencies"""
+    by_name = {section.name: section for section in sections}
+    ordered: List[ReportSection] = []
+    state: Dict[str, str] = {}
+
+    def visit(section: ReportSection) -> None:
+        if state.get(section.name) == 'done':
+            return
+        if state.get(section.name) == 'visiting':
+            raise ValueError(f"Report section dependency cycle at {section.name!r}")
+        state[section.name] = 'visiting'
+        for dependency in section.depends_on:
+            if dependency not in by_name:
+                raise ValueError(f"Report section {section.name!r} depends on unknown section {dependency!r}")
+            visit(by_name[dependency])
+        state[section.name] = 'done'
+        ordered.append(section)
+
+    for section in sections:
+        visit(section)
+    return ordered
+
+
+async def _compute(section: ReportSection, candidate_id: str, dependencies: Dict[str, Any]) -> Any:
+    async with _get_semaphore():
+        try:
+            return await section.build(dependencies)
+        except Exception as e:
+            # Continue with partial data
+            logger.warning(f"Error building report section {section.name} for candidate {candidate_id}: {e}")
+            return None
+
+
+async def _cached_section(
+    section: ReportSection,
+    candidate_id: str,
+    cycle: Optional[int],
+    version: Optional[Hashable],
+    dependencies: Dict[str, Any]
+) -> Any:
+    if version is None:
+        return await _compute(section, candidate_id, dependencies)
+
+    key = (section.name, candidate_id, cycle)
+    cached = _cache.get(key)
+    if cached and cached[0] > time.monotonic() and cached[1] == version:
+        _cache.move_to_end(key)
+        return cached[2]
+
+    pending_key = key + (version,)
+    pending = _pending.get(pending_key)
+    if pending is not None:
+        return await asyncio.shield(pending)
+
+    future = asyncio.get_running_loop().create_future()
+    _pending[pending_key] = future
+    value = None
+    try:
+        value = await _compute(section, candidate_id, dependencies)
+        if value is not None:
+            _cache[key] = (time.monotonic() + config.REPORT_SECTION_CACHE_TTL_SECONDS, version, value)
+            _cache.move_to_end(key)
+            while len(_cache) > config.REPORT_SECTION_CACHE_MAX_ENTRIES:
+                _cache.popitem(last=False)
+        return value
+    finally:
+        del _pending[pending_key]
+        future.set_result(value)
+
+
+async def assemble_sections(
+    sections: Sequence[ReportSection],
+    candidate_id: str,
+    cycle: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Compute a candidate's report sections, concurrently where dependencies allow.
+
+    Args:
+        sections: Sections of the report
+        candidate_id: Candidate the sections describe (part of the cache key)
+        cycle: Election cycle of the report (part of the cache key)
+
+    Returns:
+        Section data by section name (None for sections that failed or were skipped)
+    """
+    version = await get_data_version(candidate_id)
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run(section: ReportSection) -> Any:
+        dependencies = {name: await tasks[name] for name in section.depends_on}
+        if any(value is None for value in dependencies.values()):
+            return None
+        return await _cached_section(section, candidate_id, cycle, version, dependencies)
+
+    # Dependencies are created first, so every task can await the ones it needs
+    for section in _ordered(sections):
+        tasks[section.name] = asyncio.create_task(run(section))
+    results = await asyncio.gather(*tasks.values())
+    return dict(zip(tasks.keys(), results))
@@ -5,6 +5,11 @@ from sqlalchemy.sql import Select
 from sqlalchemy import func, select
 
 
+# Standard FEC contribution bins (edges) and their labels
+DISTRIBUTION_BINS = [0, 50, 100, 200, 500, 1000, 2700, float('inf')]
+DISTRIBUTION_LABELS = ['$0-50', '$50-100', '$100-200', '$200-500', '$500-1000', '$1000-2700', '$2700+']
+
+
 def calculate_distribution_bins(
     amounts: List[float],
     bins: Optional[List[float]] = None,
@@ -25,9 +30,9 @@ def calculate_distribution_bins(
         return {}
     
     if bins is None:
-        bins = [0, 50, 100, 200, 500, 1000, 2700, float('inf')]
+        bins = DISTRIBUTION_BINS
     if labels is None:
-        labels = ['$0-50', '$50-100', '$100-200', '$200-500', '$500-1000', '$1000-2700', '$2700+']
+        labels = DISTRIBUTION_LABELS
     
     df_amounts = pd.Series(amounts)
     df_amounts_binned = pd.cut(df_amounts, bins=bins, labels=labels, right=False)
@@ -77,3 +82,70 @@ def aggregate_by_field_from_rows(rows: List[Any], field_key: str, amount_key: st
             result[field_value] = result.get(field_value, 0.0) + float(amount or 0.0)
     return result
 
+
+class ContributionAggregator:
+    """
+    Every analyze_contributions aggregate from one pass over
+    (contribution_date, contributor_state, contributor_name, contribution_amount) rows.
+    
+    add() reduces a chunk to group sums with pandas (run it in a worker thread)
+    and folds them into the running totals, so memory grows with the number of
+    distinct dates, states and names, not with the number of rows.
+    """
+    
+    def __init__(self, top_n: int = 20):
+        self.top_n = top_n
+        self.total = 0.0
+        self.count = 0
+        self._by_date: Optional[pd.Series] = None
+        self._by_state: Optional[pd.Series] = None
+        self._by_name: Optional[pd.DataFrame] = None
+        self._bins = pd.Series(0, index=DISTRIBUTION_LABELS, dtype='int64')
+    
+    def add(self, rows: List[Any]):
+        """Aggregate a chunk of (date, state, name, amount) rows with a non-null amount"""
+        if not rows:
+            return
+        dates, states, names, amounts = (pd.Series(column, dtype=object) for column in zip(*rows))
+        amounts = pd.to_numeric(amounts, errors='coerce').fillna(0.0)
+        self.total += float(amounts.sum())
+        self.count += len(amounts)
+        
+        days = pd.to_datetime(dates, errors='coerce').dt.normalize()
+        self._by_date = self._merge(self._by_date, amounts.groupby(days).sum())
+        self._by_state = self._merge(self._by_state, amounts[states.notna() & (states != '')].groupby(states).sum())
+        self._by_name = self._merge(self._by_name, amounts.groupby(names).agg(['sum', 'count']))
+        
+        positive = amounts[amounts > 0]
+        binned = pd.cut(positive, bins=DISTRIBUTION_BINS, labels=DISTRIBUTION_LABELS, right=False)
+        self._bins = self._bins.add(binned.value_counts(), fill_value=0).astype('int64')
+    
+    @staticmethod
+    def _merge(running: Optional[Any], part: Any) -> Any:
+        """Fold a chunk's group sums into the running totals"""
+        return part if running is None else running.add(part, fill_value=0)
+    
+    def result(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dictionary with total, count, unique_donors, by_date, by_state,
+            top_donors and distribution (empty if no amount is positive)
+        """
+        by_date, by_state, by_name = self._by_date, self._by_state, self._by_name
+        
+        top_donors = []
+        if by_name is not None:
+            top = by_name[by_name.index != ''].nlargest(self.top_n, 'sum')
+            top_donors = [
+                {'name': name, 'total': float(row['sum']), 'count': int(row['count'])}
+                for name, row in top.iterrows()
+            ]
+        return {
+            'total': self.total,
+            'count': self.count,
+            'unique_donors': len(by_name) if by_name is not None else 0,
+            'by_date': {day.strftime('%Y-%m-%d'): float(amount) for day, amount in by_date.items()} if by_date is not None else {},
+            'by_state': {state: float(amount) for state, amount in by_state.items()} if by_state is not None else {},
+            'top_donors': top_donors,
+            'distribution': {str(label): int(count) for label, count in self._bins.items()} if self._bins.sum() else {},
+        }
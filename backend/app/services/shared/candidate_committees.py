@@ -0,0 +1,134 @@
+"""
+Candidate -> committee resolution
+
+Contribution queries by candidate also match the committees linked to the
+candidate (bulk-imported contributions often only have a committee_id).
+Those links live in the ``candidate_committee`` table, one row per
+(candidate_id, committee_id) pair, indexed on candidate_id; writers of
+linkage data (committee master and candidate-committee linkage imports,
+``StorageManager.store_committee``) record them with ``link_candidate_committees``.
+
+``get_candidate_committee_ids`` keeps the resolved IDs in an in-process TTL
+cache. Writers call ``mark_linkage_changed`` after committing, which
+invalidates the cache here and the ``CommitteeCandidateLookup`` of running
+imports.
+"""
+import logging
+import time
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config
+from app.db.database import AsyncSessionLocal, CandidateCommittee
+
+logger = logging.getLogger(__name__)
+
+# Pairs per insert statement (stays under SQLite's bound parameter limit)
+LINK_BATCH_SIZE = 400
+
+# Bumped whenever committee/candidate linkage data is written
+_linkage_generation = 0
+
+# candidate_id -> (expires at, linkage generation, committee IDs)
+_cache: Dict[str, Tuple[float, int, Tuple[str, ...]]] = {}
+
+
+def linkage_generation() -> int:
+    """Counter that changes whenever linkage data was written"""
+    return _linkage_generation
+
+
+def mark_linkage_changed() -> None:
+    """Invalidate cached committee IDs and loaded lookups after linkage data changed"""
+    global _linkage_generation
+    _linkage_generation += 1
+    _cache.clear()
+
+
+def clear_cache() -> None:
+    """Drop all cached committee IDs"""
+    _cache.clear()
+
+
+async def link_candidate_committees(session: AsyncSession, pairs: Iterable[Tuple[str, str]]) -> int:
+    """
+    Record candidate-committee links in the session's transaction.
+
+    Existing links are kept; the caller commits and then calls mark_linkage_changed.
+
+    Args:
+        session: Session to write with
+        pairs: (candidate_id, committee_id) pairs; blank IDs are skipped
+
+    Returns:
+        Number of links that were not stored yet
+    """
+    links = {
+        (str(candidate_id).strip(), str(committee_id).strip())
+        for candidate_id, committee_id in pairs
+        if candidate_id and committee_id and str(candidate_id).strip() and str(committee_id).strip()
+    }
+    if not links:
+        return 0
+    records = [{"candidate_id": candidate_id, "committee_id": committee_id} for candidate_id, committee_id in sorted(links)]
+    inserted = 0
+    for start in range(0, len(records), LINK_BATCH_SIZE):
+        result = await session.execute(
+            sqlite_insert(CandidateCommittee)
+            .values(records[start:start + LINK_BATCH_SIZE])
+            .on_conflict_do_nothing(index_elements=["candidate_id", "committee_id"])
+        )
+        inserted += max(result.rowcount or 0, 0)
+    return inserted
+
+
+async def _query_committee_ids(candidate_id: str) -> Tuple[str, ...]:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(CandidateCommittee.committee_id)
+            .where(CandidateCommittee.candidate_id == candidate_id)
+            .order_by(CandidateCommittee.committee_id)
+        )
+        return tuple(row[0] for row in result)
+
+
+async def get_candidate_committee_ids(candidate_id: str, fec_client=None) -> Tuple[str, ...]:
+    """
+    Committee IDs linked to a candidate.
+
+    Args:
+        candidate_id: Candidate to resolve
+        fec_client: Optional FECClient to ask the FEC API when no links are stored locally
+
+    Returns:
+        Tuple of committee IDs (empty if none are known)
+    """
+    if not candidate_id:
+        return ()
+    generation = _linkage_generation
+    cached = _cache.get(candidate_id)
+    if cached and cached[0] > time.monotonic() and cached[1] == generation:
+        return cached[2]
+
+    committee_ids: Tuple[str, ...] = ()
+    try:
+        committee_ids = await _query_committee_ids(candidate_id)
+    except Exception as e:
+        logger.warning(f"Error fetching committees from DB for candidate {candidate_id}: {e}", exc_info=True)
+        generation = None  # Don't cache a failed lookup
+
+    if not committee_ids and fec_client:
+        try:
+            committees = await fec_client.get_committees(candidate_id=candidate_id, limit=100)
+            committee_ids = tuple(dict.fromkeys(c.get('committee_id') for c in committees or [] if c.get('committee_id')))
+            logger.debug(f"Found {len(committee_ids)} committees for candidate {candidate_id} via FEC API")
+        except Exception as e:
+            logger.debug(f"Error fetching committees from API for candidate {candidate_id}: {e}")
+
+    # Entries written before a linkage change are never served (generation check)
+    if generation is not None:
+        _cache[candidate_id] = (time.monotonic() + config.CANDIDATE_COMMITTEE_CACHE_TTL_SECONDS, generation, committee_ids)
+    return committee_ids
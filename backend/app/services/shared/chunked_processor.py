@@ -6,6 +6,16 @@ of large database result sets by fetching and processing data in smaller chunks.
 This prevents memory exhaustion when dealing with datasets containing tens of
 thousands or millions of records.
 
+Chunks are read with keyset (seek) pagination on a key column, ``id`` by
+default: each chunk query continues with ``WHERE id > <last id> ORDER BY id
+LIMIT n`` and uses the primary key index, so scanning a whole candidate takes
+linear time (LIMIT/OFFSET rescanned every row before the offset). When the
+driver supports server-side cursors, stream_contributions reads one query
+through ``session.stream()`` instead.
+
+Records are ORM entities (or the first column) by default; ``as_rows=True``
+yields column tuples instead.
+
 Example:
     ```python
     processor = ChunkedProcessor(chunk_size=5000)
@@ -29,6 +39,7 @@ from typing import List, Dict, Any, Optional, Callable, AsyncIterator
 from sqlalchemy import select, func
 from sqlalchemy.sql import Select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import Contribution
 
 logger = logging.getLogger(__name__)
 
@@ -65,16 +76,22 @@ class ChunkedProcessor:
         session: AsyncSession,
         base_query,
         process_chunk: Callable[[List[Any]], Dict[str, Any]],
-        max_chunks: Optional[int] = None
+        max_chunks: Optional[int] = None,
+        as_rows: bool = False,
+        key_column=None
     ) -> Dict[str, Any]:
         """
         Process contributions in chunks and aggregate results incrementally
         
+        Chunks are read in key_column order (the base query's ORDER BY is replaced).
+        
         Args:
             session: Database session
             base_query: Base SQLAlchemy query (without limit/offset)
             process_chunk: Function that processes a chunk and returns aggregation results
             max_chunks: Maximum number of chunks to process (None = unlimited)
+            as_rows: Pass column tuples to process_chunk instead of ORM entities
+            key_column: Unique column to page on (default: Contribution.id)
         
         Returns:
             Dictionary with aggregated results and metadata
@@ -82,17 +99,15 @@ class ChunkedProcessor:
         aggregated_results = {}
         total_processed = 0
         chunk_count = 0
-        offset = 0
+        chunk_data: List[Any] = []
+        chunks = self.iter_chunks(session, base_query, as_rows=as_rows, key_column=key_column)
         
         while True:
             if max_chunks and chunk_count >= max_chunks:
                 logger.warning(f"Reached max_chunks limit ({max_chunks}), stopping processing")
                 break
             
-            # Create chunk query with limit and offset
-            chunk_query = base_query.limit(self.chunk_size).offset(offset)
-            result = await session.execute(chunk_query)
-            chunk_data = result.scalars().all()
+            chunk_data = await anext(chunks, [])
             
             if not chunk_data:
                 break
@@ -130,13 +145,13 @@ class ChunkedProcessor:
             
             total_processed += len(chunk_data)
             chunk_count += 1
-            offset += self.chunk_size
             
             # If we got fewer records than chunk_size, we've reached the end
             if len(chunk_data) < self.chunk_size:
                 break
             
             logger.debug(f"Processed chunk {chunk_count}: {len(chunk_data)} records (total: {total_processed})")
+        await chunks.aclose()
         
         # Add processing metadata
         if 'metadata' not in aggregated_results:
@@ -150,46 +165,126 @@ class ChunkedProcessor:
         logger.info(f"Chunked processing complete: {total_processed} records in {chunk_count} chunks")
         return aggregated_results
     
+    async def iter_chunks(
+        self,
+        session: AsyncSession,
+        base_query: Select,
+        as_rows: bool = False,
+        key_column=None
+    ) -> AsyncIterator[List[Any]]:
+        """
+        Read a query in chunks of chunk_size with keyset pagination
+        
+        Each chunk continues after the last key read (``WHERE key > :last ORDER BY
+        key LIMIT chunk_size``), so every query is an index range scan however
+        far into the result it is.
+        
+        Args:
+            session: Database session
+            base_query: Base SQLAlchemy query (without limit/offset; ORDER BY is replaced)
+            as_rows: Yield column tuples instead of ORM entities (or first-column values)
+            key_column: Unique column to page on (default: Contribution.id)
+        
+        Yields:
+            Lists of up to chunk_size records, the last one possibly shorter
+        """
+        key_column = Contribution.id if key_column is None else key_column
+        # The key is selected last and left out of the records
+        query = base_query.order_by(None).order_by(key_column).add_columns(key_column).limit(self.chunk_size)
+        last_key = None
+        
+        while True:
+            chunk_query = query if last_key is None else query.where(key_column > last_key)
+            result = await session.execute(chunk_query)
+            rows = result.all()
+            if not rows:
+                return
+            
+            last_key = rows[-1][-1]
+            yield [row[:-1] for row in rows] if as_rows else [row[0] for row in rows]
+            
+            if len(rows) < self.chunk_size:
+                return
+    
+    async def stream_chunks(
+        self,
+        session: AsyncSession,
+        base_query: Select,
+        max_records: Optional[int] = None,
+        as_rows: bool = False,
+        server_side: bool = True
+    ) -> AsyncIterator[List[Any]]:
+        """
+        Stream a query in chunks of up to chunk_size records
+        
+        With server_side (and a driver that supports server-side cursors) the query
+        runs once through ``session.stream()`` and keeps its ORDER BY; the session
+        must not run other statements until the iteration ends. Otherwise chunks
+        come from iter_chunks, in id order.
+        
+        Args:
+            session: Database session
+            base_query: Base SQLAlchemy query
+            max_records: Maximum number of records to stream (None = unlimited)
+            as_rows: Yield column tuples instead of ORM entities (or first-column values)
+            server_side: Use a server-side cursor when the driver supports one
+        
+        Yields:
+            Lists of records
+        """
+        if server_side and session.get_bind().dialect.supports_server_side_cursors:
+            query = base_query.limit(max_records) if max_records else base_query
+            result = await session.stream(query)
+            try:
+                if as_rows:
+                    async for partition in result.partitions(self.chunk_size):
+                        yield [tuple(row) for row in partition]
+                else:
+                    async for partition in result.scalars().partitions(self.chunk_size):
+                        yield partition
+            finally:
+                await result.close()
+            return
+        
+        total_yielded = 0
+        chunks = self.iter_chunks(session, base_query, as_rows=as_rows)
+        try:
+            async for chunk_data in chunks:
+                if max_records and total_yielded + len(chunk_data) >= max_records:
+                    yield chunk_data[:max_records - total_yielded]
+                    return
+                total_yielded += len(chunk_data)
+                yield chunk_data
+        finally:
+            await chunks.aclose()
+    
     async def stream_contributions(
         self,
         session: AsyncSession,
         base_query: Select,
-        max_records: Optional[int] = None
+        max_records: Optional[int] = None,
+        as_rows: bool = False,
+        server_side: bool = True
     ) -> AsyncIterator[Any]:
         """
         Stream contributions one at a time for memory-efficient processing
         
+        Records are read by stream_chunks (see there for server_side).
+        
         Args:
             session: Database session
             base_query: Base SQLAlchemy query
             max_records: Maximum number of records to stream (None = unlimited)
+            as_rows: Yield column tuples instead of ORM entities (or first-column values)
+            server_side: Use a server-side cursor when the driver supports one
         
         Yields:
             Individual contribution records
         """
-        offset = 0
-        total_yielded = 0
-        
-        while True:
-            if max_records and total_yielded >= max_records:
-                break
-            
-            chunk_query = base_query.limit(self.chunk_size).offset(offset)
-            result = await session.execute(chunk_query)
-            chunk_data = result.scalars().all()
-            
-            if not chunk_data:
-                break
-            
-            for record in chunk_data:
-                yield record
-                total_yielded += 1
-                if max_records and total_yielded >= max_records:
-                    break
-            
-            offset += self.chunk_size
-            
-            # If we got fewer records than chunk_size, we've reached the end
-            if len(chunk_data) < self.chunk_size:
-                break
-
+        chunks = self.stream_chunks(session, base_query, max_records, as_rows, server_side)
+        try:
+            async for chunk_data in chunks:
+                for record in chunk_data:
+                    yield record
+        finally:
+            await chunks.aclose()
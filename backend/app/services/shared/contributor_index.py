@@ -0,0 +1,140 @@
+"""
+Contributor name search index
+
+Donor search matches substrings of contributor names. ``ILIKE '%word%'`` on
+``contributions`` cannot use a b-tree index, so every search scans the whole
+table. This index keeps the distinct contributor names in ``contributor_names``
+and indexes them by trigrams:
+
+- SQLite: FTS5 external-content table ``contributor_names_fts`` with the
+  ``trigram`` tokenizer (SQLite 3.34+); ``LIKE`` on it uses the index
+- PostgreSQL: ``pg_trgm`` GIN index on ``contributor_names.name``
+
+Writers add names as they store contributions (``index_contributor_names``).
+Names are never removed: a name whose contributions are gone only costs an
+empty lookup on ``idx_contributor_name``.
+"""
+import logging
+from typing import Dict, Iterable, List
+
+from sqlalchemy import and_, column, inspect, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+logger = logging.getLogger(__name__)
+
+NAMES_TABLE = "contributor_names"
+FTS_TABLE = "contributor_names_fts"
+
+# Full-text table over every contribution row, created by an older migration
+LEGACY_FTS_TABLE = "contributions_fts"
+
+# Availability per database URL; the index is created by migrations, not at runtime
+_index_available: Dict[str, bool] = {}
+
+
+def create_index_statements(dialect_name: str) -> List[str]:
+    """DDL creating the names table and its trigram index"""
+    if dialect_name == "postgresql":
+        return [
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            f"CREATE TABLE IF NOT EXISTS {NAMES_TABLE} (id BIGSERIAL PRIMARY KEY, name TEXT NOT NULL UNIQUE)",
+            f"CREATE INDEX IF NOT EXISTS idx_{NAMES_TABLE}_trgm ON {NAMES_TABLE} USING gin (name gin_trgm_ops)",
+        ]
+    return [
+        f"CREATE TABLE IF NOT EXISTS {NAMES_TABLE} (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)",
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"name, content='{NAMES_TABLE}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON {NAMES_TABLE} BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, name) VALUES (new.id, new.name); END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON {NAMES_TABLE} BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name) VALUES ('delete', old.id, old.name); END",
+    ]
+
+
+def drop_legacy_index_statements() -> List[str]:
+    """DDL removing the per-contribution FTS5 table and its triggers (SQLite only)"""
+    return [
+        "DROP TRIGGER IF EXISTS contributions_fts_insert",
+        "DROP TRIGGER IF EXISTS contributions_fts_update",
+        "DROP TRIGGER IF EXISTS contributions_fts_delete",
+        f"DROP TABLE IF EXISTS {LEGACY_FTS_TABLE}",
+    ]
+
+
+def _insert_ignore(dialect_name: str, source: str) -> str:
+    if dialect_name == "postgresql":
+        return f"INSERT INTO {NAMES_TABLE} (name) {source} ON CONFLICT (name) DO NOTHING"
+    return f"INSERT OR IGNORE INTO {NAMES_TABLE} (name) {source}"
+
+
+def backfill_statement(dialect_name: str) -> str:
+    """SQL adding every contributor name already in contributions"""
+    return _insert_ignore(
+        dialect_name,
+        "SELECT DISTINCT contributor_name FROM contributions "
+        "WHERE contributor_name IS NOT NULL AND contributor_name != ''"
+    )
+
+
+def insert_names_statement(dialect_name: str) -> str:
+    """SQL adding one name (executed with a list of ``{"name": ...}`` params)"""
+    return _insert_ignore(dialect_name, "VALUES (:name)")
+
+
+def reset_index_cache() -> None:
+    """Forget cached availability (after creating or dropping the index)"""
+    _index_available.clear()
+
+
+async def is_contributor_index_available(session: AsyncSession) -> bool:
+    """Whether the trigram name index exists in the session's database"""
+    bind = session.get_bind()
+    key = str(bind.url)
+    if key not in _index_available:
+        index_table = NAMES_TABLE if bind.dialect.name == "postgresql" else FTS_TABLE
+        _index_available[key] = await session.run_sync(
+            lambda sync_session: inspect(sync_session.connection()).has_table(index_table)
+        )
+        if not _index_available[key]:
+            logger.info("Contributor search index not found; donor search uses ILIKE scans")
+    return _index_available[key]
+
+
+async def index_contributor_names(session: AsyncSession, names: Iterable) -> int:
+    """
+    Add contributor names to the search index in the caller's transaction.
+
+    Args:
+        session: Database session (the caller commits)
+        names: Contributor names; None, NaN and empty values are ignored
+
+    Returns:
+        Number of distinct names sent to the index (0 if the index does not exist)
+    """
+    unique_names = {name for name in names if isinstance(name, str) and name}
+    if not unique_names or not await is_contributor_index_available(session):
+        return 0
+    dialect_name = session.get_bind().dialect.name
+    await session.execute(
+        text(insert_names_statement(dialect_name)),
+        [{"name": name} for name in unique_names]
+    )
+    return len(unique_names)
+
+
+def matching_names_query(dialect_name: str, words: List[str]) -> Select:
+    """
+    Names containing every word (case-insensitive), answered from the trigram index.
+
+    Words shorter than three characters cannot use trigrams; they are still
+    matched, by scanning the (much smaller) names index.
+    """
+    if dialect_name == "postgresql":
+        names = table(NAMES_TABLE, column("name"))
+        conditions = [names.c.name.ilike(f"%{word}%") for word in words]
+    else:
+        # FTS5 trigram LIKE is case-insensitive for ASCII, like SQLite ILIKE
+        names = table(FTS_TABLE, column("name"))
+        conditions = [names.c.name.like(f"%{word}%") for word in words]
+    return select(names.c.name).where(and_(*conditions))
@@ -0,0 +1,207 @@
+"""
+Contributor rollups
+
+Donor search and the top-donor / unique-donor figures of contribution analysis
+group the whole ``contributions`` table by contributor name on every request.
+``contributor_rollups`` keeps those aggregates materialized, one row per
+normalized name (``UPPER(TRIM(contributor_name))``), candidate, committee and
+cycle, so the reads only touch the (much smaller) rollup rows.
+
+Writers keep the table in sync with delta-aggregated upserts in their own
+transaction: before contributions are written, the aggregates of the affected
+rows are subtracted (``sign=-1``); after the write, the aggregates of the same
+rows are added back (``sign=+1``). Both passes are one
+``INSERT ... SELECT ... GROUP BY ... ON CONFLICT DO UPDATE`` statement.
+
+Notes:
+- missing candidate/committee IDs are stored as ``''`` and undated
+  contributions get cycle 0 (cycle queries include them, like
+  ``ContributionQueryBuilder``)
+- only rows with a name and an amount are counted
+- rows whose contributions are gone keep ``contribution_count = 0``; reads filter them out
+- ``first_date``/``last_date`` only ever widen; ``rebuild_contributor_rollups`` tightens them
+"""
+import logging
+from typing import Dict, Iterable, List
+
+from sqlalchemy import bindparam, inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+ROLLUPS_TABLE = "contributor_rollups"
+
+# Contribution IDs per delta statement (stays under bind-parameter limits)
+DELTA_BATCH_SIZE = 5000
+
+ROLLUP_COLUMNS = [
+    "name_key", "contributor_name", "candidate_id", "committee_id", "cycle",
+    "contributor_state", "total_amount", "contribution_count",
+    "first_date", "last_date", "updated_at",
+]
+
+# Table existence / readiness per database URL
+_table_exists: Dict[str, bool] = {}
+_ready: Dict[str, bool] = {}
+
+
+def _cycle_sql(dialect_name: str) -> str:
+    """SQL expression for the election cycle of contribution_date (0 when undated)"""
+    if dialect_name == "postgresql":
+        year = "CAST(EXTRACT(YEAR FROM contribution_date) AS INTEGER)"
+    else:
+        year = "CAST(strftime('%Y', contribution_date) AS INTEGER)"
+    return f"CASE WHEN contribution_date IS NULL THEN 0 ELSE {year} + ({year} % 2) END"
+
+
+def _aggregate_sql(dialect_name: str, where: str, sign: int = 1) -> str:
+    """SELECT aggregating the contributions matching ``where`` into rollup rows"""
+    return (
+        "SELECT UPPER(TRIM(contributor_name)), MIN(contributor_name), "
+        "COALESCE(candidate_id, ''), COALESCE(committee_id, ''), "
+        f"{_cycle_sql(dialect_name)}, MAX(NULLIF(contributor_state, '')), "
+        f"{sign} * SUM(contribution_amount), {sign} * COUNT(*), "
+        "MIN(contribution_date), MAX(contribution_date), CURRENT_TIMESTAMP\n"
+        "FROM contributions\n"
+        f"WHERE ({where}) AND contributor_name IS NOT NULL AND TRIM(contributor_name) != '' "
+        "AND contribution_amount IS NOT NULL\n"
+        "GROUP BY 1, 3, 4, 5"
+    )
+
+
+def build_delta_sql(dialect_name: str, sign: int, where: str) -> str:
+    """
+    Upsert adding (``sign=1``) or subtracting (``sign=-1``) the aggregates of
+    the contributions matching ``where`` (a SQL condition on ``contributions``).
+    """
+    assignments = [
+        f"total_amount = {ROLLUPS_TABLE}.total_amount + excluded.total_amount",
+        f"contribution_count = {ROLLUPS_TABLE}.contribution_count + excluded.contribution_count",
+        "updated_at = excluded.updated_at",
+    ]
+    if sign > 0:
+        assignments += [
+            f"contributor_name = COALESCE({ROLLUPS_TABLE}.contributor_name, excluded.contributor_name)",
+            f"contributor_state = COALESCE(excluded.contributor_state, {ROLLUPS_TABLE}.contributor_state)",
+            f"first_date = CASE WHEN {ROLLUPS_TABLE}.first_date IS NULL "
+            f"OR excluded.first_date < {ROLLUPS_TABLE}.first_date "
+            f"THEN excluded.first_date ELSE {ROLLUPS_TABLE}.first_date END",
+            f"last_date = CASE WHEN {ROLLUPS_TABLE}.last_date IS NULL "
+            f"OR excluded.last_date > {ROLLUPS_TABLE}.last_date "
+            f"THEN excluded.last_date ELSE {ROLLUPS_TABLE}.last_date END",
+        ]
+    return (
+        f"INSERT INTO {ROLLUPS_TABLE} ({', '.join(ROLLUP_COLUMNS)})\n"
+        f"{_aggregate_sql(dialect_name, where, sign)}\n"
+        "ON CONFLICT (name_key, candidate_id, committee_id, cycle) DO UPDATE SET\n    "
+        + ",\n    ".join(assignments)
+    )
+
+
+def build_rebuild_sql(dialect_name: str) -> str:
+    """INSERT filling an empty rollup table from every contribution"""
+    return (
+        f"INSERT INTO {ROLLUPS_TABLE} ({', '.join(ROLLUP_COLUMNS)})\n"
+        f"{_aggregate_sql(dialect_name, '1 = 1')}"
+    )
+
+
+def reset_rollup_cache() -> None:
+    """Forget cached table state (after creating, clearing or rebuilding the rollups)"""
+    _table_exists.clear()
+    _ready.clear()
+
+
+async def rollups_table_exists(session: AsyncSession) -> bool:
+    """Whether contributor_rollups exists in the session's database"""
+    key = str(session.get_bind().url)
+    if key not in _table_exists:
+        _table_exists[key] = await session.run_sync(
+            lambda sync_session: inspect(sync_session.connection()).has_table(ROLLUPS_TABLE)
+        )
+    return _table_exists[key]
+
+
+async def are_rollups_ready(session: AsyncSession) -> bool:
+    """
+    Whether reads should use the rollups: enabled in config, and the table
+    exists and has been filled.
+    """
+    if not config.USE_CONTRIBUTOR_ROLLUPS:
+        return False
+    key = str(session.get_bind().url)
+    if _ready.get(key):
+        return True
+    if not await rollups_table_exists(session):
+        return False
+    result = await session.execute(text(f"SELECT 1 FROM {ROLLUPS_TABLE} LIMIT 1"))
+    # Only a positive answer is cached; an empty table may be filled by the next import
+    _ready[key] = result.first() is not None
+    return _ready[key]
+
+
+async def _apply_delta(session: AsyncSession, sign: int, where: str, params: dict, expanding_ids: bool = False):
+    statement = text(build_delta_sql(session.get_bind().dialect.name, sign, where))
+    if expanding_ids:
+        statement = statement.bindparams(bindparam("ids", expanding=True))
+    await session.execute(statement, params)
+
+
+async def apply_rollup_delta(session: AsyncSession, contribution_ids: Iterable, sign: int) -> int:
+    """
+    Add or subtract the aggregates of contributions by contribution_id.
+
+    Call with ``sign=-1`` before the contributions are written and with
+    ``sign=1`` after, in the same transaction.
+
+    Args:
+        session: Database session (the caller commits)
+        contribution_ids: contribution_id values of the written rows
+        sign: 1 to add, -1 to subtract
+
+    Returns:
+        Number of distinct IDs applied (0 if the rollup table does not exist)
+    """
+    # cid == cid skips NaN IDs coming from DataFrames
+    ids: List[str] = sorted({str(cid) for cid in contribution_ids if cid is not None and cid == cid})
+    if not ids or not await rollups_table_exists(session):
+        return 0
+    for start in range(0, len(ids), DELTA_BATCH_SIZE):
+        batch = ids[start:start + DELTA_BATCH_SIZE]
+        await _apply_delta(session, sign, "contribution_id IN :ids", {"ids": batch}, expanding_ids=True)
+    return len(ids)
+
+
+async def apply_committee_rollup_delta(session: AsyncSession, committee_id: str, sign: int) -> None:
+    """Add or subtract the aggregates of every contribution to a committee"""
+    if await rollups_table_exists(session):
+        await _apply_delta(session, sign, "committee_id = :committee_id", {"committee_id": committee_id})
+
+
+async def clear_contributor_rollups(session: AsyncSession) -> None:
+    """Delete every rollup row in the caller's transaction (contributions were cleared)"""
+    if await rollups_table_exists(session):
+        await session.execute(text(f"DELETE FROM {ROLLUPS_TABLE}"))
+        _ready.clear()
+
+
+async def rebuild_contributor_rollups(session: AsyncSession) -> int:
+    """
+    Recompute contributor_rollups from contributions and commit.
+
+    Returns:
+        Number of rollup rows written
+    """
+    if not await rollups_table_exists(session):
+        raise RuntimeError(f"{ROLLUPS_TABLE} table does not exist; run database migrations first")
+    dialect_name = session.get_bind().dialect.name
+    await session.execute(text(f"DELETE FROM {ROLLUPS_TABLE}"))
+    await session.execute(text(build_rebuild_sql(dialect_name)))
+    await session.commit()
+    count = (await session.execute(text(f"SELECT COUNT(*) FROM {ROLLUPS_TABLE}"))).scalar() or 0
+    _ready.clear()
+    logger.info(f"Rebuilt {ROLLUPS_TABLE}: {count} rows")
+    return count
+
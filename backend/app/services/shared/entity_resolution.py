@@ -0,0 +1,101 @@
+"""
+Blocking helpers for entity resolution (record linkage)
+
+Comparing every record with every other one is O(n²). These helpers generate
+candidate pairs with the sorted-neighbourhood method instead: keys are sorted
+and each key is only scored against the keys that follow it within a window,
+in ``rapidfuzz.process.cdist`` batches. A second pass over the reversed keys
+catches pairs that differ near the start of the key (which the forward sort
+puts far apart). Matched pairs are clustered with ``UnionFind``.
+"""
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+# Smaller similarity matrices are scored on the calling thread
+PARALLEL_MIN_CELLS = 10000
+
+
+class UnionFind:
+    """Disjoint sets over 0..size-1; the smallest index of a set is its root"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # Path halving
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            if root_b < root_a:
+                root_a, root_b = root_b, root_a
+            self.parent[root_b] = root_a
+
+    def clusters(self) -> List[List[int]]:
+        """Sets as sorted index lists, ordered by their smallest index"""
+        members: Dict[int, List[int]] = {}
+        for x in range(len(self.parent)):
+            members.setdefault(self.find(x), []).append(x)
+        return list(members.values())
+
+
+def sorted_neighbourhood_pairs(
+    keys: Sequence[str],
+    score_cutoff: float,
+    window: int = 64,
+    batch_size: int = 256,
+    scorer: Callable = fuzz.ratio
+) -> Dict[Tuple[int, int], float]:
+    """
+    Candidate pairs of similar keys found by sorted-neighbourhood blocking.
+
+    Args:
+        keys: Distinct keys to compare (e.g. normalized names)
+        score_cutoff: Minimum scorer value (0-100) for a pair to be returned
+        window: Keys after each key (in sorted order) it is compared with, at least
+        batch_size: Keys scored per ``cdist`` call
+        scorer: rapidfuzz scorer
+
+    Returns:
+        Mapping of (i, j) index pairs into ``keys`` (i < j) to their score
+    """
+    pairs: Dict[Tuple[int, int], float] = {}
+    n = len(keys)
+    if n < 2:
+        return pairs
+
+    for sort_key in (lambda k: keys[k], lambda k: keys[k][::-1]):
+        order = np.array(sorted(range(n), key=sort_key))
+        sorted_keys = [keys[k] for k in order]
+        for start in range(0, n, batch_size):
+            queries = sorted_keys[start:start + batch_size]
+            end = min(n, start + batch_size + window)
+            scores = process.cdist(
+                queries, sorted_keys[start:end],
+                scorer=scorer, score_cutoff=score_cutoff, dtype=np.float64, workers=-1
+            )
+            rows, cols = np.nonzero(scores >= score_cutoff)
+            forward = cols > rows
+            rows, cols = rows[forward], cols[forward]
+            for a, b, score in zip(order[rows + start], order[cols + start], scores[rows, cols]):
+                a, b = int(a), int(b)
+                pairs[(a, b) if a < b else (b, a)] = float(score)
+    return pairs
+
+
+def similarity_matrix(left: Sequence[str], right: Sequence[str], scorer: Callable = fuzz.ratio) -> np.ndarray:
+    """
+    Pairwise similarities (0.0-1.0) of two string lists; pairs involving an
+    empty string score 0.
+    """
+    workers = -1 if len(left) * len(right) >= PARALLEL_MIN_CELLS else 1
+    scores = process.cdist(left, right, scorer=scorer, dtype=np.float64, workers=workers) / 100.0
+    scores[[not value for value in left], :] = 0.0
+    scores[:, [not value for value in right]] = 0.0
+    return scores
@@ -0,0 +1,311 @@
+"""
+Throughput and stage timing of bulk imports
+
+An import runs inside ``track_import``, which makes an ``ImportMetrics`` the
+current metrics of its task (a context variable), so parsers and shared
+helpers record stages without passing it around:
+
+- ``timed_chunks`` wraps a chunk reader: time spent waiting for the next
+  chunk is the ``read_csv`` stage, and the time spent on a chunk outside
+  any other stage is the ``clean`` stage
+- ``timed_stage(name)`` times a block (``insert``, ``merge``, ``commit``, ...)
+  and does nothing when no import is being tracked
+
+Summaries (rows/s, MB/s, count/total/p50/p95 per stage) are served by the job
+status endpoint and ``/metrics``, and logged as one structured line per import.
+"""
+import logging
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from app.utils.structured_logging import log_with_context
+
+logger = logging.getLogger(__name__)
+
+READ_STAGE = 'read_csv'
+CLEAN_STAGE = 'clean'
+
+# Stage durations kept per import for percentiles (one sample per chunk or batch)
+MAX_STAGE_SAMPLES = 10000
+
+# Finished imports kept for the job status endpoint
+MAX_FINISHED_IMPORTS = 50
+
+_current: ContextVar[Optional['ImportMetrics']] = ContextVar('import_metrics', default=None)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values), math.ceil(pct / 100 * len(sorted_values))) - 1)
+    return sorted_values[index]
+
+
+class ImportMetrics:
+    """Rows, bytes and per-stage durations of one import"""
+
+    def __init__(self, job_id: Optional[str], data_type: str, cycle: Optional[int] = None,
+                 file_path: Optional[str] = None):
+        self.job_id = job_id
+        self.data_type = data_type
+        self.cycle = cycle
+        self.file_path = file_path
+        self.file_bytes = os.path.getsize(file_path) if file_path and os.path.exists(file_path) else None
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._end: Optional[float] = None
+        self.rows = 0
+        self.bytes = 0
+        self.status = 'running'
+        self._samples: Dict[str, Deque[float]] = OrderedDict()
+        self._totals: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+        # Time recorded by stages, for the clean remainder of a chunk
+        self._staged = 0.0
+        self._nesting = 0
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Add one duration to a stage"""
+        if stage not in self._samples:
+            self._samples[stage] = deque(maxlen=MAX_STAGE_SAMPLES)
+            self._totals[stage] = 0.0
+            self._counts[stage] = 0
+        self._samples[stage].append(seconds)
+        self._totals[stage] += seconds
+        self._counts[stage] += 1
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block as one sample of a stage (nested stages count once)"""
+        self._nesting += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._nesting -= 1
+            self.record(name, elapsed)
+            if self._nesting == 0:
+                self._staged += elapsed
+
+    def add_rows(self, rows: int) -> None:
+        self.rows += rows
+
+    def add_bytes(self, count: int) -> None:
+        self.bytes += count
+
+    def finish(self, status: str) -> None:
+        self._end = time.perf_counter()
+        self.status = status
+        if self.file_bytes and status == 'completed':
+            # Readers without byte ranges processed the whole file
+            self.bytes = max(self.bytes, self.file_bytes)
+
+    @property
+    def elapsed(self) -> float:
+        return (self._end or time.perf_counter()) - self._start
+
+    def summary(self) -> Dict[str, Any]:
+        """Throughput and per-stage timing (durations in seconds, percentiles in milliseconds)"""
+        elapsed = self.elapsed
+        stages = {}
+        for name, samples in self._samples.items():
+            ordered = sorted(samples)
+            stages[name] = {
+                "count": self._counts[name],
+                "total_seconds": round(self._totals[name], 4),
+                "p50_ms": round(_percentile(ordered, 50) * 1000, 2),
+                "p95_ms": round(_percentile(ordered, 95) * 1000, 2),
+            }
+        return {
+            "job_id": self.job_id,
+            "data_type": self.data_type,
+            "cycle": self.cycle,
+            "status": self.status,
+            "started_at": self.started_at,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "rows_per_second": round(self.rows / elapsed, 1) if elapsed > 0 else 0.0,
+            "mb_per_second": round(self.bytes / (1024 * 1024) / elapsed, 3) if elapsed > 0 else 0.0,
+            "stages": stages,
+        }
+
+
+# Imports in progress (by job ID, or data type for untracked jobs) and recently finished
+_active: Dict[str, ImportMetrics] = {}
+_finished: 'OrderedDict[str, ImportMetrics]' = OrderedDict()
+
+# Totals over all finished imports of this process, by data type (for /metrics)
+_totals: Dict[str, Dict[str, Any]] = {}
+
+
+def current_metrics() -> Optional[ImportMetrics]:
+    """Metrics of the import running in this task, if any"""
+    return _current.get()
+
+
+@contextmanager
+def timed_stage(name: str):
+    """Time a block as a stage of the current import (no-op outside track_import)"""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    with metrics.stage(name):
+        yield
+
+
+class _TimedChunks:
+    """Chunk reader wrapper recording read_csv, clean, rows and bytes per chunk"""
+
+    def __init__(self, reader, metrics: Optional[ImportMetrics]):
+        self._reader = reader
+        self._metrics = metrics
+
+    def _chunk_read(self, chunk, seconds: float) -> None:
+        metrics = self._metrics
+        metrics.record(READ_STAGE, seconds)
+        frame = getattr(chunk, 'frame', chunk)
+        metrics.add_rows(len(frame))
+        start, end = getattr(chunk, 'start', None), getattr(chunk, 'end', None)
+        if start is not None and end is not None:
+            metrics.add_bytes(end - start)
+
+    def _chunk_done(self, seconds: float) -> None:
+        metrics = self._metrics
+        metrics.record(CLEAN_STAGE, max(0.0, seconds - metrics._staged))
+        metrics._staged = 0.0
+
+    async def __aiter__(self):
+        if self._metrics is None:
+            async for chunk in self._reader:
+                yield chunk
+            return
+        iterator = self._reader.__aiter__()
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = await iterator.__anext__()
+            except StopAsyncIteration:
+                return
+            self._chunk_read(chunk, time.perf_counter() - start)
+            self._metrics._staged = 0.0
+            body_start = time.perf_counter()
+            yield chunk
+            self._chunk_done(time.perf_counter() - body_start)
+
+    def __iter__(self):
+        if self._metrics is None:
+            yield from self._reader
+            return
+        iterator = iter(self._reader)
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+            self._chunk_read(chunk, time.perf_counter() - start)
+            self._metrics._staged = 0.0
+            body_start = time.perf_counter()
+            yield chunk
+            self._chunk_done(time.perf_counter() - body_start)
+
+
+def timed_chunks(reader):
+    """Wrap a chunk reader (``async for`` or ``for``) to time reading and cleaning of each chunk"""
+    return _TimedChunks(reader, _current.get())
+
+
+def _add_to_totals(metrics: ImportMetrics) -> None:
+    totals = _totals.setdefault(metrics.data_type, {"imports": 0, "rows": 0, "bytes": 0, "stages": {}})
+    totals["imports"] += 1
+    totals["rows"] += metrics.rows
+    totals["bytes"] += metrics.bytes
+    for name, seconds in metrics._totals.items():
+        stage = totals["stages"].setdefault(name, {"seconds": 0.0, "count": 0})
+        stage["seconds"] += seconds
+        stage["count"] += metrics._counts[name]
+
+
+@asynccontextmanager
+async def track_import(job_id: Optional[str], data_type: str, cycle: Optional[int] = None,
+                       file_path: Optional[str] = None):
+    """
+    Track an import's metrics while the block runs.
+
+    Nested calls for an import that is already tracked reuse its metrics.
+    """
+    existing = _current.get()
+    if existing is not None:
+        yield existing
+        return
+
+    metrics = ImportMetrics(job_id, data_type, cycle, file_path)
+    key = job_id or f"{data_type}:{cycle}"
+    _active[key] = metrics
+    token = _current.set(metrics)
+    status = 'failed'
+    try:
+        yield metrics
+        status = 'completed'
+    finally:
+        _current.reset(token)
+        metrics.finish(status)
+        _active.pop(key, None)
+        _finished[key] = metrics
+        _finished.move_to_end(key)
+        while len(_finished) > MAX_FINISHED_IMPORTS:
+            _finished.popitem(last=False)
+        _add_to_totals(metrics)
+        summary = metrics.summary()
+        log_with_context(
+            logger, logging.INFO,
+            f"Bulk import metrics for {data_type} (cycle {cycle}): {summary['rows']} rows in "
+            f"{summary['elapsed_seconds']}s, {summary['rows_per_second']} rows/s, {summary['mb_per_second']} MB/s",
+            event="bulk_import_metrics", **{k: v for k, v in summary.items() if k not in ("data_type", "cycle")},
+            import_data_type=data_type, import_cycle=cycle
+        )
+
+
+def get_import_metrics(job_id: str) -> Optional[Dict[str, Any]]:
+    """Summary of a running or recently finished import"""
+    metrics = _active.get(job_id) or _finished.get(job_id)
+    return metrics.summary() if metrics else None
+
+
+def collect_prometheus_metrics() -> Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]:
+    """Import metric families as (name, type, help, [(labels, value)])"""
+    active = list(_active.values())
+    yield ("fec_bulk_import_active", "gauge", "Bulk imports currently running",
+           [({}, float(len(active)))])
+
+    yield ("fec_bulk_import_rows_total", "counter", "Rows read by finished bulk imports",
+           [({"data_type": data_type}, float(t["rows"])) for data_type, t in _totals.items()])
+    yield ("fec_bulk_import_bytes_total", "counter", "Bytes read by finished bulk imports",
+           [({"data_type": data_type}, float(t["bytes"])) for data_type, t in _totals.items()])
+    yield ("fec_bulk_import_stage_seconds_total", "counter", "Time spent per stage by finished bulk imports",
+           [({"data_type": data_type, "stage": stage}, s["seconds"])
+            for data_type, t in _totals.items() for stage, s in t["stages"].items()])
+    yield ("fec_bulk_import_stage_samples_total", "counter", "Stage samples (chunks or batches) of finished bulk imports",
+           [({"data_type": data_type, "stage": stage}, float(s["count"]))
+            for data_type, t in _totals.items() for stage, s in t["stages"].items()])
+
+    summaries = [m.summary() for m in active]
+    job_labels = [{"job_id": s["job_id"] or "", "data_type": s["data_type"]} for s in summaries]
+    yield ("fec_bulk_import_rows_per_second", "gauge", "Current throughput of running bulk imports",
+           [(labels, float(s["rows_per_second"])) for labels, s in zip(job_labels, summaries)])
+    yield ("fec_bulk_import_mb_per_second", "gauge", "Current MB/s of running bulk imports",
+           [(labels, float(s["mb_per_second"])) for labels, s in zip(job_labels, summaries)])
+    for quantile in ("p50", "p95"):
+        yield (f"fec_bulk_import_stage_{quantile}_seconds", "gauge",
+               f"{quantile} stage duration of running bulk imports",
+               [({**labels, "stage": stage}, timing[f"{quantile}_ms"] / 1000)
+                for labels, s in zip(job_labels, summaries) for stage, timing in s["stages"].items()])
@@ -2,10 +2,11 @@
 import logging
 from typing import Optional, List
 from datetime import datetime
-from sqlalchemy import and_, or_, select
+from sqlalchemy import and_, or_
 from sqlalchemy.sql import Select
 
-from app.db.database import Contribution, Committee, AsyncSessionLocal
+from app.db.database import Contribution, ContributorRollup
+from app.services.shared.candidate_committees import get_candidate_committee_ids
 from app.services.shared.cycle_utils import convert_cycle_to_date_range, should_convert_cycle
 
 logger = logging.getLogger(__name__)
@@ -32,33 +33,8 @@ async def build_candidate_condition(candidate_id: str, fec_client=None):
     # Start with direct candidate_id match
     candidate_condition = Contribution.candidate_id == candidate_id
     
-    # Get committees linked to this candidate from database
-    committee_ids = []
-    try:
-        async with AsyncSessionLocal() as session:
-            # SQLite JSON contains works with JSON arrays
-            # Try multiple approaches for compatibility
-            result = await session.execute(
-                select(Committee.committee_id)
-                .where(Committee.candidate_ids.contains([candidate_id]))
-            )
-            committee_ids = [row[0] for row in result]
-            if committee_ids:
-                logger.info(f"Found {len(committee_ids)} committees in DB for candidate {candidate_id}: {committee_ids[:5]}{'...' if len(committee_ids) > 5 else ''}")
-            else:
-                logger.debug(f"No committees found in DB for candidate {candidate_id} (candidate_ids field may be empty or null)")
-    except Exception as e:
-        logger.warning(f"Error fetching committees from DB for candidate {candidate_id}: {e}", exc_info=True)
-    
-    # If no committees found in DB and FEC client provided, try API
-    if not committee_ids and fec_client:
-        try:
-            committees = await fec_client.get_committees(candidate_id=candidate_id, limit=100)
-            if committees:
-                committee_ids = [c.get('committee_id') for c in committees if c.get('committee_id')]
-                logger.debug(f"Found {len(committee_ids)} committees for candidate {candidate_id} via FEC API")
-        except Exception as e:
-            logger.debug(f"Error fetching committees from API for candidate {candidate_id}: {e}")
+    # Committees linked to this candidate (cached; falls back to the API if none are stored)
+    committee_ids = list(await get_candidate_committee_ids(candidate_id, fec_client))
     
     if committee_ids:
         # Add OR condition for committee IDs
@@ -80,6 +56,7 @@ class ContributionQueryBuilder:
         self._min_date: Optional[str] = None
         self._max_date: Optional[str] = None
         self._candidate_id: Optional[str] = None
+        self._committee_id: Optional[str] = None
         self._committee_ids: Optional[List[str]] = None
         self._candidate_condition_added: bool = False
     
@@ -101,25 +78,22 @@ class ContributionQueryBuilder:
             self._candidate_condition_added = False
         return self
     
+    @property
+    def committee_ids(self) -> List[str]:
+        """Committees linked to the candidate (resolved by build_where_clause)"""
+        return self._committee_ids or []
+    
     async def _get_committee_ids_for_candidate(self, candidate_id: str) -> List[str]:
         """Get committee IDs linked to a candidate"""
-        try:
-            async with AsyncSessionLocal() as session:
-                result = await session.execute(
-                    select(Committee.committee_id)
-                    .where(Committee.candidate_ids.contains([candidate_id]))
-                )
-                committee_ids = [row[0] for row in result]
-                if committee_ids:
-                    logger.debug(f"Query builder found {len(committee_ids)} committees for candidate {candidate_id}")
-                return committee_ids
-        except Exception as e:
-            logger.warning(f"Error fetching committees for candidate {candidate_id}: {e}", exc_info=True)
-            return []
+        committee_ids = list(await get_candidate_committee_ids(candidate_id))
+        if committee_ids:
+            logger.debug(f"Query builder found {len(committee_ids)} committees for candidate {candidate_id}")
+        return committee_ids
     
     def with_committee(self, committee_id: Optional[str]) -> 'ContributionQueryBuilder':
         """Add committee_id filter"""
         if committee_id:
+            self._committee_id = committee_id
             self.conditions.append(Contribution.committee_id == committee_id)
         return self
     
@@ -230,6 +204,29 @@ class ContributionQueryBuilder:
         else:
             return True
     
+    def build_rollup_where_clause(self):
+        """
+        Build the equivalent WHERE clause for contributor_rollups.
+        
+        Call after build_where_clause(), which resolves the candidate's committees.
+        Rollups are per cycle, so only the cycle filter is applied (undated
+        contributions are in cycle 0); use contributions directly for other date ranges.
+        """
+        conditions = [ContributorRollup.contribution_count > 0]
+        if self._candidate_id:
+            candidate_condition = ContributorRollup.candidate_id == self._candidate_id
+            if self._committee_ids:
+                candidate_condition = or_(
+                    candidate_condition,
+                    ContributorRollup.committee_id.in_(self._committee_ids)
+                )
+            conditions.append(candidate_condition)
+        if self._committee_id:
+            conditions.append(ContributorRollup.committee_id == self._committee_id)
+        if self._cycle:
+            conditions.append(ContributorRollup.cycle.in_([self._cycle, 0]))
+        return and_(*conditions)
+    
     def build_where_clause_sync(self):
         """
         Build WHERE clause synchronously (for cases where async is not available).
@@ -251,6 +248,7 @@ class ContributionQueryBuilder:
         self._min_date = None
         self._max_date = None
         self._candidate_id = None
+        self._committee_id = None
         self._committee_ids = None
         self._candidate_condition_added = False
         return self
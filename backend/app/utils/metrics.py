@@ -0,0 +1,38 @@
+"""
+Prometheus metrics in the text exposition format
+
+Metric families are collected from the services that keep them in memory
+(currently bulk import throughput and stage timing) and rendered without
+a client library.
+"""
+from typing import Dict
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def get_metrics() -> str:
+    """Current metrics as Prometheus text"""
+    from app.services.shared.import_metrics import collect_prometheus_metrics
+
+    lines = []
+    for name, metric_type, help_text, samples in collect_prometheus_metrics():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in samples:
+            lines.append(f"{name}{_format_labels(labels)} {value!r}")
+    return "\n".join(lines) + "\n"
+
+
+def get_metrics_content_type() -> str:
+    """Content type of get_metrics output"""
+    return CONTENT_TYPE
@@ -0,0 +1,344 @@
+"""
+Process pool utility for parsing large bulk files on multiple cores.
+
+``async_read_csv`` (thread_pool) keeps the event loop responsive, but CSV
+tokenizing and the pandas clean-up that follows still share one core because
+of the GIL. This module splits a delimited file into byte-range shards on
+newline boundaries, parses each shard (and an optional per-chunk transform) in
+a ``ProcessPoolExecutor``, and hands the resulting DataFrames back in file
+order to a single consumer that owns the database session.
+
+Workers return DataFrames, which pickle as their NumPy column buffers.
+In-flight shards are bounded by a queue so a slow writer applies
+back-pressure instead of letting parsed data pile up in memory.
+
+Chunks are cut on line boundaries as well, so every chunk knows the byte range
+it came from and the digest of those bytes. Importers store these as resume
+checkpoints and continue later with ``start_offset`` (a ``seek()``) instead of
+re-tokenizing the rows they already imported.
+
+Worker functions must be importable without side effects (spawned workers
+import them fresh), so transforms should live in light modules such as
+``app.services.bulk_data_transforms``.
+"""
+import asyncio
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Global process pool executor
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_workers: int = 0
+
+
+@dataclass
+class ParsedChunk:
+    """A parsed chunk and the byte range [start, end) of the file it was read from"""
+    frame: Any
+    start: int
+    end: int
+    digest: str
+
+
+def chunk_digest(data: bytes) -> str:
+    """Content hash of a chunk's raw bytes (used to verify resume checkpoints)"""
+    return hashlib.md5(data).hexdigest()
+
+
+def read_chunk_digest(file_path: str, start: int, end: int) -> Optional[str]:
+    """Digest of a byte range of a file, or None if the file is shorter than end"""
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    if len(data) != end - start:
+        return None
+    return chunk_digest(data)
+
+
+def get_process_pool_workers() -> int:
+    """Configured number of parse workers (BULK_PARSE_WORKERS, 0 = CPUs - 1)"""
+    from app.config import config
+
+    workers = config.BULK_PARSE_WORKERS
+    if workers <= 0:
+        workers = max(1, (os.cpu_count() or 1) - 1)
+    return workers
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get or create the global process pool executor"""
+    global _process_pool, _process_pool_workers
+    if _process_pool is None:
+        _process_pool_workers = get_process_pool_workers()
+        # spawn: forking a process that runs an event loop and DB threads is unsafe
+        _process_pool = ProcessPoolExecutor(
+            max_workers=_process_pool_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        logger.info(f"Initialized process pool with {_process_pool_workers} workers")
+    return _process_pool
+
+
+def shutdown_process_pool():
+    """Shutdown the global process pool executor"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=True, cancel_futures=True)
+        _process_pool = None
+        logger.info("Process pool shutdown complete")
+
+
+def compute_shards(file_path: str, shard_bytes: int, start_offset: int = 0) -> List[Tuple[int, int]]:
+    """
+    Split a file into (start, end) byte ranges that end on newline boundaries.
+
+    Args:
+        file_path: Path to the file
+        shard_bytes: Target shard size in bytes
+        start_offset: Byte offset of the first data line (e.g. after a header)
+
+    Returns:
+        List of half-open byte ranges covering the file from start_offset
+    """
+    file_size = os.path.getsize(file_path)
+    shards = []
+    start = start_offset
+    with open(file_path, "rb") as f:
+        while start < file_size:
+            target = start + max(1, shard_bytes)
+            if target >= file_size:
+                end = file_size
+            else:
+                f.seek(target)
+                f.readline()  # Advance to the end of the line containing target
+                end = f.tell()
+            shards.append((start, end))
+            start = end
+    return shards
+
+
+def _read_shard(
+    file_path: str,
+    start: int,
+    end: int,
+    read_kwargs: Dict[str, Any],
+    chunksize: int,
+    transform: Optional[Callable] = None
+) -> List[ParsedChunk]:
+    """Worker: parse one byte range into chunks of chunksize lines, applying transform to each"""
+    import numpy as np
+    import pandas as pd
+
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    # Cut after every chunksize-th newline so each chunk maps to an exact byte range
+    newlines = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord("\n"))
+    bounds = [0] + (newlines[chunksize - 1::chunksize] + 1).tolist()
+    if bounds[-1] != len(data):
+        bounds.append(len(data))
+
+    chunks = []
+    for chunk_start, chunk_end in zip(bounds, bounds[1:]):
+        block = data[chunk_start:chunk_end]
+        try:
+            frame = pd.read_csv(io.BytesIO(block), **read_kwargs)
+        except pd.errors.EmptyDataError:
+            frame = pd.DataFrame(columns=read_kwargs.get("names"))
+        chunks.append(ParsedChunk(
+            frame=transform(frame) if transform else frame,
+            start=start + chunk_start,
+            end=start + chunk_end,
+            digest=chunk_digest(block)
+        ))
+    return chunks
+
+
+def _header_offset_and_names(file_path: str, read_kwargs: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+    """Resolve the header once so every shard can be parsed headerless"""
+    header = read_kwargs.get("header", "infer")
+    names = read_kwargs.get("names")
+    has_header = header == 0 or (header == "infer" and names is None)
+    if not has_header:
+        return 0, read_kwargs
+
+    import pandas as pd
+
+    kwargs = dict(read_kwargs)
+    if names is None:
+        header_kwargs = {k: v for k, v in read_kwargs.items() if k in ("sep", "delimiter", "encoding")}
+        kwargs["names"] = pd.read_csv(file_path, nrows=0, **header_kwargs).columns.tolist()
+    kwargs["header"] = None
+    with open(file_path, "rb") as f:
+        f.readline()
+        return f.tell(), kwargs
+
+
+async def async_read_csv_sharded(
+    file_path: str,
+    chunksize: int,
+    transform: Optional[Callable] = None,
+    shard_bytes: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    start_offset: int = 0,
+    with_checkpoints: bool = False,
+    **read_kwargs
+) -> AsyncIterator[Any]:
+    """
+    Parse a delimited file in parallel and iterate its chunks in file order.
+
+    Drop-in for ``async_read_csv(..., chunksize=...)`` on unquoted delimited
+    files: rows never span lines, so shards can be cut on any newline.
+
+    Args:
+        file_path: Path to the delimited file
+        chunksize: Rows per DataFrame chunk within a shard
+        transform: Optional picklable function applied to each chunk in the worker
+        shard_bytes: Target shard size (defaults to BULK_PARSE_SHARD_MB)
+        max_in_flight: Maximum shards parsed or waiting ahead of the consumer
+            (defaults to twice the worker count)
+        executor: Executor to parse shards in (defaults to the global process pool)
+        start_offset: Byte offset to start reading from; must be a line boundary,
+            e.g. the end of a ParsedChunk from an earlier run
+        with_checkpoints: Yield ParsedChunk objects instead of bare DataFrames
+        **read_kwargs: Keyword arguments passed to pd.read_csv() for every shard
+
+    Returns:
+        Async iterator of DataFrames (or ParsedChunk objects)
+    """
+    if shard_bytes is None:
+        from app.config import config
+        shard_bytes = config.BULK_PARSE_SHARD_MB * 1024 * 1024
+    if executor is None:
+        executor = get_process_pool()
+    if max_in_flight is None:
+        max_in_flight = max(2, _process_pool_workers * 2)
+
+    read_kwargs.pop("chunksize", None)
+    header_offset, read_kwargs = _header_offset_and_names(file_path, read_kwargs)
+    shards = compute_shards(file_path, shard_bytes, max(header_offset, start_offset))
+    logger.info(f"Parsing {file_path} in {len(shards)} shards ({shard_bytes // (1024 * 1024)}MB each)")
+
+    async def chunk_generator():
+        loop = asyncio.get_running_loop()
+        # Holds futures in submission order; put() blocks once max_in_flight are pending
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_in_flight)
+
+        async def submit_shards():
+            for start, end in shards:
+                future = loop.run_in_executor(
+                    executor, _read_shard, file_path, start, end, read_kwargs, chunksize, transform
+                )
+                await queue.put(future)
+            await queue.put(None)
+
+        producer = asyncio.create_task(submit_shards())
+        try:
+            while True:
+                future = await queue.get()
+                if future is None:
+                    break
+                for chunk in await future:
+                    yield chunk if with_checkpoints else chunk.frame
+            await producer
+        finally:
+            producer.cancel()
+            # Drop work queued for shards the consumer will never read
+            while not queue.empty():
+                pending = queue.get_nowait()
+                if pending is not None:
+                    pending.cancel()
+
+    return chunk_generator()
+
+
+def _is_line_delimited(read_kwargs: Dict[str, Any]) -> bool:
+    """
+    Whether every line of the file is one row, so it can be split on any newline.
+
+    Only pipe-delimited FEC files qualify: comma-separated files may contain
+    quoted fields that span lines, and row-based skiprows cannot be applied per
+    byte range.
+    """
+    if read_kwargs.get("sep", read_kwargs.get("delimiter", ",")) != "|":
+        return False
+    return read_kwargs.get("skiprows") is None
+
+
+def should_shard(file_path: str, read_kwargs: Dict[str, Any], shard_bytes: Optional[int] = None) -> bool:
+    """Whether a bulk file should be parsed across processes with async_read_csv_sharded"""
+    if get_process_pool_workers() <= 1:
+        return False
+    if not _is_line_delimited(read_kwargs):
+        return False
+    if shard_bytes is None:
+        from app.config import config
+        shard_bytes = config.BULK_PARSE_SHARD_MB * 1024 * 1024
+    return os.path.getsize(file_path) > shard_bytes
+
+
+async def async_read_bulk_csv(
+    file_path: str,
+    chunksize: int,
+    transform: Optional[Callable] = None,
+    start_offset: int = 0,
+    with_checkpoints: bool = False,
+    **read_kwargs
+) -> AsyncIterator[Any]:
+    """
+    Chunked reader for bulk files: sharded across processes when possible.
+
+    Falls back to ``async_read_csv`` (single thread) for files that cannot be
+    sharded; the transform then runs in the thread pool.
+
+    Args:
+        file_path: Path to the delimited file
+        chunksize: Rows per DataFrame chunk
+        transform: Optional picklable function applied to each chunk
+        start_offset: Byte offset to resume from (line-delimited files only)
+        with_checkpoints: Yield ParsedChunk objects with byte ranges and digests
+            (line-delimited files only)
+        **read_kwargs: Keyword arguments passed to pd.read_csv()
+
+    Returns:
+        Async iterator of (transformed) DataFrames, or ParsedChunk objects
+
+    Raises:
+        ValueError: If byte offsets are requested for a file that is not line-delimited
+    """
+    if should_shard(file_path, read_kwargs):
+        return await async_read_csv_sharded(
+            file_path, chunksize, transform=transform, start_offset=start_offset,
+            with_checkpoints=with_checkpoints, **read_kwargs
+        )
+
+    from app.utils.thread_pool import async_read_csv, get_thread_pool, run_in_thread_pool
+
+    if start_offset or with_checkpoints:
+        if not _is_line_delimited(read_kwargs):
+            raise ValueError("Byte-offset checkpoints require a pipe-delimited file without skiprows")
+        # Same byte-range reader, one shard at a time in the thread pool
+        return await async_read_csv_sharded(
+            file_path, chunksize, transform=transform, max_in_flight=1,
+            executor=get_thread_pool(), start_offset=start_offset,
+            with_checkpoints=with_checkpoints, **read_kwargs
+        )
+
+    reader = await async_read_csv(file_path, chunksize=chunksize, **read_kwargs)
+    if transform is None:
+        return reader
+
+    async def transformed_generator():
+        async for chunk in reader:
+            yield await run_in_thread_pool(transform, chunk)
+
+    return transformed_generator()
@@ -1,8 +1,10 @@
 """
-Migration to create FTS5 full-text search table for contributor names
+Migration to create the contributor name search index (FTS5 trigram)
 
-This creates a virtual FTS5 table that enables fast full-text search
-on contributor names, making donor searches 10-100x faster.
+This creates the distinct contributor name table and its FTS5 trigram index
+used by donor search (see app/services/shared/contributor_index.py). The
+alembic revision add_contributor_search_index does the same at startup; this
+script rebuilds the index by hand.
 
 Run this migration to enable FTS5 search:
     python migrations/create_contributor_fts5.py
@@ -16,9 +18,16 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.config import config
+from app.services.shared.contributor_index import (
+    FTS_TABLE,
+    NAMES_TABLE,
+    backfill_statement,
+    create_index_statements,
+    drop_legacy_index_statements,
+)
 
 def migrate():
-    """Create FTS5 virtual table for contributor names"""
+    """Create the FTS5 trigram index for contributor names"""
     # Extract database path from DATABASE_URL
     db_url = config.DATABASE_URL
     if db_url.startswith("sqlite+aiosqlite:///"):
@@ -52,96 +61,35 @@ def migrate():
             print("Could not find database file")
             return
     
-    print(f"Creating FTS5 table for contributor names in {db_path}...")
+    print(f"Creating contributor name search index in {db_path}...")
     
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
     try:
-        # Check if FTS5 extension is available
-        cursor.execute("PRAGMA compile_options")
-        compile_options = [row[0] for row in cursor.fetchall()]
-        if "ENABLE_FTS5" not in str(compile_options):
-            print("WARNING: FTS5 extension may not be enabled in this SQLite build")
-            print("FTS5 search will fall back to regular search")
+        # Remove the older per-contribution FTS5 table and its triggers
+        for statement in drop_legacy_index_statements():
+            cursor.execute(statement)
         
-        # Drop existing FTS5 table if it exists (for re-migration)
-        cursor.execute("DROP TABLE IF EXISTS contributions_fts")
+        # Distinct names table + FTS5 trigram index kept in sync by triggers
+        for statement in create_index_statements("sqlite"):
+            cursor.execute(statement)
+        print(f"  Created '{NAMES_TABLE}' and FTS5 trigram table '{FTS_TABLE}'")
         
-        # Create FTS5 virtual table
-        # FTS5 tables are read-only from SQLAlchemy, so we use raw SQL
-        cursor.execute("""
-            CREATE VIRTUAL TABLE IF NOT EXISTS contributions_fts USING fts5(
-                contributor_name,
-                content='contributions',
-                content_rowid='id'
-            )
-        """)
-        
-        print("  Created FTS5 virtual table 'contributions_fts'")
-        
-        # Populate FTS5 table with existing contributor names
-        print("  Populating FTS5 table with existing contributor names...")
-        cursor.execute("""
-            INSERT INTO contributions_fts(rowid, contributor_name)
-            SELECT id, contributor_name
-            FROM contributions
-            WHERE contributor_name IS NOT NULL AND contributor_name != ''
-        """)
-        
-        row_count = cursor.rowcount
-        print(f"  Populated {row_count} contributor names into FTS5 table")
-        
-        # Create triggers to keep FTS5 table in sync with contributions table
-        print("  Creating triggers to keep FTS5 table in sync...")
-        
-        # Trigger for INSERT
-        cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS contributions_fts_insert AFTER INSERT ON contributions
-            BEGIN
-                INSERT INTO contributions_fts(rowid, contributor_name)
-                VALUES (new.id, new.contributor_name);
-            END
-        """)
-        
-        # Trigger for UPDATE
-        cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS contributions_fts_update AFTER UPDATE ON contributions
-            WHEN old.contributor_name IS NOT new.contributor_name
-            BEGIN
-                UPDATE contributions_fts
-                SET contributor_name = new.contributor_name
-                WHERE rowid = new.id;
-            END
-        """)
-        
-        # Trigger for DELETE
-        cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS contributions_fts_delete AFTER DELETE ON contributions
-            BEGIN
-                DELETE FROM contributions_fts WHERE rowid = old.id;
-            END
-        """)
-        
-        print("  Created sync triggers")
-        
-        # Create index on FTS5 table for better performance
-        # FTS5 automatically creates indexes, but we can optimize
-        cursor.execute("""
-            INSERT INTO contributions_fts(contributions_fts) VALUES('rebuild')
-        """)
-        
-        print("  Rebuilt FTS5 index")
+        # Populate with existing contributor names (importers add new names as they go)
+        print("  Populating index with existing contributor names...")
+        cursor.execute(backfill_statement("sqlite"))
+        print(f"  Added {cursor.rowcount} contributor names")
         
         conn.commit()
-        print("✓ Successfully created and populated FTS5 table")
-        print("\nFTS5 search is now enabled. Donor searches will be significantly faster.")
+        print("✓ Successfully created and populated contributor search index")
+        print("\nDonor searches will use the trigram index.")
         
     except sqlite3.OperationalError as e:
-        if "no such module: fts5" in str(e).lower():
-            print("ERROR: FTS5 extension is not available in this SQLite build")
+        if "no such module: fts5" in str(e).lower() or "no such tokenizer" in str(e).lower():
+            print("ERROR: FTS5 trigram tokenizer is not available in this SQLite build (needs 3.34+)")
             print("The system will fall back to regular search")
-            print("To enable FTS5, you may need to recompile SQLite with FTS5 support")
+            conn.rollback()
         else:
             print(f"Error during migration: {e}")
             conn.rollback()
@@ -5,10 +5,10 @@ import pytest
 import asyncio
 import os
 import sys
-from typing import AsyncGenerator, Generator
+from typing import AsyncGenerator, Generator, Iterable, List
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy import text
+from sqlalchemy import event, text
 from datetime import datetime
 import tempfile
 import shutil
@@ -69,6 +69,54 @@ async def test_db() -> AsyncGenerator[AsyncSession, None]:
     await test_engine.dispose()
 
 
+class TempDatabase:
+    """A file-backed temp SQLite database created by the temp_db fixture"""
+
+    def __init__(self, test_engine, path: str):
+        self.engine = test_engine
+        self.path = path
+        self.sessions = async_sessionmaker(test_engine, expire_on_commit=False)
+
+    def record_statements(self, prefix: str = "") -> List[str]:
+        """List that collects the SQL statements (starting with prefix) executed from now on"""
+        statements: List[str] = []
+
+        def record(conn, cursor, statement, *args):
+            if statement.startswith(prefix):
+                statements.append(statement)
+
+        event.listen(self.engine.sync_engine, "before_cursor_execute", record)
+        return statements
+
+
+@pytest.fixture(scope="function")
+async def temp_db(tmp_path, monkeypatch):
+    """
+    Factory for file-backed temp SQLite databases.
+
+    ``await temp_db([Contribution, ...], patch=[module, ...])`` creates the
+    models' tables in a new database under tmp_path and points each patched
+    module's AsyncSessionLocal at it. Engines are disposed after the test.
+    """
+    engines = []
+
+    async def make(models: Iterable, patch: Iterable = (), name: str = "test.db") -> TempDatabase:
+        path = str(tmp_path / name)
+        test_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        engines.append(test_engine)
+        tables = [model.__table__ for model in models]
+        async with test_engine.begin() as conn:
+            await conn.run_sync(lambda c: Base.metadata.create_all(c, tables=tables))
+        database = TempDatabase(test_engine, path)
+        for module in patch:
+            monkeypatch.setattr(module, "AsyncSessionLocal", database.sessions)
+        return database
+
+    yield make
+    for test_engine in engines:
+        await test_engine.dispose()
+
+
 @pytest.fixture(scope="function")
 async def client() -> AsyncGenerator[AsyncClient, None]:
     """
@@ -0,0 +1,178 @@
+"""
+Unit tests for the batched analysis precomputation scheduler
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+import app.db.database as database_module
+import app.services.analysis.computation as computation_module
+import app.services.analysis.contribution_analysis as contribution_module
+import app.services.analysis.donor_analysis as donor_module
+import app.services.analysis.orchestrator as orchestrator_module
+import app.services.analysis.scheduler as scheduler_module
+import app.services.shared.candidate_committees as candidate_committees
+from app.config import config
+from app.db.database import (
+    AnalysisComputationJob, Candidate, CandidateCommittee, Contribution, PreComputedAnalysis
+)
+from app.services.analysis.contribution_analysis import ContributionAnalysisService
+from app.services.analysis.donor_analysis import DonorAnalysisService
+from app.services.analysis.orchestrator import AnalysisOrchestratorService
+from app.services.analysis.scheduler import AnalysisPrecomputeScheduler, record_candidate_view
+
+CANDIDATE_STATES = {"P1": "TX", "P2": "CA", "P3": "NY"}
+
+
+class FakeFECClient:
+    async def get_candidate(self, candidate_id):
+        return {"candidate_id": candidate_id, "state": CANDIDATE_STATES.get(candidate_id)}
+
+    async def get_committees(self, candidate_id=None, limit=100):
+        return []
+
+
+def _contribution(n):
+    return Contribution(
+        contribution_id=f"S{n}",
+        candidate_id=["P1", "P2", "P3", None][n % 4],
+        committee_id=["C1", "C2", "C3", "C8", "C9"][n % 5],
+        contributor_name=None if n % 19 == 0 else ("" if n % 29 == 0 else f"DONOR {n % 23}"),
+        contributor_state=["TX", "CA", None, "", "Unknown", "NY"][n % 6],
+        contributor_employer=[None, "", "ACME INC", "Acme, Inc.", "GLOBEX", "Initech LLC", "INITECH"][n % 7],
+        contribution_amount=(
+            None if n % 31 == 0 else 0.0 if n % 37 == 0 else -25.0 if n % 41 == 0 else round(n * 3.17 % 900 + 1, 2)
+        ),
+        contribution_date=None if n % 13 == 0 else datetime(2021 + n % 4, 1 + n % 12, 1 + n % 27, n % 24),
+        # Bulk rows whose state/amount may only be in the raw record
+        raw_data={"STATE": "NV", "TRANSACTION_AMT": "$1,234.50"} if n % 9 == 0 else None,
+    )
+
+
+@pytest.fixture
+async def db(temp_db, monkeypatch):
+    """Temp SQLite DB: P1 (C1, shared C3), P2 (C2, C3), P3 (direct only) contributions over 2021-2024"""
+    database = await temp_db(
+        [Contribution, CandidateCommittee, Candidate, PreComputedAnalysis, AnalysisComputationJob],
+        patch=[database_module, computation_module, contribution_module, donor_module,
+               orchestrator_module, scheduler_module, candidate_committees]
+    )
+    async with database.sessions() as session:
+        session.add_all([
+            CandidateCommittee(candidate_id="P1", committee_id="C1"),
+            CandidateCommittee(candidate_id="P1", committee_id="C3"),
+            CandidateCommittee(candidate_id="P2", committee_id="C2"),
+            CandidateCommittee(candidate_id="P2", committee_id="C3"),
+        ])
+        # P2's state comes from the FEC client
+        session.add_all([Candidate(candidate_id="P1", state="TX"), Candidate(candidate_id="P3", state="NY")])
+        session.add_all(_contribution(n) for n in range(1, 1201))
+        # After midnight on the last day of the cycle: outside it for every analysis
+        session.add(Contribution(contribution_id="LATE", candidate_id="P1", committee_id="C1",
+                                 contributor_name="LATE DONOR", contributor_state="TX", contribution_amount=50.0,
+                                 contribution_date=datetime(2024, 12, 31, 15)))
+        await session.commit()
+    candidate_committees.clear_cache()
+    scheduler_module.clear_candidate_views()
+    monkeypatch.setattr(config, "ENABLE_PRECOMPUTED_ANALYSIS", True)
+    monkeypatch.setattr(config, "ANALYSIS_CHUNK_SIZE", 50)
+    yield database.sessions
+    scheduler_module.clear_candidate_views()
+    candidate_committees.clear_cache()
+
+
+def _rounded(value):
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, dict):
+        return {k: _rounded(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_rounded(v) for v in value]
+    return value
+
+
+async def _stored(sessions, cycle=2024):
+    async with sessions() as session:
+        rows = (await session.execute(
+            select(PreComputedAnalysis).where(PreComputedAnalysis.cycle == cycle)
+        )).scalars().all()
+    return {(row.analysis_type, row.candidate_id): row for row in rows}
+
+
+async def test_batched_results_match_per_candidate_analyses(db, monkeypatch):
+    fec_client = FakeFECClient()
+    orchestrator = AnalysisOrchestratorService(fec_client)
+    orchestrator._scheduler = AnalysisPrecomputeScheduler(fec_client, workers=2, batch_size=2)
+    results = await orchestrator.compute_analyses_for_cycle(2024)
+
+    assert results["candidates"] == 3
+    assert results["analysis_types"] == {t: {"computed": 3, "failed": 0} for t in ("employer", "velocity", "donor_states")}
+    assert results["total_computed"] == 9 + 2  # Plus the cycle-level employer and velocity analyses
+    stored = await _stored(db)
+    assert set(stored) == {(t, c) for t in ("employer", "velocity", "donor_states") for c in ("P1", "P2", "P3")} | {
+        ("employer", None), ("velocity", None)
+    }
+
+    # Compare with the per-candidate services computing from scratch
+    monkeypatch.setattr(config, "ENABLE_PRECOMPUTED_ANALYSIS", False)
+    contribution_service = ContributionAnalysisService(fec_client)
+    donor_service = DonorAnalysisService(fec_client)
+    for candidate_id in ("P1", "P2", "P3"):
+        expected = {
+            "employer": await contribution_service.analyze_by_employer(candidate_id=candidate_id, cycle=2024),
+            "velocity": await contribution_service.analyze_velocity(candidate_id=candidate_id, cycle=2024),
+            "donor_states": await donor_service.analyze_donor_states(candidate_id=candidate_id, cycle=2024),
+        }
+        for analysis_type, analysis in expected.items():
+            assert _rounded(stored[(analysis_type, candidate_id)].result_data) == _rounded(analysis.model_dump()), (
+                analysis_type, candidate_id
+            )
+
+    employer = stored[("employer", "P1")].result_data
+    assert employer["employer_count"] == 3 and employer["top_employers"][0]["count"] > 0  # ACME, GLOBEX, INITECH
+    assert len(stored[("velocity", "P3")].result_data["velocity_by_date"]) > 20
+    donor_states = stored[("donor_states", "P1")].result_data
+    assert donor_states["candidate_state"] == "TX" and donor_states["donors_by_state"]["NV"] > 0
+    assert stored[("donor_states", "P2")].result_data["candidate_state"] == "CA"
+
+
+async def test_viewed_candidates_first_progress_and_fresh_results(db, monkeypatch):
+    async with db() as session:
+        session.add(AnalysisComputationJob(id="job-1", job_type="cycle", status="running", cycle=2024,
+                                           progress_data={"data_type": "individual_contributions"}))
+        await session.commit()
+
+    scheduler = AnalysisPrecomputeScheduler(FakeFECClient(), workers=1, batch_size=1)
+    order = []
+    compute_batch = scheduler._compute_batch
+
+    async def recording_compute_batch(cycle, batch):
+        order.extend(batch)
+        if len(order) == 1:
+            record_candidate_view("P2")  # Viewed while the job runs: next batch
+        return await compute_batch(cycle, batch)
+
+    monkeypatch.setattr(scheduler, "_compute_batch", recording_compute_batch)
+    record_candidate_view("P3")
+    results = await scheduler.run(2024, analysis_types=["employer", "donor_states"], job_id="job-1")
+
+    # P3 was viewed; then P2 (viewed during the run) before the larger P1
+    assert order == ["P3", "P2", "P1"]
+    assert results["total_computed"] == 6 and results["total_failed"] == 0
+    async with db() as session:
+        job = await session.get(AnalysisComputationJob, "job-1")
+    assert (job.total_items, job.completed_items) == (3, 3)
+    assert job.progress_data["data_type"] == "individual_contributions"
+    assert job.progress_data["analysis_types"]["donor_states"] == {"computed": 3, "failed": 0}
+
+    # Fresh results are kept unless recomputation is forced
+    order.clear()
+    results = await scheduler.run(2024, candidate_ids=["P1", "P2"], analysis_types=["employer", "velocity"])
+    assert order == ["P2", "P1"] and results["skipped"] == 2 and results["total_computed"] == 2
+    assert (await _stored(db))[("employer", "P1")].data_version == 1
+
+    order.clear()
+    results = await scheduler.run(2024, candidate_ids=["P1"], force_recompute=True)
+    assert order == ["P1"] and results["total_computed"] == 3
+    assert (await _stored(db))[("employer", "P1")].data_version == 2
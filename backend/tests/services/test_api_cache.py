@@ -0,0 +1,283 @@
+"""
+Unit tests for the API response cache: in-memory tier, write-behind, normalized keys and request coalescing
+"""
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+import app.services.fec_client.cache as cache_module
+from app.db.database import APICache
+from app.services.fec_client.api_client import APIClient
+from app.services.fec_client.cache import CacheEntry, CacheManager, MemoryCache
+from app.services.fec_client.rate_limiter import RateLimiter
+
+
+class CountingSessions:
+    """Session factory that counts the sessions opened"""
+
+    def __init__(self, sessions):
+        self.sessions = sessions
+        self.opened = 0
+
+    def __call__(self):
+        self.opened += 1
+        return self.sessions()
+
+
+@pytest.fixture
+async def sessions(temp_db, monkeypatch):
+    database = await temp_db([APICache])
+    counting = CountingSessions(database.sessions)
+    monkeypatch.setattr(cache_module, "AsyncSessionLocal", counting)
+    return counting
+
+
+def _response(n, records=3):
+    return {"results": [{"sub_id": f"{n}-{i}", "amount": i} for i in range(records)], "pagination": {"pages": 1}}
+
+
+async def _stored_keys(sessions):
+    async with sessions() as session:
+        return set((await session.execute(select(APICache.cache_key))).scalars())
+
+
+async def test_memory_hits_skip_the_database(sessions):
+    cache = CacheManager(write_delay=60)
+    await cache.save_to_cache("k1", _response(1), ttl_hours=1)
+    assert sessions.opened == 0  # The write is buffered
+
+    assert await cache.get_from_cache("k1") == _response(1)
+    assert await cache.check_cache_staleness("k1", cache_ttl=1) is False
+    assert sessions.opened == 0
+
+    assert await cache.flush() == 1
+    assert await _stored_keys(sessions) == {"k1"}
+
+    # A cold manager loads from api_cache once, then serves from memory
+    cold = CacheManager()
+    opened = sessions.opened
+    for _ in range(3):
+        assert await cold.get_from_cache("k1") == _response(1)
+    assert sessions.opened == opened + 1
+    assert await cold.get_from_cache("missing") is None
+
+    metrics = cold.get_cache_metrics()
+    assert (metrics["hits"], metrics["memory_hits"], metrics["database_hits"], metrics["misses"]) == (3, 2, 1, 1)
+    assert metrics["memory"]["entries"] == 1
+
+
+async def test_returned_responses_are_detached(sessions):
+    cache = CacheManager(write_delay=60)
+    data = _response(1)
+    await cache.save_to_cache("k1", data)
+    data["results"][0]["amount"] = 99
+
+    first = await cache.get_from_cache("k1")
+    first["results"][0]["amount"] = 42
+    first["results"].append({"sub_id": "extra"})
+    assert await cache.get_from_cache("k1") == _response(1)
+
+
+async def test_staleness_uses_entry_metadata(sessions):
+    cache = CacheManager(write_delay=60)
+    now = datetime.utcnow()
+    cache.memory.put("old", CacheEntry({"results": []}, now - timedelta(hours=13), now + timedelta(hours=11)))
+    cache.memory.put("new", CacheEntry({"results": []}, now - timedelta(hours=1), now + timedelta(hours=23)))
+    assert await cache.check_cache_staleness("old", cache_ttl=24) is True
+    assert await cache.check_cache_staleness("new", cache_ttl=24) is False
+    assert sessions.opened == 0
+
+
+def test_memory_tier_evicts_lru_by_size_and_expires():
+    now = datetime.utcnow()
+    later = now + timedelta(hours=1)
+    memory = MemoryCache(max_bytes=100)
+    for key in ("a", "b", "c"):
+        memory.put(key, CacheEntry(key, now, later, size=40))
+    # Adding c pushed the total to 120 bytes, evicting a (least recently used)
+    assert memory.get("a") is None and memory.get("b") is not None
+    memory.put("d", CacheEntry("d", now, later, size=40))
+    # b was just read, so c is evicted next
+    assert memory.peek("c") is None and memory.peek("b") is not None
+    assert not memory.put("huge", CacheEntry("huge", now, later, size=101))
+
+    memory.put("b", CacheEntry("b", now, now - timedelta(seconds=1), size=10))
+    assert memory.get("b") is None
+    stats = memory.get_stats()
+    assert (stats["entries"], stats["size_bytes"], stats["evictions"], stats["expirations"]) == (1, 40, 2, 1)
+
+
+async def test_write_behind_commits_in_batches(sessions):
+    cache = CacheManager(write_batch_size=10, write_delay=60)
+    for n in range(25):
+        await cache.save_to_cache(f"k{n}", _response(n))
+    # A full batch wakes the writer before the delay; it drains the whole buffer
+    await asyncio.wait_for(cache._write_task, timeout=5)
+    assert len(await _stored_keys(sessions)) == 25
+    assert cache.get_cache_metrics()["write_batches"] == 3
+
+    # Partial batches are committed after the delay; updates replace the stored response
+    cache.write_delay = 0.05
+    await cache.save_to_cache("k0", {"results": ["updated"]})
+    await asyncio.sleep(0.3)
+    async with sessions() as session:
+        stored = (await session.execute(select(APICache.response_data).where(APICache.cache_key == "k0"))).scalar_one()
+    assert stored == {"results": ["updated"]}
+    assert cache.get_cache_metrics()["pending_writes"] == 0
+
+
+async def test_close_flushes_buffered_writes(sessions):
+    cache = CacheManager(write_delay=60)
+    await cache.save_to_cache("k1", _response(1))
+    await cache.save_to_cache("k2", _response(2))
+    await cache.close()
+    assert await _stored_keys(sessions) == {"k1", "k2"}
+
+
+class FakeFEC:
+    """Offset-paged endpoint with ``rows`` results; counts the HTTP requests made"""
+
+    def __init__(self, rows=2500):
+        self.rows = [{"sub_id": str(i)} for i in range(rows)]
+        self.requests = []
+
+    async def get(self, url, params=None):
+        self.requests.append(dict(params))
+        await asyncio.sleep(0.01)
+        per_page, page = int(params["per_page"]), int(params.get("page", 1))
+        body = {
+            "results": self.rows[(page - 1) * per_page:page * per_page],
+            "pagination": {"count": len(self.rows), "pages": -(-len(self.rows) // per_page), "page": page},
+        }
+        return httpx.Response(200, json=body, request=httpx.Request("GET", url))
+
+    async def aclose(self):
+        pass
+
+
+def _api_client(fake, cache):
+    client = APIClient(
+        base_url="https://fec.test/v1", api_key="KEY-1", cache_manager=cache,
+        rate_limiter=RateLimiter(rate_limit_delay=0, requests_per_hour=100000, burst=1000)
+    )
+    client.client = fake
+    return client
+
+
+async def _api_key():
+    return "KEY-1"
+
+
+def _query(limit=None, **extra):
+    params = {"committee_id": "C001", "two_year_transaction_period": 2024, "per_page": 100, **extra}
+    if limit:
+        params["_original_limit"] = limit
+    return params
+
+
+def test_cache_keys_ignore_credentials_and_paging():
+    cache = CacheManager()
+    key = cache.generate_cache_key("schedules/schedule_a", _query(500, api_key="KEY-1"))
+    assert key == cache.generate_cache_key("schedules/schedule_a", _query(1000, api_key="KEY-2", page=3))
+    assert key == cache.generate_cache_key("/schedules/schedule_a/", {
+        "two_year_transaction_period": "2024", "committee_id": "C001", "per_page": 20, "sort": None
+    })
+    assert key != cache.generate_cache_key("schedules/schedule_a", _query(500, committee_id="C002"))
+    assert key != cache.generate_cache_key("schedules/schedule_a", _query(500, sort="-contribution_receipt_date"))
+
+
+async def test_superset_response_answers_smaller_limits(sessions):
+    fake = FakeFEC()
+    client = _api_client(fake, CacheManager(write_delay=60))
+
+    data = await client.make_request("schedules/schedule_a", _query(1000), _api_key)
+    assert len(data["results"]) == 1000 and len(fake.requests) == 10
+
+    # Smaller limit: sliced from the cached 1000, even after the API key changes
+    client.api_key = "KEY-2"
+    data = await client.make_request("schedules/schedule_a", _query(500), _api_key)
+    assert [r["sub_id"] for r in data["results"]] == [str(i) for i in range(500)]
+    assert len(fake.requests) == 10
+
+    # Larger limit or everything: the cached response is too small, so it is fetched
+    data = await client.make_request("schedules/schedule_a", _query(), _api_key)
+    assert len(data["results"]) == 2500 and len(fake.requests) == 35
+    # ...and the complete response now answers any limit
+    data = await client.make_request("schedules/schedule_a", _query(2000), _api_key)
+    assert len(data["results"]) == 2000 and len(fake.requests) == 35
+
+
+async def test_concurrent_requests_share_one_read_and_one_fetch(sessions):
+    fake = FakeFEC(rows=300)
+    cache = CacheManager(write_delay=60)
+    client = _api_client(fake, cache)
+
+    results = await asyncio.gather(*(
+        client.make_request("schedules/schedule_a", _query(limit), _api_key)
+        for limit in [300, 300, 200, 100, 300, 50, 300, 300]
+    ))
+    assert [len(r["results"]) for r in results] == [300, 300, 200, 100, 300, 50, 300, 300]
+    assert len(fake.requests) == 3  # One fetch of three pages
+    assert sessions.opened == 1  # One api_cache read (the write is still buffered)
+    await cache.flush()
+
+    # Cold memory, entry in api_cache: still one read for all of them
+    cold = CacheManager(write_delay=60)
+    client = _api_client(fake, cold)
+    opened = sessions.opened
+    await asyncio.gather(*(client.make_request("schedules/schedule_a", _query(300), _api_key) for _ in range(8)))
+    assert sessions.opened == opened + 1
+    assert len(fake.requests) == 3
+    assert client._in_flight_requests == {}
+
+
+async def test_stale_entry_is_refreshed_once_at_its_full_size(sessions):
+    fake = FakeFEC()
+    cache = CacheManager(write_delay=60)
+    client = _api_client(fake, cache)
+    await client.make_request("schedules/schedule_a", _query(1000), _api_key)
+    cache_key = cache.generate_cache_key("schedules/schedule_a", _query())
+    cache.memory.peek(cache_key).created_at -= timedelta(days=30)
+    fake.requests.clear()
+
+    data = await client.make_request("schedules/schedule_a", _query(100), _api_key, cache_ttl=24)
+    assert len(data["results"]) == 100
+    await asyncio.wait_for(client._in_flight_requests[cache_key], timeout=5)
+
+    # The refresh fetched the 1000 results the entry held (not the 100 requested), once
+    assert len(fake.requests) == 10
+    assert len((await cache.get_from_cache(cache_key))["results"]) == 1000
+    await client.make_request("schedules/schedule_a", _query(100), _api_key, cache_ttl=24)
+    await asyncio.sleep(0.05)
+    assert len(fake.requests) == 10
+
+
+@pytest.mark.slow
+async def test_cache_lookup_benchmark(sessions):
+    """Benchmark: memory vs api_cache lookups (lookups: API_CACHE_BENCHMARK_LOOKUPS, default 2000)"""
+    lookups = int(os.getenv("API_CACHE_BENCHMARK_LOOKUPS", "2000"))
+    warm = CacheManager(write_batch_size=500)
+    for n in range(500):
+        await warm.save_to_cache(f"k{n}", _response(n, records=100))
+    await warm.flush()
+
+    cold = CacheManager(memory_max_bytes=0)  # Every lookup goes to api_cache
+    start = time.perf_counter()
+    for n in range(lookups):
+        assert await cold.get_from_cache(f"k{n % 500}")
+        await cold.check_cache_staleness(f"k{n % 500}", cache_ttl=24)
+    database_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for n in range(lookups):
+        assert await warm.get_from_cache(f"k{n % 500}")
+        await warm.check_cache_staleness(f"k{n % 500}", cache_ttl=24)
+    memory_time = time.perf_counter() - start
+
+    print(f"\n{lookups} cache lookups: memory {memory_time * 1000:.1f}ms, api_cache {database_time * 1000:.1f}ms")
+    assert memory_time < database_time
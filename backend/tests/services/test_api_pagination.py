@@ -0,0 +1,191 @@
+"""
+Unit tests for concurrent and keyset pagination in the FEC API client, against a local mock FEC server
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from app.services.fec_client.api_client import APIClient
+from app.services.fec_client.rate_limiter import RateLimiter
+from app.services._fec_client_impl import FECClient
+
+TOTAL_ROWS = 950
+PAGE_DELAY = 0.05
+
+
+class MockFECServer:
+    """
+    Minimal OpenFEC: schedules/schedule_a pages with last_index cursors,
+    schedules/schedule_b by page number. Every page takes PAGE_DELAY seconds.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                with server.lock:
+                    server.requests.append((url.path, params, time.perf_counter()))
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                try:
+                    time.sleep(PAGE_DELAY)
+                    body = server.respond(url.path, params)
+                finally:
+                    with server.lock:
+                        server.active -= 1
+                payload = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def respond(self, path, params):
+        per_page = int(params.get("per_page", 100))
+        prefix = params.get("committee_id", "")
+        rows = [{"sub_id": f"{prefix}{i:04d}", "amount": i} for i in range(TOTAL_ROWS)]
+        pages = (TOTAL_ROWS + per_page - 1) // per_page
+        if path.endswith("schedule_a"):
+            assert "page" not in params
+            start = int(params["last_index"]) + 1 if "last_index" in params else 0
+            results = rows[start:start + per_page]
+            last_indexes = None
+            if start + per_page < TOTAL_ROWS:
+                last_indexes = {"last_index": str(start + per_page - 1),
+                                "last_contribution_receipt_date": "2024-01-01"}
+            pagination = {"count": TOTAL_ROWS, "pages": pages, "per_page": per_page, "last_indexes": last_indexes}
+        else:
+            page = int(params.get("page", 1))
+            results = rows[(page - 1) * per_page:page * per_page]
+            pagination = {"count": TOTAL_ROWS, "pages": pages, "per_page": per_page, "page": page}
+        return {"results": results, "pagination": pagination}
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class NoCache:
+    def get_cache_ttl(self, endpoint):
+        return 1
+
+    def generate_cache_key(self, endpoint, params):
+        return json.dumps([endpoint, params], sort_keys=True, default=str)
+
+    async def get_from_cache(self, cache_key, include_database=True):
+        return None
+
+    async def save_to_cache(self, cache_key, data, ttl_hours=24):
+        pass
+
+
+async def _api_key():
+    return "TEST"
+
+
+def _unthrottled():
+    """Rate limiter that lets the mock server's requests through unpaced"""
+    return RateLimiter(rate_limit_delay=0, max_concurrent=4, requests_per_hour=100000, burst=1000)
+
+
+@pytest.fixture
+async def server():
+    server = MockFECServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+async def client(server):
+    client = APIClient(
+        base_url=server.base_url, api_key="TEST",
+        rate_limiter=_unthrottled(), cache_manager=NoCache()
+    )
+    yield client
+    await client.close()
+
+
+def _ids(rows):
+    return [row["sub_id"] for row in rows]
+
+
+async def test_offset_pages_are_fetched_concurrently_in_order(server, client):
+    start = time.perf_counter()
+    data = await client.make_request("schedules/schedule_b", {"per_page": 100}, _api_key)
+    elapsed = time.perf_counter() - start
+
+    assert _ids(data["results"]) == [f"{i:04d}" for i in range(TOTAL_ROWS)]
+    assert server.max_active == 4
+    # 10 pages: one, then nine four at a time (sequential would take 10 page delays)
+    assert elapsed < 7 * PAGE_DELAY
+
+
+async def test_keyset_pages_follow_the_cursor(server, client):
+    data = await client.make_request("schedules/schedule_a", {"per_page": 100, "_original_limit": None}, _api_key)
+    assert _ids(data["results"]) == [f"{i:04d}" for i in range(TOTAL_ROWS)]
+    cursors = [params.get("last_index") for _, params, _ in server.requests]
+    assert cursors == [None] + [str(i * 100 + 99) for i in range(9)]
+
+
+async def test_max_results_stops_paging(server, client):
+    data = await client.make_request("schedules/schedule_b", {"per_page": 100, "_original_limit": 250}, _api_key)
+    assert _ids(data["results"]) == [f"{i:04d}" for i in range(250)]
+    assert sorted(int(p.get("page", 1)) for _, p, _ in server.requests) == [1, 2, 3]
+
+    server.requests.clear()
+    pages = [page async for page in client.iter_pages("schedules/schedule_a", {"per_page": 100}, _api_key, 250)]
+    assert [len(page) for page in pages] == [100, 100, 50]
+    assert len(server.requests) == 3
+
+
+async def test_keyset_iterator_prefetches_next_page(server, client):
+    """The next page is requested before the caller is done with the current one"""
+    processed_at = []
+    async for page in client.iter_pages("schedules/schedule_a", {"per_page": 100}, _api_key):
+        await asyncio.sleep(PAGE_DELAY)  # Caller work
+        processed_at.append(time.perf_counter())
+    requested_at = [at for _, _, at in server.requests]
+    assert len(processed_at) == 10
+    # Page n + 1 (request index n + 1) was requested while page n was being processed
+    assert all(requested_at[n + 1] < processed_at[n] for n in range(1, 9))
+
+
+async def test_iter_contributions_streams_each_committee(server, monkeypatch):
+    fec_client = FECClient(api_key="TEST")
+    fec_client.api_client.base_url = server.base_url
+    fec_client.api_client.rate_limiter = _unthrottled()
+
+    async def committees(**kwargs):
+        return [{"committee_id": "C1"}, {"committee_id": "C2"}]
+
+    monkeypatch.setattr(fec_client, "get_committees", committees)
+    try:
+        pages = [page async for page in fec_client.iter_contributions(
+            candidate_id="P001", two_year_transaction_period=2024, max_results=1500
+        )]
+    finally:
+        await fec_client.api_client.close()
+
+    rows = [row for page in pages for row in page]
+    assert _ids(rows) == [f"C1{i:04d}" for i in range(TOTAL_ROWS)] + [f"C2{i:04d}" for i in range(550)]
+    assert {row["candidate_id"] for row in rows} == {"P001"}
+    assert {params["two_year_transaction_period"] for _, params, _ in server.requests} == {"2024"}
@@ -0,0 +1,212 @@
+"""
+Unit tests for multi-process sharded parsing of bulk files
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pytest
+from sqlalchemy import select
+
+import app.services.bulk_data.job_manager as job_manager_module
+import app.services.bulk_data_original as bulk_module
+from app.db.database import BulkImportJob, Committee, Contribution
+from app.services.bulk_data.contribution_merge import SCHEDULE_A_COLUMNS
+from app.services.bulk_data_original import BulkDataService
+from app.services.bulk_data_transforms import normalize_schedule_a_chunk, parse_fec_dates
+from app.utils.process_pool import (
+    async_read_bulk_csv,
+    async_read_csv_sharded,
+    compute_shards,
+    read_chunk_digest,
+    should_shard,
+)
+
+SCHEDULE_A_READ_KWARGS = dict(sep="|", header=None, names=SCHEDULE_A_COLUMNS, dtype=str, on_bad_lines="skip")
+
+
+def _line(i: int) -> str:
+    fields = {col: "" for col in SCHEDULE_A_COLUMNS}
+    fields.update(
+        CMTE_ID=f"C{i % 7:08d}", NAME=f"DONOR {i}", TRANSACTION_DT="01152024",
+        TRANSACTION_AMT=str(i), SUB_ID=str(1000 + i) if i % 10 else ""
+    )
+    return "|".join(fields[col] for col in SCHEDULE_A_COLUMNS) + "\n"
+
+
+@pytest.fixture
+def schedule_a_file(tmp_path):
+    path = tmp_path / "itcont.txt"
+    path.write_text("".join(_line(i) for i in range(500)))
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def executor():
+    pool = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+    yield pool
+    pool.shutdown(wait=True)
+
+
+def test_compute_shards_end_on_newlines(schedule_a_file):
+    """Shards cover the whole file and every boundary starts a new line"""
+    with open(schedule_a_file, "rb") as f:
+        data = f.read()
+
+    shards = compute_shards(schedule_a_file, shard_bytes=1000)
+
+    assert shards[0][0] == 0
+    assert shards[-1][1] == len(data)
+    assert len(shards) > 5
+    for (_, end), (next_start, _) in zip(shards, shards[1:]):
+        assert end == next_start
+        assert data[end - 1:end] == b"\n"
+
+
+async def test_sharded_read_matches_sequential(schedule_a_file, executor):
+    """Workers parse and normalize shards; chunks come back in file order"""
+    expected = normalize_schedule_a_chunk(pd.read_csv(schedule_a_file, **SCHEDULE_A_READ_KWARGS))
+
+    reader = await async_read_csv_sharded(
+        schedule_a_file, chunksize=40, transform=normalize_schedule_a_chunk,
+        shard_bytes=4096, max_in_flight=2, executor=executor, **SCHEDULE_A_READ_KWARGS
+    )
+    chunks = [chunk async for chunk in reader]
+
+    assert len(chunks) > 2
+    result = pd.concat(chunks)
+    assert result["contribution_id"].tolist() == expected["contribution_id"].tolist()
+    assert result["contribution_amount"].tolist() == expected["contribution_amount"].tolist()
+    assert result["contribution_date"].notna().all()
+
+
+async def test_sharded_read_skips_header_once(tmp_path, executor):
+    """A header line is read once and every shard is parsed with its names"""
+    path = tmp_path / "with_header.txt"
+    path.write_text("A|B\n" + "".join(f"{i}|x{i}\n" for i in range(300)))
+
+    reader = await async_read_csv_sharded(
+        str(path), chunksize=50, shard_bytes=256, executor=executor, sep="|", header=0, dtype=str
+    )
+    result = pd.concat([chunk async for chunk in reader])
+
+    assert list(result.columns) == ["A", "B"]
+    assert result["A"].tolist() == [str(i) for i in range(300)]
+
+
+def test_should_shard_only_pipe_files(schedule_a_file, monkeypatch):
+    from app.config import config
+
+    monkeypatch.setattr(config, "BULK_PARSE_WORKERS", 4)
+    assert should_shard(schedule_a_file, {"sep": "|"}, shard_bytes=1000)
+    assert not should_shard(schedule_a_file, {"sep": ","}, shard_bytes=1000)
+    assert not should_shard(schedule_a_file, {"sep": "|", "skiprows": lambda x: x < 5}, shard_bytes=1000)
+    assert not should_shard(schedule_a_file, {"sep": "|"}, shard_bytes=10 ** 9)
+
+    monkeypatch.setattr(config, "BULK_PARSE_WORKERS", 1)
+    assert not should_shard(schedule_a_file, {"sep": "|"}, shard_bytes=1000)
+
+
+def test_parse_fec_dates_keeps_chunk_index():
+    """Later chunks (non-zero-based index) still get their dates parsed"""
+    series = pd.Series(["01152024", "20240301", "bad"], index=[50000, 50001, 50002])
+    result = parse_fec_dates(series)
+    assert result.loc[50000] == pd.Timestamp(2024, 1, 15)
+    assert result.loc[50001] == pd.Timestamp(2024, 3, 1)
+    assert pd.isna(result.loc[50002])
+
+
+async def test_checkpointed_chunks_cover_file_and_resume_by_offset(schedule_a_file):
+    """Chunk byte ranges are contiguous, digests match, and start_offset resumes after a chunk"""
+    reader = await async_read_bulk_csv(
+        schedule_a_file, chunksize=100, with_checkpoints=True, **SCHEDULE_A_READ_KWARGS
+    )
+    chunks = [parsed async for parsed in reader]
+
+    assert [len(parsed.frame) for parsed in chunks] == [100] * 5
+    assert chunks[0].start == 0
+    for parsed, following in zip(chunks, chunks[1:]):
+        assert parsed.end == following.start
+    for parsed in chunks:
+        assert read_chunk_digest(schedule_a_file, parsed.start, parsed.end) == parsed.digest
+
+    resumed = await async_read_bulk_csv(
+        schedule_a_file, chunksize=100, start_offset=chunks[1].end, **SCHEDULE_A_READ_KWARGS
+    )
+    names = pd.concat([frame async for frame in resumed])["NAME"].tolist()
+    assert names == [f"DONOR {i}" for i in range(200, 500)]
+
+
+async def test_checkpoints_require_line_delimited_file(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n1,2\n")
+    with pytest.raises(ValueError):
+        await async_read_bulk_csv(str(path), chunksize=10, with_checkpoints=True, sep=",")
+
+
+@pytest.fixture
+async def import_db(temp_db):
+    """Temp SQLite DB used by both the import loop and the job manager"""
+    database = await temp_db([Contribution, Committee, BulkImportJob], patch=[bulk_module, job_manager_module])
+    return database.sessions
+
+
+async def test_resume_seeks_past_committed_chunks(schedule_a_file, import_db, monkeypatch):
+    """A resumed import continues after the checkpoint, or restarts if the file changed"""
+    upserted = []
+    upsert = bulk_module.upsert_contributions
+
+    async def capturing_upsert(session, records):
+        upserted.extend(r["contribution_id"] for r in records)
+        return await upsert(session, records)
+
+    async def noop(*args, **kwargs):
+        return None
+
+    service = BulkDataService()
+    monkeypatch.setattr(bulk_module, "upsert_contributions", capturing_upsert)
+    monkeypatch.setattr(service, "_extract_and_cache_committees", noop)
+    monkeypatch.setattr(service, "_update_metadata", noop)
+
+    reader = await async_read_bulk_csv(
+        schedule_a_file, chunksize=100, with_checkpoints=True, **SCHEDULE_A_READ_KWARGS
+    )
+    second_chunk = [parsed async for parsed in reader][1]
+
+    # A job that failed after committing the first two chunks (180 rows with SUB_ID)
+    async with import_db() as session:
+        session.add(BulkImportJob(
+            id="job-1", job_type="single_cycle", status="failed", cycle=2024,
+            imported_records=180, file_position=second_chunk.end,
+            checkpoint_start=second_chunk.start, checkpoint_hash=second_chunk.digest
+        ))
+        await session.commit()
+
+    total = await service.parse_and_store_csv(
+        schedule_a_file, 2024, job_id="job-1", batch_size=100, resume=True, bulk_load=False
+    )
+    assert total == 450
+    assert upserted == [str(1000 + i) for i in range(200, 500) if i % 10]
+
+    async with import_db() as session:
+        job = (await session.execute(select(BulkImportJob))).scalar_one()
+        assert job.status == "completed"
+        assert job.file_position == os.path.getsize(schedule_a_file)
+        assert job.checkpoint_hash == read_chunk_digest(schedule_a_file, job.checkpoint_start, job.file_position)
+
+        # The file is replaced: the stored checkpoint no longer matches its bytes
+        job.file_position, job.checkpoint_start, job.checkpoint_hash = (
+            second_chunk.end, second_chunk.start, second_chunk.digest
+        )
+        await session.commit()
+    with open(schedule_a_file, "r+") as f:
+        f.seek(second_chunk.start)
+        f.write("X")
+
+    upserted.clear()
+    total = await service.parse_and_store_csv(
+        schedule_a_file, 2024, job_id="job-1", batch_size=100, resume=True, bulk_load=False
+    )
+    assert total == 450
+    assert len(upserted) == 450
@@ -0,0 +1,139 @@
+"""
+Unit tests for candidate -> committee resolution through the candidate_committee table
+"""
+import importlib.util
+from pathlib import Path
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine, select, text
+
+import app.services.fec_client.storage as storage_module
+import app.services.shared.candidate_committees as resolver
+from app.config import config
+from app.db.database import Base, CandidateCommittee, Committee
+from app.services.fec_client.storage import StorageManager
+from app.services.shared.query_builders import ContributionQueryBuilder, build_candidate_condition
+
+
+class StubClient:
+    """Stands in for FECClient.get_committees"""
+
+    def __init__(self, committees):
+        self.committees = committees
+        self.calls = 0
+
+    async def get_committees(self, candidate_id=None, limit=100):
+        self.calls += 1
+        return self.committees
+
+
+@pytest.fixture
+async def db(temp_db):
+    """Temp SQLite DB with committees and candidate_committee; resolver cache cleared"""
+    database = await temp_db([Committee, CandidateCommittee], patch=[resolver, storage_module])
+    resolver.clear_cache()
+    yield database.sessions, database.record_statements()
+    resolver.clear_cache()
+
+
+async def test_links_are_added_once(db):
+    sessions, _ = db
+    async with sessions() as session:
+        assert await resolver.link_candidate_committees(
+            session, [("P1", "C1"), ("P1", "C2"), (" P1 ", "C1"), ("", "C3"), ("P2", None)]
+        ) == 2
+        assert await resolver.link_candidate_committees(session, [("P1", "C2"), ("P2", "C2")]) == 1
+        await session.commit()
+        rows = (await session.execute(
+            select(CandidateCommittee.candidate_id, CandidateCommittee.committee_id)
+            .order_by(CandidateCommittee.candidate_id, CandidateCommittee.committee_id)
+        )).all()
+    assert rows == [("P1", "C1"), ("P1", "C2"), ("P2", "C2")]
+
+
+async def test_resolution_is_cached_until_linkage_changes(db, monkeypatch):
+    sessions, statements = db
+    async with sessions() as session:
+        await resolver.link_candidate_committees(session, [("P1", "C2"), ("P1", "C1")])
+        await session.commit()
+    statements.clear()
+
+    assert await resolver.get_candidate_committee_ids("P1") == ("C1", "C2")
+    assert await resolver.get_candidate_committee_ids("P1") == ("C1", "C2")
+    assert await resolver.get_candidate_committee_ids("P9") == ()
+    assert await resolver.get_candidate_committee_ids("P9") == ()
+    assert len(statements) == 2
+
+    async with sessions() as session:
+        await resolver.link_candidate_committees(session, [("P1", "C3")])
+        await session.commit()
+    assert await resolver.get_candidate_committee_ids("P1") == ("C1", "C2")  # Not told yet
+    resolver.mark_linkage_changed()
+    assert await resolver.get_candidate_committee_ids("P1") == ("C1", "C2", "C3")
+
+    monkeypatch.setattr(config, "CANDIDATE_COMMITTEE_CACHE_TTL_SECONDS", 0)
+    resolver.clear_cache()
+    statements.clear()
+    await resolver.get_candidate_committee_ids("P1")
+    await resolver.get_candidate_committee_ids("P1")
+    assert len(statements) == 2
+
+
+async def test_api_is_asked_only_without_local_links(db):
+    sessions, _ = db
+    async with sessions() as session:
+        await resolver.link_candidate_committees(session, [("P1", "C1")])
+        await session.commit()
+    client = StubClient([{"committee_id": "C7"}, {"committee_id": "C7"}, {"name": "no id"}])
+
+    assert await resolver.get_candidate_committee_ids("P1", client) == ("C1",)
+    assert await resolver.get_candidate_committee_ids("P2", client) == ("C7",)
+    assert await resolver.get_candidate_committee_ids("P2", client) == ("C7",)
+    assert client.calls == 1
+
+    condition = await build_candidate_condition("P2", fec_client=client)
+    assert "committee_id IN" in str(condition)
+
+    builder = ContributionQueryBuilder().with_candidate("P1")
+    await builder.build_where_clause()
+    assert builder.committee_ids == ["C1"]
+
+
+async def test_store_committee_links_its_candidates(db):
+    sessions, _ = db
+    generation = resolver.linkage_generation()
+    storage = StorageManager()
+
+    await storage.store_committee({"committee_id": "C1", "name": "One", "candidate_ids": ["P1", "P2"]})
+    assert resolver.linkage_generation() == generation + 1
+    await storage.store_committee({"committee_id": "C1", "name": "One", "candidate_ids": ["P1"]})
+    assert resolver.linkage_generation() == generation + 1  # Nothing new, cache kept
+
+    assert await resolver.get_candidate_committee_ids("P2") == ("C1",)
+
+
+def test_migration_fills_links_from_committees(tmp_path):
+    path = Path(__file__).parents[2] / "alembic" / "versions" / "add_candidate_committee.py"
+    spec = importlib.util.spec_from_file_location("add_candidate_committee", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+    Base.metadata.create_all(engine, tables=[Committee.__table__])
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO committees (committee_id, name, candidate_ids) VALUES "
+            "('C1', 'One', '[\"P1\", \"P2\"]'), ('C2', 'Two', '[\"P1\", \"\"]'), "
+            "('C3', 'Three', '[]'), ('C4', 'Four', NULL), ('C5', 'Five', 'not json')"
+        ))
+        migration.op = Operations(MigrationContext.configure(conn))
+        migration.upgrade()
+        migration.upgrade()  # Idempotent
+        rows = conn.execute(text(
+            "SELECT candidate_id, committee_id FROM candidate_committee ORDER BY 1, 2"
+        )).all()
+    engine.dispose()
+
+    assert rows == [("P1", "C1"), ("P1", "C2"), ("P2", "C1")]
@@ -0,0 +1,86 @@
+"""
+Unit tests for keyset-paginated chunked processing
+"""
+import pytest
+from sqlalchemy import select
+
+from app.db.database import Contribution
+from app.services.shared.chunked_processor import ChunkedProcessor
+
+
+@pytest.fixture
+async def db(temp_db):
+    """Temp SQLite DB with 1050 contributions, amounts 1..1050 (candidate P1 for even amounts)"""
+    database = await temp_db([Contribution])
+    async with database.sessions() as session:
+        session.add_all(
+            Contribution(contribution_id=f"S{n}", candidate_id="P1" if n % 2 == 0 else "P2",
+                         contributor_name=f"DONOR {n}", contribution_amount=float(n))
+            for n in range(1, 1051)
+        )
+        await session.commit()
+    return database.sessions, database.record_statements()
+
+
+async def test_chunks_are_read_with_keyset_pagination(db):
+    sessions, statements = db
+    processor = ChunkedProcessor(chunk_size=100)
+    query = select(Contribution).where(Contribution.candidate_id == "P1").order_by(Contribution.contributor_name)
+
+    async with sessions() as session:
+        processed = await processor.process_contributions_in_chunks(
+            session, query, lambda chunk: {"total": sum(c.contribution_amount for c in chunk), "chunks": 1}
+        )
+
+    assert processed["total"] == sum(range(2, 1051, 2))
+    assert processed["chunks"] == 6
+    assert processed["metadata"] == {"total_processed": 525, "chunks_processed": 6, "is_complete": True}
+    assert len(statements) == 6
+    assert all("contributions.id > ?" in statement for statement in statements[1:])
+
+
+async def test_chunks_can_be_column_tuples(db):
+    sessions, statements = db
+    processor = ChunkedProcessor(chunk_size=400)
+    query = select(Contribution.contribution_id, Contribution.contribution_amount)
+
+    async with sessions() as session:
+        chunks = [chunk async for chunk in processor.iter_chunks(session, query, as_rows=True)]
+
+    assert [len(chunk) for chunk in chunks] == [400, 400, 250]
+    assert chunks[0][0] == ("S1", 1.0)
+    assert chunks[2][-1] == ("S1050", 1050.0)
+
+
+async def test_max_chunks_stops_early(db):
+    sessions, statements = db
+    processor = ChunkedProcessor(chunk_size=100)
+
+    async with sessions() as session:
+        processed = await processor.process_contributions_in_chunks(
+            session, select(Contribution), lambda chunk: {"ids": [c.contribution_id for c in chunk]}, max_chunks=2
+        )
+
+    assert processed["ids"] == [f"S{n}" for n in range(1, 201)]
+    assert processed["metadata"]["is_complete"] is False
+
+
+@pytest.mark.parametrize("server_side", [True, False])
+async def test_stream_contributions(db, server_side):
+    sessions, statements = db
+    processor = ChunkedProcessor(chunk_size=100)
+    query = select(Contribution.contribution_amount).where(Contribution.candidate_id == "P2")
+
+    async with sessions() as session:
+        amounts = [amount async for amount in processor.stream_contributions(
+            session, query, max_records=250, server_side=server_side
+        )]
+        rows = [row async for row in processor.stream_contributions(
+            session, select(Contribution.contribution_id, Contribution.contribution_amount),
+            as_rows=True, server_side=server_side
+        )]
+
+    assert amounts == [float(n) for n in range(1, 500, 2)]
+    assert len(rows) == 1050 and rows[0] == ("S1", 1.0)
+    # A server-side cursor reads everything with one statement per query
+    assert len(statements) == (2 if server_side else 3 + 11)
@@ -0,0 +1,99 @@
+"""
+Unit tests for the committee -> candidate backfill lookup
+"""
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.db.database import Committee
+from app.services.bulk_data.committee_lookup import CommitteeCandidateLookup, mark_linkage_changed
+
+
+def _reference_backfill(candidate_ids: pd.Series, committee_ids: pd.Series, mapping) -> pd.Series:
+    """Previous row-by-row implementation, used to check results"""
+    result = candidate_ids.copy()
+    for idx in result.index:
+        if pd.isna(result.loc[idx]) or result.loc[idx] == '':
+            comm_id = committee_ids.loc[idx]
+            if pd.notna(comm_id) and comm_id in mapping:
+                result.loc[idx] = mapping[comm_id]
+    return result
+
+
+def test_backfill_fills_only_missing_candidates():
+    """Existing candidate IDs are kept; missing ones come from the committee"""
+    lookup = CommitteeCandidateLookup({"C001": "H001", "C002": "S002"})
+    candidate_ids = pd.Series(["P999", None, "", None, None], index=[10, 11, 12, 13, 14])
+    committee_ids = pd.Series(["C001", "C001", "C002", "C404", None], index=[10, 11, 12, 13, 14])
+
+    result, filled = lookup.backfill(candidate_ids, committee_ids)
+
+    assert filled == 2
+    assert result.tolist()[:3] == ["P999", "H001", "S002"]
+    assert pd.isna(result.loc[13]) and pd.isna(result.loc[14])
+    assert pd.isna(candidate_ids.loc[11])  # Input is not modified
+
+
+def test_backfill_without_mapping_is_noop():
+    lookup = CommitteeCandidateLookup({})
+    candidate_ids = pd.Series([None, None])
+    result, filled = lookup.backfill(candidate_ids, pd.Series(["C001", "C002"]))
+    assert filled == 0
+    assert result is candidate_ids
+
+
+@pytest.mark.asyncio
+async def test_refresh_and_staleness(temp_db):
+    """Lookup loads first linked candidate and reloads after linkage changes"""
+    database = await temp_db([Committee])
+    async with database.sessions() as session:
+        session.add_all([
+            Committee(committee_id="C001", name="One", candidate_ids=["H001", "H002"]),
+            Committee(committee_id="C002", name="Two", candidate_ids=[]),
+            Committee(committee_id="C003", name="Three", candidate_ids=None),
+        ])
+        await session.commit()
+
+        lookup = CommitteeCandidateLookup()
+        assert lookup.is_stale
+        await lookup.ensure_current(session)
+        assert not lookup.is_stale
+        assert len(lookup) == 1
+
+        session.add(Committee(committee_id="C004", name="Four", candidate_ids=["S004"]))
+        await session.commit()
+        await lookup.ensure_current(session)
+        assert len(lookup) == 1  # Not reloaded without a linkage change
+
+        mark_linkage_changed()
+        assert lookup.is_stale
+        await lookup.ensure_current(session)
+        assert len(lookup) == 2
+
+
+@pytest.mark.slow
+def test_backfill_benchmark_one_million_rows():
+    """Micro-benchmark: vectorized backfill over a 1M-row chunk"""
+    rng = np.random.default_rng(42)
+    rows = 1_000_000
+    committees = np.array([f"C{i:08d}" for i in range(20000)], dtype=object)
+    mapping = {cid: f"H{i:08d}" for i, cid in enumerate(committees[:15000])}
+    lookup = CommitteeCandidateLookup(mapping)
+
+    committee_ids = pd.Series(committees[rng.integers(0, len(committees), rows)], dtype=object)
+    candidate_ids = pd.Series(np.where(rng.random(rows) < 0.6, None, "P00000001"), dtype=object)
+
+    start = time.perf_counter()
+    result, filled = lookup.backfill(candidate_ids, committee_ids)
+    elapsed = time.perf_counter() - start
+    print(f"\nBackfilled {filled} of {rows} rows in {elapsed:.3f}s")
+
+    assert filled > 0
+    assert elapsed < 5.0
+
+    # Spot-check against the row-by-row implementation on a slice
+    sample = slice(0, 5000)
+    expected = _reference_backfill(candidate_ids[sample], committee_ids[sample], mapping)
+    pd.testing.assert_series_equal(result[sample], expected, check_dtype=False)
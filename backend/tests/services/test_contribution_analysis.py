@@ -0,0 +1,139 @@
+"""
+Unit tests for the single-pass aggregates of analyze_contributions
+"""
+import logging
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+import app.services.analysis.contribution_analysis as analysis_module
+import app.services.shared.candidate_committees as candidate_committees_module
+from app.config import config
+from app.db.database import CandidateCommittee, Committee, Contribution, ContributorRollup
+from app.services.analysis.contribution_analysis import ContributionAnalysisService
+from app.services.shared.aggregation_helpers import ContributionAggregator
+
+
+async def _no_totals(*args, **kwargs):
+    return []
+
+
+@pytest.fixture
+async def db(temp_db, monkeypatch):
+    """Temp SQLite DB: P001 contributions, direct and through committee C002, spread over 2023-2024"""
+    database = await temp_db([Contribution, Committee, ContributorRollup, CandidateCommittee],
+                             patch=[analysis_module, candidate_committees_module])
+    async with database.sessions() as session:
+        session.add(Committee(committee_id="C002", name="Linked", candidate_ids=["P001"]))
+        session.add(CandidateCommittee(candidate_id="P001", committee_id="C002"))
+        session.add_all(
+            Contribution(
+                contribution_id=f"S{n}",
+                candidate_id="P001" if n % 3 else None,
+                committee_id="C001" if n % 3 else "C002",
+                contributor_name=None if n % 17 == 0 else f"DONOR {n % 40}",
+                contributor_state=["TX", "CA", None, ""][n % 4],
+                contribution_amount=None if n % 50 == 0 else float(n % 3000),
+                contribution_date=None if n % 11 == 0 else datetime(2023 + n % 2, 1 + n % 12, 1 + n % 28, n % 24),
+            )
+            for n in range(1, 2001)
+        )
+        session.add(Contribution(contribution_id="OTHER", candidate_id="P999", committee_id="C999",
+                                 contributor_name="ELSEWHERE", contribution_amount=5000.0))
+        await session.commit()
+    candidate_committees_module.clear_cache()
+    monkeypatch.setattr(config, "USE_CONTRIBUTOR_ROLLUPS", False)
+    monkeypatch.setattr(config, "ANALYSIS_CHUNK_SIZE", 300)
+    return database.sessions, database.record_statements()
+
+
+async def _expected(sessions):
+    """The aggregates as separate GROUP BY queries (how analyze_contributions used to read them)"""
+    linked = (Contribution.candidate_id == "P001") | (Contribution.committee_id == "C002")
+    where = linked & Contribution.contribution_amount.isnot(None)
+    async with sessions() as session:
+        total, count, donors = (await session.execute(select(
+            func.sum(Contribution.contribution_amount), func.count(Contribution.id),
+            func.count(func.distinct(Contribution.contributor_name))
+        ).where(where))).one()
+        by_date = dict((await session.execute(
+            select(func.date(Contribution.contribution_date), func.sum(Contribution.contribution_amount))
+            .where(where, Contribution.contribution_date.isnot(None))
+            .group_by(func.date(Contribution.contribution_date))
+        )).all())
+        by_state = {state: amount for state, amount in (await session.execute(
+            select(Contribution.contributor_state, func.sum(Contribution.contribution_amount))
+            .where(where).group_by(Contribution.contributor_state)
+        )).all() if state}
+        top = (await session.execute(
+            select(Contribution.contributor_name, func.sum(Contribution.contribution_amount), func.count(Contribution.id))
+            .where(where, Contribution.contributor_name.isnot(None))
+            .group_by(Contribution.contributor_name).order_by(func.sum(Contribution.contribution_amount).desc()).limit(20)
+        )).all()
+    return total, count, donors, by_date, by_state, [
+        {"name": name, "total": amount, "count": n} for name, amount, n in top
+    ]
+
+
+async def test_one_scan_matches_separate_queries(db):
+    sessions, statements = db
+    total, count, donors, by_date, by_state, top = await _expected(sessions)
+    statements.clear()
+
+    analysis = await ContributionAnalysisService(
+        type("StubClient", (), {"get_candidate_totals": _no_totals})()
+    ).analyze_contributions(candidate_id="P001")
+
+    assert analysis.total_contributions == pytest.approx(total)
+    assert analysis.total_contributors == donors
+    assert analysis.average_contribution == pytest.approx(total / count)
+    assert analysis.contributions_by_date == pytest.approx(by_date)
+    assert analysis.contributions_by_state == pytest.approx(by_state)
+    assert analysis.top_donors == top
+    assert sum(analysis.contribution_distribution.values()) == count - len(
+        [n for n in range(1, 2001) if n % 50 and n % 3000 == 0]
+    )
+    # Committee lookup and one streamed scan of the contributions
+    assert len([s for s in statements if "FROM contributions" in s]) == 1
+
+
+async def test_candidate_counts_are_logged_only_at_debug(db, caplog):
+    sessions, statements = db
+    service = ContributionAnalysisService(type("StubClient", (), {"get_candidate_totals": _no_totals})())
+
+    statements.clear()
+    with caplog.at_level(logging.INFO, logger=analysis_module.logger.name):
+        await service.analyze_contributions(candidate_id="P001")
+    assert len([s for s in statements if "FROM contributions" in s]) == 1
+
+    statements.clear()
+    with caplog.at_level(logging.DEBUG, logger=analysis_module.logger.name):
+        await service.analyze_contributions(candidate_id="P001")
+    assert len([s for s in statements if "FROM contributions" in s]) == 2
+    assert "direct=1334, via_committees=666 (from 1 committees), total=2000, dated=1819" in caplog.text
+
+
+def test_aggregator_merges_chunks():
+    aggregator = ContributionAggregator(top_n=2)
+    aggregator.add([(datetime(2024, 1, 1, 5), "TX", "A", 10.0), (None, None, None, 60.0), (datetime(2024, 1, 1), "", "", 0.0)])
+    aggregator.add([(datetime(2024, 1, 2), "CA", "A", 5.0), (datetime(2024, 1, 2), "CA", "B", 3000.0)])
+
+    assert aggregator.result() == {
+        "total": 3075.0,
+        "count": 5,
+        "unique_donors": 3,
+        "by_date": {"2024-01-01": 10.0, "2024-01-02": 3005.0},
+        "by_state": {"CA": 3005.0, "TX": 10.0},
+        "top_donors": [{"name": "B", "total": 3000.0, "count": 1}, {"name": "A", "total": 15.0, "count": 2}],
+        "distribution": {"$0-50": 2, "$50-100": 1, "$100-200": 0, "$200-500": 0, "$500-1000": 0,
+                         "$1000-2700": 0, "$2700+": 1},
+    }
+    assert ContributionAggregator().result()["distribution"] == {}
+
+    # Chunks are folded into running totals: state is per distinct name, not per chunk
+    aggregator = ContributionAggregator()
+    for chunk in range(50):
+        aggregator.add([(datetime(2024, 1, 1 + n % 3), "TX", f"DONOR {n % 7}", 1.0) for n in range(chunk, chunk + 20)])
+    assert len(aggregator._by_name) == 7 and len(aggregator._by_date) == 3
+    assert aggregator.result()["unique_donors"] == 7 and aggregator.result()["total"] == 1000.0
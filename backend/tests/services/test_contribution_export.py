@@ -0,0 +1,113 @@
+"""
+Unit tests for streaming CSV/NDJSON contribution exports
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import sqlite3
+import zlib
+from datetime import datetime
+
+import pytest
+
+import app.services.contribution_export as export_module
+import app.services.shared.candidate_committees as candidate_committees
+from app.db.database import CandidateCommittee, Contribution
+from app.services.contribution_export import (
+    contributions_condition, out_of_state_condition, stream_contribution_frames, stream_export
+)
+
+DATE_ORDER = [Contribution.contribution_date.desc().nulls_last()]
+
+
+@pytest.fixture
+async def export_db(temp_db):
+    """Temp SQLite DB with contributions and candidate/committee links"""
+    database = await temp_db([Contribution, CandidateCommittee], patch=[export_module, candidate_committees])
+    candidate_committees.clear_cache()
+    yield database.sessions, database.path
+    candidate_committees.clear_cache()
+
+
+async def collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+async def test_export_streams_filtered_rows_in_batches(export_db):
+    sessions, _ = export_db
+    async with sessions() as session:
+        session.add(CandidateCommittee(candidate_id="P1", committee_id="C1"))
+        session.add_all([
+            Contribution(contribution_id=f"S{i}", committee_id="C1", contributor_name=f"DONOR {i}",
+                         contributor_state="CA" if i % 2 else "TX", contribution_amount=float(i + 1),
+                         contribution_date=datetime(2024, 1, i + 1))
+            for i in range(7)
+        ])
+        session.add(Contribution(contribution_id="OTHER", committee_id="C9", contributor_name="X",
+                                 contributor_state="CA", contribution_amount=5.0,
+                                 contribution_date=datetime(2024, 2, 1)))
+        # Amount and name only in raw_data (read on the second session)
+        session.add(Contribution(contribution_id="RAW", committee_id="C1", contributor_state="NY",
+                                 contribution_date=datetime(2023, 12, 1),
+                                 raw_data={"TRANSACTION_AMT": "250", "NAME": "RAW DONOR"}))
+        await session.commit()
+
+    condition = await contributions_condition(candidate_id="P1")
+    data = await collect(stream_export(
+        stream_contribution_frames(condition, DATE_ORDER, candidate_id="P1", batch_size=3)
+    ))
+    rows = list(csv.reader(io.StringIO(data.decode())))
+    assert rows[0][:3] == ["Contribution ID", "Candidate ID", "Committee ID"]
+    assert [row[0] for row in rows[1:]] == ["S6", "S5", "S4", "S3", "S2", "S1", "S0", "RAW"]
+    assert rows[1][1:4] == ["P1", "C1", "DONOR 6"]
+    assert rows[1][9:11] == ["7.0", "2024-01-07"]
+    assert rows[-1][3] == "RAW DONOR" and rows[-1][9] == "250.0"
+
+    condition = await contributions_condition(candidate_id="P1", min_amount=3, max_date="2024-01-05")
+    data = await collect(stream_export(
+        stream_contribution_frames(condition, DATE_ORDER, limit=2, batch_size=1), format="ndjson", compress=True
+    ))
+    records = [json.loads(line) for line in gzip.decompress(data).decode().splitlines()]
+    assert [r["contribution_id"] for r in records] == ["S4", "S3"]
+    assert records[0]["contribution_amount"] == 5.0 and records[0]["receipt_type"] is None
+
+    condition = (await contributions_condition(candidate_id="P1")) & out_of_state_condition("ca")
+    data = await collect(stream_export(stream_contribution_frames(condition, DATE_ORDER)))
+    assert [row[0] for row in csv.reader(io.StringIO(data.decode()))][1:] == ["S6", "S4", "S2", "S0", "RAW"]
+
+
+def _rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc to read RSS")
+async def test_export_of_5m_rows_keeps_memory_bounded(export_db):
+    total = 5_000_000
+    _, path = export_db
+    with sqlite3.connect(path) as conn:
+        conn.executemany(
+            "INSERT INTO contributions (contribution_id, candidate_id, committee_id, contributor_name, "
+            "contributor_state, contribution_amount, contribution_date) VALUES (?, 'P1', 'C1', ?, 'TX', ?, ?)",
+            ((f"S{i}", f"DONOR {i % 1000}", float(i % 500 + 1), f"2024-{i % 12 + 1:02d}-01 00:00:00.000000")
+             for i in range(total))
+        )
+
+    condition = await contributions_condition(committee_id="C1")
+    stream = stream_export(stream_contribution_frames(condition, DATE_ORDER), compress=True)
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    lines = 0
+    baseline = peak = None
+    async for chunk in stream:
+        lines += decompressor.decompress(chunk).count(b"\n")
+        rss = _rss_bytes()
+        if baseline is None:
+            baseline = peak = rss
+        peak = max(peak, rss)
+    lines += decompressor.flush().count(b"\n")
+
+    assert lines == total + 1
+    assert peak - baseline < 150 * 1024 * 1024, f"RSS grew by {(peak - baseline) / 2**20:.0f} MB"
@@ -0,0 +1,162 @@
+"""
+Parity tests for the set-based contribution merge used by bulk imports
+"""
+import copy
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+import app.services.bulk_data_original as bulk_module
+from app.db.database import Committee, Contribution
+from app.services.bulk_data.contribution_merge import SCHEDULE_A_COLUMNS, build_upsert_statement
+from app.services.bulk_data_original import BulkDataService
+from app.services.fec_client import FECClient
+
+COMPARED_COLUMNS = [
+    col.name for col in Contribution.__table__.columns if col.name not in ('id', 'created_at')
+]
+
+
+def _line(**fields) -> str:
+    """Build a pipe-delimited Schedule A line from keyword fields"""
+    return "|".join(fields.get(col, "") for col in SCHEDULE_A_COLUMNS) + "\n"
+
+
+def _existing_rows():
+    """Rows already in the database before the re-import"""
+    return [
+        # API row: amendment indicator and API raw_data keys must survive
+        Contribution(
+            contribution_id="2001", candidate_id="P00000001", committee_id="C00000001",
+            contributor_name="SMITH, JOHN", contributor_city="AUSTIN", contribution_amount=100.0,
+            contribution_date=datetime(2024, 1, 10), amendment_indicator="A", entity_type="IND",
+            memo_text="API MEMO", data_source="api", last_updated_from="api",
+            raw_data={"sub_id": "2001", "contribution_receipt_date": "2024-01-10", "NAME": "SMITH, JOHN"}
+        ),
+        # Zero amount and missing date: refund amount and raw_data date fallback apply
+        Contribution(
+            contribution_id="2002", committee_id="C00000002", contributor_name="DOE, JANE",
+            contribution_amount=0.0, contribution_date=None, amendment_indicator="",
+            data_source="bulk", last_updated_from="bulk", raw_data=None
+        ),
+        # Positive amount is kept when the new amount is 0
+        Contribution(
+            contribution_id="2003", candidate_id="H00000003", committee_id="C00000003",
+            contributor_name="ROE, RICHARD", contributor_employer="ACME",
+            contribution_amount=50.0, contribution_date=datetime(2024, 2, 1),
+            data_source=None, raw_data={"CMTE_ID": "C00000003", "EXTRA": "kept"}
+        ),
+    ]
+
+
+@pytest.fixture
+def fixture_file(tmp_path):
+    """Schedule A re-import file touching existing and new contributions"""
+    path = tmp_path / "itcont.txt"
+    lines = [
+        _line(CMTE_ID="C00000001", AMNDT_IND="N", RPT_TP="Q1", NAME="SMITH, JOHN Q",
+              CITY="AUSTIN", STATE="TX", TRANSACTION_DT="01102024", TRANSACTION_AMT="150",
+              ENTITY_TP_CODE="15", ENTITY_TP_DESC="CAN", SUB_ID="2001"),
+        _line(CMTE_ID="C00000002", AMNDT_IND="N", NAME="DOE, JANE", TRANSACTION_DT="2024-02-03",
+              TRANSACTION_AMT="-25", EMPLOYER="SELF", SUB_ID="2002"),
+        _line(CMTE_ID="C00000003", NAME="ROE, RICHARD", TRANSACTION_DT="",
+              TRANSACTION_AMT="0", OCCUPATION="ENGINEER", SUB_ID="2003"),
+        _line(CMTE_ID="C00000004", CAND_ID="S00000004", NAME="NEW, DONOR", STATE="CA",
+              TRANSACTION_DT="03152024", TRANSACTION_AMT="$1,250.50", ENTITY_TP_CODE="IND",
+              SUB_ID="2004"),
+    ]
+    path.write_text("".join(lines))
+    return str(path)
+
+
+async def _make_db(temp_db, name, patch=()):
+    """Temp SQLite DB with contributions/committees seeded with the existing rows"""
+    database = await temp_db([Contribution, Committee], patch=patch, name=name)
+    async with database.sessions() as session:
+        session.add_all(_existing_rows())
+        await session.commit()
+    return database.sessions
+
+
+async def _legacy_merge(session_factory, records):
+    """Previous import path: load existing ORM rows and merge them one by one"""
+    fec_client = FECClient()
+    async with session_factory() as session:
+        ids = [r['contribution_id'] for r in records]
+        result = await session.execute(select(Contribution).where(Contribution.contribution_id.in_(ids)))
+        existing = {c.contribution_id: c for c in result.scalars().all()}
+        for record in records:
+            if record['contribution_id'] in existing:
+                fec_client._smart_merge_contribution(existing[record['contribution_id']], record, 'bulk')
+            else:
+                session.add(Contribution(**record, data_source='bulk', last_updated_from='bulk'))
+        await session.commit()
+
+
+async def _snapshot(session_factory):
+    async with session_factory() as session:
+        result = await session.execute(select(Contribution).order_by(Contribution.contribution_id))
+        return {
+            c.contribution_id: {col: getattr(c, col) for col in COMPARED_COLUMNS}
+            for c in result.scalars().all()
+        }
+
+
+@pytest.mark.asyncio
+async def test_set_based_merge_matches_smart_merge(temp_db, monkeypatch, fixture_file):
+    """parse_and_store_csv produces the same rows as the per-record smart merge"""
+    new_sessions = await _make_db(temp_db, "new.db", patch=[bulk_module])
+    old_sessions = await _make_db(temp_db, "old.db")
+
+    captured = []
+    upsert = bulk_module.upsert_contributions
+
+    async def capturing_upsert(session, records):
+        captured.extend(copy.deepcopy(records))
+        return await upsert(session, records)
+
+    service = BulkDataService()
+
+    async def noop(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(bulk_module, "upsert_contributions", capturing_upsert)
+    monkeypatch.setattr(service, "_extract_and_cache_committees", noop)
+    monkeypatch.setattr(service, "_update_metadata", noop)
+
+    total = await service.parse_and_store_csv(fixture_file, 2024, bulk_load=False)
+    assert total == 4
+    assert len(captured) == 4
+
+    await _legacy_merge(old_sessions, copy.deepcopy(captured))
+
+    new_rows = await _snapshot(new_sessions)
+    old_rows = await _snapshot(old_sessions)
+
+    assert new_rows == old_rows
+
+    # Spot-check the rules the parity relies on
+    assert new_rows["2001"]["contributor_name"] == "SMITH, JOHN Q"
+    assert new_rows["2001"]["contribution_amount"] == 150.0
+    assert new_rows["2001"]["amendment_indicator"] == "A"
+    assert new_rows["2001"]["entity_type"] == "IND"
+    assert new_rows["2001"]["data_source"] == "both"
+    assert new_rows["2001"]["raw_data"]["sub_id"] == "2001"
+    assert new_rows["2001"]["raw_data"]["NAME"] == "SMITH, JOHN Q"
+    assert new_rows["2002"]["contribution_amount"] == -25.0
+    assert new_rows["2002"]["contribution_date"] == datetime(2024, 2, 3)
+    assert new_rows["2002"]["amendment_indicator"] == "N"
+    assert new_rows["2003"]["contribution_amount"] == 50.0
+    assert new_rows["2003"]["contributor_employer"] == "ACME"
+    assert new_rows["2003"]["raw_data"]["EXTRA"] == "kept"
+    assert new_rows["2003"]["data_source"] == "bulk"
+    assert new_rows["2004"]["contribution_amount"] == 1250.5
+
+
+def test_postgresql_statement_compiles():
+    """The PostgreSQL variant merges raw_data with jsonb concatenation"""
+    compiled = str(build_upsert_statement("postgresql").compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (contribution_id) DO UPDATE SET" in compiled
+    assert "::jsonb ||" in compiled
@@ -0,0 +1,155 @@
+"""
+Unit tests for the contributor name search index used by donor search
+"""
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.services.fec_client.storage as storage_module
+from app.db.database import Committee, Contribution
+from app.services.bulk_data.contribution_merge import SCHEDULE_A_COLUMNS, upsert_contributions
+from app.services.bulk_data.sqlite_loader import SQLiteBulkLoader
+from app.services.donor_search import DonorSearchService
+from app.services.fec_client.storage import StorageManager
+from app.services.shared.contributor_index import (
+    backfill_statement,
+    create_index_statements,
+    matching_names_query,
+)
+
+NAMES = [
+    ("SMITH, JOHN", 100.0), ("SMITH, JOHN", 50.0), ("Smith, Angela", 500.0),
+    ("ANGELA M. SMITH", 20.0), ("JONES, BOB", 75.0), ("NG, AL", 10.0), ("", 5.0),
+]
+
+
+async def _make_db(temp_db, name, with_index=True, patch=()):
+    """Temp SQLite DB with contributions (and optionally the name index)"""
+    database = await temp_db([Contribution, Committee], patch=patch, name=name)
+    if with_index:
+        async with database.engine.begin() as conn:
+            for statement in create_index_statements("sqlite"):
+                await conn.execute(text(statement))
+    return database
+
+
+def _record(i, name, amount):
+    return {
+        "contribution_id": f"SA{i}", "contributor_name": name or None, "committee_id": "C00000001",
+        "contribution_amount": amount, "contribution_date": datetime(2024, 1, 1), "raw_data": {"SUB_ID": f"SA{i}"},
+    }
+
+
+async def _search_both(service, session, term):
+    indexed = await service._search_with_index(session, term, limit=100)
+    scanned = await service._search_with_substring(session, term, limit=100)
+    return indexed, scanned
+
+
+async def test_bulk_upsert_indexes_names_and_search_matches_ilike(temp_db):
+    """Names written by the bulk upsert are searchable with ILIKE semantics"""
+    sessions = (await _make_db(temp_db, "search.db")).sessions
+    async with sessions() as session:
+        await upsert_contributions(session, [_record(i, n, a) for i, (n, a) in enumerate(NAMES)])
+        await session.commit()
+
+        count = (await session.execute(text("SELECT COUNT(*) FROM contributor_names"))).scalar()
+        assert count == 5
+
+        service = DonorSearchService(session=session)
+        for term in ["smith", "Angela Smith", "SMITH JOHN", "ng", "zzz"]:
+            indexed, scanned = await _search_both(service, session, term)
+            assert indexed == scanned, term
+
+        results = await service.search_unique_contributors("smith john")
+        assert results == [{"name": "SMITH, JOHN", "total_amount": 150.0, "contribution_count": 2}]
+
+
+async def test_search_falls_back_without_index(temp_db):
+    sessions = (await _make_db(temp_db, "plain.db", with_index=False)).sessions
+    async with sessions() as session:
+        await upsert_contributions(session, [_record(i, n, a) for i, (n, a) in enumerate(NAMES)])
+        await session.commit()
+
+        results = await DonorSearchService(session=session).search_unique_contributors("angela")
+        assert [r["name"] for r in results] == ["Smith, Angela", "ANGELA M. SMITH"]
+
+
+async def test_store_contribution_and_bulk_loader_index_names(tmp_path, temp_db):
+    """API storage and the native bulk loader keep the index in sync too"""
+    database = await _make_db(temp_db, "writers.db", patch=[storage_module])
+    await StorageManager().store_contribution(
+        {"sub_id": "API1", "contributor_name": "DOE, JANE", "contribution_receipt_amount": 25},
+        smart_merge_func=lambda *args: None
+    )
+
+    file_path = tmp_path / "itcont.txt"
+    fields = {col: "" for col in SCHEDULE_A_COLUMNS}
+    fields.update(CMTE_ID="C00000001", NAME=" ROE, RICHARD ", TRANSACTION_AMT="10", SUB_ID="BULK1")
+    file_path.write_text("|".join(fields[col] for col in SCHEDULE_A_COLUMNS) + "\n")
+    SQLiteBulkLoader(database.path).load_contributions(str(file_path))
+
+    async with database.sessions() as session:
+        service = DonorSearchService(session=session)
+        assert [r["name"] for r in await service._search_with_index(session, "jane")] == ["DOE, JANE"]
+        assert [r["name"] for r in await service._search_with_index(session, "richard")] == ["ROE, RICHARD"]
+
+
+def test_postgresql_uses_trigram_ilike():
+    compiled = str(matching_names_query("postgresql", ["smith", "john"]).compile(dialect=postgresql.dialect()))
+    assert "FROM contributor_names" in compiled
+    assert compiled.count("ILIKE") == 2
+    assert any("gin_trgm_ops" in s for s in create_index_statements("postgresql"))
+
+
+@pytest.mark.slow
+async def test_search_latency_benchmark(tmp_path):
+    """Benchmark: trigram index vs ILIKE scan (rows: DONOR_SEARCH_BENCHMARK_ROWS, default 10M)"""
+    rows = int(os.getenv("DONOR_SEARCH_BENCHMARK_ROWS", "10000000"))
+    db_path = tmp_path / "bench.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE contributions (id INTEGER PRIMARY KEY, contributor_name TEXT, contribution_amount REAL)")
+    conn.execute(
+        """
+        WITH RECURSIVE seq(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM seq WHERE x < ?)
+        INSERT INTO contributions (contributor_name, contribution_amount)
+        SELECT 'DONOR' || ((x * 7919) % 400000) || ', ' ||
+               substr('ANNBOBCARDANEVEFAYGUSHALIVYJON', (x % 10) * 3 + 1, 3),
+               (x % 500) + 1
+        FROM seq
+        """,
+        (rows,)
+    )
+    conn.execute("CREATE INDEX idx_contributor_name ON contributions (contributor_name)")
+    for statement in create_index_statements("sqlite"):
+        conn.execute(statement)
+    conn.execute(backfill_statement("sqlite"))
+    conn.commit()
+    conn.close()
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with sessions() as session:
+            service = DonorSearchService(session=session)
+            for term in ["DONOR12345", "donor3999 gus"]:
+                start = time.perf_counter()
+                indexed = await service._search_with_index(session, term, limit=100, timeout=600)
+                index_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                scanned = await service._search_with_substring(session, term, limit=100, timeout=600)
+                scan_time = time.perf_counter() - start
+
+                print(f"\n'{term}' over {rows} rows: index {index_time * 1000:.1f}ms, ILIKE {scan_time * 1000:.1f}ms")
+                assert indexed == scanned
+                assert indexed
+                assert index_time < scan_time
+    finally:
+        await engine.dispose()
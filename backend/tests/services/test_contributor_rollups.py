@@ -0,0 +1,213 @@
+"""
+Unit tests for the contributor_rollups table and its incremental maintenance
+"""
+import os
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+import app.services.analysis.contribution_analysis as analysis_module
+import app.services.fec_client.storage as storage_module
+import app.services.shared.candidate_committees as candidate_committees_module
+from app.config import config
+from app.db.database import CandidateCommittee, Committee, Contribution, ContributorRollup
+from app.services.analysis.contribution_analysis import ContributionAnalysisService
+from app.services.bulk_data.contribution_merge import SCHEDULE_A_COLUMNS, upsert_contributions
+from app.services.bulk_data.sqlite_loader import SQLiteBulkLoader
+from app.services.donor_search import DonorSearchService
+from app.services.fec_client.storage import StorageManager
+from app.services.shared.contributor_index import create_index_statements
+from app.services.shared.contributor_rollups import are_rollups_ready, rebuild_contributor_rollups
+
+# The rollup rows recomputed from contributions with a plain GROUP BY
+EXPECTED_SQL = """
+SELECT UPPER(TRIM(contributor_name)), COALESCE(candidate_id, ''), COALESCE(committee_id, ''),
+       CASE WHEN contribution_date IS NULL THEN 0
+            ELSE CAST(strftime('%Y', contribution_date) AS INTEGER)
+                 + CAST(strftime('%Y', contribution_date) AS INTEGER) % 2 END AS cycle,
+       ROUND(SUM(contribution_amount), 2), COUNT(*)
+FROM contributions
+WHERE contributor_name IS NOT NULL AND TRIM(contributor_name) != '' AND contribution_amount IS NOT NULL
+GROUP BY 1, 2, 3, 4
+"""
+
+ACTUAL_SQL = """
+SELECT name_key, candidate_id, committee_id, cycle, ROUND(total_amount, 2), contribution_count
+FROM contributor_rollups WHERE contribution_count > 0
+"""
+
+
+async def _make_db(temp_db, name, with_name_index=False, patch=()):
+    """Temp SQLite DB with contributions, committees and contributor_rollups"""
+    database = await temp_db([Contribution, Committee, ContributorRollup, CandidateCommittee], patch=patch, name=name)
+    if with_name_index:
+        async with database.engine.begin() as conn:
+            for statement in create_index_statements("sqlite"):
+                await conn.execute(text(statement))
+    return database
+
+
+def _record(sub_id, name, amount, date=datetime(2024, 3, 1), committee_id="C001", candidate_id=None, state="TX"):
+    return {
+        "contribution_id": sub_id, "contributor_name": name, "committee_id": committee_id,
+        "candidate_id": candidate_id, "contributor_state": state, "contribution_amount": amount,
+        "contribution_date": date, "raw_data": {"SUB_ID": sub_id},
+    }
+
+
+async def _assert_rollups_match(session):
+    expected = sorted((await session.execute(text(EXPECTED_SQL))).all())
+    actual = sorted((await session.execute(text(ACTUAL_SQL))).all())
+    assert actual == expected
+    return actual
+
+
+async def test_bulk_upserts_keep_rollups_in_sync(temp_db):
+    """Deltas match a full GROUP BY after inserts, re-imports and amendments"""
+    sessions = (await _make_db(temp_db, "delta.db")).sessions
+    async with sessions() as session:
+        await upsert_contributions(session, [
+            _record("1", "SMITH, JOHN", 100.0),
+            _record("2", "Smith, John ", 50.0, date=datetime(2023, 6, 1)),
+            _record("3", "DOE, JANE", 25.0, date=None),
+            _record("4", "DOE, JANE", 30.0, date=datetime(2022, 1, 5), candidate_id="P001"),
+            _record("5", None, 10.0),
+        ])
+        await session.commit()
+        rows = await _assert_rollups_match(session)
+        assert ("SMITH, JOHN", "", "C001", 2024, 150.0, 2) in rows
+        assert ("DOE, JANE", "", "C001", 0, 25.0, 1) in rows
+
+        # Same file again: totals must not double
+        await upsert_contributions(session, [_record("1", "SMITH, JOHN", 100.0)])
+        # Amendments move rows between names, candidates and cycles
+        await upsert_contributions(session, [
+            _record("2", "JONES, BOB", 75.0, date=datetime(2023, 6, 1)),
+            _record("3", "DOE, JANE", 40.0, date=datetime(2020, 2, 1), candidate_id="P002"),
+            _record("6", "SMITH, JOHN", 5.0, date=datetime(2024, 12, 1)),
+        ])
+        await session.commit()
+        rows = await _assert_rollups_match(session)
+        assert ("SMITH, JOHN", "", "C001", 2024, 105.0, 2) in rows
+
+        rollup = (await session.execute(
+            text("SELECT first_date, last_date, contributor_state FROM contributor_rollups "
+                 "WHERE name_key = 'SMITH, JOHN' AND cycle = 2024")
+        )).one()
+        assert rollup[0].startswith("2023-06-01") and rollup[1].startswith("2024-12-01")
+        assert rollup[2] == "TX"
+
+        # A rebuild produces the same aggregates from scratch
+        assert await rebuild_contributor_rollups(session) == len(rows)
+        assert await _assert_rollups_match(session) == rows
+
+
+async def test_bulk_loader_and_api_storage_update_rollups(tmp_path, temp_db):
+    database = await _make_db(temp_db, "writers.db", patch=[storage_module])
+    file_path = tmp_path / "itcont.txt"
+    lines = []
+    for sub_id, name, amount in [("B1", "ROE, RICHARD", "10"), ("B2", "ROE, RICHARD", "15"), ("B1", "ROE, RICHARD", "20")]:
+        fields = {col: "" for col in SCHEDULE_A_COLUMNS}
+        fields.update(CMTE_ID="C001", NAME=name, TRANSACTION_AMT=amount, TRANSACTION_DT="03012024", SUB_ID=sub_id)
+        lines.append("|".join(fields[col] for col in SCHEDULE_A_COLUMNS))
+    file_path.write_text("\n".join(lines) + "\n")
+    loader = SQLiteBulkLoader(database.path, batch_size=1, merge_window_rows=1)
+    loader.load_contributions(str(file_path))
+
+    storage = StorageManager()
+    api_row = {"sub_id": "A1", "contributor_name": "DOE, JANE", "contribution_receipt_amount": 25,
+               "committee_id": "C001", "contribution_receipt_date": "2024-02-01"}
+    await storage.store_contribution(api_row, smart_merge_func=lambda *args: None)
+    await storage.store_contribution(dict(api_row, contribution_receipt_amount=35), smart_merge_func=lambda *args: None)
+
+    async with database.sessions() as session:
+        rows = await _assert_rollups_match(session)
+        assert ("ROE, RICHARD", "", "C001", 2024, 35.0, 2) in rows
+        assert [r for r in rows if r[0] == "DOE, JANE"][0][5] == 1
+
+
+async def test_search_and_analysis_read_rollups(temp_db, monkeypatch):
+    """Rollup reads return the same donors as aggregating contributions"""
+    database = await _make_db(temp_db, "reads.db", with_name_index=True,
+                              patch=[analysis_module, candidate_committees_module])
+    sessions = database.sessions
+    candidate_committees_module.clear_cache()
+    async with sessions() as session:
+        session.add(Committee(committee_id="C002", name="Linked", candidate_ids=["P001"]))
+        session.add(CandidateCommittee(candidate_id="P001", committee_id="C002"))
+        await upsert_contributions(session, [
+            _record("1", "SMITH, JOHN", 100.0, candidate_id="P001"),
+            _record("2", "SMITH, JOHN", 50.0, committee_id="C002"),
+            _record("3", "SMITH, ANGELA", 500.0, committee_id="C002", date=None),
+            _record("4", "SMITH, ANGELA", 70.0, committee_id="C002", date=datetime(2020, 1, 1)),
+            _record("5", "JONES, BOB", 75.0, committee_id="C003"),
+        ])
+        await session.commit()
+
+        monkeypatch.setattr(config, "USE_CONTRIBUTOR_ROLLUPS", False)
+        assert not await are_rollups_ready(session)
+        service = DonorSearchService(session=session)
+        scanned = await service.search_unique_contributors("smith")
+        monkeypatch.setattr(config, "USE_CONTRIBUTOR_ROLLUPS", True)
+        assert await are_rollups_ready(session)
+        assert await service.search_unique_contributors("smith") == scanned
+        assert scanned[0] == {"name": "SMITH, ANGELA", "total_amount": 570.0, "contribution_count": 2}
+
+    fec_client = type("StubClient", (), {"get_candidate_totals": lambda self, *a, **k: _no_totals()})()
+    analysis = ContributionAnalysisService(fec_client)
+    for kwargs in [{"candidate_id": "P001", "cycle": 2024}, {"committee_id": "C002"}, {}]:
+        monkeypatch.setattr(config, "USE_CONTRIBUTOR_ROLLUPS", False)
+        raw = await analysis.analyze_contributions(**kwargs)
+        monkeypatch.setattr(config, "USE_CONTRIBUTOR_ROLLUPS", True)
+        rolled = await analysis.analyze_contributions(**kwargs)
+        assert rolled.top_donors == raw.top_donors, kwargs
+        assert rolled.total_contributors == raw.total_contributors, kwargs
+
+    cycle_result = await analysis.analyze_contributions(candidate_id="P001", cycle=2024)
+    # The undated contribution belongs to every cycle; the 2020 one does not
+    assert cycle_result.top_donors[0] == {"name": "SMITH, ANGELA", "total": 500.0, "count": 1}
+
+
+async def _no_totals():
+    return []
+
+
+@pytest.mark.slow
+async def test_top_donor_latency_benchmark(temp_db):
+    """Benchmark: top donors from rollups vs GROUP BY contributions (rows: ROLLUP_BENCHMARK_ROWS, default 1M)"""
+    rows = int(os.getenv("ROLLUP_BENCHMARK_ROWS", "1000000"))
+    sessions = (await _make_db(temp_db, "bench.db")).sessions
+    async with sessions() as session:
+        await session.execute(text(
+            """
+            WITH RECURSIVE seq(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM seq WHERE x < :rows)
+            INSERT INTO contributions (contribution_id, contributor_name, committee_id, contribution_amount, contribution_date)
+            SELECT 'SA' || x, 'DONOR' || ((x * 7919) % 50000), 'C' || (x % 20), (x % 500) + 1,
+                   '2024-01-01 00:00:00.000000'
+            FROM seq
+            """
+        ), {"rows": rows})
+        start = time.perf_counter()
+        await rebuild_contributor_rollups(session)
+        rebuild_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        raw = (await session.execute(text(
+            "SELECT contributor_name, SUM(contribution_amount) FROM contributions "
+            "WHERE committee_id = 'C7' GROUP BY contributor_name ORDER BY 2 DESC, 1 LIMIT 20"
+        ))).all()
+        raw_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rolled = (await session.execute(text(
+            "SELECT MIN(contributor_name), SUM(total_amount) FROM contributor_rollups "
+            "WHERE committee_id = 'C7' AND contribution_count > 0 GROUP BY name_key ORDER BY 2 DESC, 1 LIMIT 20"
+        ))).all()
+        rollup_time = time.perf_counter() - start
+
+    print(f"\nTop donors over {rows} rows: rollups {rollup_time * 1000:.1f}ms, "
+          f"GROUP BY {raw_time * 1000:.1f}ms (rebuild {rebuild_time:.1f}s)")
+    assert rolled == raw
+    assert rollup_time < raw_time
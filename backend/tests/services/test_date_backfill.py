@@ -0,0 +1,178 @@
+"""
+Unit tests for the batched backfill of missing contribution dates
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+import app.services.fec_client.date_backfill as backfill_module
+from app.db.database import Contribution, ContributionDateBackfill, ContributorRollup
+from app.services._fec_client_impl import FECClient
+from app.services.fec_client.date_backfill import DateBackfillQueue
+
+
+@pytest.fixture
+async def db(temp_db):
+    """Temp SQLite DB with undated contributions to committees C1 (250) and C2 (30)"""
+    database = await temp_db([Contribution, ContributorRollup, ContributionDateBackfill], patch=[backfill_module])
+    async with database.sessions() as session:
+        session.add_all(
+            Contribution(contribution_id=f"{committee_id}-{n}", committee_id=committee_id,
+                         contributor_name="JANE DOE", contribution_amount=10.0)
+            for committee_id, count in (("C1", 250), ("C2", 30))
+            for n in range(count)
+        )
+        await session.commit()
+    return database.sessions, database.record_statements()
+
+
+class FakeScheduleA:
+    """Stands in for FECClient._make_request; every sub_id except ``missing`` is found"""
+
+    def __init__(self, missing=()):
+        self.missing = set(missing)
+        self.requests = []
+
+    async def __call__(self, endpoint, params, use_cache=True, **kwargs):
+        self.requests.append((endpoint, params))
+        await asyncio.sleep(0)
+        return {"results": [
+            {"sub_id": sub_id, "committee_id": params.get("committee_id"), "contribution_receipt_date": "2024-03-01"}
+            for sub_id in params["sub_id"] if sub_id not in self.missing
+        ]}
+
+
+def _client(fake, **queue_options):
+    client = FECClient(api_key="TEST")
+    client._make_request = fake
+    client.date_backfill = DateBackfillQueue(
+        fetch_func=client._fetch_contributions_by_ids,
+        smart_merge_func=client._smart_merge_contribution,
+        **{"delay": 60, **queue_options}
+    )
+    return client
+
+
+async def _dates(sessions):
+    async with sessions() as session:
+        result = await session.execute(select(Contribution.contribution_id, Contribution.contribution_date))
+        return dict(result.all())
+
+
+async def test_known_dates_are_written_in_one_statement(db):
+    sessions, statements = db
+    queue = _client(FakeScheduleA()).date_backfill
+    for n in range(250):
+        assert queue.enqueue_date(f"C1-{n}", datetime(2024, 1, 1 + n % 28))
+    assert not queue.enqueue_date("C1-0", datetime(2024, 1, 1))  # Already queued
+
+    statements.clear()
+    assert await queue.flush() == {"dates_written": 250, "lookups": 0}
+    assert len([s for s in statements if s.startswith("UPDATE contributions")]) == 1
+
+    dates = await _dates(sessions)
+    assert dates["C1-27"] == datetime(2024, 1, 28)
+    assert sum(date is not None for date in dates.values()) == 250
+    assert not queue.enqueue_date("C1-0", datetime(2024, 1, 1))  # Just processed
+
+
+async def test_lookups_are_grouped_by_committee(db):
+    sessions, statements = db
+    fake = FakeScheduleA(missing={"C1-7"})
+    client = _client(fake)
+    for contribution_id in list(await _dates(sessions)):
+        assert client.date_backfill.enqueue_lookup(contribution_id, contribution_id.split("-")[0])
+
+    assert await client.date_backfill.flush() == {"dates_written": 0, "lookups": 280}
+    # C1: 250 IDs in requests of 100; C2: one request
+    assert sorted((p["committee_id"], len(p["sub_id"])) for _, p in fake.requests) == [
+        ("C1", 50), ("C1", 100), ("C1", 100), ("C2", 30)
+    ]
+    assert {endpoint for endpoint, _ in fake.requests} == {"schedules/schedule_a"}
+
+    dates = await _dates(sessions)
+    assert dates.pop("C1-7") is None
+    assert set(dates.values()) == {datetime(2024, 3, 1)}
+    async with sessions() as session:
+        stored = (await session.execute(
+            select(Contribution.raw_data).where(Contribution.contribution_id == "C2-0")
+        )).scalar_one()
+    assert stored["contribution_receipt_date"] == "2024-03-01"
+
+    metrics = client.date_backfill.get_metrics()
+    assert (metrics["api_requests"], metrics["lookups_found"], metrics["queue_depth"]) == (4, 279, 0)
+    # The contribution the API did not have is not looked up again right away
+    assert not client.date_backfill.enqueue_lookup("C1-7", "C1")
+
+
+async def test_get_contribution_date_queues_instead_of_spawning_tasks(db):
+    sessions, statements = db
+    client = _client(FakeScheduleA(), batch_size=100, delay=0.05)
+    async with sessions() as session:
+        contributions = (await session.execute(select(Contribution))).scalars().all()
+
+    tasks_before = len(asyncio.all_tasks())
+    for contrib in contributions:
+        if contrib.committee_id == "C2":
+            contrib.raw_data = {"TRANSACTION_DT": "02152024"}
+        assert await client.get_contribution_date(
+            contrib.contribution_id, contribution_obj=contrib, committee_id=contrib.committee_id
+        ) == (datetime(2024, 2, 15) if contrib.committee_id == "C2" else None)
+    assert len(asyncio.all_tasks()) == tasks_before + 1  # The queue's worker
+
+    metrics = client.date_backfill.get_metrics()
+    assert (metrics["queued_lookups"], metrics["queued_dates"]) == (250, 30)
+    await asyncio.wait_for(client.date_backfill._task, timeout=10)
+    dates = await _dates(sessions)
+    assert dates["C2-0"] == datetime(2024, 2, 15) and dates["C1-0"] == datetime(2024, 3, 1)
+
+
+async def test_rollups_move_to_the_backfilled_cycle(db):
+    sessions, statements = db
+    queue = _client(FakeScheduleA()).date_backfill
+    async with sessions() as session:
+        session.add(ContributorRollup(name_key="JANE DOE", contributor_name="JANE DOE", candidate_id="",
+                                      committee_id="C2", cycle=0, total_amount=300.0, contribution_count=30))
+        await session.commit()
+    for n in range(10):
+        queue.enqueue_date(f"C2-{n}", datetime(2023, 6, 1))
+    await queue.flush()
+
+    async with sessions() as session:
+        rows = (await session.execute(
+            select(ContributorRollup.cycle, ContributorRollup.total_amount, ContributorRollup.contribution_count)
+            .order_by(ContributorRollup.cycle)
+        )).all()
+    assert [tuple(row) for row in rows] == [(0, 200.0, 20), (2024, 100.0, 10)]
+
+
+async def test_overflow_and_shutdown_work_is_saved_and_resumed(db):
+    sessions, statements = db
+    queue = _client(FakeScheduleA(), max_size=10, batch_size=5).date_backfill
+    queue.enqueue_date("C2-0", datetime(2024, 5, 1))
+    for n in range(25):
+        queue.enqueue_lookup(f"C1-{n}", "C1")
+    # 10 in memory, 10 waiting to be saved, the rest dropped (queued again when next read)
+    metrics = queue.get_metrics()
+    assert (metrics["queue_depth"], metrics["overflow"], metrics["dropped"]) == (10, 10, 6)
+    await queue.close()
+
+    # Shutdown writes the queued date and saves the lookups
+    assert (await _dates(sessions))["C2-0"] == datetime(2024, 5, 1)
+    async with sessions() as session:
+        stored = (await session.execute(select(ContributionDateBackfill.contribution_id))).scalars().all()
+    assert sorted(stored) == sorted(f"C1-{n}" for n in range(19))
+
+    # After a restart the worker picks them up, max_size at a time
+    fake = FakeScheduleA()
+    resumed = _client(fake, max_size=10, batch_size=5, delay=0).date_backfill
+    resumed.start()
+    await asyncio.wait_for(resumed._task, timeout=10)
+    assert sum(len(p["sub_id"]) for _, p in fake.requests) == 19
+    assert await resumed.count_stored() == 0
+    assert resumed.get_metrics()["restored"] == 19
+    dates = await _dates(sessions)
+    assert all(dates[f"C1-{n}"] == datetime(2024, 3, 1) for n in range(19))
+    assert dates["C1-19"] is None
@@ -0,0 +1,145 @@
+"""
+Unit tests for blocking-based donor deduplication
+"""
+import os
+import random
+import string
+import time
+
+import pytest
+
+from app.services.donor_aggregation import DonorAggregationService
+from app.services.shared.entity_resolution import UnionFind, sorted_neighbourhood_pairs
+
+STATES = ["TX", "CA", "NY", "FL", "OH"]
+EMPLOYERS = ["ACME INC", "GLOBEX CORP", "INITECH", "SELF-EMPLOYED", "RETIRED", ""]
+OCCUPATIONS = ["ENGINEER", "ATTORNEY", "RETIRED", "TEACHER", ""]
+
+
+def _typo(rng, text):
+    position = rng.randrange(len(text))
+    return text[:position] + rng.choice(string.ascii_uppercase) + text[position + 1:]
+
+
+def _contributions(count, seed=7, donors=None):
+    """Synthetic contributions: donors give repeatedly with name typos and employer variations"""
+    rng = random.Random(seed)
+    donors = donors or max(1, count // 4)
+    syllables = ["AN", "BER", "CAR", "DEL", "ESS", "FOR", "GAL", "HAM", "INS", "JOR", "KEL", "LOW", "MAR", "NOR"]
+    people = []
+    for _ in range(donors):
+        last = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 3)))
+        first = "".join(rng.choice(syllables) for _ in range(2))
+        people.append((f"{last}, {first}", rng.choice(STATES), rng.choice(EMPLOYERS), rng.choice(OCCUPATIONS)))
+
+    contributions = []
+    for i in range(count):
+        name, state, employer, occupation = rng.choice(people)
+        if rng.random() < 0.1:
+            name = _typo(rng, name)
+        if rng.random() < 0.1:
+            employer = rng.choice(EMPLOYERS)
+        contributions.append({
+            "contribution_id": f"SA{i}", "contributor_name": name, "contributor_state": state,
+            "contributor_employer": employer, "contributor_occupation": occupation,
+            "contribution_amount": float(rng.randint(5, 500)), "contribution_date": "2024-01-15",
+        })
+    return contributions
+
+
+def _brute_force_clusters(service, groups):
+    """Transitive closure of every pairwise match (the O(n²) reference)"""
+    clusters = UnionFind(len(groups))
+    for i in range(len(groups)):
+        for j in range(i + 1, len(groups)):
+            confidence = service.calculate_match_confidence(groups[i][0], groups[j][0])
+            if confidence >= service.name_similarity_threshold:
+                clusters.union(i, j)
+    return clusters.clusters()
+
+
+def _exact_groups(service, contributions):
+    groups = {}
+    for contrib in contributions:
+        groups.setdefault(service.create_donor_key(contrib), []).append(contrib)
+    return list(groups.values())
+
+
+def test_merges_name_variations_within_state():
+    service = DonorAggregationService()
+    base = {"contributor_employer": "ACME", "contributor_occupation": "ENGINEER", "contribution_amount": 100.0}
+    donors = service.aggregate_donors([
+        dict(base, contribution_id="1", contributor_name="SMITH, JOHNATHAN", contributor_state="TX"),
+        dict(base, contribution_id="2", contributor_name="Smith, Jonathan", contributor_state="TX"),
+        dict(base, contribution_id="3", contributor_name="SMITH, JOHNATHAN", contributor_state="TX",
+             contributor_employer="ACME INC"),
+        dict(base, contribution_id="4", contributor_name="SMITH, JOHNATHAN", contributor_state="CA"),
+        dict(base, contribution_id="5", contributor_name="DOE, JANE", contributor_state="TX"),
+    ])
+
+    by_ids = {tuple(sorted(d["contribution_ids"])): d for d in donors}
+    assert set(by_ids) == {("1", "2", "3"), ("4",), ("5",)}
+    merged = by_ids[("1", "2", "3")]
+    assert merged["total_amount"] == 300.0
+    assert merged["donor_key"] == "smith johnathan|tx|acme|engineer"
+    assert 0.85 < merged["match_confidence"] <= 1.0
+    assert by_ids[("4",)]["match_confidence"] == 1.0
+
+
+def test_match_confidence_is_average_against_canonical():
+    service = DonorAggregationService()
+    contribs = [
+        {"contribution_id": "1", "contributor_name": "ROE, RICHARD", "contributor_state": "NY",
+         "contributor_employer": "INITECH", "contributor_occupation": "ENGINEER", "contributor_city": "ALBANY"},
+        {"contribution_id": "2", "contributor_name": "ROE, RICHARD", "contributor_state": "NY",
+         "contributor_employer": "INITECH", "contributor_occupation": "ENGINEER"},
+        {"contribution_id": "3", "contributor_name": "ROE, RICHARD", "contributor_state": "NY",
+         "contributor_employer": "INITECH", "contributor_occupation": ""},
+    ]
+    [donor] = service.aggregate_donors(contribs)
+    canonical = contribs[0]
+    expected = (
+        service.calculate_match_confidence(contribs[1], canonical)
+        + service.calculate_match_confidence(contribs[2], canonical)
+    ) / 2
+    assert donor["match_confidence"] == round(expected, 3)
+
+
+def test_blocking_matches_brute_force_clustering():
+    service = DonorAggregationService()
+    groups = _exact_groups(service, _contributions(3000, donors=600))
+
+    expected = sorted(_brute_force_clusters(service, groups))
+    actual = sorted(service.cluster_donor_groups(groups))
+    assert actual == expected
+    assert len(actual) < len(groups)
+
+    merged = service.merge_similar_donors({f"k{i}": g for i, g in enumerate(groups)})
+    assert sum(len(c) for c in merged.values()) == sum(len(g) for g in groups)
+    assert len(merged) == len(expected)
+
+
+def test_sorted_neighbourhood_reverse_pass_finds_leading_typos():
+    keys = ["xmith john"] + [f"a{i:04d}" for i in range(500)] + ["smith john"]
+    pairs = sorted_neighbourhood_pairs(keys, score_cutoff=85, window=4, batch_size=8)
+    assert (0, len(keys) - 1) in pairs
+
+
+@pytest.mark.slow
+def test_aggregation_benchmark():
+    """Benchmark: blocking dedup at 10k/50k/500k contributions (sizes: DONOR_DEDUP_BENCHMARK_SIZES)"""
+    sizes = [int(s) for s in os.getenv("DONOR_DEDUP_BENCHMARK_SIZES", "10000,50000,500000").split(",")]
+    service = DonorAggregationService()
+
+    reference_sample = _contributions(2000)
+    start = time.perf_counter()
+    _brute_force_clusters(service, _exact_groups(service, reference_sample))
+    print(f"\nO(n²) reference at {len(reference_sample)} contributions: {time.perf_counter() - start:.2f}s")
+
+    for size in sizes:
+        contributions = _contributions(size)
+        start = time.perf_counter()
+        donors = service.aggregate_donors(contributions)
+        elapsed = time.perf_counter() - start
+        print(f"Blocking dedup at {size} contributions: {elapsed:.2f}s ({len(donors)} donors)")
+        assert sum(d["contribution_count"] for d in donors) == size
@@ -0,0 +1,160 @@
+"""
+Unit tests and benchmark for the write-only streaming Excel export
+"""
+import multiprocessing
+import os
+import resource
+import time
+from io import BytesIO
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+import app.services.excel_export as excel_module
+from app.services.contribution_export import EXPORT_COLUMNS
+from app.services.excel_export import StreamingXlsxWriter, write_contributions_xlsx
+from app.services.report_generator import ReportGenerator
+from tests.services.test_report_rendering import candidate_data
+
+
+def test_columns_are_sized_from_sample_rows(monkeypatch):
+    monkeypatch.setattr(excel_module, "EXCEL_MAX_ROWS", 4)
+    writer = StreamingXlsxWriter(sample_rows=2)
+    sheet = writer.add_sheet("Contributions")
+    sheet.append_header(["ID", "Name"])
+    sheet.append(["1", "short"])
+    sheet.append(["2", "a much longer name than the sample"])  # After the sample: not measured
+    sheet.append([])
+    sheet.append(["3", "x"])
+    sheet.append(["4", "y"])
+    output = BytesIO()
+    writer.save(output)
+
+    workbook = load_workbook(output)
+    assert workbook.sheetnames == ["Contributions", "Contributions (2)"]
+    first, second = workbook.worksheets
+    assert [[c.value for c in row] for row in first.iter_rows()] == [
+        ["ID", "Name"], ["1", "short"], ["2", "a much longer name than the sample"]
+    ]  # The empty 4th row fills the sheet but has no cells
+    assert first["A1"].font.bold and first["A1"].fill.start_color.rgb.endswith("366092")
+    assert first.column_dimensions["B"].width == len("short") + 2
+    # Continuation sheet repeats the header and keeps the widths
+    assert [[c.value for c in row] for row in second.iter_rows()] == [["ID", "Name"], ["3", "x"], ["4", "y"]]
+    assert second.column_dimensions["B"].width == len("short") + 2
+
+
+async def frames_of(*frames):
+    for frame in frames:
+        yield frame
+
+
+def contributions_frame(start, count):
+    return pd.DataFrame({key: [f"{key}-{i}" for i in range(start, start + count)] for _, key in EXPORT_COLUMNS})
+
+
+async def test_contributions_are_written_to_a_temp_file():
+    path = await write_contributions_xlsx(
+        frames_of(contributions_frame(0, 3), contributions_frame(3, 2)), EXPORT_COLUMNS
+    )
+    try:
+        rows = list(load_workbook(path, read_only=True).active.iter_rows(values_only=True))
+    finally:
+        os.remove(path)
+    assert rows[0] == tuple(header for header, _ in EXPORT_COLUMNS)
+    assert [row[0] for row in rows[1:]] == [f"contribution_id-{i}" for i in range(5)]
+
+    async def failing():
+        yield contributions_frame(0, 1)
+        raise RuntimeError("cursor lost")
+
+    before = set(os.listdir(os.path.dirname(path)))
+    with pytest.raises(RuntimeError):
+        await write_contributions_xlsx(failing(), EXPORT_COLUMNS)
+    assert set(os.listdir(os.path.dirname(path))) == before
+
+
+async def test_report_excel_export_layout():
+    output = await ReportGenerator(None).generate_excel_export(candidate_data())
+    sheet = load_workbook(output).active
+    assert sheet.title == "Jane Doe"
+    values = [row[0] for row in sheet.iter_rows(values_only=True)]
+    assert values[:6] == ["Candidate Information", "Name", "Office", "Party", "State", None]
+    assert values[6:9] == ["Financial Summary", "Cycle", 2024]
+    assert "Top Donors" in values and values[-1] == "Data source: Federal Election Commission"
+    assert sheet["A1"].font.size == 14
+
+
+# Benchmark: the in-memory workbook the contributions export used to build
+# against the write-only writer, each in a fresh process for its peak RSS
+
+def _benchmark_rows(count):
+    for i in range(count):
+        yield [f"SUB{i}", "P00000001", "C00000001", f"DONOR {i % 5000}", "AUSTIN", "TX", "78701",
+               "EMPLOYER", "OCCUPATION", float(i % 500 + 1), "2024-01-15", "15", None]
+
+
+def _in_memory_xlsx(count):
+    wb = Workbook()
+    ws = wb.active
+    headers = [header for header, _ in EXPORT_COLUMNS]
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=1, column=col)
+        cell.value = header
+        cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        cell.font = Font(bold=True, color="FFFFFF")
+        cell.alignment = Alignment(horizontal="center", vertical="center")
+    for row_idx, values in enumerate(_benchmark_rows(count), 2):
+        for col, value in enumerate(values, 1):
+            ws.cell(row=row_idx, column=col, value=value)
+    for column in ws.columns:
+        width = max(len(str(cell.value)) for cell in column)
+        ws.column_dimensions[get_column_letter(column[0].column)].width = min(width + 2, 50)
+    output = BytesIO()
+    wb.save(output)
+    return len(output.getvalue())
+
+
+def _streaming_xlsx(count):
+    writer = StreamingXlsxWriter(sample_rows=1000)
+    sheet = writer.add_sheet("Contributions")
+    sheet.append_header([header for header, _ in EXPORT_COLUMNS])
+    sheet.append_rows(_benchmark_rows(count))
+    path = os.path.join(os.environ.get("TMPDIR", "/tmp"), f"bench_{os.getpid()}.xlsx")
+    writer.save(path)
+    size = os.path.getsize(path)
+    os.remove(path)
+    return size
+
+
+def _measure(engine, count):
+    start = time.perf_counter()
+    size = engine(count)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, peak_kb * 1024, size
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("count", [10_000, 100_000, 1_000_000])
+def test_benchmark_streaming_against_in_memory_workbook(count, pytestconfig, capsys):
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name, engine in (("in-memory", _in_memory_xlsx), ("write-only", _streaming_xlsx)):
+        with context.Pool(1) as pool:
+            results[name] = pool.apply(_measure, (engine, count))
+    reporter = pytestconfig.pluginmanager.get_plugin("terminalreporter")
+    for name, (elapsed, peak, size) in results.items():
+        assert size > 0, name
+        if reporter is not None:
+            with capsys.disabled():
+                reporter.write_line(f"{count:>9} rows {name:<10}: {elapsed:7.1f}s, "
+                                    f"peak RSS {peak / 2**20:7.0f} MB, {size / 2**20:.1f} MB file")
+
+    # Both write the same cells; the write-only file must not be larger
+    assert results["write-only"][2] <= results["in-memory"][2] * 1.1
+    if count >= 100_000:
+        assert results["write-only"][1] < results["in-memory"][1] / 2
+        assert results["write-only"][0] < results["in-memory"][0]
@@ -0,0 +1,226 @@
+"""
+Unit tests for the vectorized fraud detectors
+"""
+import os
+import random
+import time
+from difflib import SequenceMatcher
+
+import pytest
+
+from app.db.database import ContributionLimit
+from app.services.contribution_limits import ContributionLimitsService
+from app.services.fraud_detection import FraudDetectionService, _DetectionFrame
+
+
+class StubClient:
+    def __init__(self, contributions):
+        self.contributions = contributions
+
+    async def get_contributions(self, **kwargs):
+        return self.contributions
+
+
+def _add(rows, name, city, employer, amount, date, **extra):
+    rows.append(dict(
+        contribution_id=f"SA{len(rows):04d}", contributor_name=name, contributor_city=city,
+        contributor_state="TX", contributor_employer=employer, contribution_amount=amount,
+        contribution_date=date, **extra
+    ))
+
+
+def _fixture():
+    """Background donors plus contributions planted for each detector"""
+    rng = random.Random(11)
+    rows = []
+    for i in range(300):
+        _add(rows, f"DONOR{i:03d}, PAT", rng.choice(["AUSTIN", "DALLAS", "HOUSTON"]),
+             rng.choice(["ACME", "GLOBEX", None]), float(rng.choice([25, 50, 75, 120, 250, 333])),
+             f"2024-{rng.randint(1, 10):02d}-{rng.randint(1, 28):02d}")
+    # Smurfing: similar names (or same city and employer) just under $200
+    for name in ["SMITH, JOHN", "SMITH, JON", "SMYTH, JOHN", "SMITH, JOHN A", "SMITH, JOHNNY"]:
+        _add(rows, name, "AUSTIN", "ACME", 195.0, "2024-03-01")
+    for name in ["GARCIA, MARIA", "GARCIA, MARIE", "GARCIA, MARIA L"]:
+        _add(rows, name, "EL PASO", "SELF", 199.0, "2024-04-02")
+    for name in ["LEE, ANN", "LEE, ANNA", "LI, ANN"]:
+        _add(rows, name, "PLANO", "INITECH", 190.0, "2024-05-05")
+    # Near the 2023-24 individual limit; the 2022 one falls under the 2021-22 limit
+    _add(rows, "BIG, DONOR", "DALLAS", "OIL CO", 3300.0, "2024-02-01")
+    _add(rows, "BIG, DONOR", "DALLAS", "OIL CO", 3100.0, "2024-06-01")
+    _add(rows, "BIG, DONOR", "DALLAS", "OIL CO", 2900.0, "2022-06-01")
+    # Party committee contributions (24K) are not checked against the individual limit
+    _add(rows, "PAC, SOME", "DALLAS", None, 5000.0, "2024-02-01", contribution_type="24K")
+    _add(rows, "PAC, SOME", "DALLAS", None, 4800.0, "2024-03-01", contribution_type="24K")
+    # Same-day bursts
+    for k in range(6):
+        _add(rows, "RAPID, RAY", "WACO", "FARM", 50.0 + k, "2024-07-04")
+    for _ in range(3):
+        _add(rows, "TRIO, TOM", "WACO", "FARM", 20.0, "2024-07-05")
+    _add(rows, "NODATE, NED", "WACO", None, 100.0, None)
+    _add(rows, "BADDATE, BO", "WACO", None, 100.0, "not a date")
+    return rows
+
+
+def _summary(analysis):
+    return [
+        (p.pattern_type, p.severity, p.description, p.total_amount,
+         [c["contribution_id"] for c in p.affected_contributions])
+        for p in analysis.patterns
+    ]
+
+
+@pytest.fixture
+async def limits_service(temp_db):
+    """ContributionLimitsService over a temp DB filled with the historical limits"""
+    database = await temp_db([ContributionLimit])
+    async with database.sessions() as session:
+        service = ContributionLimitsService(session)
+        await service.populate_historical_limits()
+        yield service
+
+
+async def test_detectors_match_reference_output(limits_service):
+    """Same patterns as the row-by-row detectors produced for the fixture"""
+    analysis = await FraudDetectionService(StubClient(_fixture()), limits_service).analyze_candidate("P001")
+
+    assert _summary(analysis) == [
+        ("smurfing", "high", "Found 5 contributions just under reporting threshold from similar sources",
+         975.0, ["SA0300", "SA0301", "SA0302", "SA0303", "SA0304"]),
+        ("smurfing", "medium", "Found 3 contributions just under reporting threshold from similar sources",
+         597.0, ["SA0305", "SA0306", "SA0307"]),
+        ("smurfing", "medium", "Found 3 contributions just under reporting threshold from similar sources",
+         570.0, ["SA0308", "SA0309", "SA0310"]),
+        ("threshold_clustering", "medium", "Multiple contributions near legal limit from BIG, DONOR",
+         9300.0, ["SA0311", "SA0312", "SA0313"]),
+        ("temporal_anomaly", "medium", "6 contributions from RAPID, RAY on 2024-07-04",
+         315.0, ["SA0316", "SA0317", "SA0318", "SA0319", "SA0320", "SA0321"]),
+        ("same_day_multiple", "medium", "6 contributions from same source on same day",
+         315.0, ["SA0316", "SA0317", "SA0318", "SA0319", "SA0320", "SA0321"]),
+        ("same_day_multiple", "low", "3 contributions from same source on same day",
+         60.0, ["SA0322", "SA0323", "SA0324"]),
+    ]
+    assert analysis.total_suspicious_amount == 12132.0
+
+    # Affected contributions keep the columns each detector adds
+    smurfing, threshold, temporal, same_day = (analysis.patterns[i] for i in (0, 3, 4, 6))
+    assert smurfing.affected_contributions[1]["name_normalized"] == "smith, jon"
+    assert str(threshold.affected_contributions[0]["date"]) == "2024-02-01 00:00:00"
+    assert temporal.affected_contributions[0]["date_str"] == "2024-07-04"
+    assert same_day.affected_contributions[0]["key"] == "TRIO, TOM_WACO_TX_2024-07-05"
+    assert same_day.affected_contributions[0]["is_round"] is False
+
+
+async def test_without_limits_service_uses_fallback_limit():
+    analysis = await FraudDetectionService(StubClient(_fixture())).analyze_candidate("P001")
+    [threshold] = [p for p in analysis.patterns if p.pattern_type == "threshold_clustering"]
+    # $2,900 fallback: only the 2024 contributions within 10% of it count
+    assert [c["contribution_id"] for c in threshold.affected_contributions] == ["SA0312", "SA0313"]
+    assert threshold.total_amount == 6000.0
+
+
+async def test_aggregated_detectors_use_limits_table(limits_service):
+    service = FraudDetectionService(StubClient(_fixture()), limits_service)
+    analysis = await service.analyze_candidate_with_aggregation("P001")
+
+    evasion = {p.description for p in analysis.patterns if p.pattern_type == "aggregate_limit_evasion"}
+    assert "Aggregated donor BIG, DONOR exceeded limit by $6000.00 (Total: $9300.00, Limit: $3300.00)" in evasion
+
+
+def _reference_groups(names, cities, employers):
+    """The greedy grouping compared every pair with SequenceMatcher (the O(n²) reference)"""
+    def similarity(a, b):
+        return SequenceMatcher(None, a.lower(), b.lower()).ratio() if a and b else 0.0
+
+    groups, grouped = [], set()
+    for i in range(len(names)):
+        if i in grouped:
+            continue
+        group = [i]
+        grouped.add(i)
+        for j in range(len(names)):
+            if j in grouped:
+                continue
+            name_sim = similarity(names[i], names[j])
+            city_sim = similarity(cities[i], cities[j])
+            employer_sim = similarity(employers[i], employers[j])
+            if (name_sim > 0.7 or (city_sim > 0.8 and employer_sim > 0.8)) and name_sim > 0.5:
+                group.append(j)
+                grouped.add(j)
+        if len(group) >= 3:
+            groups.append(group)
+    return groups
+
+
+def test_smurfing_groups_match_sequence_matcher():
+    """rapidfuzz candidates confirmed with SequenceMatcher give the same groups as all pairs"""
+    rng = random.Random(5)
+    letters = "ABCDEHILMNORST"
+    names, cities, employers = [], [], []
+    for _ in range(700):
+        base = "".join(rng.choice(letters) for _ in range(rng.randint(3, 9)))
+        # Repeated letters are where LCS and SequenceMatcher ratios differ
+        names.append(rng.choice([base, base + ", " + base[::-1], base * 2, "", "None"]))
+        cities.append(rng.choice(["AUSTIN", "AUSTN", "DALLAS", "None", ""]))
+        employers.append(rng.choice(["ACME", "ACME INC", "None", "SELF"]))
+
+    service = FraudDetectionService(StubClient([]))
+    expected = _reference_groups(names, cities, employers)
+    assert service._group_similar_sources(names, cities, employers) == expected
+    assert len(expected) >= 5
+
+
+def _synthetic_contributions(count, seed=3):
+    """Repeat donors; 3% of amounts in the smurfing band, many at common limits"""
+    rng = random.Random(seed)
+    syllables = ["AN", "BER", "CAR", "DEL", "ESS", "FOR", "GAL", "HAM", "INS", "JOR", "KEL", "LOW", "MAR", "NOR"]
+    donors = [
+        ("".join(rng.choice(syllables) for _ in range(rng.randint(2, 3))) + ", "
+         + "".join(rng.choice(syllables) for _ in range(2)),
+         rng.choice(["AUSTIN", "DALLAS", "HOUSTON", "EL PASO", "WACO", "PLANO"]),
+         rng.choice(["ACME", "GLOBEX", "INITECH", "SELF", "RETIRED", None]))
+        for _ in range(max(1, count // 5))
+    ]
+    rows = []
+    for i in range(count):
+        name, city, employer = rng.choice(donors)
+        if rng.random() < 0.03:
+            amount = float(rng.randint(190, 199))
+        elif rng.random() < 0.8:
+            amount = float(rng.choice([5, 10, 25, 50, 100, 250, 500, 1000, 2900, 3300]))
+        else:
+            amount = rng.uniform(1, 3300)
+        rows.append({
+            "contribution_id": f"SA{i}", "contributor_name": name, "contributor_city": city,
+            "contributor_state": "TX", "contributor_employer": employer, "contribution_amount": amount,
+            "contribution_date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        })
+    return rows
+
+
+@pytest.mark.slow
+async def test_fraud_detection_benchmark():
+    """Benchmark: all five detectors at 100k contributions (size: FRAUD_BENCHMARK_SIZE)"""
+    size = int(os.getenv("FRAUD_BENCHMARK_SIZE", "100000"))
+    contributions = _synthetic_contributions(size)
+    service = FraudDetectionService(StubClient(contributions))
+
+    start = time.perf_counter()
+    frame = _DetectionFrame(service._contributions_frame(contributions))
+    patterns = await service._run_detectors(frame, [
+        (service._detect_smurfing,),
+        (service._detect_threshold_clustering, {}),
+        (service._detect_temporal_anomalies,),
+        (service._detect_round_number_patterns,),
+        (service._detect_same_day_patterns,),
+    ])
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analysis = await service.analyze_candidate("P001")
+    end_to_end = time.perf_counter() - start
+
+    print(f"\nFraud detection at {size} contributions: {elapsed:.2f}s "
+          f"(analyze_candidate {end_to_end:.2f}s, {len(patterns)} patterns)")
+    assert len(analysis.patterns) == len(patterns)
+    assert {p.pattern_type for p in patterns} >= {"smurfing", "threshold_clustering", "same_day_multiple"}
+    assert elapsed < 1.0
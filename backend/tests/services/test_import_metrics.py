@@ -0,0 +1,127 @@
+"""
+Unit tests for bulk import throughput and stage timing (import metrics)
+"""
+import logging
+import os
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import app.services.bulk_data.job_manager as job_manager_module
+import app.services.bulk_data_original as bulk_module
+from app.db.database import BulkImportJob, Committee, Contribution
+from app.services.bulk_data.contribution_merge import SCHEDULE_A_COLUMNS
+from app.services.bulk_data.job_manager import flush_job_progress
+from app.services.bulk_data_original import BulkDataService
+from app.services.shared import import_metrics
+from app.services.shared.import_metrics import (
+    ImportMetrics, get_import_metrics, timed_chunks, timed_stage, track_import
+)
+from app.utils.metrics import get_metrics
+
+
+class Chunk:
+    """Stands in for a checkpointed chunk of async_read_bulk_csv"""
+
+    def __init__(self, rows, start, end):
+        self.frame = pd.DataFrame({"a": range(rows)})
+        self.start = start
+        self.end = end
+
+
+async def chunks_of(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def test_summary_percentiles():
+    metrics = ImportMetrics("J1", "test")
+    for ms in range(1, 101):
+        metrics.record("insert", ms / 1000)
+    metrics.add_rows(1000)
+    metrics.finish("completed")
+
+    summary = metrics.summary()
+    assert summary["stages"]["insert"]["count"] == 100
+    assert summary["stages"]["insert"]["p50_ms"] == 50.0
+    assert summary["stages"]["insert"]["p95_ms"] == 95.0
+    assert summary["stages"]["insert"]["total_seconds"] == pytest.approx(5.05)
+    assert summary["rows_per_second"] > 0
+
+
+async def test_chunks_and_stages_are_timed(caplog):
+    with timed_stage("insert"):  # No import tracked: nothing recorded
+        pass
+    assert [c async for c in timed_chunks(chunks_of(Chunk(3, 0, 30)))][0].end == 30
+
+    with caplog.at_level(logging.INFO, logger=import_metrics.__name__):
+        async with track_import("J-metrics", "test", 2024) as metrics:
+            async for chunk in timed_chunks(chunks_of(Chunk(10, 0, 1000), Chunk(5, 1000, 1500))):
+                with timed_stage("insert"):
+                    with timed_stage("merge"):  # Nested: counted once towards the chunk
+                        pass
+                with timed_stage("commit"):
+                    pass
+            for frame in timed_chunks([pd.DataFrame({"a": [1, 2]})]):
+                pass
+
+    assert metrics.rows == 17 and metrics.bytes == 1500
+    summary = get_import_metrics("J-metrics")
+    assert summary["status"] == "completed"
+    assert {name: stage["count"] for name, stage in summary["stages"].items()} == {
+        "read_csv": 3, "insert": 2, "merge": 2, "commit": 2, "clean": 3
+    }
+
+    records = [r for r in caplog.records if getattr(r, "event", None) == "bulk_import_metrics"]
+    assert len(records) == 1
+    assert records[0].rows == 17 and records[0].import_data_type == "test"
+
+    text = get_metrics()
+    assert 'fec_bulk_import_rows_total{data_type="test"}' in text
+    assert 'fec_bulk_import_stage_seconds_total{data_type="test",stage="commit"}' in text
+
+
+async def test_failed_import_is_recorded():
+    with pytest.raises(ValueError):
+        async with track_import("J-failed", "test", 2024):
+            with timed_stage("insert"):
+                raise ValueError("boom")
+    summary = get_import_metrics("J-failed")
+    assert summary["status"] == "failed"
+    assert summary["stages"]["insert"]["count"] == 1
+
+
+def _line(i: int) -> str:
+    fields = {col: "" for col in SCHEDULE_A_COLUMNS}
+    fields.update(CMTE_ID=f"C{i % 7:08d}", NAME=f"DONOR {i}", TRANSACTION_DT="01152024",
+                  TRANSACTION_AMT=str(i), SUB_ID=str(1000 + i))
+    return "|".join(fields[col] for col in SCHEDULE_A_COLUMNS) + "\n"
+
+
+async def test_contribution_import_reports_stages(tmp_path, temp_db, monkeypatch):
+    database = await temp_db([Contribution, Committee, BulkImportJob], patch=[bulk_module, job_manager_module])
+    async with database.sessions() as session:
+        session.add(BulkImportJob(id="J-import", job_type="single_cycle", status="running", cycle=2024,
+                                  total_cycles=1, started_at=datetime(2024, 1, 1)))
+        await session.commit()
+
+    async def noop(*args, **kwargs):
+        return None
+
+    service = BulkDataService()
+    monkeypatch.setattr(service, "_extract_and_cache_committees", noop)
+    monkeypatch.setattr(service, "_update_metadata", noop)
+    path = tmp_path / "itcont.txt"
+    path.write_text("".join(_line(i) for i in range(300)))
+
+    total = await service.parse_and_store_csv(str(path), 2024, job_id="J-import", batch_size=100, bulk_load=False)
+    await flush_job_progress()
+
+    summary = get_import_metrics("J-import")
+    assert total == summary["rows"] == 300
+    assert summary["bytes"] == os.path.getsize(path)
+    assert summary["data_type"] == "individual_contributions"
+    for stage in ("read_csv", "backfill", "rollup_delta", "merge", "name_index", "commit", "checkpoint", "clean"):
+        assert stage in summary["stages"], stage
+    assert summary["stages"]["merge"]["count"] == 3
@@ -0,0 +1,193 @@
+"""
+Unit tests for the columnar mapping of local contributions (FECClient._query_local_contributions)
+"""
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from sqlalchemy import select
+
+import app.services._fec_client_impl as client_module
+from app.db.database import Contribution
+from app.services._fec_client_impl import FECClient
+
+
+class RecordingBackfill:
+    """Stands in for DateBackfillQueue"""
+
+    def __init__(self):
+        self.dates = {}
+        self.lookups = {}
+
+    def enqueue_date(self, contribution_id, contribution_date):
+        self.dates[contribution_id] = contribution_date
+        return True
+
+    def enqueue_lookup(self, contribution_id, committee_id=None):
+        self.lookups[contribution_id] = committee_id
+        return True
+
+
+async def _database(temp_db, contributions):
+    database = await temp_db([Contribution], patch=[client_module])
+    async with database.sessions() as session:
+        session.add_all(contributions)
+        await session.commit()
+    return database
+
+
+def _client():
+    client = FECClient(api_key="TEST")
+    client.bulk_data_enabled = True
+    client.date_backfill = RecordingBackfill()
+    return client
+
+
+@pytest.fixture
+async def db(temp_db):
+    """Complete contributions to C1 plus rows whose values are only in raw_data"""
+    database = await _database(temp_db, [
+        Contribution(contribution_id="FULL", candidate_id="P1", committee_id="C1", contributor_name="JANE DOE",
+                     contributor_state="TX", contribution_amount=250.0, contribution_date=datetime(2024, 5, 2),
+                     contribution_type="15", raw_data={"MEMO_CD": "X", "TRANSACTION_AMT": "250"}),
+        Contribution(contribution_id="RAW", candidate_id="P1", committee_id="C1", contributor_name="",
+                     contribution_amount=0.0,
+                     raw_data={"NAME": "SMITH, JOHN", "STATE": "CA", "TRANSACTION_AMT": "$1,000",
+                               "TRANSACTION_DT": "03152024"}),
+        Contribution(contribution_id="UNDATED", candidate_id="P1", committee_id="C1", contributor_name="AL",
+                     contributor_state="NY", contribution_amount=5.0),
+    ])
+    return database.record_statements()
+
+
+async def test_columns_are_mapped_without_raw_data(db):
+    statements = db
+    client = _client()
+    results = await client._query_local_contributions(candidate_id="P1", include_raw_data=False)
+
+    by_id = {r["contribution_id"]: r for r in results}
+    assert [r["contribution_id"] for r in results] == ["FULL", "RAW", "UNDATED"]
+    assert by_id["FULL"] == {
+        "sub_id": "FULL", "contribution_id": "FULL", "candidate_id": "P1", "committee_id": "C1",
+        "contributor_name": "JANE DOE", "contributor_city": None, "contributor_state": "TX",
+        "contributor_zip": None, "contributor_employer": None, "contributor_occupation": None,
+        "contribution_amount": 250.0, "contribution_receipt_date": "2024-05-02",
+        "contribution_date": "2024-05-02", "contribution_type": "15", "receipt_type": None,
+    }
+    # Fallbacks come from raw_data, read only for the rows that need them
+    assert (by_id["RAW"]["contributor_name"], by_id["RAW"]["contributor_state"],
+            by_id["RAW"]["contribution_amount"], by_id["RAW"]["contribution_date"]) == (
+        "SMITH, JOHN", "CA", 1000.0, "2024-03-15")
+    assert by_id["UNDATED"]["contribution_date"] is None
+    assert "raw_data" not in statements[0].split("FROM")[0]
+    assert len(statements) == 2
+
+    # Recovered dates are queued for writing, the rest for an API lookup
+    assert client.date_backfill.dates == {"RAW": datetime(2024, 3, 15)}
+    assert client.date_backfill.lookups == {"UNDATED": "C1"}
+
+
+async def test_raw_data_keys_are_added_when_requested(db):
+    results = await _client()._query_local_contributions(candidate_id="P1")
+
+    by_id = {r["contribution_id"]: r for r in results}
+    assert by_id["FULL"]["MEMO_CD"] == "X"
+    assert by_id["FULL"]["contribution_amount"] == 250.0
+    assert by_id["RAW"]["contributor_name"] == "SMITH, JOHN"
+    assert by_id["RAW"]["TRANSACTION_DT"] == "03152024"
+    assert "MEMO_CD" not in by_id["UNDATED"]
+
+
+async def test_frame_has_the_dictionary_columns(db):
+    client = _client()
+    frame = await client._query_local_contributions(candidate_id="P1", include_raw_data=False, as_frame=True)
+    records = await client._query_local_contributions(candidate_id="P1", include_raw_data=False)
+
+    assert isinstance(frame, pd.DataFrame)
+    assert frame.astype(object).where(frame.notna(), None).to_dict("records") == records
+
+
+async def test_committee_contributions_get_the_requested_candidate(temp_db):
+    await _database(temp_db, [
+        Contribution(contribution_id="LINKED", committee_id="C9", contributor_name="A", contribution_amount=1.0,
+                     contribution_date=datetime(2024, 1, 1)),
+        Contribution(contribution_id="OTHER", candidate_id="P2", committee_id="C9", contributor_name="B",
+                     contribution_amount=1.0, contribution_date=datetime(2024, 1, 2)),
+    ])
+    client = _client()
+
+    async def get_committees(**kwargs):
+        return [{"committee_id": "C9"}]
+
+    client.get_committees = get_committees
+    results = await client.get_contributions(candidate_id="P1", limit=10, fetch_new_only=False,
+                                             include_raw_data=False)
+
+    assert [(r["contribution_id"], r["candidate_id"]) for r in results[:1]] == [("LINKED", "P1")]
+    assert "OTHER" not in {r["contribution_id"] for r in results}
+
+
+async def _old_row_dicts(client, candidate_id, limit):
+    """Previous mapping: ORM entities, then per-row fallbacks and raw_data copies"""
+    async with client_module.AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Contribution).where(Contribution.candidate_id == candidate_id)
+            .order_by(Contribution.contribution_date.desc().nulls_last()).limit(limit)
+        )
+        results = []
+        for c in result.scalars().all():
+            amount = float(c.contribution_amount) if c.contribution_amount else 0.0
+            contrib_date = await client.get_contribution_date(
+                contribution_id=c.contribution_id, contribution_obj=c, committee_id=c.committee_id
+            )
+            date_str = contrib_date.strftime("%Y-%m-%d") if contrib_date else None
+            contrib_dict = {
+                "sub_id": c.contribution_id, "contribution_id": c.contribution_id,
+                "candidate_id": c.candidate_id or candidate_id, "committee_id": c.committee_id,
+                "contributor_name": c.contributor_name, "contributor_city": c.contributor_city,
+                "contributor_state": c.contributor_state, "contributor_zip": c.contributor_zip,
+                "contributor_employer": c.contributor_employer,
+                "contributor_occupation": c.contributor_occupation, "contribution_amount": amount,
+                "contribution_receipt_date": date_str, "contribution_date": date_str,
+                "contribution_type": c.contribution_type, "receipt_type": None,
+            }
+            for key, value in (c.raw_data or {}).items():
+                if key not in contrib_dict or not contrib_dict[key]:
+                    contrib_dict[key] = value
+            results.append(contrib_dict)
+        return results
+
+
+@pytest.mark.slow
+async def test_local_contributions_benchmark(temp_db):
+    """Benchmark: dicts per second before and after at 50k rows (size: LOCAL_CONTRIBUTIONS_BENCHMARK_SIZE)"""
+    size = int(os.getenv("LOCAL_CONTRIBUTIONS_BENCHMARK_SIZE", "50000"))
+    raw = {f"FIELD_{n}": f"value {n}" for n in range(20)}
+    await _database(temp_db, [
+        Contribution(contribution_id=f"S{n}", candidate_id="P1", committee_id=f"C{n % 50}",
+                     contributor_name=f"DONOR {n % 5000}", contributor_state="TX",
+                     contribution_amount=float(n % 3000 + 1),
+                     contribution_date=datetime(2024, 1 + n % 12, 1 + n % 28) if n % 10 else None,
+                     raw_data={**raw, "TRANSACTION_AMT": str(n % 3000 + 1),
+                               "TRANSACTION_DT": "" if n % 20 else "06012024"})
+        for n in range(size)
+    ])
+    client = _client()
+
+    start = time.perf_counter()
+    before = await _old_row_dicts(client, "P1", size)
+    before_rate = len(before) / (time.perf_counter() - start)
+
+    rates = {}
+    for include_raw_data in (True, False):
+        start = time.perf_counter()
+        after = await client._query_local_contributions(candidate_id="P1", limit=size,
+                                                        include_raw_data=include_raw_data)
+        rates[include_raw_data] = len(after) / (time.perf_counter() - start)
+
+    print(f"\nLocal contributions at {size} rows: before {before_rate:,.0f} dicts/s, "
+          f"after {rates[True]:,.0f} dicts/s with raw_data, {rates[False]:,.0f} dicts/s without")
+    assert len(after) == len(before) == size
+    assert rates[False] > before_rate
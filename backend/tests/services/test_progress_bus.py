@@ -0,0 +1,154 @@
+"""
+Unit tests for pushed job progress (progress bus) and throttled progress writes
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+
+import app.api.routes.bulk_data as routes_module
+import app.services.bulk_data.job_manager as job_manager_module
+from app.config import config
+from app.db.database import BulkImportJob
+from app.services.bulk_data.job_manager import JobManager, flush_job_progress
+from app.services.bulk_data.progress_bus import JobProgressBus, get_progress_bus
+
+
+@pytest.fixture
+def fast_broadcasts(monkeypatch):
+    monkeypatch.setattr(config, "PROGRESS_BROADCAST_INTERVAL_SECONDS", 0.05)
+
+
+async def test_updates_are_coalesced(fast_broadcasts):
+    bus = JobProgressBus()
+    with bus.subscribe("J1") as subscription:
+        bus.seed("J1", {"status": "running", "total_chunks": 10, "current_chunk": 0})
+        for chunk in range(1, 6):
+            bus.publish("J1", current_chunk=chunk, imported_records=chunk * 100)
+
+        assert await subscription.get(timeout=0.01) is None  # Not before the interval
+        message = await subscription.get(timeout=1)
+        assert message["type"] == "progress"
+        assert message["data"]["current_chunk"] == 5
+        assert message["data"]["imported_records"] == 500
+        assert message["data"]["overall_progress"] == 50.0
+        assert await subscription.get(timeout=0.1) is None  # One broadcast for five updates
+
+        bus.publish("J1", status="completed")
+        message = await subscription.get(timeout=1)
+        assert message["type"] == "completed"
+    assert bus.snapshot("J1") is None
+    assert bus.subscriber_count("J1") == 0
+
+
+async def test_broadcast_fans_out_to_all_subscribers(fast_broadcasts):
+    bus = JobProgressBus()
+    subscriptions = [bus.subscribe("J1") for _ in range(200)]
+    other = bus.subscribe("J2")
+    bus.publish("J1", status="running", current_chunk=3)
+
+    messages = await asyncio.gather(*(s.get(timeout=1) for s in subscriptions))
+    assert all(m["data"]["current_chunk"] == 3 for m in messages)
+    assert await other.get(timeout=0.1) is None
+    for subscription in subscriptions + [other]:
+        subscription.close()
+
+
+@pytest.fixture
+async def jobs_db(temp_db, monkeypatch):
+    """Temp SQLite DB with one running job; progress writes at most every 60s"""
+    database = await temp_db([BulkImportJob], patch=[job_manager_module])
+    async with database.sessions() as session:
+        session.add(BulkImportJob(id="J1", job_type="single_cycle", status="running", cycle=2024,
+                                  total_cycles=1, total_chunks=20, started_at=datetime(2024, 1, 1)))
+        await session.commit()
+    monkeypatch.setattr(config, "PROGRESS_DB_WRITE_INTERVAL_SECONDS", 60.0)
+    monkeypatch.setattr(config, "PROGRESS_BROADCAST_INTERVAL_SECONDS", 0.05)
+    yield database.sessions, database.record_statements("UPDATE")
+    await flush_job_progress()
+
+
+async def test_progress_writes_are_throttled(jobs_db):
+    sessions, updates = jobs_db
+    manager = JobManager()
+
+    for chunk in range(1, 11):
+        await manager.update_job_progress("J1", current_chunk=chunk, imported_records=chunk * 10,
+                                          checkpoint_start=chunk * 1000)
+    assert len(updates) == 1  # The first update, then nothing within the interval
+
+    # Reads through the job manager see the pending values
+    job = await manager.get_job("J1")
+    assert (job.current_chunk, job.imported_records, job.checkpoint_start) == (10, 100, 10000)
+
+    await manager.update_job_progress("J1", status="completed", imported_records=110)
+    assert len(updates) == 2
+    async with sessions() as session:
+        stored = await session.get(BulkImportJob, "J1")
+        assert (stored.status, stored.current_chunk, stored.imported_records, stored.checkpoint_start) == (
+            "completed", 10, 110, 10000)
+        assert stored.completed_at is not None
+
+
+async def test_pending_progress_is_flushed_later(jobs_db, monkeypatch):
+    sessions, updates = jobs_db
+    manager = JobManager()
+    monkeypatch.setattr(config, "PROGRESS_DB_WRITE_INTERVAL_SECONDS", 0.1)
+
+    await manager.update_job_progress("J1", current_chunk=1)
+    await manager.update_job_progress("J1", current_chunk=2)
+    assert len(updates) == 1
+    await asyncio.sleep(0.3)
+    assert len(updates) == 2
+    async with sessions() as session:
+        assert (await session.get(BulkImportJob, "J1")).current_chunk == 2
+
+
+async def test_progress_stream_follows_the_job(jobs_db, monkeypatch):
+    sessions, updates = jobs_db
+    manager = JobManager()
+    monkeypatch.setattr(routes_module, "get_bulk_data_service", lambda: manager)
+
+    async def run_import():
+        await asyncio.sleep(0.05)
+        for chunk in range(1, 21):
+            await manager.update_job_progress("J1", current_chunk=chunk)
+            await asyncio.sleep(0.005)
+        await manager.update_job_progress("J1", status="completed")
+
+    task = asyncio.create_task(run_import())
+    messages = [message async for message in routes_module._job_progress_messages("J1")]
+    await task
+
+    assert messages[0]["type"] == "progress" and messages[0]["data"]["total_chunks"] == 20
+    assert messages[-1]["type"] == "completed"
+    assert messages[-1]["data"]["overall_progress"] == 100.0
+    assert messages[-1]["data"]["cycle"] == 2024  # Seeded from the database row
+    assert 2 < len(messages) < 21  # Coalesced
+
+    missing = [message async for message in routes_module._job_progress_messages("NOPE")]
+    assert missing == [{"type": "error", "message": "Job not found"}]
+
+
+async def test_progress_stream_reads_jobs_of_other_workers(jobs_db, monkeypatch):
+    sessions, _ = jobs_db
+    monkeypatch.setattr(routes_module, "get_bulk_data_service", lambda: JobManager())
+    monkeypatch.setattr(routes_module, "PROGRESS_KEEPALIVE_SECONDS", 0.05)
+
+    async def run_import_elsewhere():
+        # Another process writes the job row; nothing is published on this bus
+        for values in ({"current_chunk": 10}, {"current_chunk": 20, "status": "completed"}):
+            await asyncio.sleep(0.1)
+            async with sessions() as session:
+                job = await session.get(BulkImportJob, "J1")
+                for field, value in values.items():
+                    setattr(job, field, value)
+                await session.commit()
+
+    task = asyncio.create_task(run_import_elsewhere())
+    messages = [message async for message in routes_module._job_progress_messages("J1")]
+    await task
+
+    assert not get_progress_bus().has_publisher("J1")
+    assert 10 in [message["data"]["current_chunk"] for message in messages]
+    assert messages[-1]["type"] == "completed" and messages[-1]["data"]["overall_progress"] == 100.0
@@ -0,0 +1,147 @@
+"""
+Unit tests for the token-bucket FEC API rate limiter, on a simulated clock
+"""
+import asyncio
+from collections import deque
+
+from app.services.fec_client.rate_limiter import RateLimiter
+
+HOUR = 3600
+
+
+class SimulatedClock:
+    """Clock whose sleeps advance time instantly"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.now += seconds
+
+
+class QuotaServer:
+    """OpenFEC's rolling hourly quota per key, with its rate limit headers"""
+
+    def __init__(self, quota=1000, send_limit_header=True):
+        self.quota = quota
+        self.send_limit_header = send_limit_header
+        self.accepted = {}
+        self.throttled = 0
+
+    def request(self, api_key, now):
+        window = self.accepted.setdefault(api_key, deque())
+        while window and window[0] <= now - HOUR:
+            window.popleft()
+        if len(window) >= self.quota:
+            self.throttled += 1
+            status = 429
+        else:
+            window.append(now)
+            status = 200
+        headers = {"X-RateLimit-Remaining": str(self.quota - len(window))}
+        if self.send_limit_header:
+            headers["X-RateLimit-Limit"] = str(self.quota)
+        return status, headers
+
+
+async def _run(limiter, server, clock, hours):
+    """Send requests back to back for ``hours`` simulated hours; returns requests per key"""
+    sent = {}
+    while True:
+        api_key = await limiter.wait_for_rate_limit()
+        if clock.now >= hours * HOUR:
+            return sent
+        status, headers = server.request(api_key, clock.now)
+        limiter.record_response(api_key, status, headers)
+        if status == 200:
+            sent[api_key] = sent.get(api_key, 0) + 1
+
+
+async def test_sustains_the_hourly_quota_on_every_key_without_429s():
+    clock = SimulatedClock()
+    limiter = RateLimiter(api_keys=["KEY-A", "KEY-B", "KEY-C"], requests_per_hour=1000, burst=10,
+                          clock=clock, sleep=clock.sleep)
+    server = QuotaServer()
+    sent = await _run(limiter, server, clock, hours=3)
+
+    assert server.throttled == 0
+    # Round-robin keeps every key at its quota
+    assert set(sent) == {"KEY-A", "KEY-B", "KEY-C"}
+    assert all(count >= 0.99 * 3 * 1000 for count in sent.values())
+    assert sum(sent.values()) <= 3 * 3 * 1000
+
+
+async def test_concurrent_waiters_do_not_burst():
+    """Reservations are made atomically, so waiters get distinct, paced slots"""
+    clock = SimulatedClock()
+    send_times = []
+
+    async def record(seconds):
+        send_times.append(clock.now + seconds)
+
+    limiter = RateLimiter(api_keys=["KEY-A"], requests_per_hour=1000, burst=5, rate_limit_delay=0,
+                          clock=clock, sleep=record)
+    await asyncio.gather(*(limiter.wait_for_rate_limit() for _ in range(30)))
+
+    # The first five go at once (the burst); the rest are 3.6s apart
+    assert sorted(round(t, 6) for t in send_times) == [round(3.6 * i, 6) for i in range(1, 26)]
+
+
+async def test_remaining_header_accounts_for_requests_made_elsewhere():
+    clock = SimulatedClock()
+    server = QuotaServer()
+    # Another process used 900 of the key's requests ten minutes ago
+    server.accepted["KEY-A"] = deque([-600.0] * 900)
+    limiter = RateLimiter(api_keys=["KEY-A"], requests_per_hour=1000, burst=10, clock=clock, sleep=clock.sleep)
+
+    sent = await _run(limiter, server, clock, hours=2)
+    assert server.throttled == 0
+    assert limiter.get_metrics()["keys"]["...EY-A"]["external_requests"] == 900
+    # The outside requests only delay us until they leave the window
+    assert sent["KEY-A"] >= 1000 + 100
+
+
+async def test_limit_header_corrects_the_quota():
+    clock = SimulatedClock()
+    limiter = RateLimiter(api_keys=["KEY-A"], requests_per_hour=5000, burst=10, clock=clock, sleep=clock.sleep)
+    server = QuotaServer(quota=1000)
+    await _run(limiter, server, clock, hours=2)
+    assert server.throttled == 0
+    assert limiter.get_metrics()["keys"]["...EY-A"]["requests_per_hour"] == 1000
+
+
+async def test_429_pauses_the_key_and_rotates_to_the_next():
+    clock = SimulatedClock()
+    limiter = RateLimiter(api_keys=["KEY-A", "KEY-B"], requests_per_hour=1000, burst=10, rate_limit_retry_delay=60,
+                          clock=clock, sleep=clock.sleep)
+    assert await limiter.wait_for_rate_limit() == "KEY-A"
+    limiter.record_response("KEY-A", 429, {"Retry-After": "120"})
+    # KEY-A is paused for two minutes: every request until then goes to KEY-B
+    keys = [await limiter.wait_for_rate_limit() for _ in range(5)]
+    assert keys == ["KEY-B"] * 5 and clock.now < 120
+    # KEY-B can send again after rate_limit_delay
+    assert limiter.get_retry_delay(0) == 0.5
+
+    # Without Retry-After the pause doubles with each consecutive 429, up to rate_limit_retry_delay
+    pauses = []
+    for _ in range(6):
+        limiter.record_response("KEY-B", 429, {})
+        pauses.append(limiter.get_metrics()["keys"]["...EY-B"]["next_request_in_seconds"])
+    assert pauses == [7.2, 14.4, 28.8, 57.6, 60.0, 60.0]
+
+    metrics = limiter.get_metrics()
+    assert metrics["throttled"] == 7
+    assert metrics["requests"] == 6
+    assert metrics["keys"]["...EY-A"]["next_request_in_seconds"] == 120.0 - clock.now
+
+
+async def test_unconfigured_key_gets_a_budget_on_first_use():
+    clock = SimulatedClock()
+    limiter = RateLimiter(requests_per_hour=1000, burst=1, rate_limit_delay=0, clock=clock, sleep=clock.sleep)
+    assert await limiter.wait_for_rate_limit("PRIMARY") == "PRIMARY"
+    assert await limiter.wait_for_rate_limit("PRIMARY") == "PRIMARY"
+    assert clock.now == 3.6
+    assert list(limiter.get_metrics()["keys"]) == ["...MARY"]
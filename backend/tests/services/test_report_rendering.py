@@ -0,0 +1,126 @@
+"""
+Unit tests for off-loop report rendering, the chart cache and report export jobs
+"""
+import asyncio
+
+import pytest
+from docx import Document
+
+import app.services.report_rendering as rendering_module
+from app.config import config
+from app.models.schemas import CandidateSummary, ContributionAnalysis, FinancialSummary
+from app.services.report_generator import ReportGenerator
+from app.services.report_jobs import ReportJobManager
+from app.services.report_rendering import (
+    ChartCache, chart_key, get_chart_cache, render_charts, shutdown_render_pool
+)
+
+
+@pytest.fixture
+def thread_rendering(monkeypatch):
+    """Render in the thread pool with an empty chart cache"""
+    monkeypatch.setattr(config, "REPORT_RENDER_WORKERS", 0)
+    monkeypatch.setattr(rendering_module, "_chart_cache", None)
+    yield
+    shutdown_render_pool()
+
+
+def candidate_data():
+    return {
+        "candidate": CandidateSummary(candidate_id="P1", name="Jane Doe", office="P", party="DEM", state="US"),
+        "financials": [FinancialSummary(candidate_id="P1", cycle=2024, total_receipts=1500000.0)],
+        "contribution_analysis": ContributionAnalysis(
+            total_contributions=3000.0, total_contributors=2, average_contribution=1500.0,
+            contributions_by_date={"2024-01-01": 1000.0, "2024-02-01": 2000.0},
+            contributions_by_state={"TX": 3000.0},
+            top_donors=[{"name": "DONOR A", "total": 2000.0, "count": 1}],
+            contribution_distribution={"$1000+": 2},
+        ),
+        "expenditure_breakdown": None,
+        "fraud_analysis": None,
+    }
+
+
+async def test_chart_cache_reuses_rendered_charts(thread_rendering, monkeypatch):
+    calls = []
+    render = rendering_module.render_chart
+
+    def counting_render(spec):
+        calls.append(spec["title"])
+        return render(spec)
+
+    monkeypatch.setattr(rendering_module, "render_chart", counting_render)
+    spec = {"kind": "bar", "title": "Receipts", "xlabel": "Candidate", "ylabel": "Amount ($)",
+            "labels": ["A", "B"], "values": [1.0, 2.0]}
+    broken = {"kind": "unknown", "title": "Broken"}
+
+    charts = await render_charts({"first": spec, "same": dict(spec), "broken": broken})
+    assert charts["first"].startswith(b"\x89PNG") and charts["same"] == charts["first"]
+    assert "broken" not in charts
+    assert calls == ["Receipts", "Broken"]
+
+    await render_charts({"again": dict(spec)})
+    assert calls == ["Receipts", "Broken"]
+    assert chart_key(spec) != chart_key(dict(spec, values=[1.0, 3.0]))
+    assert len(get_chart_cache()) == 1
+
+
+def test_chart_cache_is_bounded_by_size():
+    cache = ChartCache(max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.get("a")
+    cache.put("c", b"12345")
+    assert cache.get("b") is None and cache.get("a") and cache.get("c")
+    cache.put("huge", b"x" * 11)
+    assert cache.get("huge") is None
+
+
+async def test_pdf_and_docx_reports_render_off_loop(thread_rendering):
+    generator = ReportGenerator(None)
+    pdf = await generator.generate_pdf_report(candidate_data())
+    assert pdf.getvalue().startswith(b"%PDF")
+
+    docx = await generator.generate_docx_report(candidate_data())
+    document = Document(docx)
+    assert document.paragraphs[0].text == "Jane Doe"
+    assert len(document.inline_shapes) == 1  # Contributions over time chart
+    assert len(get_chart_cache()) == 1  # Shared by both documents
+
+
+@pytest.mark.slow
+async def test_reports_render_in_process_pool(monkeypatch):
+    monkeypatch.setattr(config, "REPORT_RENDER_WORKERS", 1)
+    monkeypatch.setattr(rendering_module, "_chart_cache", None)
+    try:
+        pdf = await ReportGenerator(None).generate_pdf_report(candidate_data())
+        assert pdf.getvalue().startswith(b"%PDF")
+    finally:
+        shutdown_render_pool()
+
+
+async def test_report_jobs_complete_fail_and_expire(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "REPORT_JOB_DIR", str(tmp_path))
+    manager = ReportJobManager()
+
+    async def render():
+        await asyncio.sleep(0.01)
+        return b"%PDF-report", "candidate_P1_report.pdf", "application/pdf"
+
+    async def fail():
+        raise RuntimeError("Candidate not found")
+
+    job = manager.submit("candidate P1 (pdf)", render)
+    failed = manager.submit("candidate X (pdf)", fail)
+    assert job.status in ("pending", "running")
+    await manager.wait()
+
+    assert manager.get(job.id).status == "completed"
+    with open(job.path, "rb") as f:
+        assert f.read() == b"%PDF-report"
+    assert job.to_dict()["size"] == 11 and job.filename == "candidate_P1_report.pdf"
+    assert failed.status == "failed" and failed.error == "Candidate not found"
+
+    monkeypatch.setattr(config, "REPORT_JOB_TTL_SECONDS", -1)
+    assert manager.get(job.id) is None
+    assert list(tmp_path.iterdir()) == []
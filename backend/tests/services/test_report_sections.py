@@ -0,0 +1,146 @@
+"""
+Unit tests for concurrent, cached report section assembly
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+
+import app.services.report_sections as sections_module
+from app.config import config
+from app.db.database import BulkImportJob, PreComputedAnalysis
+from app.services.report_generator import ReportGenerator
+from app.services.report_sections import ReportSection, assemble_sections, clear_section_cache
+
+
+@pytest.fixture
+async def sections_db(temp_db, monkeypatch):
+    """Temp SQLite DB for the data version; section cache cleared"""
+    database = await temp_db([BulkImportJob, PreComputedAnalysis], patch=[sections_module])
+    monkeypatch.setattr(config, "REPORT_SECTION_CONCURRENCY", 2)
+    clear_section_cache()
+    yield database.sessions
+    clear_section_cache()
+
+
+class Builds:
+    """Section builders that record calls and concurrency"""
+
+    def __init__(self):
+        self.calls = []
+        self.running = 0
+        self.max_running = 0
+
+    def section(self, name, depends_on=(), value=None, fail=False):
+        async def build(dependencies):
+            self.calls.append((name, dict(dependencies)))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            try:
+                await asyncio.sleep(0.02)
+                if fail:
+                    raise RuntimeError("boom")
+                return value if value is not None else f"{name}-data"
+            finally:
+                self.running -= 1
+        return ReportSection(name, build, depends_on)
+
+
+async def test_sections_run_after_dependencies_with_bounded_concurrency(sections_db):
+    builds = Builds()
+    sections = [
+        builds.section("a1", depends_on=("base",)),
+        builds.section("a2", depends_on=("base",)),
+        builds.section("a3", depends_on=("base",)),
+        builds.section("base"),
+        builds.section("broken", fail=True),
+        builds.section("after_broken", depends_on=("broken",)),
+    ]
+    result = await assemble_sections(sections, "P1", 2024)
+
+    assert result == {"base": "base-data", "a1": "a1-data", "a2": "a2-data", "a3": "a3-data",
+                      "broken": None, "after_broken": None}
+    names = [name for name, _ in builds.calls]
+    assert all(names.index("base") < names.index(a) for a in ("a1", "a2", "a3"))
+    assert dict(builds.calls)["a1"] == {"base": "base-data"}
+    assert "after_broken" not in names
+    assert builds.max_running == 2
+
+    with pytest.raises(ValueError):
+        await assemble_sections([builds.section("x", depends_on=("missing",))], "P1", 2024)
+
+
+async def test_sections_are_cached_until_data_changes(sections_db):
+    builds = Builds()
+    sections = [builds.section("base"), builds.section("broken", fail=True)]
+
+    await assemble_sections(sections, "P1", 2024)
+    await asyncio.gather(*(assemble_sections(sections, "P1", 2024) for _ in range(3)))
+    assert [name for name, _ in builds.calls].count("base") == 1
+    assert [name for name, _ in builds.calls].count("broken") == 2  # Failures are not cached (concurrent calls share one try)
+
+    await assemble_sections(sections, "P1", 2022)
+    await assemble_sections(sections, "P2", 2024)
+    assert [name for name, _ in builds.calls].count("base") == 3
+
+    async with sections_db() as session:
+        session.add(BulkImportJob(id="J1", job_type="single_cycle", status="completed",
+                                  completed_at=datetime(2024, 6, 1)))
+        await session.commit()
+    await assemble_sections(sections, "P1", 2024)
+    assert [name for name, _ in builds.calls].count("base") == 4
+
+
+async def test_concurrent_exports_share_sections_being_computed(sections_db):
+    builds = Builds()
+    sections = [builds.section("base")]
+    results = await asyncio.gather(*(assemble_sections(sections, "P1", 2024) for _ in range(5)))
+    assert all(result == {"base": "base-data"} for result in results)
+    assert len(builds.calls) == 1
+
+
+class StubFECClient:
+    def __init__(self):
+        self.candidate_calls = 0
+
+    async def get_candidate(self, candidate_id):
+        self.candidate_calls += 1
+        if candidate_id == "UNKNOWN":
+            return None
+        return {"candidate_id": candidate_id, "name": f"Candidate {candidate_id}"}
+
+    async def get_candidate_totals(self, candidate_id, cycle=None):
+        return [{"cycle": 2024, "receipts": 100}]
+
+
+class StubAnalyses:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        async def analysis(candidate_id=None, **kwargs):
+            self.calls.append((name, candidate_id))
+            await asyncio.sleep(0.01)
+            return f"{name}:{candidate_id}"
+        return analysis
+
+
+async def test_race_report_computes_each_analysis_once(sections_db):
+    client = StubFECClient()
+    generator = ReportGenerator(client)
+    generator.analysis_service = StubAnalyses()
+    generator.fraud_service = StubAnalyses()
+
+    race = await generator.collect_race_data(["P1", "P2", "UNKNOWN"], "P", "US", cycle=2024)
+    assert [c["candidate"].candidate_id if c["candidate"] else None for c in race["candidates"]] == ["P1", "P2", None]
+    assert race["candidates"][0]["money_flow"] == "build_money_flow_graph:P1"
+    assert race["candidates"][1]["fraud_analysis"] == "analyze_candidate:P2"
+    assert race["candidates"][2]["contribution_analysis"] is None  # Unknown candidate: no analyses
+    assert race["candidates"][2]["financials"][0].total_receipts == 100.0
+    assert len(generator.analysis_service.calls) == 10
+
+    # A second export of the same candidate reuses every section
+    data = await generator.collect_candidate_data("P1", cycle=2024)
+    assert data["velocity"] == "analyze_velocity:P1"
+    assert len(generator.analysis_service.calls) == 10
+    assert client.candidate_calls == 3
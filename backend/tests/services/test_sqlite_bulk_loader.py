@@ -0,0 +1,158 @@
+"""
+Unit tests for the native SQLite bulk-load fast path
+"""
+import json
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.db.database import Base, Committee, Contribution
+from app.services.bulk_data.sqlite_loader import (
+    SCHEDULE_A_COLUMNS,
+    SQLiteBulkLoader,
+    resolve_sqlite_path,
+)
+
+
+def _line(**fields) -> str:
+    """Build a pipe-delimited Schedule A line from keyword fields"""
+    return "|".join(fields.get(col, "") for col in SCHEDULE_A_COLUMNS) + "\n"
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """SQLite file with the contributions and committees tables in WAL mode"""
+    db_path = tmp_path / "bulk.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine, tables=[Contribution.__table__, Committee.__table__])
+    engine.dispose()
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "INSERT INTO committees (committee_id, name, candidate_ids) VALUES (?, ?, ?)",
+        ("C00000001", "Linked Committee", json.dumps(["H0TX01001", "H0TX01002"]))
+    )
+    conn.commit()
+    conn.close()
+    return str(db_path)
+
+
+@pytest.fixture
+def schedule_a_file(tmp_path):
+    """Small Schedule A file covering cleaning, backfill and malformed lines"""
+    path = tmp_path / "itcont.txt"
+    lines = [
+        _line(CMTE_ID="C00000001", NAME="SMITH, JOHN", STATE="TX", TRANSACTION_DT="01152024",
+              TRANSACTION_AMT="1,000", ENTITY_TP_CODE="15", ENTITY_TP_DESC="IND",
+              OCCUPATION="N/A", SUB_ID="1001"),
+        _line(CMTE_ID="C00000002", CAND_ID="P00000001", NAME=" DOE, JANE ", TRANSACTION_DT="20240301",
+              TRANSACTION_AMT="250", SUB_ID="1002"),
+        _line(CMTE_ID="C00000002", NAME="BAD DATE", TRANSACTION_DT="13452024",
+              TRANSACTION_AMT="abc", SUB_ID="1003"),
+        _line(CMTE_ID="C00000002", NAME="NO SUB ID", TRANSACTION_AMT="5"),
+        _line(CMTE_ID="C00000002", NAME="DUPLICATE", TRANSACTION_AMT="9", SUB_ID="1001"),
+        "C00000003|too|many|fields" + "|x" * 30 + "\n",
+    ]
+    path.write_text("".join(lines))
+    return str(path)
+
+
+def _fetch(db_path, contribution_id):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        return conn.execute(
+            "SELECT * FROM contributions WHERE contribution_id = ?", (contribution_id,)
+        ).fetchone()
+    finally:
+        conn.close()
+
+
+def test_load_contributions_transforms_rows(sqlite_db, schedule_a_file):
+    """Rows are cleaned, parsed and backfilled entirely in SQL"""
+    loader = SQLiteBulkLoader(sqlite_db, batch_size=2, merge_window_rows=2)
+    result = loader.load_contributions(schedule_a_file)
+
+    assert result.rows_read == 5  # Over-wide line skipped
+    assert result.rows_inserted == 3
+    assert result.rows_merged == 1  # Repeated SUB_ID merged into the first row
+    assert result.rows_skipped == 1  # Missing SUB_ID
+    assert result.windows >= 2
+
+    first = _fetch(sqlite_db, "1001")
+    assert first["candidate_id"] == "H0TX01001"  # Backfilled from committee linkage
+    assert first["contribution_date"] == "2024-01-15 00:00:00.000000"
+    assert first["contributor_state"] == "TX"
+    assert first["contributor_occupation"] is None
+    assert first["entity_type"] == "15IND"
+    assert first["data_source"] == "bulk"
+    # Smart-merged with the later duplicate line
+    assert first["contributor_name"] == "DUPLICATE"
+    assert first["contribution_amount"] == 9.0
+    assert first["committee_id"] == "C00000002"
+    raw = json.loads(first["raw_data"])
+    assert set(raw) == set(SCHEDULE_A_COLUMNS)
+    assert raw["TRANSACTION_AMT"] == "9"
+    assert raw["TRANSACTION_DT"] is None
+    assert raw["CAND_ID"] is None
+
+    second = _fetch(sqlite_db, "1002")
+    assert second["contributor_name"] == "DOE, JANE"
+    assert second["candidate_id"] == "P00000001"
+    assert second["contribution_date"] == "2024-03-01 00:00:00.000000"
+
+    third = _fetch(sqlite_db, "1003")
+    assert third["contribution_date"] is None
+    assert third["contribution_amount"] == 0.0
+    assert third["candidate_id"] is None
+
+
+def test_load_restores_indexes_and_pragmas(sqlite_db, schedule_a_file):
+    """Secondary indexes are rebuilt and journal mode is restored after loading"""
+    conn = sqlite3.connect(sqlite_db)
+    indexes_before = {
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'contributions'"
+        )
+    }
+    conn.close()
+
+    SQLiteBulkLoader(sqlite_db).load_contributions(schedule_a_file)
+
+    conn = sqlite3.connect(sqlite_db)
+    indexes_after = {
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'contributions'"
+        )
+    }
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.close()
+
+    assert "idx_contributor_name" in indexes_before
+    assert indexes_after == indexes_before
+    assert journal_mode == "wal"
+
+
+def test_load_stops_when_cancelled(sqlite_db, schedule_a_file):
+    """Cancellation is checked before each staging batch"""
+    loader = SQLiteBulkLoader(sqlite_db, batch_size=1, merge_window_rows=1)
+    calls = {"count": 0}
+
+    def should_cancel():
+        calls["count"] += 1
+        return calls["count"] > 1
+
+    result = loader.load_contributions(schedule_a_file, should_cancel=should_cancel)
+
+    assert result.cancelled is True
+    assert result.rows_read == 1
+    assert loader.table_is_empty() is False
+
+
+def test_resolve_sqlite_path():
+    """Only file-backed SQLite URLs resolve to a path"""
+    assert resolve_sqlite_path("sqlite+aiosqlite:///:memory:") is None
+    assert resolve_sqlite_path("postgresql+asyncpg://user@localhost/fec") is None
+    assert resolve_sqlite_path("sqlite+aiosqlite:///./fec_data.db").endswith("fec_data.db")